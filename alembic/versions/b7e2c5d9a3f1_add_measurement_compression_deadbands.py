@@ -0,0 +1,49 @@
+"""add measurement compression deadbands
+
+Revision ID: b7e2c5d9a3f1
+Revises: a4d9e6f1b2c3, 4f7a9c2d1e6b, f31a9e7c4d21
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b7e2c5d9a3f1"
+down_revision: Union[str, Sequence[str], None] = (
+    "a4d9e6f1b2c3",
+    "4f7a9c2d1e6b",
+    "f31a9e7c4d21",
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "providers",
+        sa.Column(
+            "measurement_deadband",
+            sa.Float(),
+            nullable=True,
+            comment="Swinging-door deadband for measured_value; NULL stores every reading",
+        ),
+    )
+    op.add_column(
+        "provider_metric_definitions",
+        sa.Column(
+            "compression_deadband",
+            sa.Float(),
+            nullable=True,
+            comment="Swinging-door deadband in metric units; NULL stores every sample",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("provider_metric_definitions", "compression_deadband")
+    op.drop_column("providers", "measurement_deadband")
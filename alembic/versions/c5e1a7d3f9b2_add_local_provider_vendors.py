@@ -0,0 +1,38 @@
+"""add local-network provider vendors
+
+Revision ID: c5e1a7d3f9b2
+Revises: b7e2c5d9a3f1
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a7d3f9b2"
+down_revision: Union[str, Sequence[str], None] = "b7e2c5d9a3f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_LOCAL_VENDORS = [
+    "FRONIUS",
+    "SUNSPEC",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for value in _LOCAL_VENDORS:
+        op.execute(
+            f"ALTER TYPE provider_vendor_enum ADD VALUE IF NOT EXISTS '{value}'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL enum value removal is destructive and intentionally skipped.
+    pass
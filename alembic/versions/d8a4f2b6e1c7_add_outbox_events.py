@@ -0,0 +1,95 @@
+"""Add outbox_events table for agent events published after commit.
+
+Revision ID: d8a4f2b6e1c7
+Revises: c5e1a7d3f9b2
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a4f2b6e1c7"
+down_revision: Union[str, Sequence[str], None] = "c5e1a7d3f9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+outbox_event_status_enum = postgresql.ENUM(
+    "PENDING",
+    "SENT",
+    "ACK_OK",
+    "ACK_FAIL",
+    "TIMEOUT",
+    name="outbox_event_status_enum",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    outbox_event_status_enum.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("entity_id", sa.String(length=64), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("ack_subject", sa.String(), nullable=False),
+        sa.Column("payload_json", sa.JSON(), nullable=False),
+        sa.Column("ack_match_json", sa.JSON(), nullable=False),
+        sa.Column("reconcile_json", sa.JSON(), nullable=True),
+        sa.Column("status", outbox_event_status_enum, nullable=False),
+        sa.Column("attempt", sa.Integer(), nullable=False),
+        sa.Column("next_retry_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("ack_deadline_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("ack_payload_json", sa.JSON(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_outbox_events_event_id"),
+        "outbox_events",
+        ["event_id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_outbox_events_entity_id"),
+        "outbox_events",
+        ["entity_id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_outbox_events_pending",
+        "outbox_events",
+        ["status", "next_retry_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_outbox_events_sent",
+        "outbox_events",
+        ["status", "ack_deadline_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_outbox_events_finished",
+        "outbox_events",
+        ["status", "updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_outbox_events_finished", table_name="outbox_events")
+    op.drop_index("idx_outbox_events_sent", table_name="outbox_events")
+    op.drop_index("idx_outbox_events_pending", table_name="outbox_events")
+    op.drop_index(op.f("ix_outbox_events_entity_id"), table_name="outbox_events")
+    op.drop_index(op.f("ix_outbox_events_event_id"), table_name="outbox_events")
+    op.drop_table("outbox_events")
+    outbox_event_status_enum.drop(op.get_bind(), checkfirst=True)
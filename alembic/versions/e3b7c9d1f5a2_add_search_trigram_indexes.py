@@ -0,0 +1,64 @@
+"""Add pg_trgm GIN indexes for the repository search fields.
+
+Revision ID: e3b7c9d1f5a2
+Revises: d8a4f2b6e1c7
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b7c9d1f5a2"
+down_revision: Union[str, Sequence[str], None] = "d8a4f2b6e1c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs from the repositories' search_fields.
+TRIGRAM_COLUMNS = (
+    ("users", "email"),
+    ("user_profiles", "first_name"),
+    ("user_profiles", "last_name"),
+    ("user_profiles", "company_name"),
+    ("user_profiles", "company_vat"),
+    ("microcontrollers", "name"),
+)
+
+EMAIL_PATTERN_INDEX = "ix_users_email_lower_pattern"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {EMAIL_PATTERN_INDEX} "
+            "ON users (lower(email) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {EMAIL_PATTERN_INDEX}")
+        for table, column in reversed(TRIGRAM_COLUMNS):
+            op.drop_index(
+                f"ix_{table}_{column}_trgm",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
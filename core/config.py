@@ -2,6 +2,7 @@ from functools import cached_property
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
 
 
 class CommonSettings(BaseSettings):
@@ -31,6 +32,17 @@ class CommonSettings(BaseSettings):
     POSTGRES_PASSWORD: SecretStr = SecretStr("postgres")
 
     DATABASE_URL_OVERRIDE: str | None = None
+    # Used by AsyncSession; derived from DATABASE_URL with the asyncpg driver.
+    ASYNC_DATABASE_URL_OVERRIDE: str | None = None
+    # Comma-separated read replica URLs; chart reads are spread over them.
+    DATABASE_REPLICA_URLS: str = ""
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEC: float = 30.0
+    DB_POOL_RECYCLE_SEC: int = 1800
+    # Server-side statement_timeout for every connection; 0 disables it.
+    DB_STATEMENT_TIMEOUT_MS: int = 0
 
     # ------------------------------------------------------------------
     # Messaging / Cache
@@ -41,6 +53,44 @@ class CommonSettings(BaseSettings):
     STREAM_NAME: str = "device_communication"
     SUBJECT: str = "device_communication.*.event.provider_current_energy"
 
+    # Payloads above the threshold are compressed before publishing.
+    # Agents must understand the Content-Encoding header before enabling.
+    NATS_COMPRESSION_ENABLED: bool = False
+    NATS_COMPRESSION_CODEC: str = "gzip"
+    NATS_COMPRESSION_MIN_BYTES: int = 8192
+
+    # 0 keeps a single connection; N > 0 shards publishes over N connections
+    # and moves subscriptions to a dedicated one.
+    NATS_PUBLISH_POOL_SIZE: int = 0
+
+    # JetStream KV bucket holding latest provider/device state for API nodes.
+    NATS_STATE_CACHE_BUCKET: str = "latest_state"
+    NATS_STATE_CACHE_TTL_SEC: float = 3600.0
+    # Values read from the database on a miss are only mirrored this long,
+    # since no KV update will ever replace them.
+    NATS_STATE_CACHE_LOAD_TTL_SEC: float = 30.0
+    # A microcontroller without a heartbeat for this long reads as offline.
+    NATS_STATE_CACHE_ONLINE_TIMEOUT_SEC: float = 90.0
+
+    # Transactional outbox: agent events are committed with the state
+    # change and published by OutboxRelay, which then waits for the ACKs.
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SEC: float = 0.5
+    OUTBOX_ACK_TIMEOUT_SEC: float = 10.0
+    OUTBOX_MAX_ATTEMPTS: int = 3
+    OUTBOX_RETRY_DELAY_SEC: float = 2.0
+    # Settled events are deleted once older than the retention window.
+    OUTBOX_RETENTION_SEC: float = 7 * 24 * 3600.0
+    OUTBOX_PURGE_INTERVAL_SEC: float = 300.0
+    OUTBOX_PURGE_BATCH_SIZE: int = 1000
+
+    # Microcontrollers commanded concurrently by bulk device operations.
+    DEVICE_BULK_COMMAND_CONCURRENCY: int = 8
+    # One DISABLE_SCHEDULER batch command per microcontroller. Enable once
+    # every agent answers batch commands; older agents get one command per
+    # device.
+    DEVICE_BATCH_COMMANDS_ENABLED: bool = False
+
     # ------------------------------------------------------------------
     # Security (REQUIRED)
     # ------------------------------------------------------------------
@@ -82,6 +132,18 @@ class CommonSettings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_NAME}"
         )
 
+    @cached_property
+    def ASYNC_DATABASE_URL(self) -> str:
+        if self.ASYNC_DATABASE_URL_OVERRIDE:
+            return self.ASYNC_DATABASE_URL_OVERRIDE
+
+        url = make_url(self.DATABASE_URL).set(drivername="postgresql+asyncpg")
+        return url.render_as_string(hide_password=False)
+
+    @cached_property
+    def database_replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     @cached_property
     def jwt_secret_str(self) -> str:
         return self.JWT_SECRET.get_secret_value()
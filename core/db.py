@@ -1,23 +1,144 @@
-from contextlib import asynccontextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, wraps
+from itertools import cycle
+from typing import Any, AsyncIterator, Callable, Iterator, Sequence, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from smart_common.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+T = TypeVar("T")
+
+
+def _engine_options(url: str, *, asyncpg: bool = False) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SEC,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SEC,
+    }
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms > 0 and make_url(url).get_backend_name() == "postgresql":
+        if asyncpg:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(timeout_ms)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+class RoutingSession(Session):
+    """
+    Session that can send reads to read replicas.
+
+    Only plain SELECTs issued inside `use_replica()` go to a replica,
+    round-robin. Flushes, DML, SELECT ... FOR UPDATE and raw SQL stay on
+    the primary, and once the session has written anything it is pinned
+    to the primary until closed, so a request always reads its own writes.
+    """
+
+    def __init__(self, *args: Any, replicas: Sequence[Engine] = (), **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._replicas = cycle(replicas) if replicas else None
+        self._replica_depth = 0
+        self._pinned = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any):
+        if (
+            self._replica_depth
+            and self._replicas is not None
+            and not self._pinned
+            and not self._flushing
+        ):
+            if isinstance(clause, Select) and clause._for_update_arg is None:
+                return next(self._replicas)
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        self._pinned = False
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session: RoutingSession, flush_context: Any) -> None:
+    session._pinned = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_after_dml(orm_execute_state: Any) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session._pinned = True
+
+
+@contextmanager
+def use_replica(session: Session) -> Iterator[Session]:
+    """Route the session's plain reads to a replica within the block."""
+    if not isinstance(session, RoutingSession):
+        yield session
+        return
+
+    session._replica_depth += 1
+    try:
+        yield session
+    finally:
+        session._replica_depth -= 1
+
+
+def replica_read(method: Callable[..., T]) -> Callable[..., T]:
+    """Run a read-only repository method under `use_replica(self.session)`."""
+
+    @wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> T:
+        with use_replica(self.session):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+engine = create_engine(
+    settings.DATABASE_URL, future=True, **_engine_options(settings.DATABASE_URL)
+)
+replica_engines = [
+    create_engine(url, future=True, **_engine_options(url))
+    for url in settings.database_replica_urls
+]
 
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
     expire_on_commit=False,
+    replicas=replica_engines,
+)
+
+# Bound on first use, so importing this module does not require asyncpg.
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
 )
 
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        **_engine_options(settings.ASYNC_DATABASE_URL, asyncpg=True),
+    )
+
+
 def get_db() -> Iterator[Session]:
     db = SessionLocal()
     try:
@@ -26,11 +147,41 @@ def get_db() -> Iterator[Session]:
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
+async def run_in_session(
+    db: Session | AsyncSession,
+    fn: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """
+    Call `fn(session, *args, **kwargs)` with a sync `Session`.
+
+    For an `AsyncSession` this goes through `run_sync`: the sync ORM code,
+    repositories and lazy loads included, runs unchanged while the I/O
+    happens on asyncpg without blocking the event loop. Objects it returns
+    must only be read through already loaded attributes outside `fn`.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
 @asynccontextmanager
-async def transactional_session(session: Session):
+async def transactional_session(session: Session | AsyncSession):
     try:
         yield session
-        session.commit()
+        if isinstance(session, AsyncSession):
+            await session.commit()
+        else:
+            session.commit()
     except Exception:
-        session.rollback()
+        if isinstance(session, AsyncSession):
+            await session.rollback()
+        else:
+            session.rollback()
         raise
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class OutboxEventStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    ACK_OK = "ACK_OK"
+    ACK_FAIL = "ACK_FAIL"
+    TIMEOUT = "TIMEOUT"
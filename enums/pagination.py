@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class CountMode(str, Enum):
+    EXACT = "EXACT"
+    # pg_class.reltuples without search; capped count otherwise.
+    ESTIMATED = "ESTIMATED"
+    CAPPED = "CAPPED"
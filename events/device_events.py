@@ -4,6 +4,7 @@ from smart_common.enums.event import EventType
 from smart_common.schemas.scheduler_policy import SchedulerControlPolicy
 from smart_common.schemas.automation_rule import AutomationRuleGroup
 from smart_common.schemas.base import APIModel
+from smart_common.schemas.device_config_patch import DeviceConfigPatch
 from smart_common.schemas.device_dependency import DeviceDependencyRule
 
 
@@ -23,6 +24,7 @@ class DeviceCreatedPayload(APIModel):
     device_dependency_rule: DeviceDependencyRule | None = None
     scheduler_id: Optional[int] = None
     microcontroller_uuid: Optional[str] = None
+    config_patch: DeviceConfigPatch | None = None
 
 
 class DeviceCreatedEvent(BaseEvent):
@@ -40,6 +42,7 @@ class DeviceUpdatedPayload(APIModel):
     auto_rule: Optional[AutomationRuleGroup] = None
     device_dependency_rule: DeviceDependencyRule | None = None
     scheduler_id: Optional[int] = None
+    config_patch: DeviceConfigPatch | None = None
 
 
 class DeviceUpdatedEvent(BaseEvent):
@@ -73,6 +76,27 @@ class DeviceCommandEvent(BaseEvent):
     payload: DeviceCommandPayload
 
 
+class DeviceBatchCommandItem(APIModel):
+    device_id: int
+    device_uuid: str
+    device_number: int
+    mode: str
+    is_on: bool
+    scheduler_id: Optional[int] = None
+
+
+class DeviceBatchCommandPayload(APIModel):
+    """
+    Several device commands for one microcontroller in one event. The
+    agent ACKs with the same `command_id` and per-device `results`
+    (`device_id`, `ok`, `is_on`).
+    """
+
+    command_id: str
+    command: str
+    devices: List[DeviceBatchCommandItem]
+
+
 class MicrocontrollerCommandPayload(APIModel):
     command_id: str
     command: str
@@ -101,6 +125,7 @@ class DeviceEventUnion(BaseEvent):
         DeviceUpdatedPayload,
         PowerReadingPayload,
         DeviceCommandPayload,
+        DeviceBatchCommandPayload,
         MicrocontrollerCommandPayload,
         DeviceDeletePayload,
     ]
@@ -72,6 +72,35 @@ class EventDispatcher:
             context=context or {},
         )
 
+    def build_ack_event(
+        self,
+        *,
+        entity_type: str,
+        entity_id: str,
+        event_type: Union[EventType, str],
+        data: Union[BaseModel, Dict[str, Any]],
+        subject: str | None = None,
+        ack_subject: str | None = None,
+        source: str | None = None,
+    ) -> tuple[str, str, Dict[str, Any]]:
+        """
+        Build `(subject, ack_subject, payload)` for an event that expects
+        an ACK, e.g. to store it in the outbox and publish it later.
+        """
+        resolved_subject = subject or subject_for_entity(entity_id)
+        resolved_ack = ack_subject or ack_subject_for_entity(entity_id)
+
+        payload = build_event_payload(
+            subject=resolved_subject,
+            event_type=self._event_type_value(event_type),
+            entity_type=entity_type,
+            entity_id=entity_id,
+            data=self._serialize_data(data),
+            source=source or self.default_source,
+        )
+        payload["ack_subject"] = resolved_ack
+        return resolved_subject, resolved_ack, payload
+
     async def publish_event_and_wait_for_ack(
         self,
         *,
@@ -96,20 +125,16 @@ class EventDispatcher:
 
         logger.info("Publish event and wait for ACK")
 
-        resolved_subject = subject or subject_for_entity(entity_id)
-        resolved_ack = ack_subject or ack_subject_for_entity(entity_id)
-
-        payload = build_event_payload(
-            subject=resolved_subject,
-            event_type=self._event_type_value(event_type),
+        resolved_subject, resolved_ack, payload = self.build_ack_event(
             entity_type=entity_type,
             entity_id=entity_id,
-            data=self._serialize_data(data),
-            source=source or self.default_source,
+            event_type=event_type,
+            data=data,
+            subject=subject,
+            ack_subject=ack_subject,
+            source=source,
         )
 
-        payload["ack_subject"] = resolved_ack
-
         logger.info(
             "NATS PUBLISH → subject=%s ack_subject=%s event_type=%s entity_id=%s ack_subject=%s",
             resolved_subject,
@@ -6,7 +6,7 @@ from uuid import UUID as UUIDType
 from uuid import uuid4
 
 from pydantic import BaseModel
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.mutable import MutableDict
@@ -20,6 +20,14 @@ from smart_common.models.microcontroller_sensor_capability import (
 
 class Microcontroller(Base):
     __tablename__ = "microcontrollers"
+    __table_args__ = (
+        Index(
+            "ix_microcontrollers_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
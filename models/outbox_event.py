@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID as UUIDType
+from uuid import uuid4
+
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from smart_common.core.db import Base
+from smart_common.enums.outbox import OutboxEventStatus
+
+
+class OutboxEvent(Base):
+    """
+    Agent event written in the same transaction as the state change it
+    announces. `OutboxRelay` publishes it, waits for the ACK matching
+    `ack_match_json` and runs the reconciler for `event_type` afterwards.
+    """
+
+    __tablename__ = "outbox_events"
+
+    __table_args__ = (
+        Index(
+            "idx_outbox_events_pending",
+            "status",
+            "next_retry_at",
+        ),
+        Index(
+            "idx_outbox_events_sent",
+            "status",
+            "ack_deadline_at",
+        ),
+        Index(
+            "idx_outbox_events_finished",
+            "status",
+            "updated_at",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True),
+        unique=True,
+        nullable=False,
+        index=True,
+        default=uuid4,
+    )
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Microcontroller UUID; events for one microcontroller are published in order.
+    entity_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+
+    subject: Mapped[str] = mapped_column(String, nullable=False)
+    ack_subject: Mapped[str] = mapped_column(String, nullable=False)
+    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    ack_match_json: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # State the reconciler needs, e.g. the values to restore on failure.
+    reconcile_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    status: Mapped[OutboxEventStatus] = mapped_column(
+        Enum(OutboxEventStatus, name="outbox_event_status_enum"),
+        nullable=False,
+        default=OutboxEventStatus.PENDING,
+    )
+    attempt: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    ack_deadline_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    ack_payload_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
     Numeric,
     String,
@@ -102,6 +103,11 @@ class Provider(Base):
         nullable=True,
         comment="Expected max interval (seconds) between measurements",
     )
+    measurement_deadband: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+        comment="Swinging-door deadband for measured_value; NULL stores every reading",
+    )
     has_power_meter: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     has_energy_storage: Mapped[bool] = mapped_column(
         Boolean,
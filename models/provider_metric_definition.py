@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Enum, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Enum, Float, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from smart_common.core.db import Base
@@ -56,5 +56,10 @@ class ProviderMetricDefinition(Base):
         ),
         nullable=True,
     )
+    compression_deadband: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+        comment="Swinging-door deadband in metric units; NULL stores every sample",
+    )
 
     provider = relationship("Provider", back_populates="telemetry_metrics")
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from smart_common.core.db import Base
@@ -8,6 +17,32 @@ from smart_common.core.db import Base
 
 class UserProfile(Base):
     __tablename__ = "user_profiles"
+    __table_args__ = (
+        Index(
+            "ix_user_profiles_first_name_trgm",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_user_profiles_last_name_trgm",
+            "last_name",
+            postgresql_using="gin",
+            postgresql_ops={"last_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_user_profiles_company_name_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_user_profiles_company_vat_trgm",
+            "company_vat",
+            postgresql_using="gin",
+            postgresql_ops={"company_vat": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -1,7 +1,9 @@
 from smart_common.nats.client import NATSClient, nats_client
 from smart_common.nats.listener import NatsListener
 from smart_common.nats.module import NatsModule, nats_module
+from smart_common.nats.pool import NatsConnectionPool
 from smart_common.nats.publisher import NatsPublisher
+from smart_common.nats.state_cache import LatestStateCache
 from smart_common.nats.streams import DEVICE_COMM_STREAM
 from smart_common.nats.subjects import INVERTER_UPDATE, RASPBERRY_EVENTS, RASPBERRY_HEARTBEAT
 
@@ -10,6 +12,8 @@ __all__ = [
     "nats_client",
     "NatsListener",
     "NatsPublisher",
+    "NatsConnectionPool",
+    "LatestStateCache",
     "NatsModule",
     "nats_module",
     "INVERTER_UPDATE",
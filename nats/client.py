@@ -112,6 +112,13 @@ class NATSClient:
             return True
         return False
 
+    def connection_for(self, subject: str) -> "NATSClient":
+        """Connection that carries publishes for `subject`."""
+        return self
+
+    def record_publish(self, connection: "NATSClient", error: Exception | None = None) -> None:
+        """Health hook for pooled clients; a single connection tracks nothing."""
+
     async def publish(self, subject: str, payload: dict):
         """Simple fire-and-forget publish"""
         await self.ensure_connected()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from typing import Any, Dict, Mapping
+
+from smart_common.core.config import settings
+
+try:  # optional dependency, gzip is always available
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ENCODING_HEADER = "Content-Encoding"
+ORIGINAL_SIZE_HEADER = "Content-Length-Original"
+
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+SUPPORTED_CODECS = frozenset({CODEC_GZIP, CODEC_ZSTD})
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class PayloadCodec:
+    """
+    Size-aware compression for NATS message bodies.
+
+    Payloads smaller than `min_bytes` are sent as plain JSON without headers,
+    so small commands stay readable by agents that do not decode yet.
+    Larger payloads are compressed and tagged with `Content-Encoding`.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool | None = None,
+        codec: str | None = None,
+        min_bytes: int | None = None,
+    ) -> None:
+        self.enabled = settings.NATS_COMPRESSION_ENABLED if enabled is None else enabled
+        self.codec = _resolve_codec(codec or settings.NATS_COMPRESSION_CODEC)
+        self.min_bytes = (
+            settings.NATS_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+        )
+
+    def encode(self, payload: Dict[str, Any]) -> tuple[bytes, Dict[str, str] | None]:
+        data = json.dumps(payload).encode("utf-8")
+        return self.encode_bytes(data)
+
+    def encode_bytes(self, data: bytes) -> tuple[bytes, Dict[str, str] | None]:
+        if not self.enabled or len(data) < self.min_bytes:
+            return data, None
+
+        compressed = compress(data, self.codec)
+        if len(compressed) >= len(data):
+            return data, None
+
+        return compressed, {
+            ENCODING_HEADER: self.codec,
+            ORIGINAL_SIZE_HEADER: str(len(data)),
+        }
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd payload received but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_GZIP:
+        return gzip.decompress(data)
+    raise ValueError(f"Unsupported NATS payload encoding: {codec}")
+
+
+def decode_message_data(data: bytes, headers: Mapping[str, str] | None) -> bytes:
+    """Return the plain message body, decompressing it when a header says so."""
+    codec = (headers or {}).get(ENCODING_HEADER)
+    if not codec:
+        return data
+    return decompress(data, codec)
+
+
+def decode_message_json(msg: Any) -> Dict[str, Any]:
+    data = decode_message_data(msg.data, getattr(msg, "headers", None))
+    return json.loads(data.decode("utf-8"))
+
+
+def _resolve_codec(codec: str) -> str:
+    normalized = codec.strip().lower()
+    if normalized not in SUPPORTED_CODECS:
+        raise ValueError(f"Unsupported NATS compression codec: {codec}")
+    if normalized == CODEC_ZSTD and zstandard is None:
+        logger.warning("[NATS] zstandard not installed — falling back to gzip")
+        return CODEC_GZIP
+    return normalized
+
+
+payload_codec = PayloadCodec()
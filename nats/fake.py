@@ -0,0 +1,797 @@
+"""
+In-process stand-in for a nats-server with JetStream.
+
+Covers the subset of the `nats` client and `JetStreamContext` API used by
+`NATSClient`, `NatsPublisher` and `NatsListener`: core publish/subscribe,
+JetStream publish with stream sequence acks, durable push consumers with
+manual ack and redelivery, drain and close. Latency and failures are
+injected from a seeded RNG so benchmarks are reproducible offline.
+
+    server = InMemoryNatsServer(FaultInjection(latency_sec=0.002))
+    server.add_stream("device_communication", ["device_communication.>"])
+    client = FakeNATSClient(server)
+    await client.connect()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+from nats.aio.msg import Msg
+from nats.errors import (
+    ConnectionClosedError,
+    ConnectionDrainingError,
+    TimeoutError as NatsTimeoutError,
+)
+from nats.js import api
+from nats.js.errors import NoStreamResponseError, NotFoundError
+
+from smart_common.nats.client import NATSClient
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[Any], Awaitable[None]]
+
+DEFAULT_ACK_WAIT_SEC = 30.0
+DEFAULT_MAX_DELIVER = 5
+
+
+@dataclass
+class FaultInjection:
+    """
+    Latency and failure knobs applied by `InMemoryNatsServer`.
+
+    `latency_sec` (+ uniform `jitter_sec`) is added to every publish and
+    every delivery. `publish_error_rate` makes JetStream publishes raise
+    `nats.errors.TimeoutError`; `drop_rate` silently drops core deliveries,
+    which is how a lost agent ACK looks from the backend.
+    """
+
+    latency_sec: float = 0.0
+    jitter_sec: float = 0.0
+    publish_error_rate: float = 0.0
+    drop_rate: float = 0.0
+    seed: int | None = 0
+
+
+def subject_matches(pattern: str, subject: str) -> bool:
+    pattern_tokens = pattern.split(".")
+    subject_tokens = subject.split(".")
+
+    for index, token in enumerate(pattern_tokens):
+        if token == ">":
+            return len(subject_tokens) > index
+        if index >= len(subject_tokens):
+            return False
+        if token != "*" and token != subject_tokens[index]:
+            return False
+
+    return len(pattern_tokens) == len(subject_tokens)
+
+
+class FakeMsg:
+    """Message delivered by the fake server; mirrors `nats.aio.msg.Msg`."""
+
+    def __init__(
+        self,
+        *,
+        subject: str,
+        data: bytes,
+        headers: Dict[str, str] | None = None,
+        reply: str = "",
+        connection: "FakeNatsConnection | None" = None,
+        metadata: Msg.Metadata | None = None,
+        on_ack: Callable[[bool], None] | None = None,
+    ) -> None:
+        self.subject = subject
+        self.data = data
+        self.headers = headers
+        self.reply = reply
+        self._connection = connection
+        self._metadata = metadata
+        self._on_ack = on_ack
+        self._ackd = False
+
+    @property
+    def metadata(self) -> Msg.Metadata:
+        if self._metadata is None:
+            raise ValueError("Not a JetStream message")
+        return self._metadata
+
+    async def respond(self, data: bytes) -> None:
+        if not self.reply:
+            raise ValueError("No reply subject")
+        await self._connection.publish(self.reply, data)
+
+    async def ack(self) -> None:
+        self._settle(True)
+
+    async def ack_sync(self, timeout: float = 1.0) -> "FakeMsg":
+        self._settle(True)
+        return self
+
+    async def nak(self, delay: float | None = None) -> None:
+        self._settle(False)
+
+    async def term(self) -> None:
+        self._settle(True)
+
+    async def in_progress(self) -> None:
+        return None
+
+    def _settle(self, acked: bool) -> None:
+        if self._metadata is None:
+            raise ValueError("Not a JetStream message")
+        if self._ackd:
+            return
+        self._ackd = True
+        if self._on_ack is not None:
+            self._on_ack(acked)
+
+
+class FakeSubscription:
+    def __init__(
+        self,
+        *,
+        server: "InMemoryNatsServer",
+        connection: "FakeNatsConnection",
+        subject: str,
+        queue: str = "",
+        cb: Callback | None = None,
+        max_msgs: int = 0,
+    ) -> None:
+        self.subject = subject
+        self.queue = queue
+        self._server = server
+        self._connection = connection
+        self._cb = cb
+        self._max_msgs = max_msgs
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self.delivered = 0
+        if cb is not None:
+            self._task = asyncio.create_task(self._dispatch())
+
+    @property
+    def pending_msgs(self) -> int:
+        return self._pending.qsize()
+
+    def _enqueue(self, msg: FakeMsg) -> None:
+        if not self._closed:
+            self._pending.put_nowait(msg)
+
+    async def next_msg(self, timeout: float | None = 1.0) -> FakeMsg:
+        try:
+            msg = await asyncio.wait_for(self._pending.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise NatsTimeoutError
+        self._pending.task_done()
+        self.delivered += 1
+        return msg
+
+    async def _dispatch(self) -> None:
+        while True:
+            msg = await self._pending.get()
+            try:
+                await self._server.delay()
+                self.delivered += 1
+                await self._handle(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[NATS] Fake subscriber callback failed")
+            finally:
+                self._pending.task_done()
+
+            if self._max_msgs and self.delivered >= self._max_msgs:
+                await self.unsubscribe()
+                return
+
+    async def _handle(self, msg: FakeMsg) -> None:
+        await self._cb(msg)
+
+    async def drain(self) -> None:
+        if self._task is not None and not self._closed:
+            await self._pending.join()
+        await self.unsubscribe()
+
+    async def unsubscribe(self, limit: int = 0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._server._remove_subscription(self)
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class FakeJetStreamSubscription(FakeSubscription):
+    """Push subscription bound to a durable (or ephemeral) consumer."""
+
+    def __init__(self, *, consumer: "_Consumer", **kwargs: Any) -> None:
+        self._consumer = consumer
+        super().__init__(**kwargs)
+
+    async def _handle(self, msg: FakeMsg) -> None:
+        await self._cb(msg)
+        if not self._consumer.manual_ack and not msg._ackd:
+            await msg.ack()
+
+    async def consumer_info(self) -> api.ConsumerInfo:
+        return self._consumer.info()
+
+    async def unsubscribe(self, limit: int = 0) -> None:
+        self._consumer.detach(self)
+        await super().unsubscribe(limit)
+
+
+class _Stream:
+    def __init__(self, name: str, subjects: List[str]) -> None:
+        self.name = name
+        self.subjects = subjects
+        self.messages: List[tuple[int, str, bytes, Dict[str, str] | None, datetime]] = []
+        self.bytes = 0
+        self.last_seq = 0
+
+    def matches(self, subject: str) -> bool:
+        return any(subject_matches(pattern, subject) for pattern in self.subjects)
+
+    def info(self, consumer_count: int) -> api.StreamInfo:
+        first_seq = self.messages[0][0] if self.messages else 0
+        return api.StreamInfo(
+            config=api.StreamConfig(name=self.name, subjects=list(self.subjects)),
+            state=api.StreamState(
+                messages=len(self.messages),
+                bytes=self.bytes,
+                first_seq=first_seq,
+                last_seq=self.last_seq,
+                consumer_count=consumer_count,
+            ),
+        )
+
+
+class _Consumer:
+    """Consumer state that survives re-subscription when it is durable."""
+
+    def __init__(
+        self,
+        *,
+        server: "InMemoryNatsServer",
+        stream: _Stream,
+        name: str,
+        filter_subject: str,
+        manual_ack: bool,
+        ack_wait: float,
+        max_deliver: int,
+        start_seq: int,
+    ) -> None:
+        self._server = server
+        self.stream = stream
+        self.name = name
+        self.filter_subject = filter_subject
+        self.manual_ack = manual_ack
+        self.ack_wait = ack_wait
+        self.max_deliver = max_deliver
+        self.next_seq = start_seq
+        self.delivered_seq = 0
+        self.acked: set[int] = set()
+        self.attempts: Dict[int, int] = {}
+        self.redelivered = 0
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self.subscription: FakeJetStreamSubscription | None = None
+
+    def attach(self, subscription: FakeJetStreamSubscription) -> None:
+        self.subscription = subscription
+        for seq, subject, data, headers, stored_at in self.stream.messages:
+            if seq < self.next_seq or seq in self.acked:
+                continue
+            self.offer(seq, subject, data, headers, stored_at)
+
+    def detach(self, subscription: FakeJetStreamSubscription) -> None:
+        if self.subscription is subscription:
+            self.subscription = None
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+    def offer(
+        self,
+        seq: int,
+        subject: str,
+        data: bytes,
+        headers: Dict[str, str] | None,
+        stored_at: datetime,
+    ) -> None:
+        if self.subscription is None or seq in self.acked:
+            return
+        if not subject_matches(self.filter_subject, subject):
+            return
+
+        attempts = self.attempts.get(seq, 0) + 1
+        if attempts > self.max_deliver:
+            return
+        self.attempts[seq] = attempts
+        if attempts > 1:
+            self.redelivered += 1
+        self.delivered_seq += 1
+        self.next_seq = max(self.next_seq, seq + 1)
+
+        msg = FakeMsg(
+            subject=subject,
+            data=data,
+            headers=headers,
+            connection=self.subscription._connection,
+            metadata=Msg.Metadata(
+                sequence=Msg.Metadata.SequencePair(
+                    consumer=self.delivered_seq,
+                    stream=seq,
+                ),
+                num_pending=max(0, self.stream.last_seq - seq),
+                num_delivered=attempts,
+                timestamp=stored_at,
+                stream=self.stream.name,
+                consumer=self.name,
+            ),
+            on_ack=lambda acked, seq=seq: self._settle(seq, acked),
+        )
+        self.subscription._enqueue(msg)
+
+        loop = asyncio.get_running_loop()
+        self._timers[seq] = loop.call_later(self.ack_wait, self._redeliver, seq)
+
+    def _settle(self, seq: int, acked: bool) -> None:
+        handle = self._timers.pop(seq, None)
+        if handle is not None:
+            handle.cancel()
+        if acked:
+            self.acked.add(seq)
+        else:
+            self._redeliver(seq)
+
+    def _redeliver(self, seq: int) -> None:
+        self._timers.pop(seq, None)
+        for stored in self.stream.messages:
+            if stored[0] == seq:
+                self.offer(*stored)
+                return
+
+    def info(self) -> api.ConsumerInfo:
+        return api.ConsumerInfo(
+            name=self.name,
+            stream_name=self.stream.name,
+            config=api.ConsumerConfig(
+                durable_name=self.name,
+                filter_subject=self.filter_subject,
+                ack_wait=self.ack_wait,
+                max_deliver=self.max_deliver,
+            ),
+            delivered=api.SequenceInfo(consumer_seq=self.delivered_seq, stream_seq=self.next_seq - 1),
+            ack_floor=api.SequenceInfo(consumer_seq=len(self.acked), stream_seq=max(self.acked, default=0)),
+            num_ack_pending=len(self._timers),
+            num_redelivered=self.redelivered,
+            num_waiting=0,
+            num_pending=max(0, self.stream.last_seq - self.next_seq + 1),
+        )
+
+
+class InMemoryNatsServer:
+    """Shared broker state for every `FakeNatsConnection` connected to it."""
+
+    def __init__(self, faults: FaultInjection | None = None) -> None:
+        self.faults = faults or FaultInjection()
+        self._rng = random.Random(self.faults.seed)
+        self._subscriptions: List[FakeSubscription] = []
+        self._streams: Dict[str, _Stream] = {}
+        self._consumers: Dict[tuple[str, str], _Consumer] = {}
+        self.stats: Dict[str, int] = {
+            "published": 0,
+            "js_published": 0,
+            "publish_errors": 0,
+            "dropped": 0,
+            "delivered": 0,
+        }
+
+    def connect(self, name: str = "fake") -> "FakeNatsConnection":
+        return FakeNatsConnection(self, name=name)
+
+    def add_stream(self, name: str, subjects: List[str]) -> api.StreamInfo:
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = _Stream(name, list(subjects))
+            self._streams[name] = stream
+        return stream.info(self._consumer_count(name))
+
+    def stream_info(self, name: str) -> api.StreamInfo:
+        stream = self._streams.get(name)
+        if stream is None:
+            raise NotFoundError(code=404, description="stream not found")
+        return stream.info(self._consumer_count(name))
+
+    def _consumer_count(self, stream_name: str) -> int:
+        return sum(1 for key in self._consumers if key[0] == stream_name)
+
+    def _find_stream(self, subject: str, name: str | None = None) -> _Stream:
+        if name is not None:
+            stream = self._streams.get(name)
+            if stream is None or not stream.matches(subject):
+                raise NoStreamResponseError
+            return stream
+        for stream in self._streams.values():
+            if stream.matches(subject):
+                return stream
+        raise NoStreamResponseError
+
+    def _find_stream_for_filter(self, filter_subject: str, name: str | None) -> _Stream:
+        # A wildcard filter binds to the stream whose subjects cover a
+        # concrete subject built from it.
+        sample = ".".join(
+            "_" if token in {"*", ">"} else token for token in filter_subject.split(".")
+        )
+        return self._find_stream(sample, name)
+
+    async def delay(self) -> None:
+        latency = self.faults.latency_sec
+        if self.faults.jitter_sec:
+            latency += self._rng.uniform(0, self.faults.jitter_sec)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        else:
+            await asyncio.sleep(0)
+
+    def _roll(self, rate: float) -> bool:
+        return rate > 0 and self._rng.random() < rate
+
+    def route(
+        self,
+        connection: "FakeNatsConnection",
+        subject: str,
+        data: bytes,
+        headers: Dict[str, str] | None,
+        reply: str,
+    ) -> None:
+        self.stats["published"] += 1
+        queue_groups: Dict[str, List[FakeSubscription]] = {}
+
+        for subscription in list(self._subscriptions):
+            if isinstance(subscription, FakeJetStreamSubscription):
+                continue
+            if not subject_matches(subscription.subject, subject):
+                continue
+            if subscription.queue:
+                queue_groups.setdefault(subscription.queue, []).append(subscription)
+                continue
+            self._deliver(subscription, connection, subject, data, headers, reply)
+
+        for members in queue_groups.values():
+            subscription = self._rng.choice(members)
+            self._deliver(subscription, connection, subject, data, headers, reply)
+
+    def _deliver(
+        self,
+        subscription: FakeSubscription,
+        connection: "FakeNatsConnection",
+        subject: str,
+        data: bytes,
+        headers: Dict[str, str] | None,
+        reply: str,
+    ) -> None:
+        if self._roll(self.faults.drop_rate):
+            self.stats["dropped"] += 1
+            return
+        self.stats["delivered"] += 1
+        subscription._enqueue(
+            FakeMsg(
+                subject=subject,
+                data=data,
+                headers=dict(headers) if headers else None,
+                reply=reply,
+                connection=subscription._connection,
+            )
+        )
+
+    async def js_publish(
+        self,
+        connection: "FakeNatsConnection",
+        subject: str,
+        data: bytes,
+        *,
+        timeout: float | None,
+        stream: str | None,
+        headers: Dict[str, Any] | None,
+    ) -> api.PubAck:
+        try:
+            await asyncio.wait_for(self.delay(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats["publish_errors"] += 1
+            raise NatsTimeoutError
+
+        if self._roll(self.faults.publish_error_rate):
+            self.stats["publish_errors"] += 1
+            raise NatsTimeoutError
+
+        target = self._find_stream(subject, stream)
+        target.last_seq += 1
+        stored_at = datetime.now(timezone.utc)
+        stored_headers = dict(headers) if headers else None
+        target.messages.append((target.last_seq, subject, data, stored_headers, stored_at))
+        target.bytes += len(data)
+        self.stats["js_published"] += 1
+
+        # JetStream publishes are regular messages for core subscribers too.
+        self.route(connection, subject, data, stored_headers, "")
+        for (stream_name, _), consumer in list(self._consumers.items()):
+            if stream_name == target.name:
+                consumer.offer(target.last_seq, subject, data, stored_headers, stored_at)
+
+        return api.PubAck(stream=target.name, seq=target.last_seq)
+
+    def js_subscribe(
+        self,
+        connection: "FakeNatsConnection",
+        subject: str,
+        *,
+        cb: Callback | None,
+        durable: str | None,
+        stream: str | None,
+        manual_ack: bool,
+        ack_wait: float,
+        max_deliver: int,
+        deliver_policy: api.DeliverPolicy | None,
+    ) -> FakeJetStreamSubscription:
+        target = self._find_stream_for_filter(subject, stream)
+        name = durable or f"ephemeral-{len(self._consumers) + 1}"
+        key = (target.name, name)
+
+        consumer = self._consumers.get(key)
+        if consumer is None:
+            start_seq = target.last_seq + 1 if deliver_policy == api.DeliverPolicy.NEW else 1
+            consumer = _Consumer(
+                server=self,
+                stream=target,
+                name=name,
+                filter_subject=subject,
+                manual_ack=manual_ack,
+                ack_wait=ack_wait,
+                max_deliver=max_deliver,
+                start_seq=start_seq,
+            )
+            self._consumers[key] = consumer
+
+        subscription = FakeJetStreamSubscription(
+            consumer=consumer,
+            server=self,
+            connection=connection,
+            subject=subject,
+            cb=cb,
+        )
+        self._subscriptions.append(subscription)
+        consumer.attach(subscription)
+        return subscription
+
+    def subscribe(
+        self,
+        connection: "FakeNatsConnection",
+        subject: str,
+        *,
+        queue: str,
+        cb: Callback | None,
+        max_msgs: int,
+    ) -> FakeSubscription:
+        subscription = FakeSubscription(
+            server=self,
+            connection=connection,
+            subject=subject,
+            queue=queue,
+            cb=cb,
+            max_msgs=max_msgs,
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def _remove_subscription(self, subscription: FakeSubscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if not isinstance(subscription, FakeJetStreamSubscription):
+            return
+        consumer = subscription._consumer
+        if consumer.name.startswith("ephemeral-"):
+            self._consumers.pop((consumer.stream.name, consumer.name), None)
+
+
+class FakeJetStreamContext:
+    def __init__(self, connection: "FakeNatsConnection") -> None:
+        self._nc = connection
+
+    async def publish(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        timeout: float | None = None,
+        stream: str | None = None,
+        headers: Dict[str, Any] | None = None,
+    ) -> api.PubAck:
+        self._nc._check_open()
+        return await self._nc._server.js_publish(
+            self._nc,
+            subject,
+            payload,
+            timeout=timeout,
+            stream=stream,
+            headers=headers,
+        )
+
+    async def subscribe(
+        self,
+        subject: str,
+        queue: str | None = None,
+        cb: Callback | None = None,
+        durable: str | None = None,
+        stream: str | None = None,
+        config: api.ConsumerConfig | None = None,
+        manual_ack: bool = False,
+        deliver_policy: api.DeliverPolicy | None = None,
+        ack_wait: float | None = None,
+        **kwargs: Any,
+    ) -> FakeJetStreamSubscription:
+        self._nc._check_open()
+        ack_wait = ack_wait or (config.ack_wait if config else None) or DEFAULT_ACK_WAIT_SEC
+        max_deliver = (config.max_deliver if config else None) or DEFAULT_MAX_DELIVER
+        subscription = self._nc._server.js_subscribe(
+            self._nc,
+            subject,
+            cb=cb,
+            durable=durable or (config.durable_name if config else None),
+            stream=stream,
+            manual_ack=manual_ack,
+            ack_wait=ack_wait,
+            max_deliver=max_deliver,
+            deliver_policy=deliver_policy or (config.deliver_policy if config else None),
+        )
+        self._nc._subscriptions.append(subscription)
+        return subscription
+
+    async def add_stream(
+        self,
+        config: api.StreamConfig | None = None,
+        **params: Any,
+    ) -> api.StreamInfo:
+        name = params.get("name") or (config.name if config else None)
+        subjects = params.get("subjects") or (config.subjects if config else None)
+        return self._nc._server.add_stream(name, subjects or [f"{name}.>"])
+
+    async def stream_info(self, name: str) -> api.StreamInfo:
+        return self._nc._server.stream_info(name)
+
+
+class FakeNatsConnection:
+    """Replacement for `nats.aio.client.Client` bound to an in-memory server."""
+
+    def __init__(self, server: InMemoryNatsServer, *, name: str = "fake") -> None:
+        self._server = server
+        self.name = name
+        self._subscriptions: List[FakeSubscription] = []
+        self._closed = False
+        self._draining = False
+        self._inbox_seq = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return not self._closed and not self._draining
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def is_draining(self) -> bool:
+        return self._draining
+
+    def jetstream(self, **_: Any) -> FakeJetStreamContext:
+        return FakeJetStreamContext(self)
+
+    def new_inbox(self) -> str:
+        self._inbox_seq += 1
+        return f"_INBOX.{self.name}.{self._inbox_seq}"
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ConnectionClosedError
+        if self._draining:
+            raise ConnectionDrainingError
+
+    async def publish(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        reply: str = "",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        self._check_open()
+        self._server.route(self, subject, payload, headers, reply)
+
+    async def subscribe(
+        self,
+        subject: str,
+        queue: str = "",
+        cb: Callback | None = None,
+        max_msgs: int = 0,
+        **kwargs: Any,
+    ) -> FakeSubscription:
+        self._check_open()
+        subscription = self._server.subscribe(
+            self,
+            subject,
+            queue=queue,
+            cb=cb,
+            max_msgs=max_msgs,
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    async def request(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        timeout: float = 0.5,
+        headers: Dict[str, str] | None = None,
+    ) -> FakeMsg:
+        inbox = self.new_inbox()
+        subscription = await self.subscribe(inbox, max_msgs=1)
+        try:
+            await self.publish(subject, payload, reply=inbox, headers=headers)
+            return await subscription.next_msg(timeout=timeout)
+        finally:
+            await subscription.unsubscribe()
+
+    async def flush(self, timeout: float = 2.0) -> None:
+        await asyncio.sleep(0)
+
+    async def drain(self) -> None:
+        if self._closed:
+            return
+        self._draining = True
+        for subscription in list(self._subscriptions):
+            await subscription.drain()
+        await self.close()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        for subscription in list(self._subscriptions):
+            await subscription.unsubscribe()
+        self._subscriptions.clear()
+        self._closed = True
+        self._draining = False
+
+
+class FakeNATSClient(NATSClient):
+    """`NATSClient` whose connection is served by an `InMemoryNatsServer`."""
+
+    def __init__(self, server: InMemoryNatsServer) -> None:
+        super().__init__()
+        self.server = server
+
+    async def connect(
+        self,
+        servers: list[str] | None = None,
+        name: str = "smartenergy-service",
+        max_reconnect_attempts: int | None = None,
+    ):
+        if self._shutdown:
+            raise RuntimeError("NATS client is shut down")
+
+        if self.nc and self.nc.is_connected:
+            return
+
+        self.nc = self.server.connect(name=name)
+        self.js = self.nc.jetstream()
+        self.connected_once = True
+        self._drain_started = False
@@ -1,18 +1,27 @@
-import json
 import logging
 
 from nats.js.api import DeliverPolicy
 
 from smart_common.nats.client import nats_client
+from smart_common.nats.compression import decode_message_json
 from smart_common.nats.event_helpers import stream_name
 
 logger = logging.getLogger(__name__)
 
 
+def heartbeat_uuid(subject: str) -> str | None:
+    """Microcontroller uuid of a `RASPBERRY_HEARTBEAT` subject, else None."""
+    parts = subject.split(".")
+    if len(parts) >= 4 and parts[-1] == "heartbeat" and parts[-3] == "raspberry":
+        return parts[-2]
+    return None
+
+
 class NatsListener:
 
-    def __init__(self, client=nats_client):
+    def __init__(self, client=nats_client, state_cache=None):
         self.client = client
+        self.state_cache = state_cache
         self.consumer_name = "device_communication_listener"
 
     async def subscribe(self):
@@ -22,10 +31,18 @@ class NatsListener:
         async def handler(msg):
             try:
                 subject = msg.subject
-                data = json.loads(msg.data.decode("utf-8"))
+                data = decode_message_json(msg)
 
                 logger.info(f"[NATS] Received subject={subject} data={data}")
 
+                microcontroller_uuid = heartbeat_uuid(subject)
+                if microcontroller_uuid is not None and self.state_cache is not None:
+                    payload = data.get("payload") if isinstance(data, dict) else None
+                    await self.state_cache.put_microcontroller_heartbeat(
+                        microcontroller_uuid,
+                        status=(payload or {}).get("status") or "online",
+                    )
+
                 await msg.ack()
             except Exception as e:
                 logger.exception(f"[NATS] Failed to process message: {e}")
@@ -1,13 +1,17 @@
 # smart_common/nats/module.py
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from smart_common.core.config import settings
 from smart_common.nats.client import NATSClient
 from smart_common.nats.listener import NatsListener
+from smart_common.nats.pool import NatsConnectionPool
 from smart_common.nats.publisher import NatsPublisher
+from smart_common.nats.state_cache import LatestStateCache
 from smart_common.nats.event_helpers import stream_name
 
 logger = logging.getLogger(__name__)
@@ -15,11 +19,25 @@ logger = logging.getLogger(__name__)
 
 class NatsModule:
 
-    def __init__(self, create_stream: bool = False):
-        self.client = NATSClient()
+    def __init__(
+        self,
+        create_stream: bool = False,
+        state_cache: bool = False,
+        pool_size: int | None = None,
+        outbox_relay: bool = False,
+    ):
+        pool_size = settings.NATS_PUBLISH_POOL_SIZE if pool_size is None else pool_size
+        self.client = NatsConnectionPool(pool_size) if pool_size > 0 else NATSClient()
         self.publisher = NatsPublisher(self.client)
-        self.listener = NatsListener(self.client)
         self.create_stream = create_stream
+        self.state_cache = LatestStateCache(self.client) if state_cache else None
+        # Heartbeats seen by the listener feed the microcontroller online state.
+        self.listener = NatsListener(self.client, state_cache=self.state_cache)
+        # Runs the shared OutboxRelay loop for the app's lifetime; without it
+        # (or the outbox worker script) undelivered events are never settled.
+        self.outbox_relay = outbox_relay
+        self._outbox = None
+        self._outbox_task: asyncio.Task | None = None
 
     async def _ensure_stream(self):
         await self.client.ensure_connected()
@@ -43,6 +61,24 @@ class NatsModule:
     async def ensure_stream(self):
         await self._ensure_stream()
 
+    async def _start_outbox_relay(self):
+        # Imported here: the services import this package.
+        from smart_common.services.outbox_worker import register_outbox_reconcilers
+
+        self._outbox = register_outbox_reconcilers(state_cache=self.state_cache)
+        self._outbox_task = asyncio.create_task(self._outbox.run())
+        logger.info("[NATS] Outbox relay started.")
+
+    async def _stop_outbox_relay(self):
+        if self._outbox_task is None:
+            return
+        self._outbox.stop()
+        try:
+            await self._outbox_task
+        except Exception:
+            logger.exception("[NATS] Outbox relay stopped with an error")
+        self._outbox_task = None
+
     def init_app(self, app: FastAPI):
 
         @asynccontextmanager
@@ -56,6 +92,12 @@ class NatsModule:
 
             await self.listener.subscribe()
 
+            if self.state_cache is not None:
+                await self.state_cache.start()
+
+            if self.outbox_relay:
+                await self._start_outbox_relay()
+
             logger.info("[NATS] Ready.")
 
             app.state.nats = self
@@ -63,6 +105,9 @@ class NatsModule:
             yield
 
             logger.info("[NATS] Closing...")
+            await self._stop_outbox_relay()
+            if self.state_cache is not None:
+                await self.state_cache.stop()
             await self.client.close()
 
         app.router.lifespan_context = lifespan
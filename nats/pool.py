@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from smart_common.core.config import settings
+from smart_common.nats.client import NATSClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionHealth:
+    published: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    last_failure_at: float | None = None
+
+
+class NatsConnectionPool:
+    """
+    Drop-in replacement for `NATSClient` backed by several connections.
+
+    Publishes are sharded over `size` publish connections by a stable hash
+    of the subject, so one microcontroller's commands stay ordered on one
+    socket while large config payloads for others do not block it. All
+    subscriptions (listener, ACK inboxes) use a dedicated connection,
+    exposed as `nc`/`js` like on a single client.
+
+    A publish connection that is not ready, or that failed
+    `failure_threshold` times in a row within `cooldown_sec`, is skipped
+    and its subjects move to the next healthy connection.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        *,
+        client_factory: Callable[[], NATSClient] = NATSClient,
+        failure_threshold: int = 3,
+        cooldown_sec: float = 5.0,
+    ) -> None:
+        size = settings.NATS_PUBLISH_POOL_SIZE if size is None else size
+        if size < 1:
+            raise ValueError("NATS connection pool needs at least one publish connection")
+
+        self.publishers: List[NATSClient] = [client_factory() for _ in range(size)]
+        self.subscriber = client_factory()
+        self.health: List[ConnectionHealth] = [ConnectionHealth() for _ in range(size)]
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+
+    # ------------------------------------------------------------------
+    # NATSClient compatible surface
+    # ------------------------------------------------------------------
+
+    @property
+    def nc(self):
+        return self.subscriber.nc
+
+    @property
+    def js(self):
+        return self.subscriber.js
+
+    @property
+    def connected_once(self) -> bool:
+        return self.subscriber.connected_once
+
+    async def connect(
+        self,
+        servers: list[str] | None = None,
+        name: str = "smartenergy-service",
+        max_reconnect_attempts: int | None = None,
+    ):
+        await asyncio.gather(
+            self.subscriber.connect(
+                servers,
+                name=f"{name}-sub",
+                max_reconnect_attempts=max_reconnect_attempts,
+            ),
+            *(
+                client.connect(
+                    servers,
+                    name=f"{name}-pub-{index}",
+                    max_reconnect_attempts=max_reconnect_attempts,
+                )
+                for index, client in enumerate(self.publishers)
+            ),
+        )
+        logger.info("[NATS] Connection pool ready with %s publishers", len(self.publishers))
+
+    async def ensure_connected(self):
+        await asyncio.gather(
+            self.subscriber.ensure_connected(),
+            *(client.ensure_connected() for client in self.publishers),
+        )
+
+    async def reset_connection(self):
+        await asyncio.gather(
+            self.subscriber.reset_connection(),
+            *(client.reset_connection() for client in self.publishers),
+        )
+
+    def is_draining(self) -> bool:
+        return self.subscriber.is_draining() or all(
+            client.is_draining() for client in self.publishers
+        )
+
+    def is_ready(self) -> bool:
+        return self.subscriber.is_ready() and any(
+            self._is_healthy(index) for index in range(len(self.publishers))
+        )
+
+    def connection_for(self, subject: str) -> NATSClient:
+        size = len(self.publishers)
+        start = zlib.crc32(subject.encode("utf-8")) % size
+        for offset in range(size):
+            index = (start + offset) % size
+            if self._is_healthy(index):
+                return self.publishers[index]
+        return self.publishers[start]
+
+    def record_publish(self, connection: NATSClient, error: Exception | None = None) -> None:
+        try:
+            index = self.publishers.index(connection)
+        except ValueError:
+            return
+
+        health = self.health[index]
+        if error is None:
+            health.published += 1
+            health.consecutive_failures = 0
+            return
+
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.last_error = str(error)
+        health.last_failure_at = time.monotonic()
+        if health.consecutive_failures == self.failure_threshold:
+            logger.warning(
+                "[NATS] Publish connection marked unhealthy",
+                extra={"connection": index, "error": health.last_error},
+            )
+
+    async def publish(self, subject: str, payload: dict):
+        connection = self.connection_for(subject)
+        try:
+            result = await connection.publish(subject, payload)
+        except Exception as exc:
+            self.record_publish(connection, exc)
+            raise
+        self.record_publish(connection)
+        return result
+
+    async def js_publish(self, subject: str, payload: dict, timeout=2.0):
+        connection = self.connection_for(subject)
+        try:
+            ack = await connection.js_publish(subject, payload, timeout=timeout)
+        except Exception as exc:
+            self.record_publish(connection, exc)
+            raise
+        self.record_publish(connection)
+        return ack
+
+    async def subscribe(self, subject: str, handler):
+        return await self.subscriber.subscribe(subject, handler)
+
+    async def subscribe_js(self, subject: str, durable: str, handler):
+        return await self.subscriber.subscribe_js(subject, durable, handler)
+
+    async def close(self):
+        await asyncio.gather(
+            *(client.close() for client in self.publishers),
+            self.subscriber.close(),
+        )
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _is_healthy(self, index: int) -> bool:
+        if not self.publishers[index].is_ready():
+            return False
+
+        health = self.health[index]
+        if health.consecutive_failures < self.failure_threshold:
+            return True
+        return (
+            health.last_failure_at is None
+            or time.monotonic() - health.last_failure_at >= self.cooldown_sec
+        )
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "connection": index,
+                "ready": self.publishers[index].is_ready(),
+                "healthy": self._is_healthy(index),
+                "published": health.published,
+                "failures": health.failures,
+                "consecutive_failures": health.consecutive_failures,
+                "last_error": health.last_error,
+            }
+            for index, health in enumerate(self.health)
+        ]
@@ -1,18 +1,24 @@
 import asyncio
-import json
 import logging
 from typing import Any, Callable, Dict
 
 from smart_common.nats.client import nats_client
+from smart_common.nats.compression import (
+    ENCODING_HEADER,
+    PayloadCodec,
+    decode_message_json,
+    payload_codec,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class NatsPublisher:
-    def __init__(self, client):
+    def __init__(self, client, *, codec: PayloadCodec | None = None):
         self.client = client
+        self.codec = codec or payload_codec
         self._closing = False
-        self._publish_lock = asyncio.Lock()
+        self._publish_locks: Dict[int, asyncio.Lock] = {}
 
     async def publish(
         self,
@@ -26,7 +32,7 @@ class NatsPublisher:
             raise RuntimeError("NATS publisher is shutting down")
 
         context = context or {}
-        data = json.dumps(payload).encode("utf-8")
+        data, headers = self.codec.encode(payload)
         last_error: Exception | None = None
 
         for attempt in range(1, retries + 1):
@@ -36,7 +42,8 @@ class NatsPublisher:
                 await asyncio.sleep(self._backoff(attempt))
                 continue
 
-            async with self._publish_lock:
+            connection = self.client.connection_for(subject)
+            async with self._lock_for(connection):
                 if not await self._ensure_ready_for_publish(context, subject, attempt):
                     last_error = RuntimeError("NATS connection not ready")
                     await asyncio.sleep(self._backoff(attempt))
@@ -51,7 +58,7 @@ class NatsPublisher:
                             "attempt": attempt,
                         },
                     )
-                    js = self.client.js
+                    js = connection.js
                     if not js:
                         raise RuntimeError("JetStream not initialized")
 
@@ -59,7 +66,9 @@ class NatsPublisher:
                         subject=subject,
                         payload=data,
                         timeout=5.0,
+                        headers=headers,
                     )
+                    self.client.record_publish(connection)
 
                     logger.info(
                         "[NATS] Published",
@@ -68,13 +77,15 @@ class NatsPublisher:
                             "subject": subject,
                             "seq": ack.seq,
                             "payload_bytes": len(data),
-                            "payload": data,
+                            "encoding": (headers or {}).get(ENCODING_HEADER),
+                            "payload": payload,
                         },
                     )
                     return ack
 
                 except Exception as exc:
                     last_error = exc
+                    self.client.record_publish(connection, exc)
                     logger.error(
                         "[NATS] Publish failed",
                         extra={
@@ -85,7 +96,9 @@ class NatsPublisher:
                         },
                     )
                     if attempt < retries:
-                        await self._recover_connection(exc, context, subject, attempt)
+                        await self._recover_connection(
+                            exc, context, subject, attempt, connection=connection
+                        )
                         await asyncio.sleep(self._backoff(attempt))
                     else:
                         raise
@@ -147,10 +160,13 @@ class NatsPublisher:
         context: Dict[str, Any],
         subject: str,
         attempt: int,
+        *,
+        connection=None,
     ) -> None:
-        if self.client.nc and getattr(self.client.nc, "is_closed", False):
+        connection = connection or self.client
+        if connection.nc and getattr(connection.nc, "is_closed", False):
             try:
-                await self.client.reset_connection()
+                await connection.reset_connection()
             except Exception as reset_exc:
                 logger.warning(
                     "[NATS] Reconnection step failed",
@@ -162,6 +178,14 @@ class NatsPublisher:
                     },
                 )
 
+    def _lock_for(self, connection) -> asyncio.Lock:
+        # Serialize publishes per connection; pooled connections run in parallel.
+        lock = self._publish_locks.get(id(connection))
+        if lock is None:
+            lock = asyncio.Lock()
+            self._publish_locks[id(connection)] = lock
+        return lock
+
     def _backoff(self, attempt: int) -> float:
         return min(0.3, 0.1 * attempt)
 
@@ -181,16 +205,17 @@ class NatsPublisher:
     ) -> Dict[str, Any]:
         await self.client.ensure_connected()
 
-        js = self.client.js
+        connection = self.client.connection_for(subject)
+        js = connection.js
         if not js:
             raise RuntimeError("JetStream not initialized")
 
-        data = json.dumps(message).encode("utf-8")
+        data, headers = self.codec.encode(message)
         future = asyncio.get_event_loop().create_future()
 
         async def ack_handler(msg):
             try:
-                payload = json.loads(msg.data.decode())
+                payload = decode_message_json(msg)
 
                 if predicate(payload) and not future.done():
                     future.set_result(payload)
@@ -200,8 +225,12 @@ class NatsPublisher:
                     future.set_exception(e)
 
         sub = await self.client.nc.subscribe(ack_subject, cb=ack_handler)
+        if connection.nc is not self.client.nc:
+            # The ACK subscription must reach the server before the command
+            # leaves on another connection.
+            await self.client.nc.flush()
 
-        await js.publish(subject=subject, payload=data)
+        await js.publish(subject=subject, payload=data, headers=headers)
 
         try:
             result = await asyncio.wait_for(future, timeout=timeout)
@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from nats.errors import TimeoutError as NatsTimeoutError
+from nats.js.errors import BucketNotFoundError
+
+from smart_common.core.config import settings
+from smart_common.nats.client import NATSClient
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+logger = logging.getLogger(__name__)
+
+KV_DELETE_OPERATIONS = frozenset({"DEL", "PURGE"})
+WATCH_POLL_TIMEOUT_SEC = 5.0
+
+
+def provider_power_key(provider_id: int) -> str:
+    return f"provider.{provider_id}.power"
+
+
+def provider_metrics_key(provider_id: int) -> str:
+    return f"provider.{provider_id}.metrics"
+
+
+def device_state_key(device_id: int) -> str:
+    return f"device.{device_id}.state"
+
+
+def microcontroller_online_key(microcontroller_uuid: str) -> str:
+    return f"microcontroller.{microcontroller_uuid}.online"
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def provider_power_state(
+    provider_id: int,
+    *,
+    value: float | None,
+    unit: str | None,
+    measured_at: datetime | None,
+) -> Dict[str, Any]:
+    return {
+        "provider_id": provider_id,
+        "value": value,
+        "unit": unit,
+        "measured_at": _isoformat(measured_at),
+    }
+
+
+def provider_metrics_state(
+    provider_id: int,
+    *,
+    metrics: Dict[str, Dict[str, Any]],
+    measured_at: datetime | None,
+) -> Dict[str, Any]:
+    return {
+        "provider_id": provider_id,
+        "measured_at": _isoformat(measured_at),
+        "metrics": metrics,
+    }
+
+
+def device_state_payload(
+    device_id: int,
+    *,
+    user_id: int | None,
+    is_on: bool | None,
+    mode: str | None,
+    changed_at: datetime | None,
+) -> Dict[str, Any]:
+    return {
+        "device_id": device_id,
+        "user_id": user_id,
+        "is_on": is_on,
+        "mode": mode,
+        "changed_at": _isoformat(changed_at or datetime.now(timezone.utc)),
+    }
+
+
+@dataclass
+class _MirrorEntry:
+    value: Dict[str, Any]
+    expires_at: float | None
+
+
+class LatestStateCache:
+    """
+    Latest provider/device state and microcontroller heartbeats shared
+    between API nodes.
+
+    Writers put JSON values into a JetStream Key-Value bucket. Every node
+    keeps an in-process mirror of the bucket, fed by a KV watch, so reads
+    never leave the process. When a key is missing (cold bucket, expired
+    TTL, watcher not started) readers fall back to the database loader.
+
+    KV `max_age` expiry emits no watch delete, so mirrored values expire
+    locally after `ttl_sec`; values loaded from the database expire after
+    the shorter `load_ttl_sec`.
+    """
+
+    def __init__(
+        self,
+        client: NATSClient,
+        *,
+        bucket: str | None = None,
+        ttl_sec: float | None = None,
+        load_ttl_sec: float | None = None,
+        online_timeout_sec: float | None = None,
+    ) -> None:
+        self.client = client
+        self.bucket = bucket or settings.NATS_STATE_CACHE_BUCKET
+        self.ttl_sec = (
+            settings.NATS_STATE_CACHE_TTL_SEC if ttl_sec is None else ttl_sec
+        )
+        self.load_ttl_sec = (
+            settings.NATS_STATE_CACHE_LOAD_TTL_SEC
+            if load_ttl_sec is None
+            else load_ttl_sec
+        )
+        self.online_timeout_sec = (
+            settings.NATS_STATE_CACHE_ONLINE_TIMEOUT_SEC
+            if online_timeout_sec is None
+            else online_timeout_sec
+        )
+        self.kv = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._mirror: Dict[str, _MirrorEntry] = {}
+        self._watcher = None
+        self._watch_task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def ensure_bucket(self):
+        await self.client.ensure_connected()
+        js = self.client.js
+        if js is None:
+            raise RuntimeError("JetStream context unavailable when ensuring KV bucket.")
+
+        try:
+            self.kv = await js.key_value(self.bucket)
+            logger.info("[NATS] KV bucket %s already exists.", self.bucket)
+        except BucketNotFoundError:
+            logger.warning("[NATS] KV bucket missing — creating %s...", self.bucket)
+            self.kv = await js.create_key_value(
+                bucket=self.bucket,
+                history=1,
+                ttl=self.ttl_sec or None,
+            )
+            logger.info("[NATS] KV bucket %s created.", self.bucket)
+        return self.kv
+
+    async def start(self) -> None:
+        if self._watch_task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        await self.ensure_bucket()
+        self._watcher = await self.kv.watchall()
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+        if self._watcher is not None:
+            try:
+                await self._watcher.stop()
+            except Exception:
+                logger.debug("[NATS] KV watcher stop failed", exc_info=True)
+            self._watcher = None
+
+        self._ready.clear()
+
+    def is_ready(self) -> bool:
+        """True once the mirror holds every key present when the watch started."""
+        return self._ready.is_set()
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                entry = await self._watcher.updates(timeout=WATCH_POLL_TIMEOUT_SEC)
+            except NatsTimeoutError:
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[NATS] KV watch failed for bucket %s", self.bucket)
+                await asyncio.sleep(WATCH_POLL_TIMEOUT_SEC)
+                continue
+
+            # None marks the end of the initial snapshot.
+            if entry is None:
+                self._ready.set()
+                logger.info(
+                    "[NATS] KV mirror ready",
+                    extra={"bucket": self.bucket, "keys": len(self._mirror)},
+                )
+                continue
+
+            self._apply_entry(entry)
+
+    def _apply_entry(self, entry) -> None:
+        if entry.operation in KV_DELETE_OPERATIONS or entry.value is None:
+            self._mirror.pop(entry.key, None)
+            return
+
+        try:
+            self._remember(entry.key, json.loads(entry.value.decode("utf-8")))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning(
+                "[NATS] Ignoring undecodable KV entry",
+                extra={"bucket": self.bucket, "key": entry.key},
+            )
+
+    def _remember(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl_sec: float | None = None,
+    ) -> None:
+        ttl_sec = self.ttl_sec if ttl_sec is None else ttl_sec
+        expires_at = time.monotonic() + ttl_sec if ttl_sec else None
+        self._mirror[key] = _MirrorEntry(value=value, expires_at=expires_at)
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    async def put(self, key: str, value: Dict[str, Any]) -> bool:
+        """
+        Store a value in the bucket and the local mirror.
+
+        Cache writes never fail the caller: the database already holds the
+        value, so errors are logged and reported as False.
+        """
+        self._remember(key, value)
+        if self.kv is None:
+            return False
+
+        try:
+            await self.kv.put(key, json.dumps(value).encode("utf-8"))
+        except Exception:
+            logger.warning(
+                "[NATS] KV put failed",
+                extra={"bucket": self.bucket, "key": key},
+                exc_info=True,
+            )
+            return False
+        return True
+
+    async def put_measurement(self, measurement: NormalizedMeasurement) -> None:
+        provider_id = measurement.provider_id
+
+        await self.put(
+            provider_power_key(provider_id),
+            provider_power_state(
+                provider_id,
+                value=measurement.value,
+                unit=measurement.unit,
+                measured_at=measurement.measured_at,
+            ),
+        )
+
+        if measurement.extra_metrics:
+            await self.put(
+                provider_metrics_key(provider_id),
+                provider_metrics_state(
+                    provider_id,
+                    metrics={
+                        metric.key: {"value": metric.value, "unit": metric.unit}
+                        for metric in measurement.extra_metrics
+                    },
+                    measured_at=measurement.measured_at,
+                ),
+            )
+
+    async def put_device_state(
+        self,
+        device_id: int,
+        *,
+        is_on: bool | None,
+        mode: str | None = None,
+        changed_at: datetime | None = None,
+        user_id: int | None = None,
+    ) -> None:
+        await self.put(
+            device_state_key(device_id),
+            device_state_payload(
+                device_id,
+                user_id=user_id,
+                is_on=is_on,
+                mode=mode,
+                changed_at=changed_at,
+            ),
+        )
+
+    async def put_microcontroller_heartbeat(
+        self,
+        microcontroller_uuid: str,
+        *,
+        status: str = "online",
+        seen_at: datetime | None = None,
+    ) -> None:
+        await self.put(
+            microcontroller_online_key(microcontroller_uuid),
+            {
+                "uuid": microcontroller_uuid,
+                "status": status,
+                "seen_at": _isoformat(seen_at or datetime.now(timezone.utc)),
+            },
+        )
+
+    async def delete(self, key: str) -> None:
+        self._mirror.pop(key, None)
+        if self.kv is None:
+            return
+        try:
+            await self.kv.delete(key)
+        except Exception:
+            logger.warning(
+                "[NATS] KV delete failed",
+                extra={"bucket": self.bucket, "key": key},
+                exc_info=True,
+            )
+
+    def invalidate_threadsafe(self, key: str) -> None:
+        """`delete(key)` from a worker thread, e.g. an outbox reconciler."""
+        self._mirror.pop(key, None)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.delete(key), loop)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        entry = self._mirror.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._mirror.pop(key, None)
+            return None
+        return entry.value
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Dict[str, Any] | None],
+    ) -> Dict[str, Any] | None:
+        """
+        Return the mirrored value, or call `loader` (a database read) on miss.
+
+        Loaded values are kept in the local mirror only, for `load_ttl_sec`;
+        the bucket is owned by the ingest and ACK writers.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = loader()
+        if value is not None and self.load_ttl_sec > 0:
+            self._remember(key, value, self.load_ttl_sec)
+        return value
+
+    def provider_power(
+        self,
+        provider_id: int,
+        loader: Callable[[], Dict[str, Any] | None],
+    ) -> Dict[str, Any] | None:
+        return self.get_or_load(provider_power_key(provider_id), loader)
+
+    def provider_metrics(
+        self,
+        provider_id: int,
+        loader: Callable[[], Dict[str, Any] | None],
+    ) -> Dict[str, Any] | None:
+        return self.get_or_load(provider_metrics_key(provider_id), loader)
+
+    def device_state(
+        self,
+        device_id: int,
+        loader: Callable[[], Dict[str, Any] | None],
+    ) -> Dict[str, Any] | None:
+        return self.get_or_load(device_state_key(device_id), loader)
+
+    def microcontroller_online(self, microcontroller_uuid: str) -> Dict[str, Any]:
+        """
+        Last heartbeat of the microcontroller with an `online` flag; it is
+        offline when no heartbeat arrived within `online_timeout_sec`. The
+        database keeps no online state, so there is no loader.
+        """
+        value = self.get(microcontroller_online_key(microcontroller_uuid))
+        if value is None:
+            return {
+                "uuid": microcontroller_uuid,
+                "status": None,
+                "seen_at": None,
+                "online": False,
+            }
+
+        seen_at = value.get("seen_at")
+        try:
+            age = (
+                datetime.now(timezone.utc) - datetime.fromisoformat(seen_at)
+            ).total_seconds()
+        except (TypeError, ValueError):
+            age = None
+        online = (
+            age is not None
+            and age <= self.online_timeout_sec
+            and value.get("status") == "online"
+        )
+        return {**value, "online": online}
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from smart_common.providers.adapters.async_base import (
+    AsyncBaseHttpAdapter,
+    AsyncBaseProviderAdapter,
+)
 from smart_common.providers.adapters.base import (
     BaseHttpAdapter,
     BaseProviderAdapter,
@@ -8,16 +12,36 @@ from smart_common.providers.adapters.factory import (
     VendorAdapterFactory,
     get_vendor_adapter_factory,
     create_adapter_for_provider,
+    create_async_adapter_for_provider,
+    lease_adapter_for_provider,
+    lease_async_adapter_for_provider,
+    invalidate_provider_adapters,
+    invalidate_provider_credentials,
+)
+from smart_common.providers.adapters.goodwe import (
+    AsyncGoodWeProviderAdapter,
+    GoodWeProviderAdapter,
+)
+from smart_common.providers.adapters.huawei import (
+    AsyncHuaweiProviderAdapter,
+    HuaweiProviderAdapter,
 )
-from smart_common.providers.adapters.goodwe import GoodWeProviderAdapter
-from smart_common.providers.adapters.huawei import HuaweiProviderAdapter
 
 __all__ = [
     "BaseHttpAdapter",
     "BaseProviderAdapter",
+    "AsyncBaseHttpAdapter",
+    "AsyncBaseProviderAdapter",
     "HuaweiProviderAdapter",
     "GoodWeProviderAdapter",
+    "AsyncHuaweiProviderAdapter",
+    "AsyncGoodWeProviderAdapter",
     "VendorAdapterFactory",
     "get_vendor_adapter_factory",
     "create_adapter_for_provider",
+    "create_async_adapter_for_provider",
+    "lease_adapter_for_provider",
+    "lease_async_adapter_for_provider",
+    "invalidate_provider_adapters",
+    "invalidate_provider_credentials",
 ]
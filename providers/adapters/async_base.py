@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Mapping
+from urllib.parse import urlsplit
+
+import httpx
+
+from smart_common.providers.enums import ProviderKind, ProviderType, ProviderVendor
+from smart_common.providers.adapters.circuit_breaker import (
+    CircuitBreaker,
+    backoff_delay,
+    circuit_breakers,
+)
+from smart_common.providers.adapters.rate_limit import TokenBucket, retry_after_seconds
+from smart_common.providers.adapters.transport import http_transports
+from smart_common.providers.exceptions import ProviderFetchError, ProviderThrottledError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseHttpAdapter:
+    """
+    asyncio counterpart of `BaseHttpAdapter` built on `httpx.AsyncClient`.
+
+    Same contract: base URL construction, retries + timeouts, and
+    `ProviderFetchError` once retries are exhausted.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+    ) -> None:
+        if not base_url:
+            raise ValueError("base_url is required")
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max(1, max_retries)
+        self.rate_limiter: TokenBucket | None = None
+
+        self.client = httpx.AsyncClient(
+            headers={
+                "Accept": "application/json",
+                **(headers or {}),
+            },
+            timeout=timeout,
+            transport=http_transports.async_transport(),
+        )
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.base_url).netloc
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_data: dict | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        url = self._url(path)
+        breaker = self._circuit_breaker(url)
+        if not breaker.allow():
+            logger.warning(
+                "Provider circuit open, failing fast",
+                extra={"url": url, "retry_in_sec": breaker.retry_in()},
+            )
+            raise ProviderFetchError(
+                "Provider API circuit open",
+                details={"url": url, "retry_in_sec": round(breaker.retry_in(), 3)},
+            )
+
+        last_exc: Exception | None = None
+
+        for attempt in range(1, self.max_retries + 1):
+            if attempt > 1:
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            try:
+                logger.debug(
+                    "HTTP request attempt %s/%s",
+                    attempt,
+                    self.max_retries,
+                    extra={
+                        "method": method,
+                        "url": url,
+                    },
+                )
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async()
+                response = await self.client.request(
+                    method,
+                    url,
+                    json=json_data,
+                    headers=headers,
+                )
+            except httpx.TimeoutException as exc:
+                last_exc = exc
+                logger.warning(
+                    "HTTP timeout",
+                    extra={"url": url, "attempt": attempt},
+                )
+            except httpx.HTTPError as exc:
+                last_exc = exc
+                logger.warning(
+                    "HTTP request error",
+                    extra={"url": url, "attempt": attempt, "error": str(exc)},
+                )
+            else:
+                self._record_outcome(breaker, response)
+                self._raise_if_throttled(response, url)
+                return response
+
+        breaker.record_failure()
+        logger.error(
+            "HTTP request failed after retries",
+            extra={"url": url, "retries": self.max_retries},
+        )
+        raise ProviderFetchError(
+            "HTTP request failed after retries",
+            details={"error": str(last_exc)},
+        )
+
+    def _circuit_breaker(self, url: str) -> CircuitBreaker:
+        vendor = getattr(self, "vendor", None)
+        return circuit_breakers.breaker(
+            vendor.value if vendor else None,
+            urlsplit(url).netloc,
+        )
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, response: httpx.Response) -> None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _raise_if_throttled(self, response: httpx.Response, url: str) -> None:
+        if response.status_code != 429:
+            return
+
+        retry_after = retry_after_seconds(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(retry_after)
+        logger.warning(
+            "HTTP request throttled",
+            extra={"url": url, "retry_after": retry_after},
+        )
+        raise ProviderThrottledError(
+            "Provider API rate limit exceeded",
+            retry_after=retry_after,
+            details={"url": url},
+        )
+
+    def _url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class AsyncBaseProviderAdapter(AsyncBaseHttpAdapter, ABC):
+    """
+    asyncio counterpart of `BaseProviderAdapter`.
+
+    Only measurement polling is async; wizard flows (stations, devices)
+    stay on the synchronous adapters.
+    """
+
+    provider_type: ProviderType | None = None
+    vendor: ProviderVendor | None = None
+    kind: ProviderKind | None = None
+
+    @abstractmethod
+    async def fetch_measurement(self) -> Any:
+        raise NotImplementedError
+
+    def _log_context(
+        self,
+        *,
+        task_name: str | None = None,
+        **overrides: Any,
+    ) -> dict[str, Any]:
+        context: dict[str, Any] = {
+            "provider_id": getattr(self, "provider_id", None),
+            "vendor": self.vendor.value if self.vendor else None,
+        }
+        poll_id = getattr(self, "poll_id", None)
+        if poll_id:
+            context["poll_id"] = poll_id
+        name = task_name or getattr(self, "task_name", None)
+        if name:
+            context["taskName"] = name
+        context.update(overrides)
+        return context
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Mapping
+from urllib.parse import urlsplit
 
 import requests
 from requests import Session
 
 from smart_common.providers.enums import ProviderKind, ProviderType, ProviderVendor
-from smart_common.providers.exceptions import ProviderFetchError
+from smart_common.providers.adapters.circuit_breaker import (
+    CircuitBreaker,
+    backoff_delay,
+    circuit_breakers,
+)
+from smart_common.providers.adapters.rate_limit import TokenBucket, retry_after_seconds
+from smart_common.providers.adapters.transport import http_transports
+from smart_common.providers.exceptions import ProviderFetchError, ProviderThrottledError
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +46,7 @@ class BaseHttpAdapter:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max(1, max_retries)
+        self.rate_limiter: TokenBucket | None = None
 
         self.session: Session = requests.Session()
         self.session.headers.update(
@@ -46,6 +56,10 @@ class BaseHttpAdapter:
             }
         )
 
+    @property
+    def host(self) -> str:
+        return urlsplit(self.base_url).netloc
+
     def _request(
         self,
         method: str,
@@ -55,9 +69,23 @@ class BaseHttpAdapter:
         headers: Mapping[str, str] | None = None,
     ) -> requests.Response:
         url = self._url(path)
+        http_transports.mount(self.session, url)
+        breaker = self._circuit_breaker(url)
+        if not breaker.allow():
+            logger.warning(
+                "Provider circuit open, failing fast",
+                extra={"url": url, "retry_in_sec": breaker.retry_in()},
+            )
+            raise ProviderFetchError(
+                "Provider API circuit open",
+                details={"url": url, "retry_in_sec": round(breaker.retry_in(), 3)},
+            )
+
         last_exc: Exception | None = None
 
         for attempt in range(1, self.max_retries + 1):
+            if attempt > 1:
+                time.sleep(backoff_delay(attempt - 1))
             try:
                 logger.debug(
                     "HTTP request attempt %s/%s",
@@ -68,19 +96,20 @@ class BaseHttpAdapter:
                         "url": url,
                     },
                 )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
                 request_headers = (
                     {**self.session.headers, **(headers or {})}
                     if headers
                     else self.session.headers
                 )
-                return self.session.request(
+                response = self.session.request(
                     method,
                     url,
                     json=json_data,
                     timeout=self.timeout,
                     headers=request_headers,
                 )
-
             except requests.Timeout as exc:
                 last_exc = exc
                 logger.warning(
@@ -93,7 +122,12 @@ class BaseHttpAdapter:
                     "HTTP request error",
                     extra={"url": url, "attempt": attempt, "error": str(exc)},
                 )
+            else:
+                self._record_outcome(breaker, response)
+                self._raise_if_throttled(response, url)
+                return response
 
+        breaker.record_failure()
         logger.error(
             "HTTP request failed after retries",
             extra={"url": url, "retries": self.max_retries},
@@ -103,7 +137,40 @@ class BaseHttpAdapter:
             details={"error": str(last_exc)},
         )
 
+    def _circuit_breaker(self, url: str) -> CircuitBreaker:
+        vendor = getattr(self, "vendor", None)
+        return circuit_breakers.breaker(
+            vendor.value if vendor else None,
+            urlsplit(url).netloc,
+        )
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, response: requests.Response) -> None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _raise_if_throttled(self, response: requests.Response, url: str) -> None:
+        if response.status_code != 429:
+            return
+
+        retry_after = retry_after_seconds(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(retry_after)
+        logger.warning(
+            "HTTP request throttled",
+            extra={"url": url, "retry_after": retry_after},
+        )
+        raise ProviderThrottledError(
+            "Provider API rate limit exceeded",
+            retry_after=retry_after,
+            details={"url": url},
+        )
+
     def _url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
         return f"{self.base_url}/{path.lstrip('/')}"
 
     def close(self) -> None:
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+AdapterT = TypeVar("AdapterT")
+
+
+@dataclass(eq=False)
+class _CacheEntry(Generic[AdapterT]):
+    adapter: AdapterT
+    provider_id: int | None
+    last_used: float
+    leases: int = 0
+
+
+@dataclass
+class AdapterCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class AdapterCache(Generic[AdapterT]):
+    """
+    Thread-safe LRU cache of provider adapters with an idle TTL.
+
+    Adapters own HTTP sessions, so every entry that leaves the cache
+    (size cap, idle expiry, invalidation or being replaced by a newer
+    config of the same provider) is closed. Callers that use an adapter
+    across I/O take it with `lease()`: leased adapters are skipped by the
+    size cap, and one removed for any other reason is only closed when
+    its last lease is released.
+    """
+
+    def __init__(self, *, max_size: int, idle_ttl_sec: float | None) -> None:
+        if max_size < 1:
+            raise ValueError("Adapter cache needs room for at least one adapter")
+
+        self.max_size = max_size
+        self.idle_ttl_sec = idle_ttl_sec
+        self.stats = AdapterCacheStats()
+        self._entries: OrderedDict[Hashable, _CacheEntry[AdapterT]] = OrderedDict()
+        # Entries removed from the cache while still leased.
+        self._retired: set[_CacheEntry[AdapterT]] = set()
+        self._lock = threading.RLock()
+
+    def get_or_create(
+        self,
+        key: Hashable,
+        factory: Callable[[], AdapterT],
+        *,
+        provider_id: int | None = None,
+    ) -> AdapterT:
+        """Unleased lookup; the adapter may be closed once it is evicted."""
+        return self._acquire(key, factory, provider_id, lease=False).adapter
+
+    @contextmanager
+    def lease(
+        self,
+        key: Hashable,
+        factory: Callable[[], AdapterT],
+        *,
+        provider_id: int | None = None,
+    ) -> Iterator[AdapterT]:
+        entry = self._acquire(key, factory, provider_id, lease=True)
+        try:
+            yield entry.adapter
+        finally:
+            self._release(entry)
+
+    def _acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], AdapterT],
+        provider_id: int | None,
+        *,
+        lease: bool,
+    ) -> _CacheEntry[AdapterT]:
+        closable: list[AdapterT] = []
+        try:
+            with self._lock:
+                now = time.monotonic()
+                closable.extend(self._retire(self._expire(now)))
+
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.last_used = now
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                else:
+                    self.stats.misses += 1
+                    adapter = factory()
+                    if provider_id is not None:
+                        # A config change produces a new key; drop the stale adapter.
+                        closable.extend(self._retire(self._pop_provider(provider_id)))
+                    entry = _CacheEntry(adapter, provider_id, now)
+                    self._entries[key] = entry
+                    closable.extend(self._retire(self._evict_over_size(keep=key)))
+
+                if lease:
+                    entry.leases += 1
+                return entry
+        finally:
+            self._close_all(closable)
+
+    def _release(self, entry: _CacheEntry[AdapterT]) -> None:
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.leases > 0 or entry not in self._retired:
+                return
+            self._retired.discard(entry)
+        _close_adapter(entry.adapter)
+
+    def get(self, key: Hashable) -> AdapterT | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.adapter if entry is not None else None
+
+    def invalidate_provider(self, provider_id: int) -> int:
+        with self._lock:
+            removed = self._pop_provider(provider_id)
+            self.stats.invalidations += len(removed)
+            closable = self._retire(removed)
+        self._close_all(closable)
+        return len(removed)
+
+    def expire(self) -> int:
+        with self._lock:
+            removed = self._expire(time.monotonic())
+            closable = self._retire(removed)
+        self._close_all(closable)
+        return len(removed)
+
+    def clear(self) -> None:
+        with self._lock:
+            removed = list(self._entries.values())
+            self._entries.clear()
+            closable = self._retire(removed)
+        self._close_all(closable)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "leased": sum(1 for entry in self._entries.values() if entry.leases),
+                "retired": len(self._retired),
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "evictions": self.stats.evictions,
+                "expirations": self.stats.expirations,
+                "invalidations": self.stats.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _pop_provider(self, provider_id: int) -> list[_CacheEntry[AdapterT]]:
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if entry.provider_id == provider_id
+        ]
+        return [self._entries.pop(key) for key in keys]
+
+    def _expire(self, now: float) -> list[_CacheEntry[AdapterT]]:
+        if not self.idle_ttl_sec:
+            return []
+
+        removed: list[_CacheEntry[AdapterT]] = []
+        # Entries are in LRU order, so the first fresh one ends the scan.
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.idle_ttl_sec:
+                break
+            del self._entries[key]
+            self.stats.expirations += 1
+            removed.append(entry)
+        return removed
+
+    def _evict_over_size(self, *, keep: Hashable) -> list[_CacheEntry[AdapterT]]:
+        overflow = len(self._entries) - self.max_size
+        if overflow <= 0:
+            return []
+
+        # Least recently used first; leased adapters and the one just added
+        # stay, so the cache may briefly hold more than `max_size` entries.
+        keys = []
+        for key, entry in self._entries.items():
+            if entry.leases == 0 and key != keep:
+                keys.append(key)
+                if len(keys) == overflow:
+                    break
+        self.stats.evictions += len(keys)
+        return [self._entries.pop(key) for key in keys]
+
+    def _retire(self, entries: list[_CacheEntry[AdapterT]]) -> list[AdapterT]:
+        """Adapters to close now; leased ones wait for their last release."""
+        closable: list[AdapterT] = []
+        for entry in entries:
+            if entry.leases > 0:
+                self._retired.add(entry)
+            else:
+                closable.append(entry.adapter)
+        return closable
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def _close_all(self, adapters: list[AdapterT]) -> None:
+        for adapter in adapters:
+            _close_adapter(adapter)
+
+
+_pending_closes: set[asyncio.Task] = set()
+
+
+def _close_adapter(adapter: Any) -> None:
+    try:
+        aclose = getattr(adapter, "aclose", None)
+        if aclose is None:
+            adapter.close()
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(aclose())
+            return
+
+        task = loop.create_task(aclose())
+        _pending_closes.add(task)
+        task.add_done_callback(_pending_closes.discard)
+    except Exception:
+        logger.warning(
+            "Failed to close evicted provider adapter",
+            extra={"adapter": type(adapter).__name__},
+            exc_info=True,
+        )
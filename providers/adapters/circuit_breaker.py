@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Tuple
+
+from smart_common.providers.provider_config.config import provider_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one vendor API host.
+
+    After `failure_threshold` failed requests in a row the circuit opens
+    and callers fail fast for `cooldown_sec`. Then a single probe request
+    is let through (half-open): success closes the circuit, failure opens
+    it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        cooldown_sec: float,
+        name: str = "",
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if time.monotonic() - (self.opened_at or 0.0) < self.cooldown_sec:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            now = time.monotonic()
+            # A probe that never reported back must not block the host forever.
+            if self._probe_in_flight and now - self._probe_started_at < self.cooldown_sec:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            self._probe_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Provider circuit closed", extra={"circuit": self.name})
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if (
+                self.state == HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state != OPEN:
+                    self.times_opened += 1
+                    logger.warning(
+                        "Provider circuit opened",
+                        extra={
+                            "circuit": self.name,
+                            "consecutive_failures": self.consecutive_failures,
+                        },
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown_sec - (time.monotonic() - self.opened_at))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_sec": round(self.retry_in(), 3),
+        }
+
+
+class CircuitBreakerRegistry:
+    """`CircuitBreaker`s shared by all adapters talking to one (vendor, host)."""
+
+    def __init__(self) -> None:
+        self._breakers: dict[Tuple[str | None, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, vendor: str | None, host: str) -> CircuitBreaker:
+        key = (vendor, host)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=provider_settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD,
+                    cooldown_sec=provider_settings.PROVIDER_CIRCUIT_COOLDOWN_SEC,
+                    name=f"{vendor or 'http'}:{host}",
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            items = list(self._breakers.items())
+        return [
+            {"vendor": vendor, "host": host, **breaker.snapshot()}
+            for (vendor, host), breaker in items
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    ceiling = min(
+        provider_settings.PROVIDER_RETRY_BACKOFF_MAX_SEC,
+        provider_settings.PROVIDER_RETRY_BACKOFF_BASE_SEC * (2 ** (attempt - 1)),
+    )
+    return random.uniform(0, ceiling)
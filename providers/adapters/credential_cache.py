@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Mapping
+
+from smart_common.providers.provider_config.config import provider_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialBundle:
+    """
+    Decrypted credentials of one provider, held as mutable buffers.
+
+    `wipe()` overwrites the buffers in place when the bundle leaves the
+    cache. The `str` values handed out by `as_dict()` are immutable Python
+    objects and cannot be wiped; they live as long as the adapter using
+    them.
+    """
+
+    __slots__ = ("_secrets",)
+
+    def __init__(self, secrets: Mapping[str, str]) -> None:
+        self._secrets = {
+            key: bytearray(value.encode("utf-8")) for key, value in secrets.items()
+        }
+
+    def as_dict(self) -> dict[str, str]:
+        return {key: value.decode("utf-8") for key, value in self._secrets.items()}
+
+    def wipe(self) -> None:
+        for buffer in self._secrets.values():
+            buffer[:] = b"\x00" * len(buffer)
+        self._secrets.clear()
+
+    def __repr__(self) -> str:
+        return f"CredentialBundle(keys={sorted(self._secrets)})"
+
+
+@dataclass
+class CredentialCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class CredentialCache:
+    """
+    Bounded LRU of decrypted provider credentials.
+
+    One bundle per provider, valid for the `credentials.updated_at` it was
+    decrypted at; a credential row written through the ORM gets a new
+    timestamp and is decrypted again. Writers still call `invalidate()` so
+    the old plaintext does not wait for LRU eviction. Bundles leaving the
+    cache are wiped.
+    """
+
+    def __init__(self, *, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("Credential cache needs room for at least one entry")
+
+        self.max_size = max_size
+        self.stats = CredentialCacheStats()
+        self._entries: OrderedDict[int, tuple[datetime | None, CredentialBundle]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self,
+        provider_id: int,
+        updated_at: datetime | None,
+        loader: Callable[[], Mapping[str, str]],
+    ) -> dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(provider_id)
+            if entry is not None and entry[0] == updated_at:
+                self._entries.move_to_end(provider_id)
+                self.stats.hits += 1
+                return entry[1].as_dict()
+
+        # Decrypt outside the lock; a racing miss only costs one extra decrypt.
+        bundle = CredentialBundle(loader())
+        with self._lock:
+            self.stats.misses += 1
+            previous = self._entries.pop(provider_id, None)
+            if previous is not None:
+                previous[1].wipe()
+            self._entries[provider_id] = (updated_at, bundle)
+            while len(self._entries) > self.max_size:
+                _, (_, oldest) = self._entries.popitem(last=False)
+                oldest.wipe()
+                self.stats.evictions += 1
+            return bundle.as_dict()
+
+    def invalidate(self, provider_id: int) -> bool:
+        with self._lock:
+            entry = self._entries.pop(provider_id, None)
+            if entry is None:
+                return False
+            entry[1].wipe()
+            self.stats.invalidations += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, bundle in self._entries.values():
+                bundle.wipe()
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "evictions": self.stats.evictions,
+                "invalidations": self.stats.invalidations,
+            }
+
+
+credential_cache = CredentialCache(
+    max_size=provider_settings.PROVIDER_CREDENTIAL_CACHE_MAX_SIZE,
+)
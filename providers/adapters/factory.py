@@ -1,24 +1,37 @@
 from __future__ import annotations
 
 import logging
+from contextlib import contextmanager
 from inspect import Parameter, signature
-from typing import TYPE_CHECKING, Any, Mapping, Tuple
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator, Mapping, Tuple
 
 from cryptography.fernet import InvalidToken
 
 from smart_common.core.security import decrypt_secret
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
 from smart_common.providers.adapters.base import BaseProviderAdapter
+from smart_common.providers.adapters.cache import AdapterCache
+from smart_common.providers.adapters.credential_cache import credential_cache
+from smart_common.providers.adapters.transport import http_transports
 from smart_common.providers.definitions import registry as _  # ensure definitions register
 from smart_common.providers.definitions.base import ProviderDefinition, ProviderDefinitionRegistry
 from smart_common.providers.enums import ProviderPowerSource, ProviderVendor
 from smart_common.providers.exceptions import ProviderConfigError, ProviderNotSupportedError
+from smart_common.providers.provider_config.config import provider_settings
 
 if TYPE_CHECKING:
     from smart_common.models.provider import Provider  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
-_ADAPTER_CACHE: dict[Tuple[ProviderVendor, str], BaseProviderAdapter] = {}
+_ADAPTER_CACHE: AdapterCache[BaseProviderAdapter] = AdapterCache(
+    max_size=provider_settings.PROVIDER_ADAPTER_CACHE_MAX_SIZE,
+    idle_ttl_sec=provider_settings.PROVIDER_ADAPTER_CACHE_IDLE_TTL_SEC,
+)
+_ASYNC_ADAPTER_CACHE: AdapterCache[AsyncBaseProviderAdapter] = AdapterCache(
+    max_size=provider_settings.PROVIDER_ADAPTER_CACHE_MAX_SIZE,
+    idle_ttl_sec=provider_settings.PROVIDER_ADAPTER_CACHE_IDLE_TTL_SEC,
+)
 
 
 class VendorAdapterFactory:
@@ -34,49 +47,92 @@ class VendorAdapterFactory:
         credentials: Mapping[str, Any],
         cache_key: str,
         overrides: Mapping[str, Any] | None = None,
-    ) -> BaseProviderAdapter:
-        cache_id = (vendor, cache_key)
-        cached = _ADAPTER_CACHE.get(cache_id)
-        if cached:
-            logger.debug(
-                "Using cached provider adapter",
-                extra={
-                    "vendor": vendor.value,
-                    "cache_key": cache_key,
-                    "adapter": type(cached).__name__,
-                },
-            )
-            return cached
+        asynchronous: bool = False,
+        provider_id: int | None = None,
+    ) -> BaseProviderAdapter | AsyncBaseProviderAdapter:
+        """Cached adapter without a lease; prefer `lease()` for I/O."""
+        cache = _ASYNC_ADAPTER_CACHE if asynchronous else _ADAPTER_CACHE
+        return cache.get_or_create(
+            (vendor, cache_key),
+            lambda: self._build(
+                vendor,
+                credentials=credentials,
+                cache_key=cache_key,
+                overrides=overrides,
+                asynchronous=asynchronous,
+            ),
+            provider_id=provider_id,
+        )
+
+    @contextmanager
+    def lease(
+        self,
+        vendor: ProviderVendor,
+        *,
+        credentials: Mapping[str, Any],
+        cache_key: str,
+        overrides: Mapping[str, Any] | None = None,
+        asynchronous: bool = False,
+        provider_id: int | None = None,
+    ) -> Iterator[BaseProviderAdapter | AsyncBaseProviderAdapter]:
+        """Cached adapter that is not closed while the block runs."""
+        cache = _ASYNC_ADAPTER_CACHE if asynchronous else _ADAPTER_CACHE
+        with cache.lease(
+            (vendor, cache_key),
+            lambda: self._build(
+                vendor,
+                credentials=credentials,
+                cache_key=cache_key,
+                overrides=overrides,
+                asynchronous=asynchronous,
+            ),
+            provider_id=provider_id,
+        ) as adapter:
+            yield adapter
 
+    def _build(
+        self,
+        vendor: ProviderVendor,
+        *,
+        credentials: Mapping[str, Any],
+        cache_key: str,
+        overrides: Mapping[str, Any] | None,
+        asynchronous: bool,
+    ) -> BaseProviderAdapter | AsyncBaseProviderAdapter:
         definition = self._definitions.get(vendor)
-        if not definition or not definition.adapter_cls:
+        adapter_cls = None
+        if definition:
+            adapter_cls = (
+                definition.async_adapter_cls if asynchronous else definition.adapter_cls
+            )
+        if not adapter_cls:
             raise ProviderNotSupportedError(vendor.value)
 
-        if not issubclass(definition.adapter_cls, BaseProviderAdapter):
+        base_cls = AsyncBaseProviderAdapter if asynchronous else BaseProviderAdapter
+        if not issubclass(adapter_cls, base_cls):
             raise TypeError(
-                f"Adapter {definition.adapter_cls.__name__} must extend BaseProviderAdapter"
+                f"Adapter {adapter_cls.__name__} must extend {base_cls.__name__}"
             )
 
         adapter_settings = dict(definition.adapter_settings or {})
         if overrides:
             adapter_settings.update(overrides)
 
-        allowed_params = self._filter_adapter_params(definition.adapter_cls, adapter_settings)
+        allowed_params = self._filter_adapter_params(adapter_cls, adapter_settings)
         try:
-            adapter = definition.adapter_cls(**credentials, **allowed_params)
+            adapter = adapter_cls(**credentials, **allowed_params)
         except TypeError:
             logger.exception(
                 "Failed to instantiate provider adapter",
                 extra={
                     "vendor": vendor.value,
-                    "adapter": definition.adapter_cls.__name__,
+                    "adapter": adapter_cls.__name__,
                     "credentials": list(credentials.keys()),
                     "settings": list(allowed_params.keys()),
                 },
             )
             raise
 
-        _ADAPTER_CACHE[cache_id] = adapter
         logger.info(
             "Created provider adapter instance",
             extra={
@@ -90,11 +146,22 @@ class VendorAdapterFactory:
 
     def clear_cache(self) -> None:
         _ADAPTER_CACHE.clear()
+        _ASYNC_ADAPTER_CACHE.clear()
         logger.warning("Provider adapter cache cleared")
 
+    @staticmethod
+    def cache_stats() -> dict[str, dict[str, Any]]:
+        return {
+            "sync": _ADAPTER_CACHE.snapshot(),
+            "async": _ASYNC_ADAPTER_CACHE.snapshot(),
+            "credentials": credential_cache.snapshot(),
+            "http": http_transports.snapshot(),
+        }
+
     @staticmethod
     def _filter_adapter_params(
-        adapter_cls: type[BaseProviderAdapter], settings: Mapping[str, Any]
+        adapter_cls: type[BaseProviderAdapter] | type[AsyncBaseProviderAdapter],
+        settings: Mapping[str, Any],
     ) -> dict[str, Any]:
         init_sig = signature(adapter_cls.__init__)
         allowed_params = {
@@ -130,6 +197,42 @@ def create_adapter_for_provider(
     *,
     factory: VendorAdapterFactory | None = None,
 ) -> BaseProviderAdapter:
+    factory = factory or get_vendor_adapter_factory()
+    return factory.create(**_provider_adapter_args(provider, asynchronous=False))
+
+
+def create_async_adapter_for_provider(
+    provider: "Provider",
+    *,
+    factory: VendorAdapterFactory | None = None,
+) -> AsyncBaseProviderAdapter:
+    factory = factory or get_vendor_adapter_factory()
+    return factory.create(**_provider_adapter_args(provider, asynchronous=True))
+
+
+def lease_adapter_for_provider(
+    provider: "Provider",
+    *,
+    factory: VendorAdapterFactory | None = None,
+) -> ContextManager[BaseProviderAdapter]:
+    factory = factory or get_vendor_adapter_factory()
+    return factory.lease(**_provider_adapter_args(provider, asynchronous=False))
+
+
+def lease_async_adapter_for_provider(
+    provider: "Provider",
+    *,
+    factory: VendorAdapterFactory | None = None,
+) -> ContextManager[AsyncBaseProviderAdapter]:
+    factory = factory or get_vendor_adapter_factory()
+    return factory.lease(**_provider_adapter_args(provider, asynchronous=True))
+
+
+def _provider_adapter_args(
+    provider: "Provider",
+    *,
+    asynchronous: bool,
+) -> dict[str, Any]:
     vendor = provider.vendor
     if vendor is None:
         raise ProviderConfigError(
@@ -137,8 +240,13 @@ def create_adapter_for_provider(
             details={"provider_id": provider.id},
         )
 
+    definition = ProviderDefinitionRegistry.get(vendor)
     connect_credentials = _resolve_provider_credentials(provider)
-    if not connect_credentials:
+    # Local-network vendors (no credentials schema) need no login.
+    requires_credentials = (
+        definition is None or definition.credentials_schema is not None
+    )
+    if requires_credentials and not connect_credentials:
         raise ProviderConfigError(
             "Provider credentials are missing",
             details={"provider_id": provider.id, "vendor": vendor.value},
@@ -158,18 +266,24 @@ def create_adapter_for_provider(
             details={"provider_id": provider.id, "vendor": vendor.value},
         )
 
-    factory = factory or get_vendor_adapter_factory()
-
     cache_key = (
         f"{provider.id}:{vendor.value}:{external_id}:{power_source.value}:"
         f"{int(bool(getattr(provider, 'has_power_meter', False)))}:"
         f"{int(bool(getattr(provider, 'has_energy_storage', False)))}"
     )
-    adapter = factory.create(
-        vendor,
+    config = provider.config or {}
+    config_settings = {
+        key: config[key]
+        for key in (definition.adapter_config_keys if definition else ())
+        if config.get(key) is not None
+    }
+
+    return dict(
+        vendor=vendor,
         credentials=connect_credentials,
         cache_key=cache_key,
         overrides={
+            **config_settings,
             "provider_id": provider.id,
             "provider_external_id": external_id,
             "provider_power_source": power_source,
@@ -180,9 +294,41 @@ def create_adapter_for_provider(
                 getattr(provider, "has_energy_storage", False)
             ),
         },
+        asynchronous=asynchronous,
+        provider_id=provider.id,
     )
 
-    return adapter
+
+def invalidate_provider_adapters(provider_id: int) -> int:
+    """Close and drop every cached adapter of the provider."""
+    removed = _ADAPTER_CACHE.invalidate_provider(provider_id)
+    removed += _ASYNC_ADAPTER_CACHE.invalidate_provider(provider_id)
+    if removed:
+        logger.info(
+            "Provider adapters invalidated",
+            extra={"provider_id": provider_id, "adapters": removed},
+        )
+    return removed
+
+
+def provider_account_key(provider: "Provider") -> Tuple[ProviderVendor | None, str]:
+    """(vendor, login) of the vendor account the provider polls through."""
+    try:
+        login = _resolve_provider_credentials(provider).get("username")
+    except ProviderConfigError:
+        logger.warning(
+            "Failed to decrypt provider login for account key",
+            extra={"provider_id": provider.id},
+        )
+        login = None
+    if login:
+        return provider.vendor, login
+    return provider.vendor, f"user:{provider.user_id}"
+
+
+def invalidate_provider_credentials(provider_id: int) -> bool:
+    """Drop the provider's decrypted credentials after they were rewritten."""
+    return credential_cache.invalidate(provider_id)
 
 
 def _resolve_provider_credentials(provider: "Provider") -> dict[str, str]:
@@ -190,6 +336,16 @@ def _resolve_provider_credentials(provider: "Provider") -> dict[str, str]:
     if credentials is None:
         return {}
 
+    if provider.id is None:
+        return _decrypt_provider_credentials(provider, credentials)
+    return credential_cache.get_or_load(
+        provider.id,
+        getattr(credentials, "updated_at", None),
+        lambda: _decrypt_provider_credentials(provider, credentials),
+    )
+
+
+def _decrypt_provider_credentials(provider: "Provider", credentials: Any) -> dict[str, str]:
     payload: dict[str, str] = {}
 
     attr_mapping = {
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Mapping
+
+from smart_common.enums.provider_telemetry import (
+    ProviderTelemetryCapability,
+    TelemetryAggregationMode,
+    TelemetryChartType,
+)
+from smart_common.enums.unit import PowerUnit
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
+from smart_common.providers.adapters.base import BaseProviderAdapter
+from smart_common.providers.adapters.payload_mapping import (
+    BATTERY_SOC_METRIC_KEY,
+    GRID_POWER_METRIC_KEY,
+    CompiledPayloadMapping,
+    FieldSpec,
+    MetricSpec,
+    prune_none,
+    to_float,
+)
+from smart_common.providers.enums import (
+    ProviderKind,
+    ProviderPowerSource,
+    ProviderType,
+    ProviderVendor,
+)
+from smart_common.providers.exceptions import ProviderError
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+logger = logging.getLogger(__name__)
+
+POWER_FLOW_PATH = "/solar_api/v1/GetPowerFlowRealtimeData.fcgi"
+
+
+def _grid_export_w(p_grid: Any) -> float | None:
+    # Solar API P_Grid is positive while importing; measurements use
+    # export-positive grid power like the cloud adapters.
+    value = to_float(p_grid)
+    return -value if value is not None else None
+
+
+def _first_inverter_soc(inverters: Any) -> float | None:
+    if not isinstance(inverters, Mapping):
+        return None
+    for inverter in inverters.values():
+        if isinstance(inverter, Mapping):
+            soc = to_float(inverter.get("SOC"))
+            if soc is not None:
+                return soc
+    return None
+
+
+def _inverters(inverters: Any) -> dict[str, Any] | None:
+    if not isinstance(inverters, Mapping):
+        return None
+    return prune_none(
+        {
+            str(number): {
+                "power_w": to_float(inverter.get("P")),
+                "soc": to_float(inverter.get("SOC")),
+                "energy_day_wh": to_float(inverter.get("E_Day")),
+                "energy_total_wh": to_float(inverter.get("E_Total")),
+                "device_type": inverter.get("DT"),
+            }
+            for number, inverter in inverters.items()
+            if isinstance(inverter, Mapping)
+        }
+    )
+
+
+# GetPowerFlowRealtimeData response -> measurement metadata and extra metrics.
+FRONIUS_POWER_FLOW_MAPPING = CompiledPayloadMapping(
+    [
+        FieldSpec("site.mode", "Body.Data.Site.Mode", prune_none),
+        FieldSpec("site.pv_w", "Body.Data.Site.P_PV", to_float),
+        FieldSpec("site.grid_w", "Body.Data.Site.P_Grid", to_float),
+        FieldSpec("site.load_w", "Body.Data.Site.P_Load", to_float),
+        FieldSpec("site.battery_w", "Body.Data.Site.P_Akku", to_float),
+        FieldSpec("site.autonomy_pct", "Body.Data.Site.rel_Autonomy", to_float),
+        FieldSpec(
+            "site.self_consumption_pct", "Body.Data.Site.rel_SelfConsumption", to_float
+        ),
+        FieldSpec("energy.day_wh", "Body.Data.Site.E_Day", to_float),
+        FieldSpec("energy.year_wh", "Body.Data.Site.E_Year", to_float),
+        FieldSpec("energy.total_wh", "Body.Data.Site.E_Total", to_float),
+        FieldSpec("inverters", "Body.Data.Inverters", _inverters),
+        FieldSpec("raw_timestamp", "Head.Timestamp", prune_none),
+        MetricSpec(
+            key=BATTERY_SOC_METRIC_KEY,
+            source="Body.Data.Inverters",
+            convert=_first_inverter_soc,
+            unit=PowerUnit.PERCENT.value,
+            label="Battery SOC",
+            chart_type=TelemetryChartType.LINE,
+            aggregation_mode=TelemetryAggregationMode.RAW,
+            capability_tag=ProviderTelemetryCapability.ENERGY_STORAGE,
+        ),
+        MetricSpec(
+            key=GRID_POWER_METRIC_KEY,
+            source="Body.Data.Site.P_Grid",
+            convert=_grid_export_w,
+            unit=PowerUnit.WATT.value,
+            label="Grid power",
+            chart_type=TelemetryChartType.BAR,
+            aggregation_mode=TelemetryAggregationMode.HOURLY_INTEGRAL,
+            capability_tag=ProviderTelemetryCapability.POWER_METER,
+        ),
+    ]
+)
+
+
+def fronius_base_url(
+    host: str,
+    *,
+    use_https: bool = False,
+    port: int | None = None,
+) -> str:
+    scheme = "https" if use_https else "http"
+    host = f"[{host}]" if ":" in str(host) else str(host)
+    return f"{scheme}://{host}:{port}" if port else f"{scheme}://{host}"
+
+
+class FroniusPayloadMixin:
+    """Fronius Solar API v1 handling shared by the sync and async adapters."""
+
+    provider_type = ProviderType.API
+    vendor = ProviderVendor.FRONIUS
+    kind = ProviderKind.POWER
+
+    def _init_device(
+        self,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool,
+        provider_has_energy_storage: bool,
+    ) -> None:
+        self.provider_id = provider_id
+        self.provider_external_id = provider_external_id
+        self.provider_power_source = provider_power_source
+        self.provider_has_power_meter = provider_has_power_meter
+        self.provider_has_energy_storage = provider_has_energy_storage
+        # Local devices have no vendor quota.
+        self.rate_limiter = None
+
+    def _telemetry_capabilities(self) -> set[ProviderTelemetryCapability]:
+        capabilities: set[ProviderTelemetryCapability] = set()
+        if self.provider_has_energy_storage:
+            capabilities.add(ProviderTelemetryCapability.ENERGY_STORAGE)
+        if self.provider_has_power_meter:
+            capabilities.add(ProviderTelemetryCapability.POWER_METER)
+        return capabilities
+
+    def _check_response(self, response: Any) -> Mapping[str, Any]:
+        if response.status_code >= 400:
+            raise ProviderError(
+                message="Fronius Solar API request failed",
+                status_code=502,
+                code="FRONIUS_API_ERROR",
+                details={"host": self.host, "status_code": response.status_code},
+            )
+
+        payload = response.json()
+        status = (payload.get("Head") or {}).get("Status") or {}
+        if status.get("Code", 0) != 0:
+            raise ProviderError(
+                message="Fronius Solar API error",
+                status_code=502,
+                code="FRONIUS_API_ERROR",
+                details={
+                    "host": self.host,
+                    "code": status.get("Code"),
+                    "reason": status.get("Reason"),
+                },
+            )
+
+        site = ((payload.get("Body") or {}).get("Data") or {}).get("Site")
+        if not isinstance(site, Mapping):
+            raise ProviderError(
+                message="Fronius Solar API returned unexpected payload",
+                status_code=502,
+                code="FRONIUS_API_ERROR",
+                details={"host": self.host},
+            )
+        return payload
+
+    def _build_measurement(self, payload: Mapping[str, Any]) -> NormalizedMeasurement:
+        metadata, extra_metrics = FRONIUS_POWER_FLOW_MAPPING.extract(
+            payload,
+            capabilities=self._telemetry_capabilities(),
+        )
+        site = metadata.get("site", {})
+
+        if self.provider_power_source == ProviderPowerSource.INVERTER:
+            # P_PV is null while the inverter sleeps at night.
+            value = site.get("pv_w", 0.0)
+            measurement_source = "pv"
+        else:
+            grid_w = site.get("grid_w")
+            value = -grid_w if grid_w is not None else None
+            measurement_source = "grid"
+
+        if value is None:
+            raise ProviderError(
+                message="Fronius power value missing for selected source",
+                status_code=502,
+                details={
+                    "host": self.host,
+                    "power_source": self.provider_power_source.value,
+                    "mode": site.get("mode"),
+                },
+            )
+
+        metadata["power_source"] = self.provider_power_source.value
+        metadata["measurement_source"] = measurement_source
+
+        return NormalizedMeasurement(
+            provider_id=self.provider_id,
+            value=value,
+            unit=PowerUnit.WATT.value,
+            measured_at=datetime.now(timezone.utc),
+            metadata=metadata,
+            extra_metrics=extra_metrics,
+        )
+
+    @staticmethod
+    def _devices(
+        payload: Mapping[str, Any],
+        station_code: str,
+    ) -> list[Mapping[str, Any]]:
+        inverters = ((payload.get("Body") or {}).get("Data") or {}).get("Inverters")
+        if not isinstance(inverters, Mapping):
+            return []
+        return [
+            {
+                "device_id": str(number),
+                "station_code": station_code,
+                "device_type": inverter.get("DT"),
+                "raw": dict(inverter),
+            }
+            for number, inverter in inverters.items()
+            if isinstance(inverter, Mapping)
+        ]
+
+
+class FroniusProviderAdapter(FroniusPayloadMixin, BaseProviderAdapter):
+    """
+    Polls a Fronius inverter's local Solar API (GetPowerFlowRealtimeData).
+
+    The `requests.Session` keeps the connection alive between polls, so
+    1 s polling does not reconnect each time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        provider_has_energy_storage: bool = False,
+        use_https: bool = False,
+        port: int | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        super().__init__(
+            fronius_base_url(host, use_https=use_https, port=port),
+            timeout=timeout or provider_settings.LOCAL_ADAPTER_TIMEOUT,
+            max_retries=max_retries or provider_settings.LOCAL_ADAPTER_MAX_RETRIES,
+        )
+        self._init_device(
+            provider_id=provider_id,
+            provider_external_id=provider_external_id,
+            provider_power_source=provider_power_source,
+            provider_has_power_meter=provider_has_power_meter,
+            provider_has_energy_storage=provider_has_energy_storage,
+        )
+
+    def get_power_flow(self) -> Mapping[str, Any]:
+        return self._check_response(self._request("GET", POWER_FLOW_PATH))
+
+    def fetch_measurement(self) -> NormalizedMeasurement:
+        return self._build_measurement(self.get_power_flow())
+
+    def get_current_power(self, device_id: str) -> float:
+        return self.fetch_measurement().value
+
+    def list_stations(self) -> list[Mapping[str, Any]]:
+        return [{"station_code": self.host, "name": self.host, "raw": {}}]
+
+    def list_devices(self, station_code: str) -> list[Mapping[str, Any]]:
+        return self._devices(self.get_power_flow(), station_code)
+
+
+class AsyncFroniusProviderAdapter(FroniusPayloadMixin, AsyncBaseProviderAdapter):
+    """asyncio Fronius Solar API polling on a keep-alive `httpx.AsyncClient`."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        provider_has_energy_storage: bool = False,
+        use_https: bool = False,
+        port: int | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        super().__init__(
+            fronius_base_url(host, use_https=use_https, port=port),
+            timeout=timeout or provider_settings.LOCAL_ADAPTER_TIMEOUT,
+            max_retries=max_retries or provider_settings.LOCAL_ADAPTER_MAX_RETRIES,
+        )
+        self._init_device(
+            provider_id=provider_id,
+            provider_external_id=provider_external_id,
+            provider_power_source=provider_power_source,
+            provider_has_power_meter=provider_has_power_meter,
+            provider_has_energy_storage=provider_has_energy_storage,
+        )
+
+    async def fetch_measurement(self) -> NormalizedMeasurement:
+        response = await self._request("GET", POWER_FLOW_PATH)
+        return self._build_measurement(self._check_response(response))
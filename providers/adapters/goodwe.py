@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import threading
+import time
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Mapping, Optional
 
@@ -16,7 +20,18 @@ from smart_common.schemas.normalized_measurement import (
     NormalizedMeasurement,
     NormalizedMetric,
 )
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
 from smart_common.providers.adapters.base import BaseProviderAdapter
+from smart_common.providers.adapters.payload_mapping import (
+    BATTERY_SOC_METRIC_KEY,
+    GRID_POWER_METRIC_KEY,
+    CompiledPayloadMapping,
+    FieldSpec,
+    MetricSpec,
+    prune_none,
+    to_watt,
+)
+from smart_common.providers.adapters.rate_limit import vendor_rate_limiter
 from smart_common.providers.enums import (
     ProviderKind,
     ProviderPowerSource,
@@ -30,65 +45,136 @@ logger = logging.getLogger(__name__)
 
 EXTRA_ENERGY_GRID_STATUS = -1
 IMPORT_ENERGY_GRID_STATUS = 1
-BATTERY_SOC_METRIC_KEY = "battery_soc"
-GRID_POWER_METRIC_KEY = "grid_power"
 
+SEMS_LOGIN_PATH = "/api/v2/Common/CrossLogin"
+POWERSTATION_IDS_PATH = "/PowerStation/GetPowerStationIdByOwner"
+POWERFLOW_PATH = "/v2/PowerStation/GetPowerflow"
 
-class GoodWeProviderAdapter(BaseProviderAdapter):
-    provider_type = ProviderType.API
-    vendor = ProviderVendor.GOODWE
-    kind = ProviderKind.POWER
+# SEMS answers with these codes once the token is missing or expired.
+AUTH_FAILURE_CODES = frozenset({100001, 100002})
 
-    SEMS_VER = "v2.1.0"
 
-    # ------------------------------------------------------------------
-    # INIT
-    # ------------------------------------------------------------------
+def _signed_grid_power(powerflow: Any) -> Optional[float]:
+    if not isinstance(powerflow, Mapping):
+        return None
 
-    def __init__(
-        self,
-        username: str,
-        password: str,
-        *,
-        provider_id: int,
-        provider_external_id: str,
-        provider_power_source: ProviderPowerSource,
-        provider_has_power_meter: bool = False,
-        provider_has_energy_storage: bool = False,
-    ) -> None:
-        super().__init__(
-            base_url="https://www.semsportal.com",
-            timeout=goodwe_integration_settings.GOODWE_TIMEOUT,
-            max_retries=goodwe_integration_settings.GOODWE_MAX_RETRIES,
-        )
+    grid_w = to_watt(powerflow.get("grid"))
+    if grid_w is None:
+        return None
 
-        self.username = username
-        self.password = password
-        self.provider_id = provider_id
-        self.provider_external_id = provider_external_id
-        self.provider_power_source = provider_power_source
-        self.provider_has_power_meter = provider_has_power_meter
-        self.provider_has_energy_storage = provider_has_energy_storage
+    load_status = powerflow.get("loadStatus")
+
+    if load_status == EXTRA_ENERGY_GRID_STATUS:
+        # eksport do sieci -> wartość dodatnia
+        return grid_w
+
+    if load_status == IMPORT_ENERGY_GRID_STATUS:
+        # pobór z sieci -> wartość ujemna
+        return -grid_w
+
+    return None
+
+
+def _pruned_mapping(value: Any) -> dict[str, Any] | None:
+    return prune_none(value) if isinstance(value, Mapping) else None
+
+
+# GetPowerflow `data` -> measurement metadata and extra metrics.
+GOODWE_POWERFLOW_MAPPING = CompiledPayloadMapping(
+    [
+        FieldSpec("flags.has_genset", "hasGenset", prune_none),
+        FieldSpec("flags.has_micro_grid", "hasMicroGrid", prune_none),
+        FieldSpec("flags.has_more_inverter", "hasMoreInverter", prune_none),
+        FieldSpec("flags.has_powerflow", "hasPowerflow", prune_none),
+        FieldSpec("flags.has_grid_load", "hasGridLoad", prune_none),
+        FieldSpec("flags.is_stored", "isStored", prune_none),
+        FieldSpec("flags.is_parallel_inverters", "isParallelInventers", prune_none),
+        FieldSpec(
+            "flags.is_mixed_parallel_inverters", "isMixedParallelInventers", prune_none
+        ),
+        FieldSpec("flags.is_ev_charge", "isEvCharge", prune_none),
+        FieldSpec("flags.is_third_party_ems", "is3rdEms", prune_none),
+        FieldSpec("powerflow.pv_w", "powerflow.pv", to_watt),
+        FieldSpec("powerflow.grid_w", "powerflow.grid", to_watt),
+        FieldSpec("powerflow.load_w", "powerflow.load", to_watt),
+        FieldSpec("powerflow.battery_w", "powerflow.bettery", to_watt),
+        FieldSpec("powerflow.genset_w", "powerflow.genset", to_watt),
+        FieldSpec("powerflow.micro_grid_w", "powerflow.microGrid", to_watt),
+        FieldSpec("powerflow.soc", "powerflow.soc", prune_none),
+        FieldSpec("powerflow.soc_text", "powerflow.socText", prune_none),
+        FieldSpec("powerflow.status.pv", "powerflow.pvStatus", prune_none),
+        FieldSpec("powerflow.status.battery", "powerflow.betteryStatus", prune_none),
+        FieldSpec(
+            "powerflow.status.battery_text", "powerflow.betteryStatusStr", prune_none
+        ),
+        FieldSpec("powerflow.status.load", "powerflow.loadStatus", prune_none),
+        FieldSpec("powerflow.status.grid", "powerflow.gridStatus", prune_none),
+        FieldSpec("powerflow.status.genset", "powerflow.gensetStatus", prune_none),
+        FieldSpec(
+            "powerflow.status.grid_genset", "powerflow.gridGensetStatus", prune_none
+        ),
+        FieldSpec(
+            "powerflow.status.micro_grid", "powerflow.microGridStatus", prune_none
+        ),
+        FieldSpec("powerflow.has_equipment", "powerflow.hasEquipment", prune_none),
+        FieldSpec("powerflow.is_homekit", "powerflow.isHomKit", prune_none),
+        FieldSpec(
+            "powerflow.is_bpu_inverter_no_battery",
+            "powerflow.isBpuAndInverterNoBattery",
+            prune_none,
+        ),
+        FieldSpec("powerflow.is_multi_battery", "powerflow.isMoreBettery", prune_none),
+        FieldSpec("ev_charge", "evCharge", _pruned_mapping),
+        MetricSpec(
+            key=BATTERY_SOC_METRIC_KEY,
+            source="powerflow.soc",
+            convert=to_watt,
+            unit=PowerUnit.PERCENT.value,
+            label="Battery SOC",
+            chart_type=TelemetryChartType.LINE,
+            aggregation_mode=TelemetryAggregationMode.RAW,
+            capability_tag=ProviderTelemetryCapability.ENERGY_STORAGE,
+        ),
+        MetricSpec(
+            key=GRID_POWER_METRIC_KEY,
+            source="powerflow",
+            convert=_signed_grid_power,
+            unit=PowerUnit.WATT.value,
+            label="Grid power",
+            chart_type=TelemetryChartType.BAR,
+            aggregation_mode=TelemetryAggregationMode.HOURLY_INTEGRAL,
+            capability_tag=ProviderTelemetryCapability.POWER_METER,
+        ),
+    ]
+)
 
-        self._login_base_url = "https://www.semsportal.com"
-        self._api_base_url: str | None = None
 
-        self._logged_in = False
-        self._token_ctx: dict[str, Any] | None = None
+@dataclass
+class GoodWeAuthStats:
+    logins: int = 0
+    login_failures: int = 0
+    relogins: int = 0
+    token_reuses: int = 0
+    login_time_sec: float = 0.0
+    last_login_sec: float | None = None
+    last_login_at: datetime | None = None
 
-        self._external_id: str | None = provider_external_id
-        self._powerstation_ids: list[str] | None = None
+
+class GoodWePayloadMixin:
+    """GoodWe SEMS request/response handling shared by the sync and async adapters."""
+
+    provider_type = ProviderType.API
+    vendor = ProviderVendor.GOODWE
+    kind = ProviderKind.POWER
+
+    SEMS_VER = "v2.1.0"
 
     # ------------------------------------------------------------------
     # AUTH
     # ------------------------------------------------------------------
 
-    def authenticate(self) -> None:
-        self._authenticate()
-
-    def _authenticate(self) -> None:
-
-        headers = {
+    def _login_headers(self) -> dict[str, str]:
+        return {
             "Content-Type": "application/json;charset=UTF-8",
             "Accept": "application/json, text/plain, */*",
             "User-Agent": "Mozilla/5.0",
@@ -102,23 +188,13 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
             ),
         }
 
-        body = {
+    def _login_body(self) -> dict[str, str]:
+        return {
             "account": self.username,
             "pwd": self.password,
         }
 
-        old_base_url = self.base_url
-        try:
-            self.base_url = self._login_base_url
-            response = self._request(
-                "POST",
-                "/api/v2/Common/CrossLogin",
-                json_data=body,
-                headers=headers,
-            )
-        finally:
-            self.base_url = old_base_url
-
+    def _apply_login_response(self, response: Any) -> None:
         try:
             payload = response.json()
         except ValueError as exc:
@@ -158,41 +234,66 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
 
         logger.info("[GOODWE LOGIN OK]", extra={"uid": data["uid"]})
 
-    # ------------------------------------------------------------------
-    # TOKEN
-    # ------------------------------------------------------------------
+    def _record_login(self, started: float, *, ok: bool) -> None:
+        elapsed = time.monotonic() - started
+        if not ok:
+            self._auth_stats.login_failures += 1
+            return
 
-    def _token_header(self) -> str:
-        if not self._token_ctx:
-            raise ProviderError(message="GoodWe adapter not authenticated")
+        self._auth_stats.logins += 1
+        self._auth_stats.login_time_sec += elapsed
+        self._auth_stats.last_login_sec = elapsed
+        self._auth_stats.last_login_at = datetime.now(timezone.utc)
 
-        return json.dumps(self._token_ctx, separators=(",", ":"))
+    def _invalidate_token(self) -> None:
+        self._token_ctx = None
+        self._logged_in = False
+
+    @staticmethod
+    def _is_auth_failure(data: Mapping[str, Any]) -> bool:
+        try:
+            return int(data.get("code")) in AUTH_FAILURE_CODES
+        except (TypeError, ValueError):
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        auth = self._auth_stats
+        return {
+            "logins": auth.logins,
+            "login_failures": auth.login_failures,
+            "relogins": auth.relogins,
+            "token_reuses": auth.token_reuses,
+            "avg_login_sec": (
+                auth.login_time_sec / auth.logins if auth.logins else None
+            ),
+            "last_login_sec": auth.last_login_sec,
+            "last_login_at": auth.last_login_at,
+        }
 
     # ------------------------------------------------------------------
-    # HTTP
+    # TOKEN
     # ------------------------------------------------------------------
 
-    def _post(self, path: str, payload: Mapping[str, Any]) -> Any:
-        self._authenticate()
-
-        if not self._api_base_url:
-            raise ProviderError(message="GoodWe API base URL not set")
+    def _token_header(self, token_ctx: Mapping[str, Any] | None = None) -> str:
+        token_ctx = token_ctx or self._token_ctx
+        if not token_ctx:
+            raise ProviderError(message="GoodWe adapter not authenticated")
 
-        body = dict(payload)
+        return json.dumps(token_ctx, separators=(",", ":"))
 
-        response = self._request(
-            "POST",
-            path,
-            json_data=body,
-            headers={
-                "Content-Type": "application/json;charset=UTF-8",
-                "Accept": "application/json, text/plain, */*",
-                "User-Agent": "Mozilla/5.0",
-                "Token": self._token_header(),
-            },
-        )
+    def _api_headers(
+        self,
+        token_ctx: Mapping[str, Any] | None = None,
+    ) -> dict[str, str]:
+        return {
+            "Content-Type": "application/json;charset=UTF-8",
+            "Accept": "application/json, text/plain, */*",
+            "User-Agent": "Mozilla/5.0",
+            "Token": self._token_header(token_ctx),
+        }
 
-        data = response.json()
+    @staticmethod
+    def _unwrap_api_response(data: Mapping[str, Any], path: str) -> Any:
         if data.get("code") not in (0, "0", None):
             raise ProviderError(
                 message=data.get("msg", "GoodWe API error"),
@@ -206,18 +307,10 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
         return data.get("data")
 
     # ------------------------------------------------------------------
-    # DOMAIN
+    # PAYLOAD
     # ------------------------------------------------------------------
 
-    def get_powerstation_ids(self) -> list[str]:
-        if self._powerstation_ids is not None:
-            return self._powerstation_ids
-
-        data = self._post(
-            "/PowerStation/GetPowerStationIdByOwner",
-            {},
-        )
-
+    def _remember_powerstation_ids(self, data: Any) -> list[str]:
         ids = self._collect_powerstation_ids(data)
         if not ids:
             raise ProviderError(
@@ -229,23 +322,8 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
         self._external_id = self._powerstation_ids[0]
         return self._powerstation_ids
 
-    def _get_powerflow_payload(self, power_station_id: str) -> Mapping[str, Any] | None:
-        snapshot = self._get_powerflow_snapshot(power_station_id)
-        if snapshot is None:
-            return None
-
-        powerflow = snapshot.get("powerflow")
-        if not isinstance(powerflow, Mapping):
-            return None
-
-        return powerflow
-
-    def _get_powerflow_snapshot(self, power_station_id: str) -> Mapping[str, Any] | None:
-        data = self._post(
-            "/v2/PowerStation/GetPowerflow",
-            {"PowerStationId": power_station_id},
-        )
-
+    @staticmethod
+    def _snapshot_from_powerflow_data(data: Any) -> Mapping[str, Any] | None:
         if not isinstance(data, dict):
             return None
 
@@ -266,213 +344,34 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
             return power_source_hint
         raise ProviderError("Provider power_source not configured")
 
-    @staticmethod
-    def _safe_watt(value: Any) -> float | None:
-        if value is None or isinstance(value, bool):
-            return None
-
-        if isinstance(value, (int, float)):
-            return float(value)
-
-        if isinstance(value, str):
-            cleaned = value.strip()
-            if not cleaned:
-                return None
-
-            if cleaned.endswith("W"):
-                cleaned = cleaned[:-1].strip()
-
-            try:
-                return float(cleaned)
-            except ValueError:
-                return None
-
-        return None
-
-    @classmethod
-    def _prune_none(cls, value: Any) -> Any:
-        if isinstance(value, Mapping):
-            cleaned: dict[str, Any] = {}
-            for key, nested_value in value.items():
-                pruned_value = cls._prune_none(nested_value)
-                if pruned_value is not None:
-                    cleaned[str(key)] = pruned_value
-            return cleaned or None
-
-        if isinstance(value, list):
-            cleaned_list = [cls._prune_none(item) for item in value]
-            compacted = [item for item in cleaned_list if item is not None]
-            return compacted or None
-
-        return value
-
-    def _build_metadata(
-        self,
-        snapshot: Mapping[str, Any],
-        *,
-        power_station_id: str,
-    ) -> dict[str, Any]:
-        powerflow = snapshot.get("powerflow")
-        powerflow_map: Mapping[str, Any] = (
-            powerflow if isinstance(powerflow, Mapping) else {}
-        )
-
-        extra_data: dict[str, Any] = {
-            "powerstation_id": power_station_id,
-            "flags": {
-                "has_genset": snapshot.get("hasGenset"),
-                "has_micro_grid": snapshot.get("hasMicroGrid"),
-                "has_more_inverter": snapshot.get("hasMoreInverter"),
-                "has_powerflow": snapshot.get("hasPowerflow"),
-                "has_grid_load": snapshot.get("hasGridLoad"),
-                "is_stored": snapshot.get("isStored"),
-                "is_parallel_inverters": snapshot.get("isParallelInventers"),
-                "is_mixed_parallel_inverters": snapshot.get(
-                    "isMixedParallelInventers"
-                ),
-                "is_ev_charge": snapshot.get("isEvCharge"),
-                "is_third_party_ems": snapshot.get("is3rdEms"),
-            },
-            "powerflow": {
-                "pv_w": self._safe_watt(powerflow_map.get("pv")),
-                "grid_w": self._safe_watt(powerflow_map.get("grid")),
-                "load_w": self._safe_watt(powerflow_map.get("load")),
-                "battery_w": self._safe_watt(powerflow_map.get("bettery")),
-                "genset_w": self._safe_watt(powerflow_map.get("genset")),
-                "micro_grid_w": self._safe_watt(powerflow_map.get("microGrid")),
-                "soc": powerflow_map.get("soc"),
-                "soc_text": powerflow_map.get("socText"),
-                "status": {
-                    "pv": powerflow_map.get("pvStatus"),
-                    "battery": powerflow_map.get("betteryStatus"),
-                    "battery_text": powerflow_map.get("betteryStatusStr"),
-                    "load": powerflow_map.get("loadStatus"),
-                    "grid": powerflow_map.get("gridStatus"),
-                    "genset": powerflow_map.get("gensetStatus"),
-                    "grid_genset": powerflow_map.get("gridGensetStatus"),
-                    "micro_grid": powerflow_map.get("microGridStatus"),
-                },
-                "has_equipment": powerflow_map.get("hasEquipment"),
-                "is_homekit": powerflow_map.get("isHomKit"),
-                "is_bpu_inverter_no_battery": powerflow_map.get(
-                    "isBpuAndInverterNoBattery"
-                ),
-                "is_multi_battery": powerflow_map.get("isMoreBettery"),
-            },
-        }
-
-        ev_charge = snapshot.get("evCharge")
-        if isinstance(ev_charge, Mapping):
-            extra_data["ev_charge"] = dict(ev_charge)
-
-        cleaned = self._prune_none(extra_data)
-        if isinstance(cleaned, Mapping):
-            return dict(cleaned)
-
-        return {"powerstation_id": power_station_id}
-
-    @staticmethod
-    def _extract_signed_grid_power(powerflow: Mapping[str, Any]) -> Optional[float]:
-        grid_w = GoodWeProviderAdapter._safe_watt(powerflow.get("grid"))
-        if grid_w is None:
-            return None
-
-        load_status = powerflow.get("loadStatus")
-
-        if load_status == EXTRA_ENERGY_GRID_STATUS:
-            # eksport do sieci -> wartość dodatnia
-            return float(grid_w)
-
-        if load_status == IMPORT_ENERGY_GRID_STATUS:
-            # pobór z sieci -> wartość ujemna
-            return -float(grid_w)
-
-        return None
+    _safe_watt = staticmethod(to_watt)
+    _extract_signed_grid_power = staticmethod(_signed_grid_power)
 
     @staticmethod
     def _extract_pv_power(powerflow: Mapping[str, Any]) -> Optional[float]:
-        pv_w = GoodWeProviderAdapter._safe_watt(powerflow.get("pv"))
-        if pv_w is None:
-            return None
-        return float(pv_w)
-
-    def _build_extra_metrics(
-        self,
-        powerflow: Mapping[str, Any],
-    ) -> list[NormalizedMetric]:
-        metrics: list[NormalizedMetric] = []
-
-        battery_soc = self._safe_watt(powerflow.get("soc"))
-<<<<<<< Updated upstream
-        if self.provider_has_energy_storage and battery_soc is not None:
-=======
-        if battery_soc is not None:
->>>>>>> Stashed changes
-            metrics.append(
-                NormalizedMetric(
-                    key=BATTERY_SOC_METRIC_KEY,
-                    value=battery_soc,
-                    unit=PowerUnit.PERCENT.value,
-                    label="Battery SOC",
-                    chart_type=TelemetryChartType.LINE,
-                    aggregation_mode=TelemetryAggregationMode.RAW,
-                    capability_tag=ProviderTelemetryCapability.ENERGY_STORAGE,
-                )
-            )
-
-        grid_power = self._extract_signed_grid_power(powerflow)
-<<<<<<< Updated upstream
-        if self.provider_has_power_meter and grid_power is not None:
-=======
-        if grid_power is not None:
->>>>>>> Stashed changes
-            metrics.append(
-                NormalizedMetric(
-                    key=GRID_POWER_METRIC_KEY,
-                    value=grid_power,
-                    unit=PowerUnit.WATT.value,
-                    label="Grid power",
-                    chart_type=TelemetryChartType.BAR,
-                    aggregation_mode=TelemetryAggregationMode.HOURLY_INTEGRAL,
-                    capability_tag=ProviderTelemetryCapability.POWER_METER,
-                )
-            )
+        return to_watt(powerflow.get("pv"))
 
-        return metrics
+    def _telemetry_capabilities(self) -> set[ProviderTelemetryCapability]:
+        capabilities: set[ProviderTelemetryCapability] = set()
+        if self.provider_has_energy_storage:
+            capabilities.add(ProviderTelemetryCapability.ENERGY_STORAGE)
+        if self.provider_has_power_meter:
+            capabilities.add(ProviderTelemetryCapability.POWER_METER)
+        return capabilities
 
-    def get_current_export_power(self, power_station_id: str) -> Optional[float]:
-        powerflow = self._get_powerflow_payload(power_station_id)
-        if powerflow is None:
-            return None
-        return self._extract_signed_grid_power(powerflow)
-
-    def get_current_power_by_provider_type(
+    def _extract_snapshot(
         self,
-        power_station_id: str,
+        snapshot: Mapping[str, Any],
         *,
-        power_source: ProviderPowerSource,
-    ) -> Optional[float]:
-        powerflow = self._get_powerflow_payload(power_station_id)
-        if powerflow is None:
-            return None
-
-        resolved_power_source = self._resolve_power_source(power_source)
-        if resolved_power_source == ProviderPowerSource.INVERTER:
-            return self._extract_pv_power(powerflow)
-
-        return self._extract_signed_grid_power(powerflow)
-
-    def get_current_power(self, device_id: str) -> Optional[float]:
-        return self.get_current_power_by_provider_type(
-            device_id,
-            power_source=self.provider_power_source,
+        power_station_id: str,
+    ) -> tuple[dict[str, Any], list[NormalizedMetric]]:
+        extracted, metrics = GOODWE_POWERFLOW_MAPPING.extract(
+            snapshot,
+            capabilities=self._telemetry_capabilities(),
         )
+        return {"powerstation_id": power_station_id, **extracted}, metrics
 
-    def fetch_measurement(self) -> NormalizedMeasurement:
-        if not self._external_id:
-            self.get_powerstation_ids()
-
-        snapshot = self._get_powerflow_snapshot(self._external_id)
+    def _build_measurement(self, snapshot: Mapping[str, Any] | None) -> NormalizedMeasurement:
         if snapshot is None:
             raise ProviderError(
                 message="GoodWe powerflow snapshot unavailable",
@@ -507,7 +406,7 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
                 },
             )
 
-        metadata = self._build_metadata(
+        metadata, extra_metrics = self._extract_snapshot(
             snapshot,
             power_station_id=self._external_id,
         )
@@ -530,22 +429,9 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
             unit=PowerUnit.WATT.value,
             measured_at=datetime.now(timezone.utc),
             metadata=metadata,
-            extra_metrics=self._build_extra_metrics(powerflow_map),
+            extra_metrics=extra_metrics,
         )
 
-    # ------------------------------------------------------------------
-    # REQUIRED BY BASE
-    # ------------------------------------------------------------------
-
-    def list_stations(self) -> list[Mapping[str, Any]]:
-        return [
-            {"station_id": sid, "external_id": sid}
-            for sid in self.get_powerstation_ids()
-        ]
-
-    def list_devices(self, station_code: str) -> list[Mapping[str, Any]]:
-        return [{"device_id": station_code, "external_id": station_code}]
-
     # ------------------------------------------------------------------
     # UTILS
     # ------------------------------------------------------------------
@@ -571,3 +457,334 @@ class GoodWeProviderAdapter(BaseProviderAdapter):
                 ids.extend(self._collect_powerstation_ids(item))
 
         return ids
+
+
+class GoodWeProviderAdapter(GoodWePayloadMixin, BaseProviderAdapter):
+    # ------------------------------------------------------------------
+    # INIT
+    # ------------------------------------------------------------------
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        provider_has_energy_storage: bool = False,
+        login_base_url: str | None = None,
+    ) -> None:
+        login_base_url = (
+            login_base_url or goodwe_integration_settings.GOODWE_LOGIN_BASE_URL
+        ).rstrip("/")
+        super().__init__(
+            base_url=login_base_url,
+            timeout=goodwe_integration_settings.GOODWE_TIMEOUT,
+            max_retries=goodwe_integration_settings.GOODWE_MAX_RETRIES,
+        )
+
+        self.username = username
+        self.password = password
+        self.provider_id = provider_id
+        self.provider_external_id = provider_external_id
+        self.provider_power_source = provider_power_source
+        self.provider_has_power_meter = provider_has_power_meter
+        self.provider_has_energy_storage = provider_has_energy_storage
+        self.rate_limiter = vendor_rate_limiter.bucket(self.vendor, username)
+
+        self._login_base_url = login_base_url
+        self._api_base_url: str | None = None
+
+        self._logged_in = False
+        self._token_ctx: dict[str, Any] | None = None
+        self._auth_lock = threading.Lock()
+        self._auth_stats = GoodWeAuthStats()
+
+        self._external_id: str | None = provider_external_id
+        self._powerstation_ids: list[str] | None = None
+
+    # ------------------------------------------------------------------
+    # AUTH
+    # ------------------------------------------------------------------
+
+    def authenticate(self) -> None:
+        with self._auth_lock:
+            self._authenticate()
+
+    def _authenticate(self) -> None:
+        started = time.monotonic()
+        try:
+            response = self._request(
+                "POST",
+                f"{self._login_base_url}{SEMS_LOGIN_PATH}",
+                json_data=self._login_body(),
+                headers=self._login_headers(),
+            )
+            self._apply_login_response(response)
+        except Exception:
+            self._record_login(started, ok=False)
+            raise
+        self._record_login(started, ok=True)
+
+    def _ensure_login(self) -> dict[str, Any]:
+        token_ctx = self._token_ctx
+        if token_ctx is not None:
+            self._auth_stats.token_reuses += 1
+            return token_ctx
+
+        # Callers that lose the race wait here and reuse the winner's token.
+        with self._auth_lock:
+            if self._token_ctx is None:
+                self._authenticate()
+            return self._token_ctx
+
+    def _relogin(self, rejected_ctx: Mapping[str, Any]) -> dict[str, Any]:
+        with self._auth_lock:
+            if self._token_ctx is rejected_ctx:
+                self._auth_stats.relogins += 1
+                self._invalidate_token()
+                self._authenticate()
+            return self._token_ctx
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _post(self, path: str, payload: Mapping[str, Any]) -> Any:
+        token_ctx = self._ensure_login()
+        data = self._send(path, payload, token_ctx)
+
+        if self._is_auth_failure(data):
+            logger.info(
+                "GoodWe token rejected, logging in again",
+                extra={**self._log_context(), "path": path, "code": data.get("code")},
+            )
+            token_ctx = self._relogin(token_ctx)
+            data = self._send(path, payload, token_ctx)
+
+        return self._unwrap_api_response(data, path)
+
+    def _send(
+        self,
+        path: str,
+        payload: Mapping[str, Any],
+        token_ctx: Mapping[str, Any],
+    ) -> Mapping[str, Any]:
+        if not self._api_base_url:
+            raise ProviderError(message="GoodWe API base URL not set")
+
+        response = self._request(
+            "POST",
+            path,
+            json_data=dict(payload),
+            headers=self._api_headers(token_ctx),
+        )
+
+        return response.json()
+
+    # ------------------------------------------------------------------
+    # DOMAIN
+    # ------------------------------------------------------------------
+
+    def get_powerstation_ids(self) -> list[str]:
+        if self._powerstation_ids is not None:
+            return self._powerstation_ids
+
+        data = self._post(POWERSTATION_IDS_PATH, {})
+        return self._remember_powerstation_ids(data)
+
+    def _get_powerflow_payload(self, power_station_id: str) -> Mapping[str, Any] | None:
+        snapshot = self._get_powerflow_snapshot(power_station_id)
+        if snapshot is None:
+            return None
+
+        powerflow = snapshot.get("powerflow")
+        if not isinstance(powerflow, Mapping):
+            return None
+
+        return powerflow
+
+    def _get_powerflow_snapshot(self, power_station_id: str) -> Mapping[str, Any] | None:
+        data = self._post(
+            POWERFLOW_PATH,
+            {"PowerStationId": power_station_id},
+        )
+        return self._snapshot_from_powerflow_data(data)
+
+    def get_current_export_power(self, power_station_id: str) -> Optional[float]:
+        powerflow = self._get_powerflow_payload(power_station_id)
+        if powerflow is None:
+            return None
+        return self._extract_signed_grid_power(powerflow)
+
+    def get_current_power_by_provider_type(
+        self,
+        power_station_id: str,
+        *,
+        power_source: ProviderPowerSource,
+    ) -> Optional[float]:
+        powerflow = self._get_powerflow_payload(power_station_id)
+        if powerflow is None:
+            return None
+
+        resolved_power_source = self._resolve_power_source(power_source)
+        if resolved_power_source == ProviderPowerSource.INVERTER:
+            return self._extract_pv_power(powerflow)
+
+        return self._extract_signed_grid_power(powerflow)
+
+    def get_current_power(self, device_id: str) -> Optional[float]:
+        return self.get_current_power_by_provider_type(
+            device_id,
+            power_source=self.provider_power_source,
+        )
+
+    def fetch_measurement(self) -> NormalizedMeasurement:
+        if not self._external_id:
+            self.get_powerstation_ids()
+
+        snapshot = self._get_powerflow_snapshot(self._external_id)
+        return self._build_measurement(snapshot)
+
+    # ------------------------------------------------------------------
+    # REQUIRED BY BASE
+    # ------------------------------------------------------------------
+
+    def list_stations(self) -> list[Mapping[str, Any]]:
+        return [
+            {"station_id": sid, "external_id": sid}
+            for sid in self.get_powerstation_ids()
+        ]
+
+    def list_devices(self, station_code: str) -> list[Mapping[str, Any]]:
+        return [{"device_id": station_code, "external_id": station_code}]
+
+
+class AsyncGoodWeProviderAdapter(GoodWePayloadMixin, AsyncBaseProviderAdapter):
+    """Measurement polling for GoodWe SEMS on `httpx.AsyncClient`."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        provider_has_energy_storage: bool = False,
+        login_base_url: str | None = None,
+    ) -> None:
+        login_base_url = (
+            login_base_url or goodwe_integration_settings.GOODWE_LOGIN_BASE_URL
+        ).rstrip("/")
+        super().__init__(
+            base_url=login_base_url,
+            timeout=goodwe_integration_settings.GOODWE_TIMEOUT,
+            max_retries=goodwe_integration_settings.GOODWE_MAX_RETRIES,
+        )
+
+        self.username = username
+        self.password = password
+        self.provider_id = provider_id
+        self.provider_external_id = provider_external_id
+        self.provider_power_source = provider_power_source
+        self.provider_has_power_meter = provider_has_power_meter
+        self.provider_has_energy_storage = provider_has_energy_storage
+        self.rate_limiter = vendor_rate_limiter.bucket(self.vendor, username)
+
+        self._login_base_url = login_base_url
+        self._api_base_url: str | None = None
+
+        self._logged_in = False
+        self._token_ctx: dict[str, Any] | None = None
+        self._auth_lock = asyncio.Lock()
+        self._auth_stats = GoodWeAuthStats()
+
+        self._external_id: str | None = provider_external_id
+        self._powerstation_ids: list[str] | None = None
+
+    async def _authenticate(self) -> None:
+        started = time.monotonic()
+        try:
+            response = await self._request(
+                "POST",
+                f"{self._login_base_url}{SEMS_LOGIN_PATH}",
+                json_data=self._login_body(),
+                headers=self._login_headers(),
+            )
+            self._apply_login_response(response)
+        except Exception:
+            self._record_login(started, ok=False)
+            raise
+        self._record_login(started, ok=True)
+
+    async def _ensure_login(self) -> dict[str, Any]:
+        token_ctx = self._token_ctx
+        if token_ctx is not None:
+            self._auth_stats.token_reuses += 1
+            return token_ctx
+
+        async with self._auth_lock:
+            if self._token_ctx is None:
+                await self._authenticate()
+            return self._token_ctx
+
+    async def _relogin(self, rejected_ctx: Mapping[str, Any]) -> dict[str, Any]:
+        async with self._auth_lock:
+            if self._token_ctx is rejected_ctx:
+                self._auth_stats.relogins += 1
+                self._invalidate_token()
+                await self._authenticate()
+            return self._token_ctx
+
+    async def _post(self, path: str, payload: Mapping[str, Any]) -> Any:
+        token_ctx = await self._ensure_login()
+        data = await self._send(path, payload, token_ctx)
+
+        if self._is_auth_failure(data):
+            logger.info(
+                "GoodWe token rejected, logging in again",
+                extra={**self._log_context(), "path": path, "code": data.get("code")},
+            )
+            token_ctx = await self._relogin(token_ctx)
+            data = await self._send(path, payload, token_ctx)
+
+        return self._unwrap_api_response(data, path)
+
+    async def _send(
+        self,
+        path: str,
+        payload: Mapping[str, Any],
+        token_ctx: Mapping[str, Any],
+    ) -> Mapping[str, Any]:
+        if not self._api_base_url:
+            raise ProviderError(message="GoodWe API base URL not set")
+
+        response = await self._request(
+            "POST",
+            path,
+            json_data=dict(payload),
+            headers=self._api_headers(token_ctx),
+        )
+
+        return response.json()
+
+    async def get_powerstation_ids(self) -> list[str]:
+        if self._powerstation_ids is not None:
+            return self._powerstation_ids
+
+        data = await self._post(POWERSTATION_IDS_PATH, {})
+        return self._remember_powerstation_ids(data)
+
+    async def fetch_measurement(self) -> NormalizedMeasurement:
+        if not self._external_id:
+            await self.get_powerstation_ids()
+
+        data = await self._post(
+            POWERFLOW_PATH,
+            {"PowerStationId": self._external_id},
+        )
+        return self._build_measurement(self._snapshot_from_powerflow_data(data))
@@ -1,14 +1,39 @@
 # smart_common/providers/adapters/huawei.py
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import Any, Mapping
+from functools import partial
+from typing import Any, Iterable, Mapping
 
 from smart_common.enums.unit import PowerUnit
 from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
 from smart_common.providers.adapters.base import BaseProviderAdapter
-from smart_common.providers.exceptions import ProviderError, ProviderFetchError
+from smart_common.providers.adapters.payload_mapping import (
+    CompiledPayloadMapping,
+    FieldSpec,
+    prune_none,
+    to_float,
+)
+from smart_common.providers.adapters.huawei_session import (
+    AccountSession,
+    DevRealKpiBatcher,
+    async_huawei_sessions,
+    huawei_sessions,
+    index_kpi_by_device,
+)
+from smart_common.providers.adapters.rate_limit import (
+    retry_after_seconds,
+    vendor_rate_limiter,
+)
+from smart_common.providers.exceptions import (
+    ProviderError,
+    ProviderFetchError,
+    ProviderThrottledError,
+)
 from smart_common.providers.enums import (
     ProviderKind,
     ProviderPowerSource,
@@ -19,12 +44,303 @@ from smart_common.providers.provider_config.config import provider_settings
 
 logger = logging.getLogger(__name__)
 
+TOKEN_TTL = timedelta(minutes=25)
+RELOGIN_FAIL_CODE = 20010
+THROTTLED_FAIL_CODE = 407
+PV_STRING_COUNT = 36
+MPPT_COUNT = 10
+
+
+def _pv_string(values: tuple[Any, Any]) -> dict[str, float] | None:
+    voltage, current = to_float(values[0]), to_float(values[1])
+    if voltage is None and current is None:
+        return None
+    if voltage == 0.0 and current == 0.0:
+        return None
+    return prune_none({"voltage": voltage, "current": current})
+
+
+# getDevRealKpi `dataItemMap` -> measurement metadata.
+HUAWEI_KPI_MAPPING = CompiledPayloadMapping(
+    [
+        FieldSpec("temperature", "temperature", to_float),
+        FieldSpec("efficiency", "efficiency", to_float),
+        FieldSpec("power_factor", "power_factor", to_float),
+        FieldSpec("frequency", "elec_freq", to_float),
+        FieldSpec("reactive_power", "reactive_power", to_float),
+        FieldSpec("energy.day", "day_cap", to_float),
+        FieldSpec("energy.total", "total_cap", to_float),
+        FieldSpec("energy.mppt_total", "mppt_total_cap", to_float),
+        *(
+            FieldSpec(
+                f"energy.mppt_capacities.mppt_{index}_cap",
+                f"mppt_{index}_cap",
+                to_float,
+            )
+            for index in range(1, MPPT_COUNT + 1)
+        ),
+        FieldSpec("mppt_power", "mppt_power", to_float),
+        FieldSpec("voltage.a", "a_u", to_float),
+        FieldSpec("voltage.b", "b_u", to_float),
+        FieldSpec("voltage.c", "c_u", to_float),
+        FieldSpec("line_voltage.ab", "ab_u", to_float),
+        FieldSpec("line_voltage.bc", "bc_u", to_float),
+        FieldSpec("line_voltage.ca", "ca_u", to_float),
+        FieldSpec("current.a", "a_i", to_float),
+        FieldSpec("current.b", "b_i", to_float),
+        FieldSpec("current.c", "c_i", to_float),
+        *(
+            FieldSpec(
+                f"pv_strings.pv{index}",
+                (f"pv{index}_u", f"pv{index}_i"),
+                _pv_string,
+            )
+            for index in range(1, PV_STRING_COUNT + 1)
+        ),
+        FieldSpec("status.run_state", "run_state", prune_none),
+        FieldSpec("status.inverter_state", "inverter_state", prune_none),
+        FieldSpec("raw_timestamp", "open_time", prune_none),
+    ]
+)
+
+
+class HuaweiPayloadMixin:
+    """Huawei request/response handling shared by the sync and async adapters."""
 
-class HuaweiProviderAdapter(BaseProviderAdapter):
     provider_type = ProviderType.API
     vendor = ProviderVendor.HUAWEI
     kind = ProviderKind.POWER
 
+    _account: AccountSession
+
+    # ------------------------------------------------------------------
+    # Account session state
+    # ------------------------------------------------------------------
+
+    @property
+    def _logged_in(self) -> bool:
+        return self._account.logged_in
+
+    @_logged_in.setter
+    def _logged_in(self, value: bool) -> None:
+        self._account.logged_in = value
+
+    @property
+    def _token_expires_at(self) -> datetime | None:
+        return self._account.token_expires_at
+
+    @_token_expires_at.setter
+    def _token_expires_at(self, value: datetime | None) -> None:
+        self._account.token_expires_at = value
+
+    def _is_expired(self) -> bool:
+        return (
+            self._token_expires_at is not None
+            and datetime.now(timezone.utc) >= self._token_expires_at
+        )
+
+    def _mark_logged_in(self) -> None:
+        self._logged_in = True
+        self._token_expires_at = datetime.now(timezone.utc) + TOKEN_TTL
+        self._account.logins += 1
+
+    @staticmethod
+    def _resolve_power_source(
+        power_source_hint: ProviderPowerSource | str | None,
+    ) -> ProviderPowerSource:
+        if isinstance(power_source_hint, ProviderPowerSource):
+            return power_source_hint
+
+        if isinstance(power_source_hint, str):
+            normalized = power_source_hint.strip().lower()
+            if normalized in {"meter", "power_meter", "grid_meter"}:
+                return ProviderPowerSource.METER
+            if normalized in {"inverter", "pv_inverter", "pv"}:
+                return ProviderPowerSource.INVERTER
+
+        # Huawei adapter currently uses inverter-level KPI payload.
+        return ProviderPowerSource.INVERTER
+
+    @staticmethod
+    def _resolve_production_payload(payload: Any) -> Mapping[str, Any] | None:
+        data = payload[0] if isinstance(payload, list) and payload else payload
+        if isinstance(data, Mapping):
+            return data
+        return None
+
+    _safe_float = staticmethod(to_float)
+
+    def _extract_power_value(self, payload: Mapping[str, Any]) -> float | None:
+        data_item_map = payload.get("dataItemMap")
+        if isinstance(data_item_map, Mapping):
+            active_power = self._safe_float(data_item_map.get("active_power"))
+            if active_power is not None:
+                return active_power
+
+        return self._safe_float(payload.get("active_power"))
+
+    @staticmethod
+    def _build_metadata(data_item_map: Mapping[str, Any]) -> dict[str, Any]:
+        metadata, _ = HUAWEI_KPI_MAPPING.extract(data_item_map)
+        return metadata
+
+    # ------------------------------------------------------------------
+    # Normalization
+    # ------------------------------------------------------------------
+
+    def _normalize_station(self, raw: Mapping[str, Any]) -> Mapping[str, Any]:
+        return {
+            "station_code": raw.get("stationCode"),
+            "name": raw.get("stationName"),
+            "capacity_kw": raw.get("capacity"),
+            "grid_connected_time": raw.get("gridConnectedTime"),
+            "raw": dict(raw),
+        }
+
+    def _normalize_device(self, raw: Mapping[str, Any]) -> Mapping[str, Any]:
+        return {
+            "device_id": raw.get("id"),
+            "name": raw.get("devName"),
+            "station_code": raw.get("stationCode"),
+            "device_type": raw.get("devTypeId"),
+            "model": raw.get("model"),
+            "inv_type": raw.get("invType"),
+            "latitude": raw.get("latitude"),
+            "longitude": raw.get("longitude"),
+            "optimizer_count": raw.get("optimizerNumber"),
+            "software_version": raw.get("softwareVersion"),
+            "raw": dict(raw),
+        }
+
+    # ------------------------------------------------------------------
+    # Request / response helpers
+    # ------------------------------------------------------------------
+
+    def _login_payload(self) -> dict[str, Any]:
+        return {
+            "userName": self.username,
+            "systemCode": self.password,
+        }
+
+    @staticmethod
+    def _check_login_response(response: Any) -> None:
+        if response.status_code >= 400:
+            raise ProviderError(
+                message="Huawei authentication failed",
+                status_code=response.status_code,
+                code="HUAWEI_AUTH_FAILED",
+                details={"body": response.text},
+            )
+
+        result = response.json()
+        if not result.get("success"):
+            raise ProviderError(
+                message="Huawei authentication rejected",
+                status_code=401,
+                code="HUAWEI_AUTH_REJECTED",
+                details={
+                    "message": result.get("message"),
+                    "failCode": result.get("failCode"),
+                },
+            )
+
+    @staticmethod
+    def _missing_xsrf_error() -> ProviderError:
+        return ProviderError(
+            message="Huawei login missing XSRF token",
+            status_code=502,
+            code="HUAWEI_XSRF_MISSING",
+        )
+
+    @staticmethod
+    def _must_relogin(result: Mapping[str, Any]) -> bool:
+        return (
+            result.get("message") == "USER_MUST_RELOGIN"
+            or result.get("failCode") == RELOGIN_FAIL_CODE
+        )
+
+    def _check_api_result(self, result: Mapping[str, Any]) -> None:
+        if result.get("failCode") == THROTTLED_FAIL_CODE:
+            retry_after = retry_after_seconds(None)
+            if self.rate_limiter is not None:
+                self.rate_limiter.penalize(retry_after)
+            raise ProviderThrottledError(
+                "Huawei API call frequency too high",
+                retry_after=retry_after,
+                details={
+                    "message": result.get("message"),
+                    "failCode": result.get("failCode"),
+                },
+            )
+
+        if not result.get("success", False):
+            raise ProviderError(
+                message="Huawei API error",
+                status_code=502,
+                code="HUAWEI_API_ERROR",
+                details={
+                    "message": result.get("message"),
+                    "failCode": result.get("failCode"),
+                },
+            )
+
+    def _require_device_id(self) -> str:
+        device_id = self.provider_external_id
+        if not device_id:
+            raise ProviderError(
+                message="Huawei adapter missing device identifier",
+                details={"vendor": self.vendor.value},
+            )
+        return device_id
+
+    def _build_measurement(self, device_id: str, payload: Any) -> NormalizedMeasurement:
+        data = self._resolve_production_payload(payload)
+        if data is None:
+            raise ProviderError(
+                message="Huawei getDevRealKpi returned unexpected payload",
+                details={"payload": payload},
+            )
+
+        data_item_map = data.get("dataItemMap")
+        data_map: Mapping[str, Any] = (
+            data_item_map if isinstance(data_item_map, Mapping) else {}
+        )
+
+        active_power = self._extract_power_value(data)
+        if active_power is None:
+            raise ProviderError(
+                message="Huawei getDevRealKpi missing power value",
+                details={"payload": payload},
+            )
+
+        resolved_power_source = self._resolve_power_source(
+            self.provider_power_source
+        )
+        metadata = self._build_metadata(data_map)
+        metadata.setdefault("device_id", device_id)
+        metadata.setdefault("power_source", resolved_power_source.value)
+        metadata.setdefault("measurement_source", "active_power")
+
+        logger.info(
+            "Huawei measurement ready",
+            extra=self._log_context(
+                device_id=device_id,
+                value=active_power,
+                power_source=resolved_power_source.value,
+                metadata_keys=sorted(metadata.keys()),
+            ),
+        )
+        return NormalizedMeasurement(
+            provider_id=self.provider_id,
+            value=active_power,
+            unit=PowerUnit.KILOWATT.value,
+            measured_at=datetime.now(timezone.utc),
+            metadata=metadata,
+            extra_metrics=[],
+        )
+
+
+class HuaweiProviderAdapter(HuaweiPayloadMixin, BaseProviderAdapter):
     def __init__(
         self,
         username: str,
@@ -49,31 +365,44 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
         self.provider_id = provider_id
         self.provider_external_id = provider_external_id
         self.provider_power_source = provider_power_source
-        self._logged_in = False
-        self._token_expires_at: datetime | None = None
+        self.rate_limiter = vendor_rate_limiter.bucket(self.vendor, username)
+
+        own_session = self.session
+        self._account = huawei_sessions.acquire(
+            (self.vendor, self.base_url, username),
+            lambda: AccountSession(
+                key=(self.vendor, self.base_url, username),
+                http=own_session,
+                lock=threading.Lock(),
+            ),
+        )
+        if self._account.http is not own_session:
+            own_session.close()
+        self.session = self._account.http
+        self._released = False
 
     # ------------------------------------------------------------------
     # Login handling
     # ------------------------------------------------------------------
 
-    def _is_expired(self) -> bool:
-        return (
-            self._token_expires_at is not None
-            and datetime.now(timezone.utc) >= self._token_expires_at
-        )
-
-    def _ensure_login(self) -> None:
+    def _ensure_login(self) -> int:
         if not self._logged_in or self._is_expired():
-            logger.info("Huawei login required", extra=self._log_context())
-            self._login()
+            with self._account.lock:
+                if not self._logged_in or self._is_expired():
+                    logger.info("Huawei login required", extra=self._log_context())
+                    self._login()
+        return self._account.logins
+
+    def _relogin(self, generation: int) -> None:
+        # Only the first adapter to see a rejected session logs in again.
+        with self._account.lock:
+            if self._account.logins == generation:
+                self._login()
 
     def _login(self) -> None:
         logger.info("Huawei login start", extra=self._log_context())
 
-        payload = {
-            "userName": self.username,
-            "systemCode": self.password,
-        }
+        payload = self._login_payload()
         logger.info(
             "Huawei login request",
             extra={
@@ -107,37 +436,14 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
             },
         )
 
-        if not response.ok:
-            raise ProviderError(
-                message="Huawei authentication failed",
-                status_code=response.status_code,
-                code="HUAWEI_AUTH_FAILED",
-                details={"body": response.text},
-            )
-
-        result = response.json()
-        if not result.get("success"):
-            raise ProviderError(
-                message="Huawei authentication rejected",
-                status_code=401,
-                code="HUAWEI_AUTH_REJECTED",
-                details={
-                    "message": result.get("message"),
-                    "failCode": result.get("failCode"),
-                },
-            )
+        self._check_login_response(response)
 
         xsrf = self.session.cookies.get("XSRF-TOKEN")
         if not xsrf:
-            raise ProviderError(
-                message="Huawei login missing XSRF token",
-                status_code=502,
-                code="HUAWEI_XSRF_MISSING",
-            )
+            raise self._missing_xsrf_error()
 
         self.session.headers["XSRF-TOKEN"] = xsrf
-        self._logged_in = True
-        self._token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=25)
+        self._mark_logged_in()
 
         logger.info("Huawei login OK", extra=self._log_context())
 
@@ -146,7 +452,7 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
     # ------------------------------------------------------------------
 
     def _post(self, endpoint: str, payload: dict | None = None) -> dict:
-        self._ensure_login()
+        generation = self._ensure_login()
         safe_payload = payload or {}
 
         logger.info(
@@ -177,7 +483,7 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
 
         if response.status_code == 401:
             logger.warning("Huawei 401 → re-login")
-            self._login()
+            self._relogin(generation)
             response = self._request("POST", endpoint, json_data=payload or {})
 
             logger.info(
@@ -193,12 +499,9 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
 
         result = response.json()
 
-        if (
-            result.get("message") == "USER_MUST_RELOGIN"
-            or result.get("failCode") == 20010
-        ):
+        if self._must_relogin(result):
             logger.warning("Huawei USER_MUST_RELOGIN → re-login")
-            self._login()
+            self._relogin(generation)
             response = self._request("POST", endpoint, json_data=payload or {})
             result = response.json()
 
@@ -212,41 +515,15 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
                 },
             )
 
-        if not result.get("success", False):
-            raise ProviderError(
-                message="Huawei API error",
-                status_code=502,
-                code="HUAWEI_API_ERROR",
-                details={
-                    "message": result.get("message"),
-                    "failCode": result.get("failCode"),
-                },
-            )
+        self._check_api_result(result)
 
-        self._token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=25)
+        self._token_expires_at = datetime.now(timezone.utc) + TOKEN_TTL
         return result
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _resolve_power_source(
-        power_source_hint: ProviderPowerSource | str | None,
-    ) -> ProviderPowerSource:
-        if isinstance(power_source_hint, ProviderPowerSource):
-            return power_source_hint
-
-        if isinstance(power_source_hint, str):
-            normalized = power_source_hint.strip().lower()
-            if normalized in {"meter", "power_meter", "grid_meter"}:
-                return ProviderPowerSource.METER
-            if normalized in {"inverter", "pv_inverter", "pv"}:
-                return ProviderPowerSource.INVERTER
-
-        # Huawei adapter currently uses inverter-level KPI payload.
-        return ProviderPowerSource.INVERTER
-
     def list_stations(self) -> list[Mapping[str, Any]]:
         logger.info("Huawei → list stations", extra=self._log_context())
 
@@ -328,197 +605,191 @@ class HuaweiProviderAdapter(BaseProviderAdapter):
         )
         return power_value
 
-    @staticmethod
-    def _resolve_production_payload(payload: Any) -> Mapping[str, Any] | None:
-        data = payload[0] if isinstance(payload, list) and payload else payload
-        if isinstance(data, Mapping):
-            return data
-        return None
-
-    def _safe_float(self, value: Any) -> float | None:
-        if value is None or isinstance(value, bool):
-            return None
-
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+    def get_production_many(
+        self,
+        device_ids: Iterable[str],
+    ) -> dict[str, list[Mapping[str, Any]]]:
+        """Fetch getDevRealKpi for several inverters of this account in batches."""
+        ids = list(dict.fromkeys(str(device_id) for device_id in device_ids))
+        batch_size = provider_settings.HUAWEI_KPI_BATCH_MAX_DEVICES
+        productions: dict[str, list[Mapping[str, Any]]] = {}
+
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start : start + batch_size]
+            result = self._post(
+                "getDevRealKpi",
+                {"devTypeId": "1", "devIds": ",".join(chunk)},
+            )
+            by_device = index_kpi_by_device(result.get("data", []))
+            for device_id in chunk:
+                item = by_device.get(device_id)
+                productions[device_id] = [item] if item is not None else []
 
-    def _extract_power_value(self, payload: Mapping[str, Any]) -> float | None:
-        data_item_map = payload.get("dataItemMap")
-        if isinstance(data_item_map, Mapping):
-            active_power = self._safe_float(data_item_map.get("active_power"))
-            if active_power is not None:
-                return active_power
+        return productions
 
-        return self._safe_float(payload.get("active_power"))
+    def fetch_measurement(self) -> NormalizedMeasurement:
+        logger.info("Huawei fetching measurement", extra=self._log_context())
+        device_id = self._require_device_id()
+        # Not coalesced like the async adapter: synchronous callers have no
+        # shared loop to batch on, and use get_production_many instead.
+        payload = self.get_production(device_id)
+        return self._build_measurement(device_id, payload)
 
-    @classmethod
-    def _prune_none(cls, value: Any) -> Any:
-        if isinstance(value, Mapping):
-            cleaned: dict[str, Any] = {}
-            for key, nested_value in value.items():
-                pruned_value = cls._prune_none(nested_value)
-                if pruned_value is not None:
-                    cleaned[key] = pruned_value
-            return cleaned or None
-
-        if isinstance(value, list):
-            cleaned_list = [cls._prune_none(item) for item in value]
-            compacted = [item for item in cleaned_list if item is not None]
-            return compacted or None
-
-        return value
-
-    def _extract_pv_strings(self, data_item_map: Mapping[str, Any]) -> dict[str, Any]:
-        pv_strings: dict[str, Any] = {}
-        for index in range(1, 37):
-            voltage = self._safe_float(data_item_map.get(f"pv{index}_u"))
-            current = self._safe_float(data_item_map.get(f"pv{index}_i"))
-
-            if voltage is None and current is None:
-                continue
-
-            if voltage == 0.0 and current == 0.0:
-                continue
-
-            pv_strings[f"pv{index}"] = {
-                "voltage": voltage,
-                "current": current,
-            }
-
-        return pv_strings
-
-    def _extract_mppt_capacities(self, data_item_map: Mapping[str, Any]) -> dict[str, Any]:
-        capacities: dict[str, Any] = {}
-        for index in range(1, 11):
-            key = f"mppt_{index}_cap"
-            value = self._safe_float(data_item_map.get(key))
-            if value is not None:
-                capacities[key] = value
-        return capacities
-
-    def _build_metadata(self, data_item_map: Mapping[str, Any]) -> dict[str, Any]:
-        extra_data: dict[str, Any] = {
-            "temperature": self._safe_float(data_item_map.get("temperature")),
-            "efficiency": self._safe_float(data_item_map.get("efficiency")),
-            "power_factor": self._safe_float(data_item_map.get("power_factor")),
-            "frequency": self._safe_float(data_item_map.get("elec_freq")),
-            "reactive_power": self._safe_float(data_item_map.get("reactive_power")),
-            "energy": {
-                "day": self._safe_float(data_item_map.get("day_cap")),
-                "total": self._safe_float(data_item_map.get("total_cap")),
-                "mppt_total": self._safe_float(data_item_map.get("mppt_total_cap")),
-                "mppt_capacities": self._extract_mppt_capacities(data_item_map),
-            },
-            "mppt_power": self._safe_float(data_item_map.get("mppt_power")),
-            "voltage": {
-                "a": self._safe_float(data_item_map.get("a_u")),
-                "b": self._safe_float(data_item_map.get("b_u")),
-                "c": self._safe_float(data_item_map.get("c_u")),
-            },
-            "line_voltage": {
-                "ab": self._safe_float(data_item_map.get("ab_u")),
-                "bc": self._safe_float(data_item_map.get("bc_u")),
-                "ca": self._safe_float(data_item_map.get("ca_u")),
-            },
-            "current": {
-                "a": self._safe_float(data_item_map.get("a_i")),
-                "b": self._safe_float(data_item_map.get("b_i")),
-                "c": self._safe_float(data_item_map.get("c_i")),
-            },
-            "pv_strings": self._extract_pv_strings(data_item_map),
-            "status": {
-                "run_state": data_item_map.get("run_state"),
-                "inverter_state": data_item_map.get("inverter_state"),
-            },
-            "raw_timestamp": data_item_map.get("open_time"),
-        }
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if huawei_sessions.release(self._account):
+            self._account.http.close()
 
-        cleaned = self._prune_none(extra_data)
-        if isinstance(cleaned, Mapping):
-            return dict(cleaned)
-        return {}
 
-    # ------------------------------------------------------------------
-    # Normalization
-    # ------------------------------------------------------------------
+class AsyncHuaweiProviderAdapter(HuaweiPayloadMixin, AsyncBaseProviderAdapter):
+    """Measurement polling for Huawei FusionSolar on `httpx.AsyncClient`."""
 
-    def _normalize_station(self, raw: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {
-            "station_code": raw.get("stationCode"),
-            "name": raw.get("stationName"),
-            "capacity_kw": raw.get("capacity"),
-            "grid_connected_time": raw.get("gridConnectedTime"),
-            "raw": dict(raw),
-        }
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        super().__init__(
+            base_url or provider_settings.HUAWEI_BASE_URL,
+            headers={"Content-Type": "application/json"},
+            timeout=timeout or provider_settings.HUAWEI_TIMEOUT,
+            max_retries=max_retries or provider_settings.HUAWEI_MAX_RETRIES,
+        )
 
-    def _normalize_device(self, raw: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {
-            "device_id": raw.get("id"),
-            "name": raw.get("devName"),
-            "station_code": raw.get("stationCode"),
-            "device_type": raw.get("devTypeId"),
-            "model": raw.get("model"),
-            "inv_type": raw.get("invType"),
-            "latitude": raw.get("latitude"),
-            "longitude": raw.get("longitude"),
-            "optimizer_count": raw.get("optimizerNumber"),
-            "software_version": raw.get("softwareVersion"),
-            "raw": dict(raw),
-        }
+        self.username = username
+        self.password = password
+        self.provider_id = provider_id
+        self.provider_external_id = provider_external_id
+        self.provider_power_source = provider_power_source
+        self.rate_limiter = vendor_rate_limiter.bucket(self.vendor, username)
+
+        own_client = self.client
+        self._account = async_huawei_sessions.acquire(
+            (self.vendor, self.base_url, username),
+            lambda: AccountSession(
+                key=(self.vendor, self.base_url, username),
+                http=own_client,
+                lock=asyncio.Lock(),
+                kpi_batcher=DevRealKpiBatcher(
+                    window_sec=provider_settings.HUAWEI_KPI_BATCH_WINDOW_SEC,
+                    max_devices=provider_settings.HUAWEI_KPI_BATCH_MAX_DEVICES,
+                ),
+            ),
+        )
+        # A client that lost the race was never used; there is nothing to close.
+        self.client = self._account.http
+        self._released = False
 
-    def fetch_measurement(self) -> NormalizedMeasurement:
-        logger.info("Huawei fetching measurement", extra=self._log_context())
-        device_id = self.provider_external_id
-        if not device_id:
-            raise ProviderError(
-                message="Huawei adapter missing device identifier",
-                details={"vendor": self.vendor.value},
-            )
+    async def _ensure_login(self) -> int:
+        if not self._logged_in or self._is_expired():
+            async with self._account.lock:
+                if not self._logged_in or self._is_expired():
+                    logger.info("Huawei login required", extra=self._log_context())
+                    await self._login()
+        return self._account.logins
+
+    async def _relogin(self, generation: int) -> None:
+        async with self._account.lock:
+            if self._account.logins == generation:
+                await self._login()
+
+    async def _login(self) -> None:
+        logger.info("Huawei login start", extra=self._log_context())
 
-        payload = self.get_production(device_id)
-        data = self._resolve_production_payload(payload)
-        if data is None:
-            raise ProviderError(
-                message="Huawei getDevRealKpi returned unexpected payload",
-                details={"payload": payload},
+        try:
+            response = await self._request(
+                "POST",
+                "login",
+                json_data=self._login_payload(),
             )
+        except ProviderFetchError:
+            raise
+        except Exception as exc:
+            logger.exception("Huawei login unexpected error")
+            raise ProviderFetchError(
+                "Huawei login failed",
+                details={"error": str(exc)},
+            ) from exc
 
-        data_item_map = data.get("dataItemMap")
-        data_map: Mapping[str, Any] = (
-            data_item_map if isinstance(data_item_map, Mapping) else {}
+        logger.info(
+            "Huawei login response",
+            extra={
+                **self._log_context(),
+                "status_code": response.status_code,
+                "ok": response.is_success,
+            },
         )
 
-        active_power = self._extract_power_value(data)
-        if active_power is None:
-            raise ProviderError(
-                message="Huawei getDevRealKpi missing power value",
-                details={"payload": payload},
-            )
+        self._check_login_response(response)
 
-        resolved_power_source = self._resolve_power_source(
-            self.provider_power_source
-        )
-        metadata = self._build_metadata(data_map)
-        metadata.setdefault("device_id", device_id)
-        metadata.setdefault("power_source", resolved_power_source.value)
-        metadata.setdefault("measurement_source", "active_power")
+        xsrf = self.client.cookies.get("XSRF-TOKEN")
+        if not xsrf:
+            raise self._missing_xsrf_error()
+
+        self.client.headers["XSRF-TOKEN"] = xsrf
+        self._mark_logged_in()
+
+        logger.info("Huawei login OK", extra=self._log_context())
+
+    async def _post(self, endpoint: str, payload: dict | None = None) -> dict:
+        generation = await self._ensure_login()
+        safe_payload = payload or {}
+
+        response = await self._request("POST", endpoint, json_data=safe_payload)
 
         logger.info(
-            "Huawei measurement ready",
-            extra=self._log_context(
-                device_id=device_id,
-                value=active_power,
-                power_source=resolved_power_source.value,
-                metadata_keys=sorted(metadata.keys()),
-            ),
+            "Huawei API response",
+            extra={
+                **self._log_context(),
+                "endpoint": endpoint,
+                "status_code": response.status_code,
+                "ok": response.is_success,
+            },
         )
-        return NormalizedMeasurement(
-            provider_id=self.provider_id,
-            value=active_power,
-            unit=PowerUnit.KILOWATT.value,
-            measured_at=datetime.now(timezone.utc),
-            metadata=metadata,
-            extra_metrics=[],
+
+        if response.status_code == 401:
+            logger.warning("Huawei 401 → re-login")
+            await self._relogin(generation)
+            response = await self._request("POST", endpoint, json_data=safe_payload)
+
+        result = response.json()
+
+        if self._must_relogin(result):
+            logger.warning("Huawei USER_MUST_RELOGIN → re-login")
+            await self._relogin(generation)
+            response = await self._request("POST", endpoint, json_data=safe_payload)
+            result = response.json()
+
+        self._check_api_result(result)
+
+        self._token_expires_at = datetime.now(timezone.utc) + TOKEN_TTL
+        return result
+
+    async def get_production(self, device_id: str) -> list[Mapping[str, Any]]:
+        # Concurrent polls of inverters on this account share one devIds call.
+        return await self._account.kpi_batcher.fetch(
+            device_id,
+            partial(self._post, "getDevRealKpi"),
         )
+
+    async def fetch_measurement(self) -> NormalizedMeasurement:
+        logger.info("Huawei fetching measurement", extra=self._log_context())
+        device_id = self._require_device_id()
+        payload = await self.get_production(device_id)
+        return self._build_measurement(device_id, payload)
+
+    async def aclose(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if async_huawei_sessions.release(self._account):
+            await self._account.http.aclose()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Mapping, Tuple
+
+from smart_common.providers.enums import ProviderVendor
+
+logger = logging.getLogger(__name__)
+
+# (vendor, base_url, username): one login per account on each API server.
+AccountKey = Tuple[ProviderVendor, str, str]
+
+
+@dataclass
+class AccountSession:
+    """
+    Login state shared by every adapter of one vendor account.
+
+    `http` is the account's `requests.Session` or `httpx.AsyncClient`; it
+    carries the cookies and XSRF header, so all adapters holding the
+    session reuse one login.
+    """
+
+    key: AccountKey
+    http: Any
+    lock: Any
+    logged_in: bool = False
+    token_expires_at: datetime | None = None
+    logins: int = 0
+    refs: int = 0
+    kpi_batcher: "DevRealKpiBatcher | None" = None
+
+
+class AccountSessionRegistry:
+    """Reference-counted `AccountSession`s keyed by (vendor, base_url, username)."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[AccountKey, AccountSession] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        key: AccountKey,
+        factory: Callable[[], AccountSession],
+    ) -> AccountSession:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = factory()
+                self._sessions[key] = session
+                logger.debug(
+                    "Account session created",
+                    extra={
+                        "vendor": key[0].value,
+                        "base_url": key[1],
+                        "account": key[2],
+                    },
+                )
+            session.refs += 1
+            return session
+
+    def release(self, session: AccountSession) -> bool:
+        """Drop one reference; returns True when the caller must close `http`."""
+        with self._lock:
+            session.refs -= 1
+            if session.refs > 0:
+                return False
+            if self._sessions.get(session.key) is session:
+                del self._sessions[session.key]
+            return True
+
+    def get(self, key: AccountKey) -> AccountSession | None:
+        return self._sessions.get(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+huawei_sessions = AccountSessionRegistry()
+async_huawei_sessions = AccountSessionRegistry()
+
+
+@dataclass
+class _BatchStats:
+    calls: int = 0
+    devices: int = 0
+
+
+class DevRealKpiBatcher:
+    """
+    Coalesces concurrent `getDevRealKpi` lookups of one account.
+
+    Device ids requested within `window_sec` of each other are sent as one
+    comma-separated `devIds` call (at most `max_devices` per call) and each
+    caller gets back only its own device's entry.
+    """
+
+    def __init__(self, *, window_sec: float, max_devices: int) -> None:
+        self.window_sec = window_sec
+        self.max_devices = max_devices
+        self.stats = _BatchStats()
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def fetch(
+        self,
+        device_id: str,
+        post: Callable[[dict[str, Any]], Awaitable[Mapping[str, Any]]],
+    ) -> list[Mapping[str, Any]]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.setdefault(str(device_id), []).append(future)
+
+        if len(self._pending) >= self.max_devices:
+            self._flush(post)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_sec, self._flush, post)
+
+        return await future
+
+    def _flush(
+        self,
+        post: Callable[[dict[str, Any]], Awaitable[Mapping[str, Any]]],
+    ) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        for start in range(0, len(items), self.max_devices):
+            task = asyncio.ensure_future(
+                self._run(dict(items[start : start + self.max_devices]), post)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        batch: dict[str, list[asyncio.Future]],
+        post: Callable[[dict[str, Any]], Awaitable[Mapping[str, Any]]],
+    ) -> None:
+        self.stats.calls += 1
+        self.stats.devices += len(batch)
+        try:
+            result = await post({"devTypeId": "1", "devIds": ",".join(batch)})
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        by_device = index_kpi_by_device(result.get("data", []))
+        for device_id, futures in batch.items():
+            item = by_device.get(device_id)
+            payload = [item] if item is not None else []
+            for future in futures:
+                if not future.done():
+                    future.set_result(payload)
+
+
+def index_kpi_by_device(data: Any) -> dict[str, Mapping[str, Any]]:
+    if not isinstance(data, list):
+        return {}
+    return {
+        str(item.get("devId")): item
+        for item in data
+        if isinstance(item, Mapping) and item.get("devId") is not None
+    }
+
+
+__all__ = [
+    "AccountKey",
+    "AccountSession",
+    "AccountSessionRegistry",
+    "DevRealKpiBatcher",
+    "async_huawei_sessions",
+    "huawei_sessions",
+    "index_kpi_by_device",
+]
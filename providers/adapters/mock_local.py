@@ -0,0 +1,359 @@
+"""
+Simulators for the local-network adapters.
+
+`MockFroniusDevice` serves the Fronius Solar API v1
+`GetPowerFlowRealtimeData` over HTTP/1.1 keep-alive; `MockSunSpecDevice`
+is a Modbus TCP slave exposing a SunSpec map (common model, an inverter
+model 101-103 and optionally a meter model 201-204). Both run on
+localhost, count accepted connections and requests, and take live values
+through `set()`, so polling, reconnects and persistent connections can be
+exercised without hardware.
+
+    with MockSunSpecDevice(inverter_power_w=4200) as device:
+        adapter = SunSpecProviderAdapter(device.host, port=device.port, ...)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from smart_common.providers.adapters.fronius import POWER_FLOW_PATH
+from smart_common.providers.adapters.modbus import READ_HOLDING_REGISTERS
+from smart_common.providers.adapters.sunspec import END_MODEL_ID, SUNSPEC_MARKER
+
+logger = logging.getLogger(__name__)
+
+_MBAP = struct.Struct(">HHHB")
+
+
+class _LocalDevice:
+    """Threaded server lifecycle and counters shared by the simulators."""
+
+    def __init__(self, server: socketserver.BaseServer, latency_sec: float) -> None:
+        self.latency_sec = latency_sec
+        self._server = server
+        self._thread: threading.Thread | None = None
+        self._stats: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        # Many adapters connect in the same poll cycle; the default listen
+        # backlog of 5 would drop SYNs and add a 1 s retransmit.
+        server.daemon_threads = True
+        server.request_queue_size = 128
+        server.server_bind()
+        server.server_activate()
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name=f"{type(self).__name__}-server",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _delay(self) -> None:
+        if self.latency_sec > 0:
+            time.sleep(self.latency_sec)
+
+
+# ----------------------------------------------------------------------
+# Fronius Solar API
+# ----------------------------------------------------------------------
+
+
+class MockFroniusDevice(_LocalDevice):
+    """Fronius Datamanager answering GetPowerFlowRealtimeData."""
+
+    def __init__(
+        self,
+        *,
+        pv_w: float | None = 3200.0,
+        grid_w: float | None = -1500.0,
+        load_w: float | None = -1700.0,
+        soc: float | None = None,
+        latency_sec: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.values: dict[str, float | None] = {
+            "pv_w": pv_w,
+            "grid_w": grid_w,
+            "load_w": load_w,
+            "soc": soc,
+        }
+        httpd = ThreadingHTTPServer(
+            (host, port), self._handler_class(), bind_and_activate=False
+        )
+        super().__init__(httpd, latency_sec)
+
+    def set(self, **values: float | None) -> None:
+        with self._lock:
+            self.values.update(values)
+
+    def power_flow(self) -> dict[str, Any]:
+        with self._lock:
+            values = dict(self.values)
+        inverter: dict[str, Any] = {"DT": 1, "P": values["pv_w"], "E_Day": 12000.0}
+        if values["soc"] is not None:
+            inverter["SOC"] = values["soc"]
+        return {
+            "Body": {
+                "Data": {
+                    "Site": {
+                        "Mode": "bidirectional" if values["soc"] is not None else "meter",
+                        "P_PV": values["pv_w"],
+                        "P_Grid": values["grid_w"],
+                        "P_Load": values["load_w"],
+                        "P_Akku": None,
+                        "E_Day": 12000.0,
+                        "E_Year": 3500000.0,
+                        "E_Total": 21000000.0,
+                        "rel_Autonomy": 100.0,
+                        "rel_SelfConsumption": 53.1,
+                    },
+                    "Inverters": {"1": inverter},
+                    "Version": "12",
+                }
+            },
+            "Head": {
+                "RequestArguments": {},
+                "Status": {"Code": 0, "Reason": "", "UserMessage": ""},
+                "Timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        device = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                device._count("connections")
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                device._count("requests")
+                device._delay()
+                if self.path.split("?")[0] == POWER_FLOW_PATH:
+                    status, payload = 200, device.power_flow()
+                else:
+                    status, payload = 404, {
+                        "Head": {"Status": {"Code": 11, "Reason": "Unknown path"}}
+                    }
+
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("Mock Fronius request: " + format, *args)
+
+        return Handler
+
+
+# ----------------------------------------------------------------------
+# SunSpec Modbus TCP
+# ----------------------------------------------------------------------
+
+
+def _int16(value: float) -> int:
+    return int(round(value)) & 0xFFFF
+
+
+def _acc32(value: float) -> list[int]:
+    raw = int(round(value)) & 0xFFFFFFFF
+    return [raw >> 16, raw & 0xFFFF]
+
+
+class MockSunSpecDevice(_LocalDevice):
+    """Modbus TCP slave with a SunSpec register map at `base_address`."""
+
+    def __init__(
+        self,
+        *,
+        unit_id: int = 1,
+        base_address: int = 40000,
+        inverter_model: int | None = 103,
+        meter_model: int | None = 203,
+        inverter_power_w: float = 4200.0,
+        meter_power_w: float = -1800.0,
+        energy_total_wh: float = 12_345_678.0,
+        latency_sec: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.unit_id = unit_id
+        self.base_address = base_address
+        self.inverter_model = inverter_model
+        self.meter_model = meter_model
+        self.values: dict[str, float] = {
+            "inverter_power_w": inverter_power_w,
+            "meter_power_w": meter_power_w,
+            "energy_total_wh": energy_total_wh,
+        }
+        self._connections: set[socket.socket] = set()
+
+        server = socketserver.ThreadingTCPServer(
+            (host, port), self._handler_class(), bind_and_activate=False
+        )
+        server.allow_reuse_address = True
+        super().__init__(server, latency_sec)
+
+    def set(self, **values: float) -> None:
+        with self._lock:
+            self.values.update(values)
+
+    def drop_connections(self) -> int:
+        """Close every open client connection, as a device reboot would."""
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return len(connections)
+
+    def registers(self) -> dict[int, int]:
+        with self._lock:
+            values = dict(self.values)
+
+        address = self.base_address
+        registers: list[int] = [*SUNSPEC_MARKER]
+        # Common model: manufacturer / model strings left blank.
+        registers += [1, 66] + [0] * 66
+
+        if self.inverter_model is not None:
+            block = [0] * 50
+            block[0], block[4] = 1826, _int16(-2)  # A, A_SF
+            block[8], block[11] = 2301, _int16(-1)  # PhVphA, V_SF
+            block[12], block[13] = _int16(values["inverter_power_w"]), 0  # W, W_SF
+            block[14], block[15] = 5000, _int16(-2)  # Hz, Hz_SF
+            block[16], block[17] = _int16(values["inverter_power_w"]), 0  # VA
+            block[18], block[19] = 0, 0  # VAr
+            block[20], block[21] = 1000, _int16(-1)  # PF
+            block[22:24] = _acc32(values["energy_total_wh"])
+            block[24] = 0  # WH_SF
+            block[25], block[26] = 1050, _int16(-2)  # DCA
+            block[27], block[28] = 4100, _int16(-1)  # DCV
+            block[29], block[30] = _int16(values["inverter_power_w"] * 1.03), 0  # DCW
+            block[31], block[35] = 415, _int16(-1)  # TmpCab, Tmp_SF
+            block[32:35] = [0x8000] * 3
+            block[36] = 4  # St: MPPT
+            registers += [self.inverter_model, 50] + block
+
+        if self.meter_model is not None:
+            block = [0] * 105
+            block[0], block[4] = 780, _int16(-2)  # A, A_SF
+            block[5], block[13] = 2298, _int16(-1)  # PhV, V_SF
+            block[14], block[15] = 4998, _int16(-2)  # Hz, Hz_SF
+            block[16], block[20] = _int16(values["meter_power_w"]), 0  # W, W_SF
+            block[36:38] = _acc32(5_400_000)  # TotWhExp
+            block[44:46] = _acc32(2_100_000)  # TotWhImp
+            block[52] = 0  # TotWh_SF
+            registers += [self.meter_model, 105] + block
+
+        registers += [END_MODEL_ID, 0]
+        return {address + offset: value for offset, value in enumerate(registers)}
+
+    def _respond(self, unit_id: int, pdu: bytes) -> bytes:
+        function = pdu[0]
+        if unit_id != self.unit_id:
+            return bytes([function | 0x80, 11])
+        if function != READ_HOLDING_REGISTERS or len(pdu) != 5:
+            return bytes([function | 0x80, 1])
+
+        address, quantity = struct.unpack(">HH", pdu[1:5])
+        registers = self.registers()
+        if not 1 <= quantity <= 125 or any(
+            address + offset not in registers for offset in range(quantity)
+        ):
+            return bytes([function | 0x80, 2])
+
+        values = [registers[address + offset] for offset in range(quantity)]
+        return bytes([function, quantity * 2]) + struct.pack(f">{quantity}H", *values)
+
+    def _handler_class(self) -> type[socketserver.BaseRequestHandler]:
+        device = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                device._count("connections")
+                with device._lock:
+                    device._connections.add(self.request)
+                try:
+                    while True:
+                        header = self._recv(_MBAP.size)
+                        if header is None:
+                            return
+                        transaction_id, _, length, unit_id = _MBAP.unpack(header)
+                        pdu = self._recv(length - 1)
+                        if pdu is None:
+                            return
+                        device._count("requests")
+                        device._delay()
+                        response = device._respond(unit_id, pdu)
+                        self.request.sendall(
+                            _MBAP.pack(transaction_id, 0, len(response) + 1, unit_id)
+                            + response
+                        )
+                except OSError:
+                    return
+                finally:
+                    with device._lock:
+                        device._connections.discard(self.request)
+
+            def _recv(self, size: int) -> bytes | None:
+                data = bytearray()
+                while len(data) < size:
+                    chunk = self.request.recv(size - len(data))
+                    if not chunk:
+                        return None
+                    data += chunk
+                return bytes(data)
+
+        return Handler
@@ -0,0 +1,427 @@
+"""
+Local stand-in for the Huawei FusionSolar and GoodWe SEMS cloud APIs.
+
+Serves the endpoints the adapters use (`login`, `getStationList`,
+`getDevList`, `getDevRealKpi`; `CrossLogin`, `GetPowerStationIdByOwner`,
+`GetPowerflow`) over real HTTP on localhost, so the sync (`requests`) and
+async (`httpx`) adapters run unmodified. Responses are replayed from
+recorded `FixtureSet`s, falling back to small synthetic payloads. Latency,
+5xx errors, vendor throttling, token expiry and forced re-logins are
+injected from a seeded RNG so runs are reproducible.
+
+    with MockVendorServer(faults=VendorFaultInjection(latency_sec=0.05)) as server:
+        adapter = HuaweiProviderAdapter(
+            "user", "secret", base_url=server.huawei_base_url, ...
+        )
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Any, Mapping
+from uuid import uuid4
+
+from smart_common.providers.adapters.recording import FixtureSet, endpoint_name
+
+logger = logging.getLogger(__name__)
+
+HUAWEI_PREFIX = "/thirdData"
+SEMS_API_PREFIX = "/api"
+
+HUAWEI_RELOGIN = {"success": False, "failCode": 305, "message": "USER_MUST_RELOGIN"}
+HUAWEI_THROTTLED = {
+    "success": False,
+    "failCode": 407,
+    "message": "ACCESS_FREQUENCY_IS_TOO_HIGH",
+}
+SEMS_TOKEN_EXPIRED = {
+    "code": 100002,
+    "msg": "The authorization has expired, please log in again.",
+    "data": None,
+}
+
+
+@dataclass
+class VendorFaultInjection:
+    """
+    Latency and failure knobs applied by `MockVendorServer`.
+
+    `latency_sec` (+ uniform `jitter_sec`) delays every response.
+    `error_rate` answers HTTP 503, `throttle_rate` answers the vendor's
+    throttle response (Huawei failCode 407, HTTP 429 for SEMS) and
+    `relogin_rate` rejects a valid token with USER_MUST_RELOGIN / SEMS
+    code 100002. Tokens expire after `token_ttl_sec` when set.
+    """
+
+    latency_sec: float = 0.0
+    jitter_sec: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    relogin_rate: float = 0.0
+    token_ttl_sec: float | None = None
+    retry_after_sec: float = 1.0
+    seed: int | None = 0
+
+
+class _Replay:
+    """Round-robin over the recorded responses of each endpoint."""
+
+    def __init__(self, fixtures: list[FixtureSet]) -> None:
+        self._responses: dict[str, list[Any]] = defaultdict(list)
+        for fixture in fixtures:
+            for exchange in fixture.exchanges:
+                if exchange.status_code < 400 and exchange.response is not None:
+                    self._responses[exchange.endpoint].append(exchange.response)
+        self._cursor: dict[str, count] = defaultdict(count)
+
+    def next(self, endpoint: str) -> Any | None:
+        responses = self._responses.get(endpoint)
+        if not responses:
+            return None
+        return copy.deepcopy(responses[next(self._cursor[endpoint]) % len(responses)])
+
+
+class MockVendorServer:
+    """Threaded HTTP server emulating the vendor clouds; see module docstring."""
+
+    def __init__(
+        self,
+        *,
+        fixtures: list[FixtureSet] | None = None,
+        faults: VendorFaultInjection | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.faults = faults or VendorFaultInjection()
+        self._replay = _Replay(fixtures or [])
+        self._rng = random.Random(self.faults.seed)
+        self._rng_lock = threading.Lock()
+        self._tokens: dict[str, float] = {}
+        self._tokens_lock = threading.Lock()
+        self._stats: dict[str, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def huawei_base_url(self) -> str:
+        return f"{self.url}{HUAWEI_PREFIX}"
+
+    @property
+    def goodwe_login_base_url(self) -> str:
+        return self.url
+
+    def start(self) -> "MockVendorServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                name="mock-vendor-server",
+                daemon=True,
+            )
+            self._thread.start()
+            logger.info("Mock vendor server started", extra={"url": self.url})
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockVendorServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def expire_tokens(self) -> None:
+        """Invalidate every issued token, as a vendor-side session reset would."""
+        with self._tokens_lock:
+            self._tokens.clear()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # One accepted connection = one TLS handshake against the real cloud.
+                server._count("connections")
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+                status, payload, headers = server._dispatch(self.path, self.headers, body)
+
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("Mock vendor request: " + format, *args)
+
+        return Handler
+
+    def _dispatch(
+        self,
+        path: str,
+        headers: Mapping[str, str],
+        body: Mapping[str, Any],
+    ) -> tuple[int, Any, dict[str, str]]:
+        endpoint = endpoint_name(path)
+        self._count(f"requests.{endpoint}")
+        self._delay()
+
+        if self._roll(self.faults.error_rate):
+            self._count("faults.error")
+            return 503, {"message": "Service Unavailable"}, {}
+
+        if path.startswith(HUAWEI_PREFIX):
+            return self._huawei(endpoint, headers, body)
+        if path.startswith(SEMS_API_PREFIX):
+            return self._goodwe(endpoint, headers, body)
+        return 404, {"message": f"Unknown path {path}"}, {}
+
+    # ------------------------------------------------------------------
+    # Huawei FusionSolar
+    # ------------------------------------------------------------------
+
+    def _huawei(
+        self,
+        endpoint: str,
+        headers: Mapping[str, str],
+        body: Mapping[str, Any],
+    ) -> tuple[int, Any, dict[str, str]]:
+        if endpoint == "login":
+            token = self._issue_token()
+            return (
+                200,
+                {"success": True, "failCode": 0, "data": None},
+                {"Set-Cookie": f"XSRF-TOKEN={token}; Path=/"},
+            )
+
+        if not self._token_valid(headers.get("XSRF-TOKEN") or _cookie(headers, "XSRF-TOKEN")):
+            return 200, dict(HUAWEI_RELOGIN), {}
+        if self._roll(self.faults.throttle_rate):
+            self._count("faults.throttle")
+            return 200, dict(HUAWEI_THROTTLED), {}
+
+        recorded = self._replay.next(endpoint)
+        if endpoint == "getDevRealKpi":
+            device_ids = str(body.get("devIds", "")).split(",")
+            return 200, _huawei_kpi(recorded, device_ids), {}
+        if recorded is not None:
+            return 200, recorded, {}
+        if endpoint == "getStationList":
+            return 200, _huawei_ok(
+                [{"stationCode": "NE=mock-1", "stationName": "Mock plant", "capacity": 9.9}]
+            ), {}
+        if endpoint == "getDevList":
+            return 200, _huawei_ok(
+                [
+                    {
+                        "id": 1000000001,
+                        "devName": "Mock inverter",
+                        "devTypeId": 1,
+                        "esnCode": "MOCK0001",
+                        "stationCode": body.get("stationCodes"),
+                    }
+                ]
+            ), {}
+        return 200, {"success": False, "failCode": 404, "message": "Unknown endpoint"}, {}
+
+    # ------------------------------------------------------------------
+    # GoodWe SEMS
+    # ------------------------------------------------------------------
+
+    def _goodwe(
+        self,
+        endpoint: str,
+        headers: Mapping[str, str],
+        body: Mapping[str, Any],
+    ) -> tuple[int, Any, dict[str, str]]:
+        if endpoint == "CrossLogin":
+            token = self._issue_token()
+            return 200, {
+                "code": 0,
+                "msg": "",
+                "api": f"{self.url}{SEMS_API_PREFIX}/",
+                "data": {
+                    "uid": "mock-uid",
+                    "timestamp": int(time.time() * 1000),
+                    "token": token,
+                    "language": "en",
+                },
+            }, {}
+
+        try:
+            token_ctx = json.loads(headers.get("Token") or "{}")
+        except ValueError:
+            token_ctx = {}
+        if not self._token_valid(token_ctx.get("token")):
+            return 200, dict(SEMS_TOKEN_EXPIRED), {}
+        if self._roll(self.faults.throttle_rate):
+            self._count("faults.throttle")
+            return 429, {"code": 429, "msg": "Too Many Requests"}, {
+                "Retry-After": str(self.faults.retry_after_sec)
+            }
+
+        recorded = self._replay.next(endpoint)
+        if recorded is not None:
+            return 200, recorded, {}
+        if endpoint == "GetPowerStationIdByOwner":
+            return 200, {"code": 0, "msg": "", "data": "mock-station-1"}, {}
+        if endpoint == "GetPowerflow":
+            return 200, {"code": 0, "msg": "", "data": _goodwe_powerflow()}, {}
+        return 200, {"code": 404, "msg": "Unknown endpoint", "data": None}, {}
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _issue_token(self) -> str:
+        token = uuid4().hex
+        with self._tokens_lock:
+            self._tokens[token] = time.monotonic()
+        self._count("logins")
+        return token
+
+    def _token_valid(self, token: str | None) -> bool:
+        with self._tokens_lock:
+            issued_at = self._tokens.get(token or "")
+            if issued_at is None:
+                self._count("auth.rejected")
+                return False
+            ttl = self.faults.token_ttl_sec
+            if ttl is not None and time.monotonic() - issued_at > ttl:
+                self._tokens.pop(token, None)
+                self._count("auth.expired")
+                return False
+        if self._roll(self.faults.relogin_rate):
+            self._count("faults.relogin")
+            return False
+        return True
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < rate
+
+    def _delay(self) -> None:
+        delay = self.faults.latency_sec
+        if self.faults.jitter_sec:
+            with self._rng_lock:
+                delay += self._rng.uniform(0, self.faults.jitter_sec)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+
+def _cookie(headers: Mapping[str, str], name: str) -> str | None:
+    cookie = SimpleCookie(headers.get("Cookie") or "")
+    morsel = cookie.get(name)
+    return morsel.value if morsel is not None else None
+
+
+def _huawei_ok(data: Any) -> dict[str, Any]:
+    return {"success": True, "failCode": 0, "message": None, "data": data}
+
+
+def _huawei_kpi(recorded: Any, device_ids: list[str]) -> dict[str, Any]:
+    """Answer getDevRealKpi for the requested devices, reusing a recorded item as template."""
+    template: Mapping[str, Any] | None = None
+    if isinstance(recorded, Mapping) and isinstance(recorded.get("data"), list):
+        template = next(
+            (item for item in recorded["data"] if isinstance(item, Mapping)),
+            None,
+        )
+    if template is None:
+        template = {
+            "dataItemMap": {
+                "active_power": 3.2,
+                "reactive_power": 0.01,
+                "efficiency": 98.4,
+                "temperature": 41.2,
+                "elec_freq": 50.0,
+                "day_cap": 12.3,
+                "total_cap": 4567.8,
+                "run_state": 1,
+                "inverter_state": 512,
+            }
+        }
+
+    data = []
+    for device_id in device_ids:
+        if not device_id:
+            continue
+        item = copy.deepcopy(dict(template))
+        item["devId"] = int(device_id) if device_id.isdigit() else device_id
+        data.append(item)
+    return _huawei_ok(data)
+
+
+def _goodwe_powerflow() -> dict[str, Any]:
+    return {
+        "hasPowerflow": True,
+        "hasGridLoad": True,
+        "isStored": False,
+        "powerflow": {
+            "pv": "3200",
+            "pvStatus": -1,
+            "bettery": "0",
+            "betteryStatus": 0,
+            "load": "1800",
+            "loadStatus": 1,
+            "grid": "1400",
+            "gridStatus": -1,
+            "soc": 0,
+            "socText": "0%",
+        },
+    }
+
+
+__all__ = ["MockVendorServer", "VendorFaultInjection"]
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import struct
+import threading
+from itertools import count
+
+from smart_common.providers.exceptions import ProviderError, ProviderFetchError
+
+logger = logging.getLogger(__name__)
+
+READ_HOLDING_REGISTERS = 0x03
+# Modbus limits a single read to 125 registers.
+MAX_READ_REGISTERS = 125
+# MBAP length counts the unit id and the PDU: at least unit, function and
+# exception code; at most a full 125-register read response.
+MIN_RESPONSE_LENGTH = 3
+MAX_RESPONSE_LENGTH = 3 + MAX_READ_REGISTERS * 2
+
+_MBAP = struct.Struct(">HHHB")
+_READ_REQUEST = struct.Struct(">BHH")
+
+MODBUS_EXCEPTIONS = {
+    1: "ILLEGAL_FUNCTION",
+    2: "ILLEGAL_DATA_ADDRESS",
+    3: "ILLEGAL_DATA_VALUE",
+    4: "SLAVE_DEVICE_FAILURE",
+    6: "SLAVE_DEVICE_BUSY",
+    10: "GATEWAY_PATH_UNAVAILABLE",
+    11: "GATEWAY_TARGET_FAILED_TO_RESPOND",
+}
+
+
+class ModbusExceptionResponse(ProviderError):
+    """The device answered with a Modbus exception (e.g. illegal address)."""
+
+    def __init__(self, exception_code: int, *, address: int, count: int) -> None:
+        self.exception_code = exception_code
+        super().__init__(
+            message="Modbus device rejected the request",
+            status_code=502,
+            code="MODBUS_EXCEPTION",
+            details={
+                "exception": MODBUS_EXCEPTIONS.get(exception_code, exception_code),
+                "address": address,
+                "count": count,
+            },
+        )
+
+
+def encode_read_request(
+    transaction_id: int,
+    unit_id: int,
+    address: int,
+    quantity: int,
+) -> bytes:
+    pdu = _READ_REQUEST.pack(READ_HOLDING_REGISTERS, address, quantity)
+    return _MBAP.pack(transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+
+
+def response_body_length(header: bytes) -> int:
+    """Bytes left to read after the MBAP header, validated."""
+    length = _MBAP.unpack(header)[2]
+    if not MIN_RESPONSE_LENGTH <= length <= MAX_RESPONSE_LENGTH:
+        raise ProviderFetchError(
+            "Malformed Modbus response",
+            details={"length": length},
+        )
+    return length - 1
+
+
+def decode_read_response(
+    header: bytes,
+    body: bytes,
+    *,
+    transaction_id: int,
+    address: int,
+    quantity: int,
+) -> list[int]:
+    received_id, protocol, _, _ = _MBAP.unpack(header)
+    if received_id != transaction_id or protocol != 0:
+        raise ProviderFetchError(
+            "Modbus response does not match the request",
+            details={"transaction_id": transaction_id, "received": received_id},
+        )
+
+    if len(body) < 2:
+        raise ProviderFetchError(
+            "Malformed Modbus response",
+            details={"length": len(body) + 1, "address": address, "count": quantity},
+        )
+
+    function = body[0]
+    if function == READ_HOLDING_REGISTERS | 0x80:
+        raise ModbusExceptionResponse(body[1], address=address, count=quantity)
+    if (
+        function != READ_HOLDING_REGISTERS
+        or body[1] != quantity * 2
+        or len(body) != 2 + quantity * 2
+    ):
+        raise ProviderFetchError(
+            "Malformed Modbus response",
+            details={"function": function, "address": address, "count": quantity},
+        )
+    return list(struct.unpack(f">{quantity}H", body[2 : 2 + quantity * 2]))
+
+
+def _chunks(address: int, quantity: int) -> list[tuple[int, int]]:
+    return [
+        (start, min(MAX_READ_REGISTERS, address + quantity - start))
+        for start in range(address, address + quantity, MAX_READ_REGISTERS)
+    ]
+
+
+class ModbusTcpClient:
+    """
+    Modbus TCP master for holding-register reads over one persistent socket.
+
+    The connection is opened on first use and kept for the following
+    polls; any transport error or undecodable response drops it so the
+    next read reconnects on a clean stream. Transactions are serialised,
+    as most devices handle one at a time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        *,
+        unit_id: int = 1,
+        timeout: float = 2.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.connects = 0
+        self._socket: socket.socket | None = None
+        self._transaction_ids = count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    def read_holding_registers(self, address: int, quantity: int) -> list[int]:
+        registers: list[int] = []
+        with self._lock:
+            for start, size in _chunks(address, quantity):
+                registers.extend(self._read(start, size))
+        return registers
+
+    def _read(self, address: int, quantity: int) -> list[int]:
+        transaction_id = next(self._transaction_ids) & 0xFFFF
+        request = encode_read_request(transaction_id, self.unit_id, address, quantity)
+        try:
+            sock = self._connect()
+            sock.sendall(request)
+            header = self._recv_exact(sock, _MBAP.size)
+            body = self._recv_exact(sock, response_body_length(header))
+            return decode_read_response(
+                header,
+                body,
+                transaction_id=transaction_id,
+                address=address,
+                quantity=quantity,
+            )
+        except ProviderFetchError:
+            # The stream is out of sync with our transactions.
+            self.close()
+            raise
+        except OSError as exc:
+            self.close()
+            raise ProviderFetchError(
+                "Modbus TCP request failed",
+                details={"host": self.host, "port": self.port, "error": str(exc)},
+            ) from exc
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self._socket = sock
+            self.connects += 1
+            logger.debug(
+                "Modbus TCP connected",
+                extra={"host": self.host, "port": self.port, "unit_id": self.unit_id},
+            )
+        return self._socket
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Modbus connection closed by device")
+            data += chunk
+        return bytes(data)
+
+    def close(self) -> None:
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+class AsyncModbusTcpClient:
+    """asyncio counterpart of `ModbusTcpClient` on a persistent stream."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        *,
+        unit_id: int = 1,
+        timeout: float = 2.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.connects = 0
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._transaction_ids = count(1)
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def read_holding_registers(self, address: int, quantity: int) -> list[int]:
+        registers: list[int] = []
+        async with self._lock:
+            for start, size in _chunks(address, quantity):
+                registers.extend(await self._read(start, size))
+        return registers
+
+    async def _read(self, address: int, quantity: int) -> list[int]:
+        transaction_id = next(self._transaction_ids) & 0xFFFF
+        request = encode_read_request(transaction_id, self.unit_id, address, quantity)
+        try:
+            reader, writer = await self._connect()
+            writer.write(request)
+            await writer.drain()
+            header = await asyncio.wait_for(
+                reader.readexactly(_MBAP.size), timeout=self.timeout
+            )
+            body = await asyncio.wait_for(
+                reader.readexactly(response_body_length(header)),
+                timeout=self.timeout,
+            )
+            return decode_read_response(
+                header,
+                body,
+                transaction_id=transaction_id,
+                address=address,
+                quantity=quantity,
+            )
+        except ProviderFetchError:
+            # The stream is out of sync with our transactions.
+            await self.aclose()
+            raise
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+            await self.aclose()
+            raise ProviderFetchError(
+                "Modbus TCP request failed",
+                details={"host": self.host, "port": self.port, "error": repr(exc)},
+            ) from exc
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._reader is None or self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=self.timeout,
+            )
+            sock = self._writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self.connects += 1
+        return self._reader, self._writer
+
+    async def aclose(self) -> None:
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Container, Iterable
+
+from smart_common.enums.provider_telemetry import (
+    ProviderTelemetryCapability,
+    TelemetryAggregationMode,
+    TelemetryChartType,
+)
+from smart_common.schemas.normalized_measurement import NormalizedMetric
+
+BATTERY_SOC_METRIC_KEY = "battery_soc"
+GRID_POWER_METRIC_KEY = "grid_power"
+
+Converter = Callable[[Any], Any]
+# (container path, key): "powerflow.pv" -> (("powerflow",), "pv")
+SourceKey = tuple[tuple[str, ...], str]
+
+
+# ----------------------------------------------------------------------
+# Converters
+# ----------------------------------------------------------------------
+
+
+def to_float(value: Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_watt(value: Any) -> float | None:
+    """Like `to_float`, but also accepts SEMS strings such as "1200W"."""
+    if isinstance(value, str):
+        cleaned = value.strip()
+        if cleaned.endswith("W"):
+            cleaned = cleaned[:-1].strip()
+        if not cleaned:
+            return None
+        try:
+            return float(cleaned)
+        except ValueError:
+            return None
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def prune_none(value: Any) -> Any:
+    """Drop None values and empty containers recursively; None if nothing is left."""
+    if isinstance(value, Mapping):
+        cleaned: dict[str, Any] = {}
+        for key, nested_value in value.items():
+            pruned_value = prune_none(nested_value)
+            if pruned_value is not None:
+                cleaned[str(key)] = pruned_value
+        return cleaned or None
+
+    if isinstance(value, list):
+        compacted = [item for item in map(prune_none, value) if item is not None]
+        return compacted or None
+
+    return value
+
+
+# ----------------------------------------------------------------------
+# Spec
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One metadata value: `source` read from the payload, passed through
+    `convert` and stored at the dotted `target` path.
+
+    `source` is a dotted key path ("powerflow.pv"), or a tuple of paths
+    whose values reach `convert` as one tuple. A None result is skipped,
+    so parent dicts only exist when one of their fields has a value.
+    """
+
+    target: str
+    source: str | tuple[str, ...]
+    convert: Converter | None = None
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """One `NormalizedMetric`, emitted when the provider has `capability_tag`."""
+
+    key: str
+    source: str | tuple[str, ...]
+    convert: Converter | None
+    unit: str | None
+    label: str
+    chart_type: TelemetryChartType
+    aggregation_mode: TelemetryAggregationMode
+    capability_tag: ProviderTelemetryCapability | None = None
+
+    def build(self, value: float) -> NormalizedMetric:
+        return NormalizedMetric(
+            key=self.key,
+            value=value,
+            unit=self.unit,
+            label=self.label,
+            chart_type=self.chart_type,
+            aggregation_mode=self.aggregation_mode,
+            capability_tag=self.capability_tag,
+        )
+
+
+def _source_key(path: str) -> SourceKey:
+    *container, key = path.split(".")
+    return tuple(container), key
+
+
+@dataclass(frozen=True)
+class _Step:
+    source: SourceKey | tuple[SourceKey, ...]
+    multi: bool
+    convert: Converter | None
+    parents: tuple[str, ...]
+    leaf: str
+    metric: MetricSpec | None
+
+
+class CompiledPayloadMapping:
+    """
+    Flat extraction plan built once from `FieldSpec`s and `MetricSpec`s.
+
+    Source keys, converters and split target paths are precomputed, so
+    `extract()` is one loop over the plan that writes pruned metadata and
+    collects metrics without building and re-walking intermediate dicts.
+    """
+
+    def __init__(self, specs: Iterable[FieldSpec | MetricSpec]) -> None:
+        steps = []
+        for spec in specs:
+            multi = not isinstance(spec.source, str)
+            source = (
+                tuple(_source_key(path) for path in spec.source)
+                if multi
+                else _source_key(spec.source)
+            )
+            if isinstance(spec, MetricSpec):
+                parents, leaf, metric = (), "", spec
+            else:
+                *parents, leaf = spec.target.split(".")
+                metric = None
+            steps.append(_Step(source, multi, spec.convert, tuple(parents), leaf, metric))
+        self._steps = tuple(steps)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def extract(
+        self,
+        payload: Mapping[str, Any],
+        *,
+        capabilities: Container[ProviderTelemetryCapability] = (),
+    ) -> tuple[dict[str, Any], list[NormalizedMetric]]:
+        metadata: dict[str, Any] = {}
+        metrics: list[NormalizedMetric] = []
+        containers: dict[tuple[str, ...], Mapping[str, Any] | None] = {(): payload}
+        nodes: dict[tuple[str, ...], dict[str, Any]] = {(): metadata}
+
+        def read(source: SourceKey) -> Any:
+            path, key = source
+            try:
+                container = containers[path]
+            except KeyError:
+                container = containers[path] = _resolve(payload, path)
+            return container.get(key) if container is not None else None
+
+        for step in self._steps:
+            metric = step.metric
+            if metric is not None and metric.capability_tag not in capabilities:
+                continue
+
+            if step.multi:
+                value = tuple(map(read, step.source))
+            else:
+                value = read(step.source)
+            if step.convert is not None:
+                value = step.convert(value)
+            if value is None:
+                continue
+
+            if metric is not None:
+                metrics.append(metric.build(value))
+                continue
+
+            node = nodes.get(step.parents)
+            if node is None:
+                node = metadata
+                for part in step.parents:
+                    node = node.setdefault(part, {})
+                nodes[step.parents] = node
+            node[step.leaf] = value
+
+        return metadata, metrics
+
+
+def _resolve(
+    payload: Mapping[str, Any],
+    path: tuple[str, ...],
+) -> Mapping[str, Any] | None:
+    value: Any = payload
+    for key in path:
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, Mapping) else None
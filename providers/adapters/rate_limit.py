@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Mapping, Tuple
+
+from smart_common.providers.enums import ProviderVendor
+from smart_common.providers.provider_config.config import provider_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket for one vendor account.
+
+    Refills at `rate_per_sec` up to `burst` tokens. `penalize()` empties the
+    bucket and blocks it until the vendor's throttle window has passed.
+    """
+
+    def __init__(self, *, rate_per_sec: float, burst: int) -> None:
+        if rate_per_sec <= 0 or burst < 1:
+            raise ValueError("Token bucket needs a positive rate and burst")
+
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited_sec = 0.0
+
+    def _reserve(self) -> float:
+        """Take one token; returns how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            # No tokens accrue while the vendor blocks us.
+            refilled_from = max(self._updated_at, self._blocked_until)
+            self._tokens = min(
+                self.burst,
+                self._tokens + max(0.0, now - refilled_from) * self.rate_per_sec,
+            )
+            self._updated_at = now
+
+            start = max(now, self._blocked_until)
+            self._tokens -= 1
+            deficit = max(0.0, -self._tokens) / self.rate_per_sec
+            # Queued callers are spaced out after the block, not released at once.
+            wait = (start - now) + deficit
+            self.waited_sec += wait
+            return wait
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: float) -> None:
+        with self._lock:
+            self._tokens = 0.0
+            self._updated_at = time.monotonic()
+            self._blocked_until = max(
+                self._blocked_until, self._updated_at + retry_after
+            )
+            self.throttled += 1
+
+    def blocked_for(self) -> float:
+        return max(0.0, self._blocked_until - time.monotonic())
+
+
+class VendorRateLimiter:
+    """`TokenBucket`s per (vendor, account) sized from provider settings."""
+
+    def __init__(self, quotas: Mapping[ProviderVendor, Tuple[float, int]]) -> None:
+        self._quotas = dict(quotas)
+        self._buckets: dict[Tuple[ProviderVendor, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, vendor: ProviderVendor, account: str) -> TokenBucket | None:
+        quota = self._quotas.get(vendor)
+        if quota is None:
+            return None
+
+        key = (vendor, account)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                calls_per_minute, burst = quota
+                bucket = TokenBucket(
+                    rate_per_sec=calls_per_minute / 60.0,
+                    burst=burst,
+                )
+                self._buckets[key] = bucket
+            return bucket
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "vendor": vendor.value,
+                    "account": account,
+                    "throttled": bucket.throttled,
+                    "waited_sec": round(bucket.waited_sec, 3),
+                    "blocked_for_sec": round(bucket.blocked_for(), 3),
+                }
+                for (vendor, account), bucket in self._buckets.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+def retry_after_seconds(headers: Mapping[str, str] | None) -> float:
+    raw = (headers or {}).get("Retry-After")
+    try:
+        value = float(raw) if raw is not None else None
+    except ValueError:
+        value = None
+    return value if value and value > 0 else provider_settings.PROVIDER_THROTTLE_BACKOFF_SEC
+
+
+vendor_rate_limiter = VendorRateLimiter(
+    {
+        ProviderVendor.HUAWEI: (
+            provider_settings.HUAWEI_CALLS_PER_MINUTE,
+            provider_settings.HUAWEI_CALL_BURST,
+        ),
+        ProviderVendor.GOODWE: (
+            provider_settings.GOODWE_CALLS_PER_MINUTE,
+            provider_settings.GOODWE_CALL_BURST,
+        ),
+    }
+)
@@ -0,0 +1,306 @@
+"""
+Capture of vendor API traffic into sanitized, replayable fixtures.
+
+`VendorRecorder.attach(adapter)` hooks the adapter's `requests.Session` or
+`httpx.AsyncClient` and keeps every exchange with credentials, tokens and
+personal data removed. Station and device identifiers are replaced with
+stable pseudonyms, so request and response still refer to the same
+objects. `FixtureSet` is the on-disk format read back by
+`MockVendorServer`.
+
+    recorder = VendorRecorder(ProviderVendor.HUAWEI)
+    recorder.attach(adapter)
+    adapter.fetch_measurement()
+    recorder.fixtures().save("fixtures/huawei.json")
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import urlsplit
+
+from smart_common.providers.enums import ProviderVendor
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "<redacted>"
+
+# Credentials, session tokens and personal data: dropped entirely.
+SECRET_KEYS = frozenset(
+    {
+        "userName",
+        "systemCode",
+        "account",
+        "pwd",
+        "password",
+        "token",
+        "uid",
+        "email",
+        "phone",
+        "ownerName",
+        "ownerPhone",
+        "ownerEmail",
+        "linkmanPho",
+        "stationLinkman",
+        "stationAddr",
+        "plantAddress",
+        "address",
+        "latitude",
+        "longitude",
+    }
+)
+
+# Object identifiers: replaced with stable pseudonyms so fixtures stay consistent.
+IDENTIFIER_KEYS = frozenset(
+    {
+        "stationCode",
+        "stationCodes",
+        "stationName",
+        "devId",
+        "devIds",
+        "devDn",
+        "devName",
+        "esnCode",
+        "id",
+        "sn",
+        "PowerStationId",
+        "powerStationId",
+        "powerstation_id",
+        "stationname",
+    }
+)
+
+# Endpoints whose `data` is a bare identifier rather than an object.
+IDENTIFIER_PAYLOAD_ENDPOINTS = frozenset({"GetPowerStationIdByOwner"})
+
+
+class PayloadSanitizer:
+    """
+    Removes secrets from vendor payloads and pseudonymizes identifiers.
+
+    Pseudonyms are a keyed hash of the original value, so one recording
+    session maps the same device to the same fake id everywhere. Numeric
+    ids stay numeric and comma-separated id lists keep their shape.
+    """
+
+    def __init__(self, *, salt: str = "smart-common-fixtures") -> None:
+        self._salt = salt.encode("utf-8")
+
+    def sanitize(self, value: Any) -> Any:
+        if isinstance(value, Mapping):
+            return {str(key): self._sanitize_item(str(key), item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.sanitize(item) for item in value]
+        return value
+
+    def _sanitize_item(self, key: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if key in SECRET_KEYS:
+            return REDACTED
+        if key in IDENTIFIER_KEYS:
+            return self.pseudonym(value)
+        return self.sanitize(value)
+
+    def pseudonym(self, value: Any) -> Any:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int):
+            return int(self._digest(str(value))[:12], 16)
+        if isinstance(value, str):
+            return ",".join(
+                f"mock-{self._digest(part.strip())[:10]}" if part.strip() else part
+                for part in value.split(",")
+            )
+        if isinstance(value, list):
+            return [self.pseudonym(item) for item in value]
+        return REDACTED
+
+    def _digest(self, value: str) -> str:
+        return hashlib.blake2b(
+            value.encode("utf-8"), key=self._salt[:64], digest_size=16
+        ).hexdigest()
+
+
+@dataclass
+class RecordedExchange:
+    """One sanitized request/response pair."""
+
+    endpoint: str
+    method: str
+    status_code: int
+    request: Any
+    response: Any
+    elapsed_ms: float
+
+
+@dataclass
+class FixtureSet:
+    """Recorded exchanges of one vendor, grouped by endpoint on replay."""
+
+    vendor: str
+    exchanges: list[RecordedExchange] = field(default_factory=list)
+    recorded_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+    def responses(self, endpoint: str) -> list[RecordedExchange]:
+        return [
+            exchange
+            for exchange in self.exchanges
+            if exchange.endpoint == endpoint and exchange.status_code < 400
+        ]
+
+    def endpoints(self) -> dict[str, int]:
+        counts: dict[str, int] = defaultdict(int)
+        for exchange in self.exchanges:
+            counts[exchange.endpoint] += 1
+        return dict(counts)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "vendor": self.vendor,
+            "recorded_at": self.recorded_at,
+            "exchanges": [asdict(exchange) for exchange in self.exchanges],
+        }
+        path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FixtureSet":
+        payload = json.loads(Path(path).read_text())
+        return cls(
+            vendor=payload["vendor"],
+            recorded_at=payload.get("recorded_at", ""),
+            exchanges=[RecordedExchange(**item) for item in payload.get("exchanges", [])],
+        )
+
+
+def endpoint_name(url: str) -> str:
+    """Huawei `.../thirdData/getDevList` -> `getDevList`, SEMS `.../GetPowerflow` -> `GetPowerflow`."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _decode_json(raw: bytes | str | None) -> Any:
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+class VendorRecorder:
+    """Collects sanitized exchanges from adapters of one vendor."""
+
+    def __init__(
+        self,
+        vendor: ProviderVendor,
+        *,
+        sanitizer: PayloadSanitizer | None = None,
+    ) -> None:
+        self.vendor = vendor
+        self.sanitizer = sanitizer or PayloadSanitizer()
+        self.exchanges: list[RecordedExchange] = []
+
+    def attach(self, adapter: Any) -> None:
+        """Record everything `adapter` sends from now on (sync or async adapter)."""
+        client = getattr(adapter, "client", None)
+        if client is not None and hasattr(client, "event_hooks"):
+            self._attach_httpx(client)
+            return
+
+        session = getattr(adapter, "session", None)
+        if session is not None and hasattr(session, "hooks"):
+            self._attach_requests(session)
+            return
+
+        raise TypeError(f"Cannot record {type(adapter).__name__}: no HTTP client")
+
+    def _attach_requests(self, session: Any) -> None:
+        def on_response(response: Any, *args: Any, **kwargs: Any) -> Any:
+            self.add(
+                url=response.request.url,
+                method=response.request.method,
+                status_code=response.status_code,
+                request_body=response.request.body,
+                response_body=response.content,
+                elapsed_ms=response.elapsed.total_seconds() * 1000,
+            )
+            return response
+
+        session.hooks.setdefault("response", []).append(on_response)
+
+    def _attach_httpx(self, client: Any) -> None:
+        async def on_response(response: Any) -> None:
+            await response.aread()
+            self.add(
+                url=str(response.request.url),
+                method=response.request.method,
+                status_code=response.status_code,
+                request_body=response.request.content,
+                response_body=response.content,
+                elapsed_ms=response.elapsed.total_seconds() * 1000,
+            )
+
+        hooks = dict(client.event_hooks)
+        hooks["response"] = [*hooks.get("response", []), on_response]
+        client.event_hooks = hooks
+
+    def add(
+        self,
+        *,
+        url: str,
+        method: str,
+        status_code: int,
+        request_body: bytes | str | None,
+        response_body: bytes | str | None,
+        elapsed_ms: float,
+    ) -> RecordedExchange:
+        endpoint = endpoint_name(url)
+        response = self.sanitizer.sanitize(_decode_json(response_body))
+        if (
+            endpoint in IDENTIFIER_PAYLOAD_ENDPOINTS
+            and isinstance(response, dict)
+            and response.get("data") is not None
+        ):
+            response["data"] = self.sanitizer.pseudonym(response.get("data"))
+
+        exchange = RecordedExchange(
+            endpoint=endpoint,
+            method=method,
+            status_code=status_code,
+            request=self.sanitizer.sanitize(_decode_json(request_body)),
+            response=response,
+            elapsed_ms=round(elapsed_ms, 3),
+        )
+        self.exchanges.append(exchange)
+        logger.debug(
+            "Vendor exchange recorded",
+            extra={
+                "vendor": self.vendor.value,
+                "endpoint": exchange.endpoint,
+                "status_code": status_code,
+            },
+        )
+        return exchange
+
+    def fixtures(self) -> FixtureSet:
+        return FixtureSet(vendor=self.vendor.value, exchanges=list(self.exchanges))
+
+
+__all__ = [
+    "FixtureSet",
+    "PayloadSanitizer",
+    "RecordedExchange",
+    "VendorRecorder",
+    "endpoint_name",
+]
@@ -0,0 +1,574 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Mapping
+
+from smart_common.enums.provider_telemetry import (
+    ProviderTelemetryCapability,
+    TelemetryAggregationMode,
+    TelemetryChartType,
+)
+from smart_common.enums.unit import PowerUnit
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
+from smart_common.providers.adapters.base import BaseProviderAdapter
+from smart_common.providers.adapters.circuit_breaker import (
+    CircuitBreaker,
+    backoff_delay,
+    circuit_breakers,
+)
+from smart_common.providers.adapters.modbus import (
+    AsyncModbusTcpClient,
+    ModbusExceptionResponse,
+    ModbusTcpClient,
+)
+from smart_common.providers.adapters.payload_mapping import (
+    GRID_POWER_METRIC_KEY,
+    CompiledPayloadMapping,
+    FieldSpec,
+    MetricSpec,
+)
+from smart_common.providers.enums import (
+    ProviderKind,
+    ProviderPowerSource,
+    ProviderType,
+    ProviderVendor,
+)
+from smart_common.providers.exceptions import ProviderError, ProviderFetchError
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+logger = logging.getLogger(__name__)
+
+# "SunS" in two registers at the start of the SunSpec map.
+SUNSPEC_MARKER = (0x5375, 0x6E53)
+SUNSPEC_BASE_ADDRESSES = (40000, 0, 50000)
+END_MODEL_ID = 0xFFFF
+MAX_MODELS = 64
+
+# Preference order: three-phase first.
+INVERTER_MODELS = (103, 102, 101)
+METER_MODELS = (203, 204, 202, 201)
+
+_NOT_IMPLEMENTED = {
+    "int16": 0x8000,
+    "uint16": 0xFFFF,
+    "enum16": 0xFFFF,
+    "sunssf": 0x8000,
+    "acc32": 0,
+}
+
+
+@dataclass(frozen=True)
+class SunSpecPoint:
+    """One point of a model block; offsets count from the first register after ID/L."""
+
+    name: str
+    offset: int
+    kind: str
+    scale_offset: int | None = None
+
+
+# Models 101-103 (integer + scale factor inverters).
+INVERTER_POINTS = (
+    SunSpecPoint("current_a", 0, "uint16", 4),
+    SunSpecPoint("voltage_an_v", 8, "uint16", 11),
+    SunSpecPoint("power_w", 12, "int16", 13),
+    SunSpecPoint("frequency_hz", 14, "uint16", 15),
+    SunSpecPoint("apparent_power_va", 16, "int16", 17),
+    SunSpecPoint("reactive_power_var", 18, "int16", 19),
+    SunSpecPoint("power_factor_pct", 20, "int16", 21),
+    SunSpecPoint("energy_total_wh", 22, "acc32", 24),
+    SunSpecPoint("dc_current_a", 25, "uint16", 26),
+    SunSpecPoint("dc_voltage_v", 27, "uint16", 28),
+    SunSpecPoint("dc_power_w", 29, "int16", 30),
+    SunSpecPoint("temperature_c", 31, "int16", 35),
+    SunSpecPoint("state", 36, "enum16"),
+)
+
+# Models 201-204 (integer + scale factor meters).
+METER_POINTS = (
+    SunSpecPoint("current_a", 0, "int16", 4),
+    SunSpecPoint("voltage_ln_v", 5, "int16", 13),
+    SunSpecPoint("frequency_hz", 14, "int16", 15),
+    SunSpecPoint("power_w", 16, "int16", 20),
+    SunSpecPoint("energy_exported_wh", 36, "acc32", 52),
+    SunSpecPoint("energy_imported_wh", 44, "acc32", 52),
+)
+
+
+def _read_length(points: tuple[SunSpecPoint, ...]) -> int:
+    end = 0
+    for point in points:
+        end = max(end, point.offset + (2 if point.kind == "acc32" else 1))
+        if point.scale_offset is not None:
+            end = max(end, point.scale_offset + 1)
+    return end
+
+
+INVERTER_READ_LENGTH = _read_length(INVERTER_POINTS)
+METER_READ_LENGTH = _read_length(METER_POINTS)
+
+
+def decode_points(
+    registers: list[int],
+    points: tuple[SunSpecPoint, ...],
+) -> dict[str, float | int]:
+    """Scaled values of `points`; unimplemented (sentinel) points are left out."""
+    values: dict[str, float | int] = {}
+    for point in points:
+        if point.offset >= len(registers):
+            continue
+        raw = registers[point.offset]
+        if point.kind == "acc32":
+            if point.offset + 1 >= len(registers):
+                continue
+            raw = (raw << 16) | registers[point.offset + 1]
+        if raw == _NOT_IMPLEMENTED[point.kind]:
+            continue
+        if point.kind == "enum16":
+            values[point.name] = raw
+            continue
+        if point.kind == "int16" and raw >= 0x8000:
+            raw -= 0x10000
+
+        if point.scale_offset is None or point.scale_offset >= len(registers):
+            values[point.name] = float(raw)
+            continue
+        scale = registers[point.scale_offset]
+        if scale == _NOT_IMPLEMENTED["sunssf"]:
+            continue
+        if scale >= 0x8000:
+            scale -= 0x10000
+        # Dividing by an exact power of ten keeps e.g. 2301 * 10**-1 at 230.1.
+        if scale >= 0:
+            values[point.name] = float(raw * 10**scale)
+        else:
+            values[point.name] = raw / 10 ** (-scale)
+    return values
+
+
+def _grid_export_w(meter_power_w: Any) -> float | None:
+    # SunSpec meters report import from the grid as positive; measurements
+    # use export-positive grid power like the cloud adapters.
+    return -meter_power_w if meter_power_w is not None else None
+
+
+SUNSPEC_MAPPING = CompiledPayloadMapping(
+    [
+        FieldSpec("models", "models"),
+        FieldSpec("inverter", "inverter"),
+        FieldSpec("meter", "meter"),
+        MetricSpec(
+            key=GRID_POWER_METRIC_KEY,
+            source="meter.power_w",
+            convert=_grid_export_w,
+            unit=PowerUnit.WATT.value,
+            label="Grid power",
+            chart_type=TelemetryChartType.BAR,
+            aggregation_mode=TelemetryAggregationMode.HOURLY_INTEGRAL,
+            capability_tag=ProviderTelemetryCapability.POWER_METER,
+        ),
+    ]
+)
+
+ModelMap = dict[int, tuple[int, int]]
+
+
+def modbus_url(host: str, port: int) -> str:
+    host = f"[{host}]" if ":" in str(host) else str(host)
+    return f"modbus://{host}:{port}"
+
+
+class SunSpecPayloadMixin:
+    """SunSpec model discovery and decoding shared by the sync and async adapters."""
+
+    provider_type = ProviderType.API
+    vendor = ProviderVendor.SUNSPEC
+    kind = ProviderKind.POWER
+
+    def _init_device(
+        self,
+        *,
+        unit_id: int,
+        base_address: int | None,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool,
+    ) -> None:
+        self.unit_id = unit_id
+        self.base_address = base_address
+        self.provider_id = provider_id
+        self.provider_external_id = provider_external_id
+        self.provider_power_source = provider_power_source
+        self.provider_has_power_meter = provider_has_power_meter
+        # Local devices have no vendor quota.
+        self.rate_limiter = None
+        self._models: ModelMap | None = None
+
+    def _breaker(self) -> CircuitBreaker:
+        return circuit_breakers.breaker(self.vendor.value, self.host)
+
+    def _open_circuit_error(self, breaker: CircuitBreaker) -> ProviderFetchError:
+        logger.warning(
+            "Provider circuit open, failing fast",
+            extra=self._log_context(retry_in_sec=breaker.retry_in()),
+        )
+        return ProviderFetchError(
+            "Provider API circuit open",
+            details={"host": self.host, "retry_in_sec": round(breaker.retry_in(), 3)},
+        )
+
+    def _candidate_bases(self) -> tuple[int, ...]:
+        if self.base_address is not None:
+            return (self.base_address,)
+        return SUNSPEC_BASE_ADDRESSES
+
+    def _not_found_error(self) -> ProviderError:
+        return ProviderError(
+            message="SunSpec register map not found",
+            status_code=502,
+            code="SUNSPEC_NOT_FOUND",
+            details={
+                "host": self.host,
+                "unit_id": self.unit_id,
+                "base_addresses": list(self._candidate_bases()),
+            },
+        )
+
+    @staticmethod
+    def _select(models: ModelMap, preferred: tuple[int, ...]) -> tuple[int, int] | None:
+        for model_id in preferred:
+            if model_id in models:
+                return models[model_id]
+        return None
+
+    def _needs_meter(self) -> bool:
+        return (
+            self.provider_power_source == ProviderPowerSource.METER
+            or self.provider_has_power_meter
+        )
+
+    def _build_measurement(
+        self,
+        models: ModelMap,
+        inverter_registers: list[int] | None,
+        meter_registers: list[int] | None,
+    ) -> NormalizedMeasurement:
+        inverter = (
+            decode_points(inverter_registers, INVERTER_POINTS)
+            if inverter_registers is not None
+            else None
+        )
+        meter = (
+            decode_points(meter_registers, METER_POINTS)
+            if meter_registers is not None
+            else None
+        )
+
+        if self.provider_power_source == ProviderPowerSource.METER:
+            value = _grid_export_w((meter or {}).get("power_w"))
+            measurement_source = "meter_w"
+        else:
+            value = (inverter or {}).get("power_w")
+            measurement_source = "inverter_w"
+
+        if value is None:
+            raise ProviderError(
+                message="SunSpec power value missing for selected source",
+                status_code=502,
+                details={
+                    "host": self.host,
+                    "unit_id": self.unit_id,
+                    "models": sorted(models),
+                    "power_source": self.provider_power_source.value,
+                },
+            )
+
+        capabilities = (
+            {ProviderTelemetryCapability.POWER_METER}
+            if self.provider_has_power_meter
+            else set()
+        )
+        metadata, extra_metrics = SUNSPEC_MAPPING.extract(
+            {"models": sorted(models) or None, "inverter": inverter, "meter": meter},
+            capabilities=capabilities,
+        )
+        metadata["unit_id"] = self.unit_id
+        metadata["power_source"] = self.provider_power_source.value
+        metadata["measurement_source"] = measurement_source
+
+        return NormalizedMeasurement(
+            provider_id=self.provider_id,
+            value=float(value),
+            unit=PowerUnit.WATT.value,
+            measured_at=datetime.now(timezone.utc),
+            metadata=metadata,
+            extra_metrics=extra_metrics,
+        )
+
+
+class SunSpecProviderAdapter(SunSpecPayloadMixin, BaseProviderAdapter):
+    """Polls a SunSpec inverter or meter over a persistent Modbus TCP connection."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        port: int = 502,
+        unit_id: int = 1,
+        base_address: int | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        timeout = timeout or provider_settings.LOCAL_ADAPTER_TIMEOUT
+        super().__init__(
+            modbus_url(host, port),
+            timeout=timeout,
+            max_retries=max_retries or provider_settings.LOCAL_ADAPTER_MAX_RETRIES,
+        )
+        self._init_device(
+            unit_id=unit_id,
+            base_address=base_address,
+            provider_id=provider_id,
+            provider_external_id=provider_external_id,
+            provider_power_source=provider_power_source,
+            provider_has_power_meter=provider_has_power_meter,
+        )
+        self.modbus = ModbusTcpClient(str(host), port, unit_id=unit_id, timeout=timeout)
+
+    def _read(self, address: int, quantity: int) -> list[int]:
+        breaker = self._breaker()
+        if not breaker.allow():
+            raise self._open_circuit_error(breaker)
+
+        last_exc: Exception | None = None
+        for attempt in range(1, self.max_retries + 1):
+            # The first retry reconnects at once: it usually replaces a
+            # kept-alive connection the device dropped between polls.
+            if attempt > 2:
+                time.sleep(backoff_delay(attempt - 2))
+            try:
+                registers = self.modbus.read_holding_registers(address, quantity)
+            except ModbusExceptionResponse:
+                breaker.record_success()
+                raise
+            except ProviderFetchError as exc:
+                last_exc = exc
+                logger.warning(
+                    "Modbus read failed",
+                    extra=self._log_context(address=address, attempt=attempt),
+                )
+            else:
+                breaker.record_success()
+                return registers
+
+        breaker.record_failure()
+        raise ProviderFetchError(
+            "Modbus TCP request failed after retries",
+            details={"host": self.host, "error": str(last_exc)},
+        )
+
+    def discover_models(self) -> ModelMap:
+        """Walk the SunSpec model list once; cached for the adapter's lifetime."""
+        if self._models is not None:
+            return self._models
+
+        for base in self._candidate_bases():
+            try:
+                if tuple(self._read(base, 2)) != SUNSPEC_MARKER:
+                    continue
+            except ModbusExceptionResponse:
+                continue
+
+            models: ModelMap = {}
+            address = base + 2
+            while len(models) < MAX_MODELS:
+                model_id, length = self._read(address, 2)
+                if model_id == END_MODEL_ID:
+                    break
+                models[model_id] = (address, length)
+                address += 2 + length
+
+            logger.info(
+                "SunSpec models discovered",
+                extra=self._log_context(base_address=base, models=sorted(models)),
+            )
+            self._models = models
+            return models
+
+        raise self._not_found_error()
+
+    def _read_model(
+        self,
+        model: tuple[int, int] | None,
+        read_length: int,
+    ) -> list[int] | None:
+        if model is None:
+            return None
+        address, length = model
+        return self._read(address + 2, min(length, read_length))
+
+    def fetch_measurement(self) -> NormalizedMeasurement:
+        models = self.discover_models()
+        inverter = self._read_model(
+            self._select(models, INVERTER_MODELS), INVERTER_READ_LENGTH
+        )
+        meter = (
+            self._read_model(self._select(models, METER_MODELS), METER_READ_LENGTH)
+            if self._needs_meter()
+            else None
+        )
+        return self._build_measurement(models, inverter, meter)
+
+    def get_current_power(self, device_id: str) -> float:
+        return self.fetch_measurement().value
+
+    def list_stations(self) -> list[Mapping[str, Any]]:
+        return [{"station_code": self.host, "name": self.host, "raw": {}}]
+
+    def list_devices(self, station_code: str) -> list[Mapping[str, Any]]:
+        models = self.discover_models()
+        return [
+            {
+                "device_id": self.unit_id,
+                "station_code": station_code,
+                "models": sorted(models),
+                "raw": {},
+            }
+        ]
+
+    def close(self) -> None:
+        self.modbus.close()
+        super().close()
+
+
+class AsyncSunSpecProviderAdapter(SunSpecPayloadMixin, AsyncBaseProviderAdapter):
+    """asyncio SunSpec polling over a persistent Modbus TCP stream."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        provider_id: int,
+        provider_external_id: str,
+        provider_power_source: ProviderPowerSource,
+        provider_has_power_meter: bool = False,
+        port: int = 502,
+        unit_id: int = 1,
+        base_address: int | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        timeout = timeout or provider_settings.LOCAL_ADAPTER_TIMEOUT
+        super().__init__(
+            modbus_url(host, port),
+            timeout=timeout,
+            max_retries=max_retries or provider_settings.LOCAL_ADAPTER_MAX_RETRIES,
+        )
+        self._init_device(
+            unit_id=unit_id,
+            base_address=base_address,
+            provider_id=provider_id,
+            provider_external_id=provider_external_id,
+            provider_power_source=provider_power_source,
+            provider_has_power_meter=provider_has_power_meter,
+        )
+        self.modbus = AsyncModbusTcpClient(
+            str(host), port, unit_id=unit_id, timeout=timeout
+        )
+
+    async def _read(self, address: int, quantity: int) -> list[int]:
+        breaker = self._breaker()
+        if not breaker.allow():
+            raise self._open_circuit_error(breaker)
+
+        last_exc: Exception | None = None
+        for attempt in range(1, self.max_retries + 1):
+            if attempt > 2:
+                await asyncio.sleep(backoff_delay(attempt - 2))
+            try:
+                registers = await self.modbus.read_holding_registers(address, quantity)
+            except ModbusExceptionResponse:
+                breaker.record_success()
+                raise
+            except ProviderFetchError as exc:
+                last_exc = exc
+                logger.warning(
+                    "Modbus read failed",
+                    extra=self._log_context(address=address, attempt=attempt),
+                )
+            else:
+                breaker.record_success()
+                return registers
+
+        breaker.record_failure()
+        raise ProviderFetchError(
+            "Modbus TCP request failed after retries",
+            details={"host": self.host, "error": str(last_exc)},
+        )
+
+    async def discover_models(self) -> ModelMap:
+        if self._models is not None:
+            return self._models
+
+        for base in self._candidate_bases():
+            try:
+                if tuple(await self._read(base, 2)) != SUNSPEC_MARKER:
+                    continue
+            except ModbusExceptionResponse:
+                continue
+
+            models: ModelMap = {}
+            address = base + 2
+            while len(models) < MAX_MODELS:
+                model_id, length = await self._read(address, 2)
+                if model_id == END_MODEL_ID:
+                    break
+                models[model_id] = (address, length)
+                address += 2 + length
+
+            logger.info(
+                "SunSpec models discovered",
+                extra=self._log_context(base_address=base, models=sorted(models)),
+            )
+            self._models = models
+            return models
+
+        raise self._not_found_error()
+
+    async def _read_model(
+        self,
+        model: tuple[int, int] | None,
+        read_length: int,
+    ) -> list[int] | None:
+        if model is None:
+            return None
+        address, length = model
+        return await self._read(address + 2, min(length, read_length))
+
+    async def fetch_measurement(self) -> NormalizedMeasurement:
+        models = await self.discover_models()
+        inverter = await self._read_model(
+            self._select(models, INVERTER_MODELS), INVERTER_READ_LENGTH
+        )
+        meter = (
+            await self._read_model(
+                self._select(models, METER_MODELS), METER_READ_LENGTH
+            )
+            if self._needs_meter()
+            else None
+        )
+        return self._build_measurement(models, inverter, meter)
+
+    async def aclose(self) -> None:
+        await self.modbus.aclose()
+        await super().aclose()
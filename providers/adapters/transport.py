@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import threading
+import weakref
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from smart_common.providers.provider_config.config import provider_settings
+
+logger = logging.getLogger(__name__)
+
+HostKey = Tuple[str, str]
+
+
+def _socket_options() -> list[tuple[int, int, int]]:
+    options = list(HTTPConnection.default_socket_options)
+    if not provider_settings.PROVIDER_HTTP_TCP_KEEPALIVE:
+        return options
+
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    idle = provider_settings.PROVIDER_HTTP_TCP_KEEPIDLE_SEC
+    # TCP_KEEPIDLE is Linux-only; other platforms keep the system default.
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4)))
+    return options
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter owned by `HttpTransportRegistry`.
+
+    Mounted into many sessions at once, so `Session.close()` must not tear
+    down its pool; only the registry closes it.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int,
+        socket_options: list[tuple[int, int, int]],
+    ) -> None:
+        self._socket_options = socket_options
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+
+    def init_poolmanager(
+        self,
+        connections: int,
+        maxsize: int,
+        block: bool = False,
+        **pool_kwargs: Any,
+    ) -> None:
+        pool_kwargs.setdefault("socket_options", self._socket_options)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    `httpx` transport handing each request to the registry's pool for its
+    (scheme, host) on the running event loop. `aclose()` of one client does
+    not close the shared pools.
+    """
+
+    def __init__(self, registry: "HttpTransportRegistry") -> None:
+        self._registry = registry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self._registry.async_pool(
+            request.url.scheme,
+            request.url.netloc.decode("ascii"),
+        )
+        return await transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HttpTransportRegistry:
+    """
+    Process-wide connection pools per (scheme, host) for provider adapters.
+
+    Sync adapters mount a `SharedHTTPAdapter` for the request's host into
+    their own `requests.Session`, so headers and cookies stay per adapter
+    while TCP/TLS connections are reused across all adapters talking to
+    that host. Async adapters get a `SharedAsyncTransport`; its pools are
+    also keyed by event loop, since httpcore connections are loop-bound.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = provider_settings.PROVIDER_HTTP_SHARED_POOLS
+        self._sync: dict[HostKey, SharedHTTPAdapter] = {}
+        self._async: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[HostKey, httpx.AsyncHTTPTransport]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # requests
+    # ------------------------------------------------------------------
+
+    def mount(self, session: Session, url: str) -> None:
+        """Route `session`'s requests to the host of `url` through the shared pool."""
+        if not self.enabled:
+            return
+        parts = urlsplit(url)
+        prefix = f"{parts.scheme}://{parts.netloc}/"
+        if prefix in session.adapters:
+            return
+        session.mount(prefix, self.sync_pool(parts.scheme, parts.netloc))
+
+    def sync_pool(self, scheme: str, host: str) -> SharedHTTPAdapter:
+        key = (scheme, host)
+        with self._lock:
+            adapter = self._sync.get(key)
+            if adapter is None:
+                adapter = SharedHTTPAdapter(
+                    pool_maxsize=provider_settings.PROVIDER_HTTP_POOL_MAXSIZE,
+                    socket_options=_socket_options(),
+                )
+                self._sync[key] = adapter
+                logger.debug(
+                    "Shared HTTP pool created",
+                    extra={"scheme": scheme, "host": host},
+                )
+            return adapter
+
+    # ------------------------------------------------------------------
+    # httpx
+    # ------------------------------------------------------------------
+
+    def async_transport(self) -> httpx.AsyncBaseTransport | None:
+        """Transport for a new `httpx.AsyncClient`; None keeps httpx's own pool."""
+        return SharedAsyncTransport(self) if self.enabled else None
+
+    def async_pool(self, scheme: str, host: str) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        key = (scheme, host)
+        with self._lock:
+            pools = self._async.setdefault(loop, {})
+            transport = pools.get(key)
+            if transport is None:
+                maxsize = provider_settings.PROVIDER_HTTP_POOL_MAXSIZE
+                transport = httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=maxsize,
+                        max_keepalive_connections=maxsize,
+                        keepalive_expiry=provider_settings.PROVIDER_HTTP_KEEPALIVE_EXPIRY_SEC,
+                    ),
+                    socket_options=_socket_options(),
+                )
+                pools[key] = transport
+            return transport
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        with self._lock:
+            adapters = list(self._sync.values())
+            self._sync.clear()
+        for adapter in adapters:
+            adapter.shutdown()
+
+    async def aclose(self) -> None:
+        """Close the running loop's async pools."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._async.pop(loop, {})
+        for transport in pools.values():
+            await transport.aclose()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sync_hosts": sorted(f"{scheme}://{host}" for scheme, host in self._sync),
+                "async_hosts": sorted(
+                    {
+                        f"{scheme}://{host}"
+                        for pools in self._async.values()
+                        for scheme, host in pools
+                    }
+                ),
+            }
+
+
+http_transports = HttpTransportRegistry()
@@ -10,6 +10,7 @@ from smart_common.enums.unit import PowerUnit
 from smart_common.providers.enums import ProviderKind, ProviderType, ProviderVendor
 
 if TYPE_CHECKING:  # pragma: no cover
+    from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
     from smart_common.providers.adapters.base import BaseProviderAdapter
     from smart_common.providers.wizard.base import ProviderWizard
 
@@ -28,7 +29,10 @@ class ProviderDefinition:
     config_schema: Type[BaseModel]
     credentials_schema: Type[BaseModel] | None = None
     adapter_cls: type["BaseProviderAdapter"] | None = None
+    async_adapter_cls: type["AsyncBaseProviderAdapter"] | None = None
     adapter_settings: Mapping[str, Any] = field(default_factory=dict)
+    # Provider.config keys handed to the adapter (e.g. a local device's host).
+    adapter_config_keys: tuple[str, ...] = ()
     wizard_cls: type["ProviderWizard"] | None = None
     default_unit: Unit | None
     default_value_min: float | None = None
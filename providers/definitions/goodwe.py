@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from smart_common.enums.unit import PowerUnit
-from smart_common.providers.adapters.goodwe import GoodWeProviderAdapter
+from smart_common.providers.adapters.goodwe import (
+    AsyncGoodWeProviderAdapter,
+    GoodWeProviderAdapter,
+)
 from smart_common.providers.definitions.base import (
     ProviderDefinition,
     ProviderDefinitionRegistry,
@@ -27,6 +30,7 @@ ProviderDefinitionRegistry.register(
         config_schema=GoodWeProviderConfig,
         credentials_schema=GoodWeAuthStep,
         adapter_cls=GoodWeProviderAdapter,
+        async_adapter_cls=AsyncGoodWeProviderAdapter,
         adapter_settings={
             "timeout": goodwe_integration_settings.GOODWE_TIMEOUT,
             "max_retries": goodwe_integration_settings.GOODWE_MAX_RETRIES,
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from smart_common.enums.unit import PowerUnit
-from smart_common.providers.adapters.huawei import HuaweiProviderAdapter
+from smart_common.providers.adapters.huawei import (
+    AsyncHuaweiProviderAdapter,
+    HuaweiProviderAdapter,
+)
 from smart_common.providers.definitions.base import (
     ProviderDefinition,
     ProviderDefinitionRegistry,
@@ -26,6 +29,7 @@ ProviderDefinitionRegistry.register(
         config_schema=HuaweiProviderConfig,
         credentials_schema=UsernamePasswordCredentials,
         adapter_cls=HuaweiProviderAdapter,
+        async_adapter_cls=AsyncHuaweiProviderAdapter,
         adapter_settings={
             "base_url": provider_settings.HUAWEI_BASE_URL,
             "timeout": provider_settings.HUAWEI_TIMEOUT,
@@ -12,8 +12,10 @@ from smart_common.providers.enums import ProviderKind, ProviderType, ProviderVen
 from smart_common.providers.provider_config.sensor_base import SensorThresholdConfig
 
 # Import provider-specific modules to register their definitions.
+from smart_common.providers.definitions import fronius  # noqa: F401
 from smart_common.providers.definitions import goodwe  # noqa: F401
 from smart_common.providers.definitions import huawei  # noqa: F401
+from smart_common.providers.definitions import sunspec  # noqa: F401
 
 
 def _register_sensor(
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from smart_common.enums.unit import PowerUnit
+from smart_common.providers.adapters.sunspec import (
+    AsyncSunSpecProviderAdapter,
+    SunSpecProviderAdapter,
+)
+from smart_common.providers.definitions.base import (
+    ProviderDefinition,
+    ProviderDefinitionRegistry,
+)
+from smart_common.providers.enums import ProviderKind, ProviderType, ProviderVendor
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.providers.provider_config.sunspec import SunSpecProviderConfig
+
+
+ProviderDefinitionRegistry.register(
+    ProviderDefinition(
+        vendor=ProviderVendor.SUNSPEC,
+        label="SunSpec Modbus TCP (local network)",
+        provider_type=ProviderType.API,
+        kind=ProviderKind.POWER,
+        default_unit=PowerUnit.WATT,
+        requires_wizard=False,
+        config_schema=SunSpecProviderConfig,
+        adapter_cls=SunSpecProviderAdapter,
+        async_adapter_cls=AsyncSunSpecProviderAdapter,
+        adapter_settings={
+            "timeout": provider_settings.LOCAL_ADAPTER_TIMEOUT,
+            "max_retries": provider_settings.LOCAL_ADAPTER_MAX_RETRIES,
+        },
+        adapter_config_keys=("host", "port", "unit_id", "base_address"),
+        default_value_min=0.0,
+        default_value_max=20000.0,
+        default_expected_interval_sec=provider_settings.LOCAL_ADAPTER_POLL_INTERVAL_SEC,
+    )
+)
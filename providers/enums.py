@@ -35,13 +35,16 @@ class ProviderVendor(str, Enum):
     GOODWE = "goodwe"
     # SMA = "sma"
     # SOLAREDGE = "solaredge"
-    # FRONIUS = "fronius"
+    FRONIUS = "fronius"
     # GROWATT = "growatt"
     # SUNGROW = "sungrow"
     # KOSTAL = "kostal"
     # VICTRON = "victron"
     # ENPHASE = "enphase"
 
+    # Local network (LAN protocols)
+    SUNSPEC = "sunspec"
+
     # # Sensors (hardware-only; must be validated against microcontroller capabilities)
     # DHT22 = "dht22"
     # BME280 = "bme280"
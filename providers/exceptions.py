@@ -72,3 +72,25 @@ class ProviderNotSupportedError(ProviderError):
             status_code=404,
             code="PROVIDER_NOT_SUPPORTED",
         )
+
+
+# ------------------------------------------------------------------
+# Vendor quota / throttling
+# ------------------------------------------------------------------
+class ProviderThrottledError(ProviderError):
+    """Raised when the vendor rejects a call for exceeding its quota."""
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        retry_after: float | None = None,
+        details: Mapping[str, Any] | None = None,
+    ) -> None:
+        super().__init__(
+            message=message,
+            status_code=429,
+            code="PROVIDER_THROTTLED",
+            details=details,
+        )
+        self.retry_after = retry_after
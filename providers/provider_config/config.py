@@ -25,6 +25,179 @@ class ProviderIntegrationSettings(BaseSettings):
         gt=0,
         description="Max retry attempts for Huawei API requests",
     )
+    HUAWEI_KPI_BATCH_WINDOW_SEC: float = Field(
+        default=0.05,
+        ge=0,
+        description="How long concurrent getDevRealKpi lookups wait to share one call",
+    )
+    HUAWEI_KPI_BATCH_MAX_DEVICES: int = Field(
+        default=100,
+        gt=0,
+        description="Max devIds per Huawei getDevRealKpi call",
+    )
+
+    # ------------------------------------------------------------------
+    # Local network adapters (Fronius Solar API, SunSpec Modbus TCP)
+    # ------------------------------------------------------------------
+    LOCAL_ADAPTER_TIMEOUT: float = Field(
+        default=2.0,
+        gt=0,
+        description="Timeout for requests to devices on the local network",
+    )
+    LOCAL_ADAPTER_MAX_RETRIES: int = Field(
+        default=2,
+        gt=0,
+        description="Attempts per local device request (a stale connection costs one)",
+    )
+    LOCAL_ADAPTER_POLL_INTERVAL_SEC: int = Field(
+        default=1,
+        gt=0,
+        description="Default expected_interval_sec of local-network providers",
+    )
+
+    # ------------------------------------------------------------------
+    # Retries / circuit breaker (per vendor host)
+    # ------------------------------------------------------------------
+    PROVIDER_RETRY_BACKOFF_BASE_SEC: float = Field(
+        default=0.5,
+        ge=0,
+        description="Base delay for jittered exponential backoff between retries",
+    )
+    PROVIDER_RETRY_BACKOFF_MAX_SEC: float = Field(
+        default=8.0,
+        ge=0,
+        description="Upper bound for a single retry backoff delay",
+    )
+    PROVIDER_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        gt=0,
+        description="Consecutive failed requests that open a vendor host circuit",
+    )
+    PROVIDER_CIRCUIT_COOLDOWN_SEC: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long an open circuit fails fast before probing again",
+    )
+
+    # ------------------------------------------------------------------
+    # Vendor quotas (per account)
+    # ------------------------------------------------------------------
+    HUAWEI_CALLS_PER_MINUTE: float = Field(
+        default=30.0,
+        gt=0,
+        description="Sustained Huawei API calls per minute per FusionSolar account",
+    )
+    HUAWEI_CALL_BURST: int = Field(
+        default=10,
+        gt=0,
+        description="Huawei API calls allowed back to back before rate limiting",
+    )
+    GOODWE_CALLS_PER_MINUTE: float = Field(
+        default=60.0,
+        gt=0,
+        description="Sustained GoodWe SEMS calls per minute per account",
+    )
+    GOODWE_CALL_BURST: int = Field(
+        default=10,
+        gt=0,
+        description="GoodWe SEMS calls allowed back to back before rate limiting",
+    )
+    PROVIDER_THROTTLE_BACKOFF_SEC: float = Field(
+        default=60.0,
+        gt=0,
+        description="Pause after a throttle response without Retry-After",
+    )
+    PROVIDER_THROTTLE_MAX_BACKOFF_SEC: float = Field(
+        default=900.0,
+        gt=0,
+        description="Upper bound for the poll scheduler's throttle backoff",
+    )
+
+    # ------------------------------------------------------------------
+    # Adapter cache
+    # ------------------------------------------------------------------
+    # Must cover every provider one process polls: an evicted adapter is
+    # rebuilt on its next poll and loses its vendor login token.
+    PROVIDER_ADAPTER_CACHE_MAX_SIZE: int = Field(
+        default=65536,
+        gt=0,
+        description="Max cached provider adapters per cache (sync / async)",
+    )
+    PROVIDER_ADAPTER_CACHE_IDLE_TTL_SEC: float = Field(
+        default=1800.0,
+        ge=0,
+        description="Close cached adapters unused for this long (0 disables)",
+    )
+    PROVIDER_CREDENTIAL_CACHE_MAX_SIZE: int = Field(
+        default=4096,
+        gt=0,
+        description="Max providers whose decrypted credentials are kept in memory",
+    )
+
+    # ------------------------------------------------------------------
+    # HTTP transport
+    # ------------------------------------------------------------------
+    PROVIDER_HTTP_SHARED_POOLS: bool = Field(
+        default=True,
+        description="Share connection pools per (scheme, host) across adapters",
+    )
+    PROVIDER_HTTP_POOL_MAXSIZE: int = Field(
+        default=32,
+        gt=0,
+        description="Max pooled connections per vendor host",
+    )
+    PROVIDER_HTTP_KEEPALIVE_EXPIRY_SEC: float = Field(
+        default=60.0,
+        gt=0,
+        description="Idle time before a pooled async connection is closed",
+    )
+    PROVIDER_HTTP_TCP_KEEPALIVE: bool = Field(
+        default=True,
+        description="Enable TCP keep-alive probes on pooled connections",
+    )
+    PROVIDER_HTTP_TCP_KEEPIDLE_SEC: int = Field(
+        default=60,
+        gt=0,
+        description="Idle seconds before the first TCP keep-alive probe (Linux)",
+    )
+
+    # ------------------------------------------------------------------
+    # Measurement persistence
+    # ------------------------------------------------------------------
+    PROVIDER_MEASUREMENT_HEARTBEAT_SEC: float = Field(
+        default=900.0,
+        ge=0,
+        description="Persist an unchanged reading at least this often (0 keeps every poll)",
+    )
+
+    # ------------------------------------------------------------------
+    # Fleet polling
+    # ------------------------------------------------------------------
+    PROVIDER_POLL_VENDOR_CONCURRENCY: int = Field(
+        default=64,
+        gt=0,
+        description="Max in-flight measurement polls per vendor",
+    )
+    PROVIDER_POLL_HOST_CONCURRENCY: int = Field(
+        default=16,
+        gt=0,
+        description="Max in-flight measurement polls per vendor API host",
+    )
+    PROVIDER_POLL_WORKERS: int = Field(
+        default=256,
+        gt=0,
+        description="Poll orchestrator worker tasks per process",
+    )
+    PROVIDER_POLL_TICK_SEC: float = Field(
+        default=1.0,
+        gt=0,
+        description="Resolution of the poll orchestrator timing wheel",
+    )
+    PROVIDER_LAST_SEEN_FLUSH_SEC: float = Field(
+        default=10.0,
+        gt=0,
+        description="How often successful polls are written to providers.last_seen_at",
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,5 +1,6 @@
 from pydantic import Field, IPvAnyAddress
 
+from smart_common.providers.enums import ProviderPowerSource
 from smart_common.schemas.base import APIModel
 
 
@@ -9,6 +10,13 @@ class FroniusProviderConfig(APIModel):
         description="Fronius inverter IP address (local network)",
     )
 
+    port: int | None = Field(
+        default=None,
+        ge=1,
+        le=65535,
+        description="Solar API port (defaults to 80 / 443)",
+    )
+
     use_https: bool = Field(
         default=False,
         description="Use HTTPS instead of HTTP",
@@ -19,3 +27,10 @@ class FroniusProviderConfig(APIModel):
         gt=0,
         description="Maximum inverter power in kW",
     )
+
+    min_power_kw: float = Field(default=0.0, ge=0)
+
+    power_source: ProviderPowerSource = Field(
+        default=ProviderPowerSource.INVERTER,
+        description="Primary power source used by this provider",
+    )
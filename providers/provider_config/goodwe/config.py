@@ -4,6 +4,11 @@ from smart_common.providers.provider_config.config import ProviderIntegrationSet
 
 
 class GoodWeProviderIntegrationSettings(ProviderIntegrationSettings):
+    GOODWE_LOGIN_BASE_URL: str = Field(
+        default="https://www.semsportal.com",
+        description="SEMS CrossLogin host; the API host comes from the login response",
+    )
+
     GOODWE_TIMEOUT: float = Field(
         default=15.0,
         description="Default HTTP timeout for GoodWe provider",
@@ -0,0 +1,45 @@
+from pydantic import Field, IPvAnyAddress
+
+from smart_common.providers.enums import ProviderPowerSource
+from smart_common.schemas.base import APIModel
+
+
+class SunSpecProviderConfig(APIModel):
+    host: IPvAnyAddress = Field(
+        ...,
+        description="Modbus TCP device IP address (local network)",
+    )
+
+    port: int = Field(
+        default=502,
+        ge=1,
+        le=65535,
+        description="Modbus TCP port",
+    )
+
+    unit_id: int = Field(
+        default=1,
+        ge=0,
+        le=255,
+        description="Modbus unit (slave) id of the inverter or meter",
+    )
+
+    base_address: int | None = Field(
+        default=None,
+        ge=0,
+        le=65535,
+        description="SunSpec base register; discovered (40000, 0, 50000) when empty",
+    )
+
+    max_power_kw: float = Field(
+        default=20.0,
+        gt=0,
+        description="Maximum inverter power in kW",
+    )
+
+    min_power_kw: float = Field(default=0.0, ge=0)
+
+    power_source: ProviderPowerSource = Field(
+        default=ProviderPowerSource.INVERTER,
+        description="Primary power source used by this provider",
+    )
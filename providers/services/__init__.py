@@ -1,5 +1,22 @@
 from __future__ import annotations
 
+from smart_common.providers.services.fleet_poller import FleetPoller, PollResult
+from smart_common.providers.services.measurement_compression import (
+    MeasurementCompressor,
+)
+from smart_common.providers.services.measurement_dedup import MeasurementDeduplicator
+from smart_common.providers.services.poll_orchestrator import PollOrchestrator
+from smart_common.providers.services.poll_scheduler import AdaptivePollScheduler
+from smart_common.providers.services.timing_wheel import HierarchicalTimingWheel
 from smart_common.providers.services.wizard_service import WizardService
 
-__all__ = ["WizardService"]
+__all__ = [
+    "AdaptivePollScheduler",
+    "FleetPoller",
+    "HierarchicalTimingWheel",
+    "MeasurementCompressor",
+    "MeasurementDeduplicator",
+    "PollOrchestrator",
+    "PollResult",
+    "WizardService",
+]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, ContextManager, Iterable, Mapping
+
+from smart_common.providers.adapters.async_base import AsyncBaseProviderAdapter
+from smart_common.providers.adapters.factory import lease_async_adapter_for_provider
+from smart_common.providers.enums import ProviderVendor
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.providers.services.poll_scheduler import (
+    AdaptivePollScheduler,
+    poll_interval,
+)
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+if TYPE_CHECKING:
+    from smart_common.models.provider import Provider  # noqa: F401
+    from smart_common.nats.state_cache import LatestStateCache  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PollResult:
+    provider_id: int
+    measurement: NormalizedMeasurement | None = None
+    error: Exception | None = None
+    duration_sec: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FleetPoller:
+    """
+    Polls all due providers concurrently on the async adapters.
+
+    Each poll holds a per-vendor slot and a per-API-host slot, so one slow
+    vendor cannot starve the others and no single host sees more than
+    `host_limit` parallel requests from this process. Failures are
+    returned as `PollResult.error` instead of aborting the round.
+
+    With a `scheduler`, due providers and their next slots come from
+    `AdaptivePollScheduler` instead of `last_seen_at`. With a
+    `state_cache`, every fetched measurement is also published as the
+    provider's latest state for the API nodes.
+    """
+
+    def __init__(
+        self,
+        *,
+        vendor_limits: Mapping[ProviderVendor, int] | None = None,
+        default_vendor_limit: int | None = None,
+        host_limit: int | None = None,
+        adapter_lease: Callable[
+            ["Provider"], ContextManager[AsyncBaseProviderAdapter]
+        ] = lease_async_adapter_for_provider,
+        scheduler: AdaptivePollScheduler | None = None,
+        state_cache: "LatestStateCache | None" = None,
+    ) -> None:
+        self.vendor_limits = dict(vendor_limits or {})
+        self.default_vendor_limit = (
+            default_vendor_limit or provider_settings.PROVIDER_POLL_VENDOR_CONCURRENCY
+        )
+        self.host_limit = host_limit or provider_settings.PROVIDER_POLL_HOST_CONCURRENCY
+        self.adapter_lease = adapter_lease
+        self.scheduler = scheduler
+        self.state_cache = state_cache
+        self._vendor_slots: dict[ProviderVendor | None, asyncio.Semaphore] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def poll_interval(provider: "Provider") -> timedelta:
+        return poll_interval(provider)
+
+    @classmethod
+    def is_due(cls, provider: "Provider", now: datetime | None = None) -> bool:
+        if not provider.enabled or provider.vendor is None:
+            return False
+        if provider.last_seen_at is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        return now - provider.last_seen_at >= cls.poll_interval(provider)
+
+    @classmethod
+    def due_providers(
+        cls,
+        providers: Iterable["Provider"],
+        now: datetime | None = None,
+    ) -> list["Provider"]:
+        now = now or datetime.now(timezone.utc)
+        return [provider for provider in providers if cls.is_due(provider, now)]
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    async def poll_due(
+        self,
+        providers: Iterable["Provider"],
+        now: datetime | None = None,
+    ) -> list[PollResult]:
+        if self.scheduler is not None:
+            return await self.poll(self.scheduler.due(providers, now))
+        return await self.poll(self.due_providers(providers, now))
+
+    async def poll(self, providers: Iterable["Provider"]) -> list[PollResult]:
+        providers = list(providers)
+        if not providers:
+            return []
+
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(self.poll_one(provider) for provider in providers)
+        )
+        if self.scheduler is not None:
+            for provider, result in zip(providers, results):
+                self.scheduler.record(provider, result)
+
+        failed = sum(1 for result in results if not result.ok)
+        logger.info(
+            "Fleet poll finished",
+            extra={
+                "providers": len(results),
+                "failed": failed,
+                "duration_sec": round(time.monotonic() - started, 3),
+            },
+        )
+        return list(results)
+
+    async def poll_one(self, provider: "Provider") -> PollResult:
+        started = time.monotonic()
+        try:
+            # The lease keeps the adapter open even if the cache evicts it.
+            with self.adapter_lease(provider) as adapter:
+                async with self._vendor_slot(provider.vendor), self._host_slot(
+                    adapter.host
+                ):
+                    measurement = await adapter.fetch_measurement()
+        except Exception as exc:
+            logger.warning(
+                "Provider poll failed",
+                extra={
+                    "provider_id": provider.id,
+                    "vendor": provider.vendor.value if provider.vendor else None,
+                    "error": str(exc),
+                },
+            )
+            return PollResult(
+                provider_id=provider.id,
+                error=exc,
+                duration_sec=time.monotonic() - started,
+            )
+
+        if self.state_cache is not None and measurement is not None:
+            await self.state_cache.put_measurement(measurement)
+
+        return PollResult(
+            provider_id=provider.id,
+            measurement=measurement,
+            duration_sec=time.monotonic() - started,
+        )
+
+    def _vendor_slot(self, vendor: ProviderVendor | None) -> asyncio.Semaphore:
+        slot = self._vendor_slots.get(vendor)
+        if slot is None:
+            limit = self.vendor_limits.get(vendor, self.default_vendor_limit)
+            slot = asyncio.Semaphore(limit)
+            self._vendor_slots[vendor] = slot
+        return slot
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.host_limit)
+            self._host_slots[host] = slot
+        return slot
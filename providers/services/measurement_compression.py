@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping
+
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+logger = logging.getLogger(__name__)
+
+# Series key of the primary measured value; metric series use their metric key.
+VALUE_SERIES: str | None = None
+
+Deadbands = Mapping[str | None, float | None]
+
+
+class SwingingDoor:
+    """
+    Swinging-door state of one series.
+
+    Points are kept while a single line from the last archived point
+    (anchor) stays within `deadband` of all of them. Slopes are per
+    second, areas in value·seconds.
+    """
+
+    def __init__(self, deadband: float) -> None:
+        self.deadband = deadband
+        self.anchor: tuple[float, float] | None = None
+        self._last: tuple[float, float] | None = None
+        self._slope_max = math.inf
+        self._slope_min = -math.inf
+        self._raw_area = 0.0
+        self.energy_error = 0.0
+        self.energy_error_bound = 0.0
+
+    def _slopes(self, t: float, v: float) -> tuple[float, float]:
+        anchor_t, anchor_v = self.anchor
+        dt = t - anchor_t
+        return (
+            min(self._slope_max, (v + self.deadband - anchor_v) / dt),
+            max(self._slope_min, (v - self.deadband - anchor_v) / dt),
+        )
+
+    def violates(self, t: float, v: float) -> bool:
+        if self.anchor is None or t <= self.anchor[0]:
+            return False
+        slope_max, slope_min = self._slopes(t, v)
+        return slope_min > slope_max
+
+    def extend(self, t: float, v: float) -> None:
+        if self.anchor is None:
+            self.anchor_at(t, v)
+            return
+        if t <= self._last[0]:
+            return
+
+        self._slope_max, self._slope_min = self._slopes(t, v)
+        last_t, last_v = self._last
+        self._raw_area += (last_v + v) / 2 * (t - last_t)
+        self._last = (t, v)
+
+    def anchor_at(self, t: float, v: float) -> None:
+        """Archive (t, v): close the current segment and start a new door."""
+        if self.anchor is not None and t > self.anchor[0]:
+            anchor_t, anchor_v = self.anchor
+            reconstructed = (anchor_v + v) / 2 * (t - anchor_t)
+            self.energy_error += abs(self._raw_area - reconstructed)
+            self.energy_error_bound += self.deadband * (t - anchor_t)
+
+        self.anchor = (t, v)
+        self._last = (t, v)
+        self._slope_max = math.inf
+        self._slope_min = -math.inf
+        self._raw_area = 0.0
+
+
+@dataclass
+class _ProviderState:
+    deadbands: dict[str | None, float | None]
+    loaded_at: float
+    doors: dict[str | None, SwingingDoor] = field(default_factory=dict)
+    held: NormalizedMeasurement | None = None
+    last_stored_at: float | None = None
+    received: int = 0
+    stored: int = 0
+
+
+class MeasurementCompressor:
+    """
+    Swinging-door compression of provider readings before persistence.
+
+    Each series (the primary value and every extra metric) has its own
+    door, sized by the provider's `measurement_deadband` or the metric's
+    `ProviderMetricDefinition.compression_deadband`. A reading is dropped
+    while every series can be reconstructed by linear interpolation
+    between stored rows within its deadband. When any door breaks, the
+    previous reading is stored retroactively and all doors restart from
+    it. Series without a deadband, and missing values, are never
+    compressed, so such readings are always stored. A row is forced every
+    `max_gap_sec`.
+
+    Per series, the area between raw and reconstructed signal (energy for
+    power series) is accumulated with its bound `deadband * duration`.
+    `energy_report()` returns both.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_gap_sec: float | None = None,
+        deadband_refresh_sec: float = 300.0,
+    ) -> None:
+        self.max_gap_sec = (
+            provider_settings.PROVIDER_MEASUREMENT_HEARTBEAT_SEC
+            if max_gap_sec is None
+            else max_gap_sec
+        )
+        self.deadband_refresh_sec = deadband_refresh_sec
+        self._states: dict[int, _ProviderState] = {}
+        self._lock = threading.Lock()
+
+    def offer(
+        self,
+        measurement: NormalizedMeasurement,
+        load_deadbands: Callable[[], Deadbands],
+    ) -> list[NormalizedMeasurement]:
+        """Returns the readings to persist now, oldest first (possibly none)."""
+        with self._lock:
+            state = self._state_for(measurement.provider_id, load_deadbands)
+            state.received += 1
+
+            series = _series(measurement)
+            if not any(state.deadbands.get(key) is not None for key in series):
+                return self._store(state, measurement, series)
+
+            t = measurement.measured_at.timestamp()
+            uncompressed = any(
+                value is None or state.deadbands.get(key) is None
+                for key, value in series.items()
+            )
+            broken = uncompressed or any(
+                self._door(state, key).violates(t, value)
+                for key, value in series.items()
+            )
+
+            stored: list[NormalizedMeasurement] = []
+            if broken and state.held is not None:
+                stored += self._store(state, state.held, _series(state.held))
+
+            if state.last_stored_at is None or uncompressed:
+                return stored + self._store(state, measurement, series)
+            if self.max_gap_sec and t - state.last_stored_at >= self.max_gap_sec:
+                return stored + self._store(state, measurement, series)
+
+            for key, value in series.items():
+                self._door(state, key).extend(t, value)
+            state.held = measurement
+            return stored
+
+    def compresses(self, provider_id: int) -> bool:
+        """True once `provider_id` has a deadband on at least one series."""
+        with self._lock:
+            state = self._states.get(provider_id)
+            return state is not None and any(
+                deadband is not None for deadband in state.deadbands.values()
+            )
+
+    def flush(self, provider_id: int) -> NormalizedMeasurement | None:
+        """Hand back the reading held for `provider_id`, e.g. on shutdown."""
+        with self._lock:
+            state = self._states.get(provider_id)
+            if state is None or state.held is None:
+                return None
+            held = state.held
+            self._store(state, held, _series(held))
+            return held
+
+    def forget(self, provider_id: int) -> None:
+        with self._lock:
+            self._states.pop(provider_id, None)
+
+    def energy_report(self, provider_id: int) -> dict[str, dict[str, float]]:
+        """Integration error per series in value·hours (Wh for W series)."""
+        with self._lock:
+            state = self._states.get(provider_id)
+            if state is None:
+                return {}
+            return {
+                key or "value": {
+                    "error": door.energy_error / 3600,
+                    "bound": door.energy_error_bound / 3600,
+                }
+                for key, door in state.doors.items()
+            }
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            received = sum(state.received for state in self._states.values())
+            stored = sum(state.stored for state in self._states.values())
+        return {
+            "providers": len(self._states),
+            "received": received,
+            "stored": stored,
+            "dropped": received - stored,
+            "ratio": round(received / stored, 2) if stored else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _state_for(
+        self,
+        provider_id: int,
+        load_deadbands: Callable[[], Deadbands],
+    ) -> _ProviderState:
+        now = time.monotonic()
+        state = self._states.get(provider_id)
+        if state is not None and now - state.loaded_at < self.deadband_refresh_sec:
+            return state
+
+        deadbands = {
+            key: (float(value) if value is not None and value >= 0 else None)
+            for key, value in load_deadbands().items()
+        }
+        if state is not None and state.deadbands == deadbands:
+            state.loaded_at = now
+            return state
+
+        if state is not None:
+            logger.info(
+                "Measurement deadbands changed, restarting compression",
+                extra={"provider_id": provider_id},
+            )
+        state = _ProviderState(deadbands=deadbands, loaded_at=now)
+        self._states[provider_id] = state
+        return state
+
+    @staticmethod
+    def _door(state: _ProviderState, key: str | None) -> SwingingDoor:
+        door = state.doors.get(key)
+        if door is None:
+            door = SwingingDoor(state.deadbands.get(key) or 0.0)
+            state.doors[key] = door
+        return door
+
+    def _store(
+        self,
+        state: _ProviderState,
+        measurement: NormalizedMeasurement,
+        series: dict[str | None, float | None],
+    ) -> list[NormalizedMeasurement]:
+        t = measurement.measured_at.timestamp()
+        for key, value in series.items():
+            if value is not None and state.deadbands.get(key) is not None:
+                door = self._door(state, key)
+                door.extend(t, value)
+                door.anchor_at(t, value)
+        if state.held is measurement or (
+            state.held is not None and state.held.measured_at <= measurement.measured_at
+        ):
+            state.held = None
+        state.last_stored_at = t
+        state.stored += 1
+        return [measurement]
+
+
+def _series(measurement: NormalizedMeasurement) -> dict[str | None, float | None]:
+    series: dict[str | None, float | None] = {VALUE_SERIES: measurement.value}
+    for metric in measurement.extra_metrics:
+        series[metric.key] = metric.value
+    return series
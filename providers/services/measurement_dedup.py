@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.schemas.normalized_measurement import NormalizedMeasurement
+
+logger = logging.getLogger(__name__)
+
+
+def measurement_fingerprint(measurement: NormalizedMeasurement) -> str:
+    """
+    Stable hash of everything the vendor reported, excluding our poll time.
+
+    Vendor-side timestamps travel in `metadata`, so a refreshed cloud
+    snapshot changes the fingerprint even if the power value did not.
+    """
+    payload = {
+        "value": measurement.value,
+        "unit": measurement.unit,
+        "metadata": measurement.metadata,
+        "metrics": sorted(
+            (metric.key, metric.value, metric.unit)
+            for metric in measurement.extra_metrics
+        ),
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class _LastWrite:
+    fingerprint: str
+    written_at: datetime
+
+
+class MeasurementDeduplicator:
+    """
+    Decides whether a polled measurement is worth a new row.
+
+    A reading identical to the last persisted one for the provider is
+    skipped, unless `heartbeat_sec` has passed since that write, so every
+    provider still gets at least one row per heartbeat. State is kept per
+    process; the first reading after a restart is always written.
+
+    `should_persist` only checks; call `record` once the row is actually
+    committed, so a failed insert or a rolled-back transaction does not
+    suppress the next identical reading.
+    """
+
+    def __init__(self, *, heartbeat_sec: float | None = None) -> None:
+        self.heartbeat_sec = (
+            provider_settings.PROVIDER_MEASUREMENT_HEARTBEAT_SEC
+            if heartbeat_sec is None
+            else heartbeat_sec
+        )
+        self.persisted = 0
+        self.skipped = 0
+        self._last: dict[int, _LastWrite] = {}
+        self._lock = threading.Lock()
+
+    def should_persist(self, measurement: NormalizedMeasurement) -> bool:
+        fingerprint = measurement_fingerprint(measurement)
+        with self._lock:
+            last = self._last.get(measurement.provider_id)
+            if (
+                last is not None
+                and last.fingerprint == fingerprint
+                and (measurement.measured_at - last.written_at).total_seconds()
+                < self.heartbeat_sec
+            ):
+                self.skipped += 1
+                return False
+            return True
+
+    def record(self, measurement: NormalizedMeasurement) -> None:
+        fingerprint = measurement_fingerprint(measurement)
+        with self._lock:
+            last = self._last.get(measurement.provider_id)
+            # Commits can land out of order; never move the heartbeat back.
+            if last is not None and last.written_at > measurement.measured_at:
+                return
+            self._last[measurement.provider_id] = _LastWrite(
+                fingerprint=fingerprint,
+                written_at=measurement.measured_at,
+            )
+            self.persisted += 1
+
+    def forget(self, provider_id: int) -> None:
+        with self._lock:
+            self._last.pop(provider_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "providers": len(self._last),
+            "persisted": self.persisted,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+from sqlalchemy.orm import Session
+
+from smart_common.core.db import SessionLocal
+from smart_common.providers.exceptions import ProviderThrottledError
+from smart_common.providers.provider_config.config import provider_settings
+from smart_common.providers.services.fleet_poller import FleetPoller, PollResult
+from smart_common.providers.services.poll_scheduler import poll_interval
+from smart_common.providers.services.timing_wheel import HierarchicalTimingWheel
+from smart_common.repositories.provider import ProviderRepository
+
+if TYPE_CHECKING:
+    from smart_common.models.provider import Provider  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+ResultHandler = Callable[["Provider", PollResult], Awaitable[None] | None]
+
+
+@dataclass
+class ProviderPollState:
+    provider: "Provider"
+    interval_sec: float
+    due_at: float
+    queued: bool = False
+    last_started_at: float | None = None
+    last_success_at: datetime | None = None
+    last_error: str | None = None
+    lag_sec: float = 0.0
+    consecutive_failures: int = 0
+
+
+class PollOrchestrator:
+    """
+    Decides when every provider of this process is polled and runs the polls.
+
+    Each provider is kept on a `HierarchicalTimingWheel` at its
+    `expected_interval_sec` (see `poll_interval`), starting at a random
+    phase so providers with the same interval do not fire together. Due
+    providers are queued for a fixed pool of `workers` tasks that poll
+    through `FleetPoller.poll_one` (per-vendor and per-host slots apply).
+
+    The next deadline is computed when a poll completes: the next slot of
+    the provider's phase after the completion time, so a slow poll skips
+    the slots it overran instead of queueing them. A throttled poll waits
+    at least `retry_after`. Successful polls are collected and written to
+    `Provider.last_seen_at` in one batch every `last_seen_flush_sec`.
+    """
+
+    def __init__(
+        self,
+        *,
+        poller: FleetPoller | None = None,
+        workers: int | None = None,
+        tick_sec: float | None = None,
+        last_seen_flush_sec: float | None = None,
+        on_result: ResultHandler | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        clock: Callable[[], float] = time.monotonic,
+        seed: int | None = None,
+    ) -> None:
+        self.poller = poller or FleetPoller()
+        self.workers = workers or provider_settings.PROVIDER_POLL_WORKERS
+        self.last_seen_flush_sec = (
+            last_seen_flush_sec or provider_settings.PROVIDER_LAST_SEEN_FLUSH_SEC
+        )
+        self.on_result = on_result
+        self.session_factory = session_factory
+        self.clock = clock
+
+        self._wheel: HierarchicalTimingWheel[int] = HierarchicalTimingWheel(
+            tick_sec=tick_sec or provider_settings.PROVIDER_POLL_TICK_SEC,
+            start=clock(),
+        )
+        self._states: dict[int, ProviderPollState] = {}
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._pending_last_seen: dict[int, datetime] = {}
+        self._rng = random.Random(seed)
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+        self.polls_ok = 0
+        self.polls_failed = 0
+
+    # ------------------------------------------------------------------
+    # Provider set
+    # ------------------------------------------------------------------
+
+    def sync(self, providers: Iterable["Provider"]) -> None:
+        """Align the schedule with the current provider list (add, update, drop)."""
+        now = self.clock()
+        seen: set[int] = set()
+
+        for provider in providers:
+            if not provider.enabled or provider.vendor is None:
+                continue
+            seen.add(provider.id)
+            interval = poll_interval(provider).total_seconds()
+            state = self._states.get(provider.id)
+
+            if state is None:
+                due_at = now + self._rng.uniform(0, interval)
+                self._states[provider.id] = ProviderPollState(
+                    provider=provider,
+                    interval_sec=interval,
+                    due_at=due_at,
+                )
+                self._wheel.schedule(provider.id, due_at)
+                continue
+
+            state.provider = provider
+            if state.interval_sec != interval:
+                state.interval_sec = interval
+                if not state.queued and provider.id in self._wheel:
+                    state.due_at = min(state.due_at, now + interval)
+                    self._wheel.schedule(provider.id, state.due_at)
+
+        for provider_id in set(self._states) - seen:
+            self.forget(provider_id)
+
+    def forget(self, provider_id: int) -> None:
+        self._wheel.cancel(provider_id)
+        self._states.pop(provider_id, None)
+
+    # ------------------------------------------------------------------
+    # Run loop
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        load_providers: Callable[[], Iterable["Provider"]] | None = None,
+        *,
+        refresh_sec: float = 300.0,
+    ) -> None:
+        """
+        Poll until `stop()` is called.
+
+        `load_providers` (e.g. `ProviderRepository.get_active_providers`
+        on a fresh session) is re-run every `refresh_sec` in a thread.
+        """
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"provider-poll-worker-{index}")
+            for index in range(self.workers)
+        ]
+        last_flush = last_refresh = self.clock()
+        if load_providers is not None:
+            self.sync(await asyncio.to_thread(lambda: list(load_providers())))
+
+        try:
+            while not self._stopping.is_set():
+                now = self.clock()
+                self.dispatch_due(now)
+
+                if now - last_flush >= self.last_seen_flush_sec:
+                    await self.flush_last_seen()
+                    last_flush = now
+                if load_providers is not None and now - last_refresh >= refresh_sec:
+                    self.sync(await asyncio.to_thread(lambda: list(load_providers())))
+                    last_refresh = now
+
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self._wheel.tick_sec
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            await self.flush_last_seen()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def dispatch_due(self, now: float | None = None) -> int:
+        """Queue every provider whose deadline passed; returns how many."""
+        due = self._wheel.advance(self.clock() if now is None else now)
+        for provider_id in due:
+            state = self._states.get(provider_id)
+            if state is None or state.queued:
+                continue
+            state.queued = True
+            self._queue.put_nowait(provider_id)
+        return len(due)
+
+    async def _worker(self) -> None:
+        while True:
+            provider_id = await self._queue.get()
+            try:
+                state = self._states.get(provider_id)
+                if state is not None:
+                    await self._poll(state)
+            except Exception:
+                logger.exception(
+                    "Provider poll handler failed",
+                    extra={"provider_id": provider_id},
+                )
+            finally:
+                self._queue.task_done()
+
+    async def _poll(self, state: ProviderPollState) -> None:
+        provider = state.provider
+        started = self.clock()
+        state.last_started_at = started
+        state.lag_sec = max(0.0, started - state.due_at)
+
+        result = await self.poller.poll_one(provider)
+        completed = self.clock()
+
+        if result.ok:
+            self.polls_ok += 1
+            state.consecutive_failures = 0
+            state.last_error = None
+            state.last_success_at = datetime.now(timezone.utc)
+            self._pending_last_seen[provider.id] = state.last_success_at
+        else:
+            self.polls_failed += 1
+            state.consecutive_failures += 1
+            state.last_error = str(result.error)
+
+        self._reschedule(state, result, completed)
+
+        if self.on_result is not None:
+            outcome = self.on_result(provider, result)
+            if inspect.isawaitable(outcome):
+                await outcome
+
+    def _reschedule(
+        self,
+        state: ProviderPollState,
+        result: PollResult,
+        completed: float,
+    ) -> None:
+        state.queued = False
+        if self._states.get(state.provider.id) is not state:
+            return
+
+        interval = state.interval_sec
+        missed = max(0, int((completed - state.due_at) // interval))
+        next_due = state.due_at + interval * (missed + 1)
+
+        if isinstance(result.error, ProviderThrottledError):
+            next_due = max(next_due, completed + (result.error.retry_after or interval))
+
+        state.due_at = next_due
+        self._wheel.schedule(state.provider.id, next_due)
+
+    # ------------------------------------------------------------------
+    # last_seen_at
+    # ------------------------------------------------------------------
+
+    async def flush_last_seen(self) -> int:
+        if not self._pending_last_seen:
+            return 0
+
+        batch, self._pending_last_seen = self._pending_last_seen, {}
+        try:
+            return await asyncio.to_thread(self._write_last_seen, batch)
+        except Exception:
+            logger.exception(
+                "Provider last_seen_at flush failed",
+                extra={"providers": len(batch)},
+            )
+            # Keep the newest timestamps for the next flush.
+            for provider_id, seen_at in batch.items():
+                current = self._pending_last_seen.get(provider_id)
+                if current is None or current < seen_at:
+                    self._pending_last_seen[provider_id] = seen_at
+            return 0
+
+    def _write_last_seen(self, batch: dict[int, datetime]) -> int:
+        session = self.session_factory()
+        try:
+            updated = ProviderRepository(session).update_last_seen_many(batch)
+            session.commit()
+            return updated
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def state(self, provider_id: int) -> ProviderPollState | None:
+        return self._states.get(provider_id)
+
+    def stats(self) -> dict[str, Any]:
+        lags = sorted(state.lag_sec for state in self._states.values())
+        return {
+            "providers": len(self._states),
+            "scheduled": len(self._wheel),
+            "queued": self._queue.qsize(),
+            "workers": self.workers,
+            "polls_ok": self.polls_ok,
+            "polls_failed": self.polls_failed,
+            "lag_p50_sec": round(lags[len(lags) // 2], 3) if lags else 0.0,
+            "lag_max_sec": round(lags[-1], 3) if lags else 0.0,
+            "last_seen_pending": len(self._pending_last_seen),
+        }
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable
+
+from smart_common.providers.adapters.factory import provider_account_key
+from smart_common.providers.definitions.base import ProviderDefinitionRegistry
+from smart_common.providers.exceptions import ProviderThrottledError
+from smart_common.providers.provider_config.config import provider_settings
+
+if TYPE_CHECKING:
+    from smart_common.models.provider import Provider  # noqa: F401
+    from smart_common.providers.services.fleet_poller import PollResult  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SEC = 60
+
+
+def poll_interval(provider: "Provider") -> timedelta:
+    seconds = provider.expected_interval_sec
+    if not seconds and provider.vendor is not None:
+        definition = ProviderDefinitionRegistry.get(provider.vendor)
+        seconds = definition.default_expected_interval_sec if definition else None
+    return timedelta(seconds=seconds or DEFAULT_POLL_INTERVAL_SEC)
+
+
+class AdaptivePollScheduler:
+    """
+    Decides when each provider is polled next.
+
+    Providers sharing one vendor account get evenly spaced first slots
+    within their `expected_interval_sec`, so an account's quota is spent
+    across the interval instead of in one burst. After that each provider
+    keeps its phase. A throttled poll blocks the whole account for an
+    exponentially growing backoff (capped by
+    PROVIDER_THROTTLE_MAX_BACKOFF_SEC); the next unthrottled poll resets it.
+    """
+
+    def __init__(
+        self,
+        *,
+        account_key: Callable[["Provider"], Hashable] = provider_account_key,
+        base_backoff_sec: float | None = None,
+        max_backoff_sec: float | None = None,
+    ) -> None:
+        self.account_key = account_key
+        self.base_backoff_sec = (
+            base_backoff_sec or provider_settings.PROVIDER_THROTTLE_BACKOFF_SEC
+        )
+        self.max_backoff_sec = (
+            max_backoff_sec or provider_settings.PROVIDER_THROTTLE_MAX_BACKOFF_SEC
+        )
+        self._next_due: dict[int, datetime] = {}
+        self._accounts: dict[int, Hashable] = {}
+        self._backoff_sec: dict[Hashable, float] = {}
+        self._blocked_until: dict[Hashable, datetime] = {}
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def due(
+        self,
+        providers: Iterable["Provider"],
+        now: datetime | None = None,
+    ) -> list["Provider"]:
+        now = now or datetime.now(timezone.utc)
+        active = [p for p in providers if p.enabled and p.vendor is not None]
+        self._place_new(active, now)
+
+        return [
+            provider
+            for provider in active
+            if self._next_due[provider.id] <= now
+            and self._blocked_until.get(self._accounts[provider.id], now) <= now
+        ]
+
+    def next_due_at(self, provider_id: int) -> datetime | None:
+        return self._next_due.get(provider_id)
+
+    def _place_new(self, providers: list["Provider"], now: datetime) -> None:
+        new = [p for p in providers if p.id not in self._next_due]
+        if not new:
+            return
+
+        for provider in new:
+            self._accounts[provider.id] = self.account_key(provider)
+
+        members: dict[Hashable, list["Provider"]] = defaultdict(list)
+        for provider in providers:
+            members[self._accounts[provider.id]].append(provider)
+
+        for provider in new:
+            group = sorted(members[self._accounts[provider.id]], key=lambda p: p.id)
+            slot = group.index(provider)
+            offset = poll_interval(provider) * slot / len(group)
+            self._next_due[provider.id] = now + offset
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        provider: "Provider",
+        result: "PollResult",
+        now: datetime | None = None,
+    ) -> None:
+        now = now or datetime.now(timezone.utc)
+        account = self._accounts.get(provider.id)
+        if account is None:
+            account = self._accounts[provider.id] = self.account_key(provider)
+        interval = poll_interval(provider)
+
+        if isinstance(result.error, ProviderThrottledError):
+            previous = self._backoff_sec.get(account)
+            backoff = min(
+                self.max_backoff_sec,
+                max(
+                    result.error.retry_after or 0.0,
+                    previous * 2 if previous else self.base_backoff_sec,
+                ),
+            )
+            self._backoff_sec[account] = backoff
+            blocked_until = now + timedelta(seconds=backoff)
+            self._blocked_until[account] = blocked_until
+            self._next_due[provider.id] = max(now + interval, blocked_until)
+            logger.warning(
+                "Provider account throttled, backing off",
+                extra={
+                    "provider_id": provider.id,
+                    "vendor": provider.vendor.value if provider.vendor else None,
+                    "backoff_sec": backoff,
+                },
+            )
+            return
+
+        self._backoff_sec.pop(account, None)
+        self._blocked_until.pop(account, None)
+
+        # Keep the provider's phase; skip slots missed while it was blocked.
+        previous_due = self._next_due.get(provider.id, now)
+        missed = (now - previous_due) // interval + 1 if now >= previous_due else 1
+        self._next_due[provider.id] = previous_due + interval * missed
+
+    def forget(self, provider_id: int) -> None:
+        self._next_due.pop(provider_id, None)
+        self._accounts.pop(provider_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "providers": len(self._next_due),
+            "accounts": len(set(self._accounts.values())),
+            "throttled_accounts": len(self._blocked_until),
+        }
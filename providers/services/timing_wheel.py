@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+_OVERFLOW = -1
+
+
+class HierarchicalTimingWheel(Generic[K]):
+    """
+    Hierarchical timing wheel holding one deadline per key.
+
+    Level 0 has `slots` buckets of `tick_sec`; every further level covers
+    `slots` times the span of the one below (64 slots of 1s reach ~3 days
+    with 3 levels). Scheduling and cancelling are O(1); `advance()` costs
+    O(1) per elapsed tick plus the keys that fire or cascade down. Keys
+    beyond the top level wait in an overflow bucket until the top level
+    wraps.
+
+    Deadlines are plain floats on whatever clock the caller uses
+    (`time.monotonic()` for the poll orchestrator).
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_sec: float = 1.0,
+        slots: int = 64,
+        levels: int = 3,
+        start: float = 0.0,
+    ) -> None:
+        if tick_sec <= 0 or slots < 2 or levels < 1:
+            raise ValueError("Timing wheel needs tick_sec > 0, slots >= 2, levels >= 1")
+
+        self.tick_sec = tick_sec
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: list[list[set[K]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: set[K] = set()
+        # key -> (due tick, level, slot); level _OVERFLOW for the overflow bucket.
+        self._entries: dict[K, tuple[int, int, int]] = {}
+        self._tick = math.floor(start / tick_sec)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @property
+    def now(self) -> float:
+        """Time of the last processed tick."""
+        return self._tick * self.tick_sec
+
+    def deadline(self, key: K) -> float | None:
+        entry = self._entries.get(key)
+        return entry[0] * self.tick_sec if entry is not None else None
+
+    def schedule(self, key: K, due_at: float) -> None:
+        """(Re)schedule `key`; overdue deadlines fire on the next tick."""
+        self.cancel(key)
+        due_tick = max(math.ceil(due_at / self.tick_sec), self._tick + 1)
+        self._place(key, due_tick)
+
+    def cancel(self, key: K) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, level, slot = entry
+        if level == _OVERFLOW:
+            self._overflow.discard(key)
+        else:
+            self._wheels[level][slot].discard(key)
+        return True
+
+    def advance(self, now: float) -> list[K]:
+        """Move the wheel up to `now`; returns the keys whose deadline passed."""
+        target = math.floor(now / self.tick_sec)
+        expired: list[K] = []
+
+        while self._tick < target:
+            if not self._entries:
+                self._tick = target
+                break
+
+            self._tick += 1
+            self._cascade()
+
+            bucket = self._wheels[0][self._tick % self.slots]
+            if bucket:
+                for key in bucket:
+                    del self._entries[key]
+                expired.extend(bucket)
+                bucket.clear()
+
+        return expired
+
+    def _place(self, key: K, due_tick: int) -> None:
+        delta = due_tick - self._tick
+        for level in range(self.levels):
+            if delta < self._spans[level + 1]:
+                slot = (due_tick // self._spans[level]) % self.slots
+                self._wheels[level][slot].add(key)
+                self._entries[key] = (due_tick, level, slot)
+                return
+
+        self._overflow.add(key)
+        self._entries[key] = (due_tick, _OVERFLOW, 0)
+
+    def _cascade(self) -> None:
+        # Higher levels first, so their keys can land in a lower level that
+        # is cascaded (or fired) in the same tick.
+        for level in range(self.levels, 0, -1):
+            if self._tick % self._spans[level]:
+                continue
+
+            if level == self.levels:
+                bucket, self._overflow = self._overflow, set()
+            else:
+                slot = (self._tick // self._spans[level]) % self.slots
+                bucket = self._wheels[level][slot]
+                self._wheels[level][slot] = set()
+
+            for key in bucket:
+                due_tick = self._entries[key][0]
+                self._place(key, due_tick)
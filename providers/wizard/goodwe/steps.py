@@ -26,13 +26,12 @@ class GoodWeAuthWizardStep(WizardStep):
         credentials = payload.model_dump()
         from smart_common.providers.adapters.factory import get_vendor_adapter_factory
 
-        adapter = get_vendor_adapter_factory().create(
+        with get_vendor_adapter_factory().lease(
             ProviderVendor.GOODWE,
             credentials=credentials,
             cache_key=payload.username,
-        )
-
-        station_ids = adapter.get_powerstation_ids()
+        ) as adapter:
+            station_ids = adapter.get_powerstation_ids()
         options = {
             "powerstation_id": [
                 {"value": station_id, "label": station_id} for station_id in station_ids
@@ -62,13 +61,12 @@ class GoodWePowerStationWizardStep(WizardStep):
         powerstation_id = payload.powerstation_id
         from smart_common.providers.adapters.factory import get_vendor_adapter_factory
 
-        adapter = get_vendor_adapter_factory().create(
+        with get_vendor_adapter_factory().lease(
             ProviderVendor.GOODWE,
             credentials=credentials,
             cache_key=credentials["username"],
-        )
-
-        raw = adapter.get_powerstation_detail(powerstation_id)
+        ) as adapter:
+            raw = adapter.get_powerstation_detail(powerstation_id)
 
         if not isinstance(raw, Mapping):
             raise ProviderError(
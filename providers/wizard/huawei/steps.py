@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, ContextManager, Mapping
 
 from smart_common.providers.adapters.huawei import HuaweiProviderAdapter
 from smart_common.providers.enums import ProviderVendor
@@ -19,7 +19,9 @@ from smart_common.providers.schemas.wizard.huawei import (
 # Helpers
 # ------------------------------------------------------------
 
-def _resolve_adapter(session_data: Mapping[str, Any]) -> HuaweiProviderAdapter:
+def _lease_adapter(
+    session_data: Mapping[str, Any],
+) -> ContextManager[HuaweiProviderAdapter]:
     credentials = session_data.get("credentials")
     if not credentials:
         raise WizardSessionStateError("Missing Huawei credentials in wizard session")
@@ -32,7 +34,7 @@ def _resolve_adapter(session_data: Mapping[str, Any]) -> HuaweiProviderAdapter:
 
     from smart_common.providers.adapters.factory import get_vendor_adapter_factory
 
-    return get_vendor_adapter_factory().create(
+    return get_vendor_adapter_factory().lease(
         ProviderVendor.HUAWEI,
         credentials=credentials,
         cache_key=username,
@@ -55,13 +57,12 @@ class HuaweiAuthWizardStep(WizardStep):
     ) -> WizardStepResult:
         from smart_common.providers.adapters.factory import get_vendor_adapter_factory
 
-        adapter = get_vendor_adapter_factory().create(
+        with get_vendor_adapter_factory().lease(
             ProviderVendor.HUAWEI,
             credentials={"username": payload.username, "password": payload.password},
             cache_key=payload.username,
-        )
-
-        stations = adapter.list_stations()
+        ) as adapter:
+            stations = adapter.list_stations()
         options = {
             "stations": [
                 {"value": s["station_code"], "label": s["name"]}
@@ -94,8 +95,8 @@ class HuaweiStationWizardStep(WizardStep):
         payload: HuaweiStationForm,
         session_data: Mapping[str, Any],
     ) -> WizardStepResult:
-        adapter = _resolve_adapter(session_data)
-        devices = adapter.list_devices(payload.station_code)
+        with _lease_adapter(session_data) as adapter:
+            devices = adapter.list_devices(payload.station_code)
 
         options = {
             "devices": [
@@ -1,4 +1,4 @@
-from .base import BaseRepository
+from .base import BaseRepository, KeysetPage
 from .device import DeviceRepository
 from .device_event import DeviceEventRepository
 from .device_schedule import DeviceScheduleRepository
@@ -10,9 +10,11 @@ from .measurement_repository import MeasurementRepository
 from .market_energy_price import MarketEnergyPriceRepository
 from .user import UserRepository
 from .scheduler_command_repository import SchedulerCommandRepository
+from .outbox_repository import OutboxRepository
 
 __all__ = [
     "BaseRepository",
+    "KeysetPage",
     "DeviceRepository",
     "DeviceEventRepository",
     "DeviceScheduleRepository",
@@ -24,4 +26,5 @@ __all__ = [
     "MeasurementRepository",
     "MarketEnergyPriceRepository",
     "SchedulerCommandRepository",
+    "OutboxRepository",
 ]
@@ -1,14 +1,154 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+import uuid as uuid_module
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
 from enum import Enum
-from typing import Any, Generic, Type, TypeVar, Union
-
-from sqlalchemy import UUID, String, func, or_
+from typing import Any, Generic, Sequence, Type, TypeVar, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    UUID,
+    String,
+    and_,
+    func,
+    inspect,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+)
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
 from sqlalchemy.sql.sqltypes import Integer, Boolean, String
 
+from smart_common.enums.pagination import CountMode
+from smart_common.repositories.search import (
+    contains,
+    is_uuid_column,
+    parse_uuid,
+    rank_expression,
+    text_conditions,
+    uuid_conditions,
+)
+
 ModelT = TypeVar("ModelT")
 
+DEFAULT_COUNT_CAP = 10_000
+
+
+@dataclass
+class KeysetPage(Generic[ModelT]):
+    items: list[ModelT] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+# ----------------------------------------------------------------------
+# Cursor encoding
+# ----------------------------------------------------------------------
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid_module.UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    (tag, raw), = value.items()
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "u":
+        return uuid_module.UUID(raw)
+    if tag == "n":
+        return Decimal(raw)
+    raise ValueError(f"unknown cursor value tag {tag!r}")
+
+
+def _coerce_value(value: Any, column: Any) -> Any:
+    """`value` as the Python type of `column`, or ValueError."""
+    if value is None:
+        raise ValueError("cursor values must not be null")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, bool) and python_type is not bool:
+        raise ValueError("unexpected boolean cursor value")
+    if isinstance(value, python_type):
+        return value
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if python_type is Decimal and isinstance(value, (int, float)):
+        return Decimal(str(value))
+    raise ValueError(
+        f"cursor value for {column} must be {python_type.__name__}"
+    )
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    """Opaque cursor: the order-by keys and the last row's values."""
+    payload = {"k": list(keys), "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(
+    cursor: str,
+    keys: Sequence[str],
+    columns: Sequence[Any] | None = None,
+) -> list[Any]:
+    """
+    Values of a cursor from `encode_cursor`. With `columns`, each value is
+    checked against the column type, so a tampered cursor is a 400 rather
+    than a failing bind parameter.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != list(keys) or len(payload["v"]) != len(keys):
+            raise ValueError("cursor does not match the ordering")
+        values = [_decode_value(value) for value in payload["v"]]
+        if columns is not None:
+            values = [_coerce_value(value, column) for value, column in zip(values, columns)]
+        return values
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+
+def _order_column(expression: Any) -> tuple[Any, bool]:
+    """(column, descending) from `col`, `col.asc()` or `col.desc()`."""
+    if isinstance(expression, UnaryExpression) and expression.modifier in (
+        operators.asc_op,
+        operators.desc_op,
+    ):
+        return expression.element, expression.modifier is operators.desc_op
+    return expression, False
+
 
 class BaseRepository(Generic[ModelT]):
     """
@@ -59,7 +199,7 @@ class BaseRepository(Generic[ModelT]):
                 query = query.filter(column.is_(value))
 
             elif isinstance(col_type, String) and isinstance(value, str):
-                query = query.filter(column.ilike(f"%{value}%"))
+                query = query.filter(contains(column, value))
 
             else:
                 query = query.filter(column == value)
@@ -73,19 +213,25 @@ class BaseRepository(Generic[ModelT]):
         search: str | None,
         search_fields: dict[str, Any],
     ) -> Query:
+        search = (search or "").strip()
         if not search or not search_fields:
             return query
 
+        columns = list(search_fields.values())
         conditions: list[Any] = []
 
-        for column in search_fields.values():
+        for column in columns:
             col_type = column.type
 
             if isinstance(col_type, Integer) and search.isdigit():
                 conditions.append(column == int(search))
 
-            elif isinstance(col_type, String):
-                conditions.append(column.ilike(f"%{search}%"))
+            elif is_uuid_column(column):
+                conditions.extend(uuid_conditions(column, search))
+
+        # A full UUID only ever matches a uuid column.
+        if not (conditions and parse_uuid(search)):
+            conditions.extend(text_conditions(columns, search))
 
         if not conditions:
             return query
@@ -152,7 +298,12 @@ class BaseRepository(Generic[ModelT]):
         search_fields: dict[str, Any],
         order_by: Any | None = None,
         base_query: Query | None = None,
+        rank: bool = False,
     ) -> list[ModelT]:
+        """
+        With `rank`, matches are ordered by full-text relevance first and
+        `order_by` (or `default_order_by`) only breaks ties.
+        """
         query = base_query or self._base_query()
 
         query = self._apply_search(
@@ -161,7 +312,15 @@ class BaseRepository(Generic[ModelT]):
             search_fields=search_fields,
         )
 
-        if order_by is not None:
+        if rank and search and search.strip():
+            relevance = rank_expression(
+                search_fields.values(), search.strip()
+            )
+            tie_breaker = order_by if order_by is not None else self.default_order_by
+            query = query.order_by(None).order_by(relevance.desc())
+            if tie_breaker is not None:
+                query = query.order_by(tie_breaker)
+        elif order_by is not None:
             query = query.order_by(order_by)
 
         return query.offset(offset).limit(limit).all()
@@ -172,7 +331,12 @@ class BaseRepository(Generic[ModelT]):
         search: str | None,
         search_fields: dict[str, Any],
         base_query: Query | None = None,
+        mode: CountMode = CountMode.EXACT,
+        cap: int = DEFAULT_COUNT_CAP,
     ) -> int:
+        if mode is not CountMode.EXACT and not search and base_query is None:
+            return self.fast_count(mode=mode, cap=cap)
+
         query = base_query or self._base_query()
 
         query = self._apply_search(
@@ -181,7 +345,110 @@ class BaseRepository(Generic[ModelT]):
             search_fields=search_fields,
         )
 
-        return query.count()
+        return self.fast_count(query, mode=mode, cap=cap)
+
+    def list_keyset(
+        self,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        order_by: Any | Sequence[Any] | None = None,
+        search: str | None = None,
+        search_fields: dict[str, Any] | None = None,
+        base_query: Query | None = None,
+    ) -> KeysetPage[ModelT]:
+        """
+        Cursor-paginated counterpart of `list_with_search`.
+
+        Rows after the cursor are selected with a WHERE on the order-by
+        columns instead of OFFSET, so every page costs the same index range
+        scan. The primary key is appended as a tie-breaker. Order-by
+        columns must be NOT NULL.
+        """
+        if order_by is None:
+            order_by = self.default_order_by
+        if order_by is None:
+            expressions: list[Any] = []
+        elif isinstance(order_by, (list, tuple)):
+            expressions = list(order_by)
+        else:
+            expressions = [order_by]
+
+        columns = [_order_column(expression) for expression in expressions]
+        for pk_column in inspect(self.model).primary_key:
+            if not any(column is pk_column for column, _ in columns):
+                columns.append((pk_column, False))
+        keys = [str(column) for column, _ in columns]
+
+        query = (base_query or self.session.query(self.model)).order_by(None)
+        query = self._apply_search(
+            query,
+            search=search,
+            search_fields=search_fields or {},
+        )
+
+        if cursor is not None:
+            values = decode_cursor(cursor, keys, [column for column, _ in columns])
+            query = query.filter(self._keyset_after(columns, values))
+
+        query = query.order_by(
+            *(column.desc() if descending else column.asc() for column, descending in columns)
+        )
+        rows = query.add_columns(*(column for column, _ in columns)).limit(limit + 1).all()
+
+        page = KeysetPage(items=[row[0] for row in rows[:limit]])
+        if len(rows) > limit:
+            page.next_cursor = encode_cursor(keys, rows[limit - 1][1:])
+        return page
+
+    @staticmethod
+    def _keyset_after(columns: list[tuple[Any, bool]], values: list[Any]) -> Any:
+        values = [literal(value, column.type) for (column, _), value in zip(columns, values)]
+        directions = {descending for _, descending in columns}
+        if len(directions) == 1:
+            # Row-value comparison lets PostgreSQL use a composite index.
+            left = tuple_(*(column for column, _ in columns))
+            right = tuple_(*values)
+            return left < right if directions.pop() else left > right
+
+        conditions = []
+        for index, (column, descending) in enumerate(columns):
+            preceding = [columns[i][0] == values[i] for i in range(index)]
+            after = column < values[index] if descending else column > values[index]
+            conditions.append(and_(*preceding, after))
+        return or_(*conditions)
+
+    def fast_count(
+        self,
+        query: Query | None = None,
+        *,
+        mode: CountMode = CountMode.ESTIMATED,
+        cap: int = DEFAULT_COUNT_CAP,
+    ) -> int:
+        """
+        Row count without scanning the whole result.
+
+        ESTIMATED on the unfiltered table reads the planner statistics in
+        `pg_class.reltuples`; with a `query` it falls back to CAPPED, which
+        counts at most `cap` rows. EXACT is `query.count()`.
+        """
+        if mode is CountMode.EXACT:
+            return (query or self.session.query(self.model)).count()
+
+        if mode is CountMode.ESTIMATED and query is None:
+            estimate = self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__table__.fullname},
+            ).scalar()
+            # -1 / NULL until the table has been vacuumed or analyzed.
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+
+        query = query or self.session.query(self.model)
+        limited = query.order_by(None).limit(cap).subquery()
+        return self.session.execute(
+            select(func.count()).select_from(limited)
+        ).scalar() or 0
 
     def partial_update(
         self,
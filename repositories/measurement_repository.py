@@ -3,12 +3,13 @@ from __future__ import annotations
 from datetime import datetime
 from collections.abc import Mapping
 import logging
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
-from sqlalchemy import select
-from sqlalchemy.orm import object_session
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
 from sqlalchemy.orm.exc import UnmappedInstanceError
 
+from smart_common.core.db import replica_read
 from smart_common.models.provider import Provider
 from smart_common.models.provider_metric_definition import ProviderMetricDefinition
 from smart_common.models.provider_metric_sample import ProviderMetricSample
@@ -21,8 +22,20 @@ from smart_common.enums.provider_telemetry import (
 )
 from smart_common.schemas.normalized_measurement import NormalizedMeasurement
 
+if TYPE_CHECKING:
+    from smart_common.providers.services.measurement_compression import (  # noqa: F401
+        MeasurementCompressor,
+    )
+    from smart_common.providers.services.measurement_dedup import (  # noqa: F401
+        MeasurementDeduplicator,
+    )
+
 logger = logging.getLogger(__name__)
 
+# session.info key of the measurements waiting for commit before the
+# deduplicator may treat them as written.
+_DEDUP_PENDING_KEY = "measurement_dedup_pending"
+
 SYSTEM_METADATA_KEYS = frozenset(
     {
         "unit_source",
@@ -78,9 +91,35 @@ def _count_nested_entries(value: Any) -> int:
     return 1
 
 
+def _record_pending_dedup(session: Session) -> None:
+    pending = session.info.get(_DEDUP_PENDING_KEY)
+    if not pending:
+        return
+    for deduplicator, measurement in pending:
+        deduplicator.record(measurement)
+    pending.clear()
+
+
+def _drop_pending_dedup(session: Session, previous_transaction: Any) -> None:
+    pending = session.info.get(_DEDUP_PENDING_KEY)
+    if pending:
+        pending.clear()
+
+
 class MeasurementRepository(BaseRepository[ProviderMeasurement]):
     model = ProviderMeasurement
 
+    def __init__(
+        self,
+        session: Session,
+        *,
+        deduplicator: "MeasurementDeduplicator | None" = None,
+        compressor: "MeasurementCompressor | None" = None,
+    ) -> None:
+        super().__init__(session)
+        self.deduplicator = deduplicator
+        self.compressor = compressor
+
     @staticmethod
     def split_metadata(metadata: Mapping[str, Any] | None) -> tuple[dict[str, Any], dict[str, Any]]:
         return _split_metadata(metadata)
@@ -96,6 +135,84 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
         if provider.id is None:
             raise ValueError("provider must be persisted before saving measurements")
 
+        # The compressor needs every reading of a plateau to store its end;
+        # it drops the repeats itself, so the deduplicator only gates
+        # providers it does not compress.
+        compressed = (
+            self.compressor is not None
+            and self.compressor.compresses(measurement.provider_id)
+        )
+        if (
+            self.deduplicator is not None
+            and not force_insert
+            and not compressed
+            and not self.deduplicator.should_persist(measurement)
+        ):
+            logger.debug(
+                "Measurement unchanged, skipped",
+                extra={"provider_id": provider.id, "poll_id": poll_id},
+            )
+            return None
+
+        if self.compressor is None or force_insert:
+            entry = self._insert_measurement(
+                provider,
+                measurement,
+                poll_id=poll_id,
+                force_insert=force_insert,
+            )
+            if not force_insert:
+                self._record_after_commit(measurement)
+            return entry
+
+        pending = self.compressor.offer(
+            measurement,
+            lambda: self._compression_deadbands(provider),
+        )
+        if not pending:
+            logger.debug(
+                "Measurement within deadband, held back",
+                extra={"provider_id": provider.id, "poll_id": poll_id},
+            )
+            return None
+
+        entry: ProviderMeasurement | None = None
+        for item in pending:
+            entry = self._insert_measurement(provider, item, poll_id=poll_id)
+            self._record_after_commit(item)
+        return entry
+
+    def _record_after_commit(self, measurement: NormalizedMeasurement) -> None:
+        """Tell the deduplicator about `measurement` once the session commits."""
+        if self.deduplicator is None:
+            return
+        pending = self.session.info.get(_DEDUP_PENDING_KEY)
+        if pending is None:
+            pending = self.session.info[_DEDUP_PENDING_KEY] = []
+            event.listen(self.session, "after_commit", _record_pending_dedup)
+            event.listen(self.session, "after_soft_rollback", _drop_pending_dedup)
+        pending.append((self.deduplicator, measurement))
+
+    def _compression_deadbands(self, provider: Provider) -> dict[str | None, float | None]:
+        deadbands: dict[str | None, float | None] = {
+            None: self._resolve_provider(provider).measurement_deadband,
+        }
+        # Write path: read definitions from the primary, not a lagging replica.
+        definitions = self.session.query(ProviderMetricDefinition).filter(
+            ProviderMetricDefinition.provider_id == provider.id
+        )
+        for definition in definitions:
+            deadbands[definition.metric_key] = definition.compression_deadband
+        return deadbands
+
+    def _insert_measurement(
+        self,
+        provider: Provider,
+        measurement: NormalizedMeasurement,
+        *,
+        poll_id: str | None = None,
+        force_insert: bool = False,
+    ) -> ProviderMeasurement:
         incoming_metadata = _normalize_metadata(measurement.metadata)
         system_metadata, extra_data = self.split_metadata(incoming_metadata)
         persisted_provider = self._resolve_provider(provider)
@@ -111,11 +228,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
         self.session.add(entry)
         self.session.flush()
         self._sync_metric_samples(
-<<<<<<< Updated upstream
             provider=persisted_provider,
-=======
-            provider=provider,
->>>>>>> Stashed changes
             entry=entry,
             measurement=measurement,
         )
@@ -137,36 +250,9 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
 
         return entry
 
-<<<<<<< Updated upstream
     def _resolve_provider(self, provider: Provider) -> Provider:
         if provider.id is None:
             raise ValueError("provider must be persisted before saving measurements")
-=======
-    def _update_last_measurement(
-        self,
-        entry: ProviderMeasurement,
-        measurement: NormalizedMeasurement,
-        *,
-        metadata_parts: tuple[dict[str, Any], dict[str, Any]],
-        provider_id: int,
-        poll_id: str | None,
-        incoming_metadata: dict[str, Any],
-    ) -> None:
-        system_metadata, extra_data = metadata_parts
-        entry.measured_at = measurement.measured_at
-        entry.measured_unit = measurement.unit
-        entry.measured_value = measurement.value
-        entry.metadata_payload = system_metadata
-        existing_extra_data = _normalize_metadata(entry.extra_data)
-        entry.extra_data = _deep_merge_dict(existing_extra_data, extra_data)
-        self.session.add(entry)
-        self.session.flush()
-        self._replace_metric_samples(
-            provider=provider_id,
-            entry=entry,
-            measurement=measurement,
-        )
->>>>>>> Stashed changes
 
         try:
             current_session = object_session(provider)
@@ -184,6 +270,15 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
 
         return persisted_provider
 
+    def get_last_measurement(self, provider_id: int) -> ProviderMeasurement | None:
+        stmt = (
+            select(ProviderMeasurement)
+            .where(ProviderMeasurement.provider_id == provider_id)
+            .order_by(ProviderMeasurement.measured_at.desc())
+            .limit(1)
+        )
+        return self.session.execute(stmt).scalars().first()
+
     def get_last_measurements(
         self,
         provider_ids: Iterable[int],
@@ -255,6 +350,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .all()
         )
 
+    @replica_read
     def list_metric_definitions(
         self,
         *,
@@ -267,6 +363,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .all()
         )
 
+    @replica_read
     def get_metric_definition(
         self,
         *,
@@ -282,6 +379,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .first()
         )
 
+    @replica_read
     def list_metric_samples(
         self,
         *,
@@ -302,6 +400,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .all()
         )
 
+    @replica_read
     def list_power_samples(
         self,
         *,
@@ -324,6 +423,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .all()
         )
 
+    @replica_read
     def list_measurements(
         self,
         *,
@@ -342,6 +442,7 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .all()
         )
 
+    @replica_read
     def get_last_power_sample_before(
         self,
         *,
@@ -362,29 +463,6 @@ class MeasurementRepository(BaseRepository[ProviderMeasurement]):
             .first()
         )
 
-<<<<<<< Updated upstream
-=======
-    def _replace_metric_samples(
-        self,
-        *,
-        provider: int,
-        entry: ProviderMeasurement,
-        measurement: NormalizedMeasurement,
-    ) -> None:
-        self.session.query(ProviderMetricSample).filter(
-            ProviderMetricSample.provider_measurement_id == entry.id,
-        ).delete(synchronize_session=False)
-        self.session.flush()
-        persisted_provider = self.session.get(Provider, provider)
-        if persisted_provider is None:
-            return
-        self._sync_metric_samples(
-            provider=persisted_provider,
-            entry=entry,
-            measurement=measurement,
-        )
-
->>>>>>> Stashed changes
     def _sync_metric_samples(
         self,
         *,
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import json
 from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import String, cast, or_
+from sqlalchemy import String, cast, or_, text
 from sqlalchemy.orm import Query, selectinload
 
+from smart_common.enums.pagination import CountMode
 from smart_common.models.microcontroller import Microcontroller
 from smart_common.models.provider import Provider
 from smart_common.models.user import User
 from smart_common.providers.enums import ProviderType
-from smart_common.repositories.base import BaseRepository
+from smart_common.repositories.base import BaseRepository, KeysetPage
+from smart_common.repositories.search import (
+    parse_uuid,
+    text_conditions,
+    uuid_conditions,
+)
 
 
 search_fields = (
@@ -165,6 +172,70 @@ class MicrocontrollerRepository(BaseRepository[Microcontroller]):
         self.session.delete(microcontroller)
         self.session.commit()
 
+    # =====================================================
+    # DEVICES CONFIG
+    # =====================================================
+
+    def write_device_config_entry(
+        self,
+        microcontroller: Microcontroller,
+        *,
+        index: int | None,
+        entry: dict[str, Any],
+    ) -> bool:
+        """
+        Write a single `devices_config` entry with jsonb_set instead of
+        rewriting the whole config blob. `index=None` appends the entry.
+
+        Returns False when the entry at `index` no longer belongs to the
+        same device (concurrent rewrite); the caller must fall back to a
+        full config write.
+        """
+        params: dict[str, Any] = {
+            "microcontroller_id": microcontroller.id,
+            "entry": json.dumps(entry),
+        }
+
+        if index is None:
+            stmt = text(
+                """
+                UPDATE microcontrollers
+                SET config = jsonb_set(
+                    config,
+                    '{devices_config}',
+                    COALESCE(config -> 'devices_config', CAST('[]' AS jsonb))
+                        || jsonb_build_array(CAST(:entry AS jsonb))
+                )
+                WHERE id = :microcontroller_id
+                """
+            )
+        else:
+            stmt = text(
+                """
+                UPDATE microcontrollers
+                SET config = jsonb_set(
+                    config,
+                    CAST(:path AS text[]),
+                    CAST(:entry AS jsonb)
+                )
+                WHERE id = :microcontroller_id
+                  AND config #>> CAST(:device_id_path AS text[]) = :device_id
+                """
+            )
+            params.update(
+                path=f"{{devices_config,{index}}}",
+                device_id_path=f"{{devices_config,{index},device_id}}",
+                device_id=str(entry["device_id"]),
+            )
+
+        result = self.session.execute(stmt, params)
+        if result.rowcount != 1:
+            return False
+
+        # The in-memory config is stale now; reload it on next access.
+        self.session.expire(microcontroller, ["config"])
+        return True
+
     # =====================================================
     # ADMIN LISTING
     # =====================================================
@@ -193,19 +264,51 @@ class MicrocontrollerRepository(BaseRepository[Microcontroller]):
 
         return query.offset(offset).limit(limit).all()
 
-    def count_admin(self, *, search: str | None) -> int:
+    def list_admin_page(
+        self,
+        *,
+        limit: int,
+        cursor: str | None,
+        search: str | None,
+        order_by: Any | None = None,
+    ) -> KeysetPage[Microcontroller]:
+        query = (
+            self.session.query(self.model)
+            .outerjoin(User)
+            .options(*self._full_options())
+        )
+
+        if search:
+            query = self._apply_microcontroller_search(query, search)
+
+        return self.list_keyset(
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            base_query=query,
+        )
+
+    def count_admin(
+        self,
+        *,
+        search: str | None,
+        mode: CountMode = CountMode.EXACT,
+    ) -> int:
         query = self.session.query(self.model).outerjoin(User)
 
         if search:
             query = self._apply_microcontroller_search(query, search)
+        elif mode is CountMode.ESTIMATED:
+            return self.fast_count(mode=mode)
 
-        return query.count()
+        return self.fast_count(query, mode=mode)
 
     # =====================================================
     # SEARCH
     # =====================================================
 
     def _apply_microcontroller_search(self, query: Query, search: str) -> Query:
+        search = search.strip()
         conditions = []
 
         if search.isdigit():
@@ -213,14 +316,10 @@ class MicrocontrollerRepository(BaseRepository[Microcontroller]):
             conditions.append(self.model.id == value)
             conditions.append(self.model.user_id == value)
 
-        try:
-            uuid = UUID(search)
-            conditions.append(self.model.uuid == uuid)
-        except ValueError:
-            pass
-
-        conditions.append(User.email.ilike(f"%{search}%"))
-        conditions.append(self.model.name.ilike(f"%{search}%"))
+        conditions.extend(uuid_conditions(self.model.uuid, search))
+        # A full UUID only ever matches the uuid column.
+        if parse_uuid(search) is None:
+            conditions.extend(text_conditions((User.email, self.model.name), search))
 
         return query.filter(or_(*conditions))
 
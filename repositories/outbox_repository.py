@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Collection
+from uuid import UUID
+
+from sqlalchemy import Select, delete, or_, select
+from sqlalchemy.orm import Session
+
+from smart_common.enums.outbox import OutboxEventStatus
+from smart_common.models.outbox_event import OutboxEvent
+
+FINAL_STATUSES = frozenset(
+    {
+        OutboxEventStatus.ACK_OK,
+        OutboxEventStatus.ACK_FAIL,
+        OutboxEventStatus.TIMEOUT,
+    }
+)
+
+
+class OutboxRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def enqueue(
+        self,
+        *,
+        event_type: str,
+        entity_id: str,
+        subject: str,
+        ack_subject: str,
+        payload: dict[str, Any],
+        ack_match: dict[str, Any],
+        reconcile: dict[str, Any] | None = None,
+        now_utc: datetime | None = None,
+    ) -> OutboxEvent:
+        now = _utc_now() if now_utc is None else now_utc
+        event = OutboxEvent(
+            event_type=event_type,
+            entity_id=entity_id,
+            subject=subject,
+            ack_subject=ack_subject,
+            payload_json=payload,
+            ack_match_json=ack_match,
+            reconcile_json=reconcile,
+            status=OutboxEventStatus.PENDING,
+            attempt=0,
+            next_retry_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.add(event)
+        self.db.flush()
+        return event
+
+    def claim_pending(
+        self,
+        *,
+        limit: int,
+        now_utc: datetime,
+        ack_timeout_sec: float,
+        event_ids: Collection[UUID] | None = None,
+    ) -> list[OutboxEvent]:
+        """
+        Lock due PENDING events and mark them SENT.
+
+        Entities with an event in flight are skipped, so with several
+        relays each microcontroller still gets its events in commit order;
+        the relay publishes one batch in order per entity.
+        """
+        lock_stmt: Select = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.status == OutboxEventStatus.PENDING,
+                or_(
+                    OutboxEvent.next_retry_at.is_(None),
+                    OutboxEvent.next_retry_at <= now_utc,
+                ),
+            )
+            .order_by(OutboxEvent.id.asc())
+            .limit(max(1, limit) * 4)
+            .with_for_update(skip_locked=True)
+        )
+        if event_ids is not None:
+            lock_stmt = lock_stmt.where(OutboxEvent.event_id.in_(list(event_ids)))
+        candidates = list(self.db.execute(lock_stmt).scalars().all())
+        if not candidates:
+            return []
+
+        entity_ids = {event.entity_id for event in candidates}
+        busy = set(
+            self.db.execute(
+                select(OutboxEvent.entity_id)
+                .where(
+                    OutboxEvent.status == OutboxEventStatus.SENT,
+                    OutboxEvent.entity_id.in_(entity_ids),
+                )
+                .distinct()
+            ).scalars()
+        )
+
+        ack_deadline = now_utc + timedelta(seconds=max(1.0, ack_timeout_sec))
+        claimed: list[OutboxEvent] = []
+        for event in candidates:
+            if event.entity_id in busy:
+                continue
+            event.status = OutboxEventStatus.SENT
+            event.attempt += 1
+            event.ack_deadline_at = ack_deadline
+            event.updated_at = now_utc
+            claimed.append(event)
+            if len(claimed) >= limit:
+                break
+        return claimed
+
+    def get_for_update(self, *, event_id: UUID) -> OutboxEvent | None:
+        stmt = (
+            select(OutboxEvent)
+            .where(OutboxEvent.event_id == event_id)
+            .with_for_update()
+        )
+        return self.db.execute(stmt).scalars().first()
+
+    def get_status(self, *, event_id: UUID) -> OutboxEventStatus | None:
+        return self.db.execute(
+            select(OutboxEvent.status).where(OutboxEvent.event_id == event_id)
+        ).scalar_one_or_none()
+
+    def mark_result(
+        self,
+        event: OutboxEvent,
+        *,
+        status: OutboxEventStatus,
+        now_utc: datetime,
+        ack_payload: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        event.status = status
+        event.ack_payload_json = ack_payload
+        event.last_error = error
+        event.ack_deadline_at = None
+        event.next_retry_at = None
+        event.updated_at = now_utc
+
+    def mark_retry(
+        self,
+        event: OutboxEvent,
+        *,
+        now_utc: datetime,
+        retry_delay_sec: float,
+        error: str | None,
+    ) -> None:
+        event.status = OutboxEventStatus.PENDING
+        event.last_error = error
+        event.ack_deadline_at = None
+        event.next_retry_at = now_utc + timedelta(seconds=retry_delay_sec)
+        event.updated_at = now_utc
+
+    def claim_abandoned(
+        self,
+        *,
+        now_utc: datetime,
+        limit: int,
+    ) -> list[OutboxEvent]:
+        """SENT events past their ACK deadline, left behind by a stopped relay."""
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.status == OutboxEventStatus.SENT,
+                OutboxEvent.ack_deadline_at.is_not(None),
+                OutboxEvent.ack_deadline_at < now_utc,
+            )
+            .order_by(OutboxEvent.ack_deadline_at.asc(), OutboxEvent.id.asc())
+            .limit(max(1, limit))
+            .with_for_update(skip_locked=True)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def purge_finished(self, *, older_than: datetime, limit: int) -> int:
+        """Delete up to `limit` settled events last updated before `older_than`."""
+        ids = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.status.in_(FINAL_STATUSES),
+                OutboxEvent.updated_at < older_than,
+            )
+            .order_by(OutboxEvent.id.asc())
+            .limit(max(1, limit))
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = self.db.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Mapping, Optional
 from uuid import UUID
 
+from sqlalchemy import bindparam, or_, update
 from sqlalchemy.orm import joinedload, selectinload
 
 from smart_common.models.provider import Provider
@@ -49,6 +51,32 @@ class ProviderRepository(BaseRepository[Provider]):
         )
         return query.all()
 
+    def update_last_seen_many(self, seen: Mapping[int, datetime]) -> int:
+        """Batch-advance `last_seen_at`; never moves a provider backwards."""
+        if not seen:
+            return 0
+
+        table = self.model.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("provider_id"))
+            .where(
+                or_(
+                    table.c.last_seen_at.is_(None),
+                    table.c.last_seen_at < bindparam("seen_at"),
+                )
+            )
+            .values(last_seen_at=bindparam("seen_at"))
+        )
+        result = self.session.execute(
+            statement,
+            [
+                {"provider_id": provider_id, "seen_at": seen_at}
+                for provider_id, seen_at in seen.items()
+            ],
+        )
+        return result.rowcount
+
     def get_for_user(self, provider_id: int, user_id: int) -> Optional[Provider]:
         return (
             self.session.query(self.model)
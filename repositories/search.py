@@ -0,0 +1,102 @@
+"""
+Index-friendly search conditions for the repositories.
+
+Substring matches stay `ILIKE '%term%'`, which PostgreSQL serves from
+the `gin_trgm_ops` indexes added for the declared `search_fields`; terms
+shorter than a trigram still match as substrings, through a scan. A
+full UUID is matched by equality only; a hex UUID prefix becomes a range
+on the uuid column; terms containing "@" additionally match as a prefix
+of `lower(email)`, which has a `text_pattern_ops` index.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import String, Uuid, func, literal
+
+# Shorter hex strings match too many UUIDs to be worth a range scan.
+UUID_PREFIX_MIN_LENGTH = 4
+
+FULL_TEXT_CONFIG = "simple"
+
+_HEX_PREFIX = re.compile(r"^[0-9a-fA-F-]+$")
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parse_uuid(term: str) -> UUID | None:
+    try:
+        return UUID(term)
+    except ValueError:
+        return None
+
+
+def uuid_prefix_bounds(term: str) -> tuple[UUID, UUID] | None:
+    """Smallest and largest UUID starting with the hex prefix `term`."""
+    if not _HEX_PREFIX.match(term):
+        return None
+    digits = term.replace("-", "").lower()
+    if not UUID_PREFIX_MIN_LENGTH <= len(digits) <= 32:
+        return None
+    return UUID(digits.ljust(32, "0")), UUID(digits.ljust(32, "f"))
+
+
+def is_uuid_column(column: Any) -> bool:
+    return isinstance(getattr(column, "type", None), Uuid)
+
+
+def is_email_column(column: Any) -> bool:
+    return getattr(column, "key", None) == "email"
+
+
+def contains(column: Any, term: str) -> Any:
+    """Case-insensitive substring match, trigram-indexable."""
+    return column.ilike(f"%{escape_like(term)}%", escape="\\")
+
+
+def email_prefix(column: Any, term: str) -> Any:
+    return func.lower(column).like(f"{escape_like(term.lower())}%", escape="\\")
+
+
+def uuid_conditions(column: Any, term: str) -> list[Any]:
+    value = parse_uuid(term)
+    if value is not None:
+        return [column == value]
+
+    bounds = uuid_prefix_bounds(term)
+    if bounds is None:
+        return []
+    low, high = bounds
+    return [column.between(low, high)]
+
+
+def text_conditions(columns: Iterable[Any], term: str) -> list[Any]:
+    """
+    Conditions for the string `columns`; email columns also get the
+    prefix fast path when the term looks like an address, so domain
+    searches such as "@gmail.com" still match by substring.
+    """
+    conditions = []
+    for column in columns:
+        if not isinstance(column.type, String):
+            continue
+        conditions.append(contains(column, term))
+        if "@" in term and is_email_column(column):
+            conditions.append(email_prefix(column, term))
+    return conditions
+
+
+def rank_expression(columns: Iterable[Any], term: str) -> Any:
+    """`ts_rank` of the string `columns` against `term`, for ORDER BY ... DESC."""
+    document = func.to_tsvector(
+        FULL_TEXT_CONFIG,
+        func.concat_ws(
+            " ", *(column for column in columns if isinstance(column.type, String))
+        ),
+    )
+    query = func.plainto_tsquery(FULL_TEXT_CONFIG, literal(term))
+    return func.ts_rank(document, query)
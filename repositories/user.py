@@ -6,11 +6,12 @@ from typing import Any, Optional
 from sqlalchemy.orm import selectinload, joinedload
 
 from smart_common.core.security import hash_password
+from smart_common.enums.pagination import CountMode
 from smart_common.enums.user import UserRole
 from smart_common.models.microcontroller import Microcontroller
 from smart_common.models.user import User
 from smart_common.models.user_profile import UserProfile
-from smart_common.repositories.base import BaseRepository
+from smart_common.repositories.base import BaseRepository, KeysetPage
 
 logger = logging.getLogger(__name__)
 
@@ -187,13 +188,53 @@ class UserRepository(BaseRepository[User]):
         )
         return results
 
-    def count_admin(self, *, search: str | None) -> int:
+    def list_admin_page(
+        self,
+        *,
+        limit: int,
+        cursor: str | None,
+        search: str | None,
+        order_by=None,
+    ) -> KeysetPage[User]:
+        base_query = (
+            self.session.query(User)
+            .outerjoin(UserProfile)
+            .options(joinedload(User.profile))
+        )
+
+        page = self.list_keyset(
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            search=search,
+            search_fields=self.search_fields,
+            base_query=base_query,
+        )
+        logger.info(
+            "Admin listed users limit=%s cursor=%s search=%s returned=%s",
+            limit,
+            cursor is not None,
+            search,
+            len(page.items),
+        )
+        return page
+
+    def count_admin(
+        self,
+        *,
+        search: str | None,
+        mode: CountMode = CountMode.EXACT,
+    ) -> int:
+        if not search and mode is CountMode.ESTIMATED:
+            return self.fast_count(mode=mode)
+
         base_query = self.session.query(User).outerjoin(UserProfile)
 
         return self.count_with_search(
             search=search,
             search_fields=self.search_fields,
             base_query=base_query,
+            mode=mode,
         )
 
     def create_user_admin(
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from pydantic import Field
+
+from smart_common.schemas.base import APIModel
+
+CONFIG_VERSION_KEY = "config_version"
+DEVICE_ID_KEY = "device_id"
+
+
+class DeviceConfigVersionConflict(ValueError):
+    """Raised when a patch is applied on top of a different entry version."""
+
+    def __init__(self, device_id: int, expected: int, actual: int | None) -> None:
+        self.device_id = device_id
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"devices_config entry {device_id} is at version {actual}, "
+            f"patch expects {expected}"
+        )
+
+
+class DeviceConfigPatch(APIModel):
+    """
+    Delta for a single `devices_config` entry.
+
+    `base_version` is the entry version the patch was computed against;
+    a receiver holding another version must request a full config sync.
+    `base_version == 0` means the entry did not exist before.
+    """
+
+    device_id: int
+    base_version: int = Field(0, ge=0)
+    version: int = Field(..., ge=1)
+    changes: dict[str, Any] = Field(default_factory=dict)
+
+
+def entry_version(entry: Mapping[str, Any] | None) -> int:
+    if not entry:
+        return 0
+    value = entry.get(CONFIG_VERSION_KEY)
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def diff_device_config_entry(
+    previous: Mapping[str, Any] | None,
+    current: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Return the keys of `current` whose values differ from `previous`."""
+    previous = previous or {}
+    return {
+        key: value
+        for key, value in current.items()
+        if key != CONFIG_VERSION_KEY
+        and (key not in previous or previous[key] != value)
+    }
+
+
+def build_device_config_patch(
+    previous: Mapping[str, Any] | None,
+    current: Mapping[str, Any],
+) -> DeviceConfigPatch | None:
+    """Compute a versioned patch, or None when nothing changed."""
+    changes = diff_device_config_entry(previous, current)
+    if not changes:
+        return None
+
+    base_version = entry_version(previous)
+    return DeviceConfigPatch(
+        device_id=int(current[DEVICE_ID_KEY]),
+        base_version=base_version,
+        version=base_version + 1,
+        changes=changes,
+    )
+
+
+def apply_device_config_patch(
+    devices_config: list[dict[str, Any]],
+    patch: DeviceConfigPatch,
+) -> list[dict[str, Any]]:
+    """
+    Apply a patch to a `devices_config` list and return the new list.
+
+    Entries other than the patched one are reused as-is.
+    """
+    result = list(devices_config)
+    for index, item in enumerate(result):
+        if item.get(DEVICE_ID_KEY) != patch.device_id:
+            continue
+
+        actual = entry_version(item)
+        if actual != patch.base_version:
+            raise DeviceConfigVersionConflict(patch.device_id, patch.base_version, actual)
+
+        result[index] = {
+            **item,
+            **patch.changes,
+            CONFIG_VERSION_KEY: patch.version,
+        }
+        return result
+
+    if patch.base_version != 0:
+        raise DeviceConfigVersionConflict(patch.device_id, patch.base_version, None)
+
+    result.append(
+        {
+            DEVICE_ID_KEY: patch.device_id,
+            **patch.changes,
+            CONFIG_VERSION_KEY: patch.version,
+        }
+    )
+    return result
@@ -137,6 +137,7 @@ class DeviceConfig(APIModel):
     device_dependency_rule: Optional[DeviceDependencyRule] = None
     desired_state: Optional[bool] = None
     is_on: Optional[bool] = None
+    config_version: int = Field(0, ge=0)
 
     @model_validator(mode="after")
     def normalize_device_number(self):
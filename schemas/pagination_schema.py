@@ -1,7 +1,7 @@
 # smart-api/smart_common/schemas/pagination_schema.py
 from __future__ import annotations
 
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import Field
 
@@ -24,3 +24,24 @@ class PaginatedResponse(APIModel, Generic[T]):
 class PaginationQuery(APIModel):
     limit: int = Field(20, ge=1, le=100)
     offset: int = Field(0, ge=0)
+
+
+class CursorPaginationMeta(APIModel):
+    limit: int = Field(..., description="Max items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page; null on the last page"
+    )
+    total: Optional[int] = Field(None, description="Total number of items")
+    total_is_estimate: bool = Field(
+        False, description="Total comes from table statistics or is capped"
+    )
+
+
+class CursorPaginatedResponse(APIModel, Generic[T]):
+    meta: CursorPaginationMeta
+    items: List[T]
+
+
+class CursorPaginationQuery(APIModel):
+    limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = Field(None, description="`next_cursor` of the previous page")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Count new vendor connections (= TLS handshakes against the real clouds)
+per poll cycle with and without the shared per-host connection pools.
+
+Runs GoodWe adapters (one `requests.Session` / `httpx.AsyncClient` each)
+against the local mock vendor server, which counts accepted connections.
+
+Usage:
+    python -m smart_common.scripts.benchmark_http_pools --providers 200 --cycles 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_common.providers.adapters.goodwe import (
+    AsyncGoodWeProviderAdapter,
+    GoodWeProviderAdapter,
+)
+from smart_common.providers.adapters.mock_vendor import (
+    MockVendorServer,
+    VendorFaultInjection,
+)
+from smart_common.providers.adapters.transport import http_transports
+from smart_common.providers.enums import ProviderPowerSource
+
+
+def _adapters(cls, server: MockVendorServer, providers: int) -> list:
+    adapters = []
+    for index in range(providers):
+        adapter = cls(
+            f"bench-{index}",
+            "secret",
+            provider_id=index + 1,
+            provider_external_id=f"station-{index}",
+            provider_power_source=ProviderPowerSource.INVERTER,
+            login_base_url=server.goodwe_login_base_url,
+        )
+        adapter.rate_limiter = None
+        adapters.append(adapter)
+    return adapters
+
+
+def _run_sync(server: MockVendorServer, args: argparse.Namespace) -> list[int]:
+    adapters = _adapters(GoodWeProviderAdapter, server, args.providers)
+    per_cycle = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.cycles):
+            before = server.stats().get("connections", 0)
+            list(pool.map(lambda adapter: adapter.fetch_measurement(), adapters))
+            per_cycle.append(server.stats().get("connections", 0) - before)
+    for adapter in adapters:
+        adapter.close()
+    http_transports.close()
+    return per_cycle
+
+
+async def _run_async(server: MockVendorServer, args: argparse.Namespace) -> list[int]:
+    adapters = _adapters(AsyncGoodWeProviderAdapter, server, args.providers)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def poll(adapter) -> None:
+        async with semaphore:
+            await adapter.fetch_measurement()
+
+    per_cycle = []
+    for _ in range(args.cycles):
+        before = server.stats().get("connections", 0)
+        await asyncio.gather(*(poll(adapter) for adapter in adapters))
+        per_cycle.append(server.stats().get("connections", 0) - before)
+    await asyncio.gather(*(adapter.aclose() for adapter in adapters))
+    await http_transports.aclose()
+    return per_cycle
+
+
+def _measure(args: argparse.Namespace, *, shared: bool, asynchronous: bool) -> None:
+    http_transports.enabled = shared
+    faults = VendorFaultInjection(latency_sec=args.latency_ms / 1000)
+    with MockVendorServer(faults=faults) as server:
+        started = time.perf_counter()
+        if asynchronous:
+            per_cycle = asyncio.run(_run_async(server, args))
+        else:
+            per_cycle = _run_sync(server, args)
+        elapsed = time.perf_counter() - started
+
+    polls = args.providers * args.cycles
+    print(
+        f"{'async' if asynchronous else 'sync'} {'shared' if shared else 'per-adapter'} pools: "
+        f"connections per cycle {per_cycle} "
+        f"({sum(per_cycle) / polls:.3f} per poll), {polls / elapsed:,.0f} polls/s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.getLogger("smart_common").setLevel(logging.CRITICAL)
+    for asynchronous in (False, True):
+        for shared in (False, True):
+            _measure(args, shared=shared, asynchronous=asynchronous)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Poll local-network adapters at a fixed interval against the device simulators.
+
+Starts a `MockFroniusDevice` and a `MockSunSpecDevice`, builds Fronius
+Solar API and SunSpec Modbus TCP adapters (async by default, `--sync`
+for the requests / socket ones) and polls them every `--interval`
+seconds. Reports poll latency and how many TCP connections the devices
+accepted, which stays at one per adapter while connections persist.
+`--drop-every` closes the Modbus connections periodically to exercise
+reconnects.
+
+Usage:
+    python -m smart_common.scripts.benchmark_local_adapters --adapters 20 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_common.providers.adapters.fronius import (
+    AsyncFroniusProviderAdapter,
+    FroniusProviderAdapter,
+)
+from smart_common.providers.adapters.mock_local import (
+    MockFroniusDevice,
+    MockSunSpecDevice,
+)
+from smart_common.providers.adapters.sunspec import (
+    AsyncSunSpecProviderAdapter,
+    SunSpecProviderAdapter,
+)
+from smart_common.providers.enums import ProviderPowerSource
+
+
+class _Results:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.failures = 0
+
+    def report(self, name: str, device) -> None:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            print(f"{name}: no successful polls, {self.failures} failed")
+            return
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(
+            f"{name}: {len(latencies)} polls, {self.failures} failed, "
+            f"p50={p50:.2f}ms p99={p99:.2f}ms, device {device.stats()}"
+        )
+
+
+def _adapters(args: argparse.Namespace, fronius, sunspec) -> list[tuple[str, object]]:
+    fronius_cls = FroniusProviderAdapter if args.sync else AsyncFroniusProviderAdapter
+    sunspec_cls = SunSpecProviderAdapter if args.sync else AsyncSunSpecProviderAdapter
+    adapters = []
+    for index in range(args.adapters):
+        common = dict(
+            provider_id=index + 1,
+            provider_external_id=f"local-{index}",
+            provider_power_source=ProviderPowerSource.INVERTER,
+            provider_has_power_meter=True,
+        )
+        adapters.append(("fronius", fronius_cls(fronius.host, port=fronius.port, **common)))
+        adapters.append(("sunspec", sunspec_cls(sunspec.host, port=sunspec.port, **common)))
+    return adapters
+
+
+def _should_drop(args: argparse.Namespace, cycle: int) -> bool:
+    return bool(args.drop_every) and cycle % args.drop_every == 0
+
+
+async def _run_async(args, adapters, sunspec, results: dict[str, _Results]) -> None:
+    async def poll(name: str, adapter) -> None:
+        started = time.perf_counter()
+        try:
+            await adapter.fetch_measurement()
+        except Exception:
+            results[name].failures += 1
+        else:
+            results[name].latencies.append(time.perf_counter() - started)
+
+    deadline = time.monotonic() + args.duration
+    cycle = 0
+    while time.monotonic() < deadline:
+        cycle += 1
+        if _should_drop(args, cycle):
+            sunspec.drop_connections()
+        tick = time.monotonic()
+        await asyncio.gather(*(poll(name, adapter) for name, adapter in adapters))
+        await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - tick)))
+
+    await asyncio.gather(*(adapter.aclose() for _, adapter in adapters))
+
+
+def _run_sync(args, adapters, sunspec, results: dict[str, _Results]) -> None:
+    def poll(item: tuple[str, object]) -> None:
+        name, adapter = item
+        started = time.perf_counter()
+        try:
+            adapter.fetch_measurement()
+        except Exception:
+            results[name].failures += 1
+        else:
+            results[name].latencies.append(time.perf_counter() - started)
+
+    deadline = time.monotonic() + args.duration
+    cycle = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        while time.monotonic() < deadline:
+            cycle += 1
+            if _should_drop(args, cycle):
+                sunspec.drop_connections()
+            tick = time.monotonic()
+            list(pool.map(poll, adapters))
+            time.sleep(max(0.0, args.interval - (time.monotonic() - tick)))
+
+    for _, adapter in adapters:
+        adapter.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--adapters", type=int, default=20, help="Adapters per protocol")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=32, help="Threads for --sync")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Device response time")
+    parser.add_argument("--drop-every", type=int, default=0, help="Drop Modbus connections every N cycles")
+    parser.add_argument("--sync", action="store_true")
+    args = parser.parse_args()
+
+    logging.getLogger("smart_common").setLevel(logging.CRITICAL)
+    latency = args.latency_ms / 1000
+    with MockFroniusDevice(latency_sec=latency) as fronius, MockSunSpecDevice(
+        latency_sec=latency
+    ) as sunspec:
+        adapters = _adapters(args, fronius, sunspec)
+        results = {"fronius": _Results(), "sunspec": _Results()}
+        if args.sync:
+            _run_sync(args, adapters, sunspec, results)
+        else:
+            asyncio.run(_run_async(args, adapters, sunspec, results))
+
+        results["fronius"].report("Fronius Solar API", fronius)
+        results["sunspec"].report("SunSpec Modbus TCP", sunspec)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Compare stream storage and encode/decode latency of WRITE_CONFIG_FILES
+command events with and without payload compression.
+
+Usage:
+    python -m smart_common.scripts.benchmark_nats_compression --devices 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from uuid import uuid4
+
+from smart_common.nats.compression import (
+    CODEC_GZIP,
+    CODEC_ZSTD,
+    PayloadCodec,
+    decode_message_data,
+    zstandard,
+)
+
+# JetStream stores subject, headers and payload per message; the fixed
+# per-record overhead is the same for every codec so it is left out.
+HEADER_LINE_OVERHEAD = len("NATS/1.0\r\n\r\n")
+
+
+def _build_command_event(devices: int) -> dict:
+    devices_config = [
+        {
+            "device_id": index,
+            "device_uuid": uuid4().hex,
+            "device_number": index,
+            "pin_number": index,
+            "mode": "AUTO_POWER",
+            "rated_power": 2000.0,
+            "threshold_value": 1.5,
+            "threshold_unit": "kW",
+            "auto_rule": {
+                "operator": "AND",
+                "items": [
+                    {
+                        "source": "provider_primary_power",
+                        "comparator": "gte",
+                        "value": 1.5,
+                        "unit": "kW",
+                    }
+                ],
+            },
+            "device_dependency_rule": None,
+            "is_on": False,
+        }
+        for index in range(1, devices + 1)
+    ]
+    env_file_content = "\n".join(
+        f"AGENT_OPTION_{index}=value-{index}" for index in range(60)
+    )
+    return {
+        "subject": f"device_communication.{uuid4()}.command.MICROCONTROLLER_COMMAND",
+        "event_type": "MICROCONTROLLER_COMMAND",
+        "event_id": uuid4().hex,
+        "source": "smart-common",
+        "entity_type": "MICROCONTROLLER_COMMAND",
+        "entity_id": str(uuid4()),
+        "timestamp": "2026-01-01T00:00:00+00:00",
+        "data_version": "1",
+        "data": {
+            "command_id": uuid4().hex,
+            "command": "WRITE_CONFIG_FILES",
+            "config_json": {
+                "uuid": str(uuid4()),
+                "device_max": devices,
+                "available_sensors": ["dht22", "ds18b20"],
+                "active_low": False,
+                "devices_config": devices_config,
+                "provider": None,
+            },
+            "hardware_config_json": {
+                "pins": {str(index): {"gpio": index + 2} for index in range(devices)},
+                "i2c_bus": 1,
+            },
+            "env_file_content": env_file_content,
+        },
+    }
+
+
+def _stored_bytes(data: bytes, headers: dict[str, str] | None) -> int:
+    if not headers:
+        return len(data)
+    header_bytes = sum(len(f"{k}: {v}\r\n") for k, v in headers.items())
+    return len(data) + header_bytes + HEADER_LINE_OVERHEAD
+
+
+def _measure(codec: PayloadCodec, event: dict, iterations: int) -> tuple[int, float, float]:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        data, headers = codec.encode(event)
+    encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        json.loads(decode_message_data(data, headers))
+    decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    return _stored_bytes(data, headers), encode_us, decode_us
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10_000)
+    args = parser.parse_args()
+
+    event = _build_command_event(args.devices)
+
+    variants = [("plain", PayloadCodec(enabled=False))]
+    variants.append(("gzip", PayloadCodec(enabled=True, codec=CODEC_GZIP, min_bytes=0)))
+    if zstandard is not None:
+        variants.append(("zstd", PayloadCodec(enabled=True, codec=CODEC_ZSTD, min_bytes=0)))
+
+    print(
+        f"{'codec':<8}{'bytes/msg':>12}{'stream MiB':>14}"
+        f"{'encode us':>12}{'decode us':>12}"
+    )
+    for name, codec in variants:
+        size, encode_us, decode_us = _measure(codec, event, args.iterations)
+        stream_mib = size * args.messages / (1024 * 1024)
+        print(
+            f"{name:<8}{size:>12}{stream_mib:>14.2f}"
+            f"{encode_us:>12.1f}{decode_us:>12.1f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark NatsPublisher throughput and EventDispatcher ACK round trips
+against the in-memory NATS server, without a nats-server.
+
+Usage:
+    python -m smart_common.scripts.benchmark_nats_publish --latency-ms 1 --drop-rate 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from smart_common.enums.event import EventType
+from smart_common.events.event_dispatcher import EventDispatcher
+from smart_common.nats.compression import decode_message_json
+from smart_common.nats.event_helpers import ack_subject_for_entity, subject_for_entity
+from smart_common.nats.fake import FakeNATSClient, FaultInjection, InMemoryNatsServer
+from smart_common.nats.pool import NatsConnectionPool
+from smart_common.nats.publisher import NatsPublisher
+
+STREAM = "device_communication"
+MICROCONTROLLER_UUID = "00000000-0000-0000-0000-000000000001"
+
+
+async def _start_agent(server: InMemoryNatsServer):
+    agent = server.connect(name="agent")
+
+    async def respond(msg) -> None:
+        event = decode_message_json(msg)
+        if "ack_subject" not in event:
+            return
+        ack = {"data": {"ok": True, "device_id": event["data"].get("device_id")}}
+        await agent.publish(event["ack_subject"], json.dumps(ack).encode("utf-8"))
+
+    return await agent.subscribe(f"{STREAM}.*.command.>", cb=respond)
+
+
+async def _publish_throughput(
+    publisher: NatsPublisher,
+    messages: int,
+    concurrency: int,
+    microcontrollers: int,
+) -> float:
+    subjects = [
+        subject_for_entity(f"mc-{index}", EventType.DEVICE_COMMAND.value)
+        for index in range(microcontrollers)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await publisher.publish(subjects[index % len(subjects)], {"index": index}, retries=1)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(messages)))
+    return messages / (time.perf_counter() - started)
+
+
+async def _ack_round_trips(
+    dispatcher: EventDispatcher,
+    requests: int,
+    timeout: float,
+) -> tuple[list[float], int]:
+    subject = subject_for_entity(MICROCONTROLLER_UUID, EventType.DEVICE_COMMAND.value)
+    ack_subject = ack_subject_for_entity(MICROCONTROLLER_UUID, EventType.DEVICE_COMMAND.value)
+    latencies: list[float] = []
+    timeouts = 0
+
+    for index in range(requests):
+        started = time.perf_counter()
+        try:
+            await dispatcher.publish_event_and_wait_for_ack(
+                entity_type=EventType.DEVICE_COMMAND.value,
+                entity_id=MICROCONTROLLER_UUID,
+                event_type=EventType.DEVICE_COMMAND,
+                data={"device_id": index},
+                predicate=lambda event, index=index: event["data"]["device_id"] == index,
+                timeout=timeout,
+                subject=subject,
+                ack_subject=ack_subject,
+            )
+        except Exception:
+            timeouts += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return latencies, timeouts
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    server = InMemoryNatsServer(
+        FaultInjection(
+            latency_sec=args.latency_ms / 1000,
+            jitter_sec=args.jitter_ms / 1000,
+            drop_rate=args.drop_rate,
+            seed=args.seed,
+        )
+    )
+    server.add_stream(STREAM, [f"{STREAM}.>"])
+    agent_subscription = await _start_agent(server)
+
+    if args.pool_size > 0:
+        client = NatsConnectionPool(
+            args.pool_size,
+            client_factory=lambda: FakeNATSClient(server),
+        )
+    else:
+        client = FakeNATSClient(server)
+    await client.connect()
+    publisher = NatsPublisher(client)
+    dispatcher = EventDispatcher(publisher)
+
+    subjects = max(1, args.microcontrollers)
+    rate = await _publish_throughput(publisher, args.messages, args.concurrency, subjects)
+    print(f"publish: {args.messages} msgs, {rate:,.0f} msg/s")
+
+    # Let the agent work off the throughput backlog before timing ACKs.
+    while agent_subscription.pending_msgs:
+        await asyncio.sleep(0.01)
+
+    latencies, timeouts = await _ack_round_trips(dispatcher, args.requests, args.ack_timeout)
+    print(
+        f"ack round trip: n={len(latencies)} timeouts={timeouts} "
+        f"p50={_percentile(latencies, 0.5):.2f}ms p99={_percentile(latencies, 0.99):.2f}ms"
+    )
+    print(f"server stats: {server.stats}")
+
+    await client.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--microcontrollers", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--ack-timeout", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pool-size", type=int, default=0)
+    args = parser.parse_args()
+
+    # Dropped ACKs are expected here; keep per-message error logs out of the report.
+    logging.getLogger("smart_common").setLevel(logging.CRITICAL)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark Huawei / GoodWe adapter polling against the local mock vendor
+server: throughput, latency, logins and failures under injected faults.
+
+Usage:
+    python -m smart_common.scripts.benchmark_provider_adapters --vendor huawei \
+        --providers 200 --accounts 4 --latency-ms 80 --error-rate 0.02 --token-ttl 5
+    python -m smart_common.scripts.benchmark_provider_adapters --vendor goodwe \
+        --fixtures fixtures/goodwe.json --relogin-rate 0.05 --sync
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_common.providers.adapters.circuit_breaker import circuit_breakers
+from smart_common.providers.adapters.goodwe import (
+    AsyncGoodWeProviderAdapter,
+    GoodWeProviderAdapter,
+)
+from smart_common.providers.adapters.huawei import (
+    AsyncHuaweiProviderAdapter,
+    HuaweiProviderAdapter,
+)
+from smart_common.providers.adapters.mock_vendor import (
+    MockVendorServer,
+    VendorFaultInjection,
+)
+from smart_common.providers.adapters.recording import FixtureSet
+from smart_common.providers.enums import ProviderPowerSource
+
+
+def _build_adapter(args: argparse.Namespace, server: MockVendorServer, index: int, *, sync: bool):
+    account = f"bench-{index % max(1, args.accounts)}"
+    common = {
+        "provider_id": index + 1,
+        "provider_external_id": str(1_000_000_000 + index),
+        "provider_power_source": ProviderPowerSource.INVERTER,
+    }
+    if args.vendor == "huawei":
+        cls = HuaweiProviderAdapter if sync else AsyncHuaweiProviderAdapter
+        adapter = cls(account, "secret", base_url=server.huawei_base_url, **common)
+    else:
+        cls = GoodWeProviderAdapter if sync else AsyncGoodWeProviderAdapter
+        adapter = cls(
+            account,
+            "secret",
+            login_base_url=server.goodwe_login_base_url,
+            **common,
+        )
+    if not args.quota:
+        adapter.rate_limiter = None
+    return adapter
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _run_async(args: argparse.Namespace, server: MockVendorServer):
+    adapters = [
+        _build_adapter(args, server, index, sync=False) for index in range(args.providers)
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    failures: Counter[str] = Counter()
+
+    async def poll(adapter) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await adapter.fetch_measurement()
+            except Exception as exc:
+                failures[type(exc).__name__] += 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        await asyncio.gather(*(poll(adapter) for adapter in adapters))
+    elapsed = time.perf_counter() - started
+
+    await asyncio.gather(*(adapter.aclose() for adapter in adapters))
+    return latencies, failures, elapsed
+
+
+def _run_sync(args: argparse.Namespace, server: MockVendorServer):
+    adapters = [
+        _build_adapter(args, server, index, sync=True) for index in range(args.providers)
+    ]
+    latencies: list[float] = []
+    failures: Counter[str] = Counter()
+
+    def poll(adapter) -> None:
+        started = time.perf_counter()
+        try:
+            adapter.fetch_measurement()
+        except Exception as exc:
+            failures[type(exc).__name__] += 1
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.rounds):
+            list(pool.map(poll, adapters))
+    elapsed = time.perf_counter() - started
+
+    for adapter in adapters:
+        adapter.close()
+    return latencies, failures, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vendor", choices=("huawei", "goodwe"), default="huawei")
+    parser.add_argument("--providers", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sync", action="store_true", help="use the requests-based adapters")
+    parser.add_argument("--quota", action="store_true", help="keep per-account vendor quotas")
+    parser.add_argument("--fixtures", action="append", default=[])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--relogin-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Injected faults are expected here; keep per-request logs out of the report.
+    logging.getLogger("smart_common").setLevel(logging.CRITICAL)
+    circuit_breakers.clear()
+
+    faults = VendorFaultInjection(
+        latency_sec=args.latency_ms / 1000,
+        jitter_sec=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        relogin_rate=args.relogin_rate,
+        token_ttl_sec=args.token_ttl,
+        seed=args.seed,
+    )
+    fixtures = [FixtureSet.load(path) for path in args.fixtures]
+
+    with MockVendorServer(fixtures=fixtures, faults=faults) as server:
+        if args.sync:
+            latencies, failures, elapsed = _run_sync(args, server)
+        else:
+            latencies, failures, elapsed = asyncio.run(_run_async(args, server))
+        stats = server.stats()
+
+    polls = args.providers * args.rounds
+    print(
+        f"{args.vendor} {'sync' if args.sync else 'async'}: {polls} polls in {elapsed:.2f}s, "
+        f"{polls / elapsed:,.1f} polls/s"
+    )
+    print(
+        f"latency: p50={_percentile(latencies, 0.5):.1f}ms "
+        f"p99={_percentile(latencies, 0.99):.1f}ms ok={len(latencies)} "
+        f"failed={sum(failures.values())} {dict(failures)}"
+    )
+    print(f"server stats: {dict(sorted(stats.items()))}")
+    print(f"circuits: {circuit_breakers.snapshot()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Record sanitized Huawei / GoodWe API responses for the mock vendor server.
+
+Runs the calls a poller and the wizard make against the real cloud with a
+`VendorRecorder` attached and writes the sanitized exchanges to a fixture
+file. The password is read from PROVIDER_PASSWORD when not given.
+
+Usage:
+    PROVIDER_PASSWORD=... python -m smart_common.scripts.record_provider_fixtures \
+        --vendor huawei --username api-user --external-id 1000000033587231 \
+        --out fixtures/huawei.json
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from smart_common.providers.adapters.goodwe import GoodWeProviderAdapter
+from smart_common.providers.adapters.huawei import HuaweiProviderAdapter
+from smart_common.providers.adapters.recording import VendorRecorder
+from smart_common.providers.enums import ProviderPowerSource, ProviderVendor
+
+logger = logging.getLogger(__name__)
+
+
+def _record_huawei(adapter: HuaweiProviderAdapter) -> None:
+    stations = adapter.list_stations()
+    for station in stations[:1]:
+        adapter.list_devices(station["station_code"])
+    adapter.fetch_measurement()
+
+
+def _record_goodwe(adapter: GoodWeProviderAdapter) -> None:
+    adapter.get_powerstation_ids()
+    adapter.fetch_measurement()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vendor", choices=("huawei", "goodwe"), required=True)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", default=os.environ.get("PROVIDER_PASSWORD"))
+    parser.add_argument("--external-id", default="")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    if not args.password:
+        parser.error("--password or PROVIDER_PASSWORD is required")
+
+    common = {
+        "provider_id": 0,
+        "provider_external_id": args.external_id,
+        "provider_power_source": ProviderPowerSource.INVERTER,
+    }
+    if args.vendor == "huawei":
+        vendor = ProviderVendor.HUAWEI
+        adapter = HuaweiProviderAdapter(args.username, args.password, **common)
+        record = _record_huawei
+    else:
+        vendor = ProviderVendor.GOODWE
+        adapter = GoodWeProviderAdapter(args.username, args.password, **common)
+        record = _record_goodwe
+
+    recorder = VendorRecorder(vendor)
+    recorder.attach(adapter)
+    try:
+        record(adapter)
+    except Exception:
+        logger.exception("Recording stopped early; saving what was captured")
+    finally:
+        adapter.close()
+
+    fixtures = recorder.fixtures()
+    path = fixtures.save(args.out)
+    print(f"recorded {len(fixtures.exchanges)} exchanges {fixtures.endpoints()} -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Run the outbox relay as a standalone worker: publishes committed outbox
+events, settles their ACKs, runs the reconcilers and purges old events.
+
+Usage:
+    python -m smart_common.scripts.run_outbox_worker
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from smart_common.services.outbox_worker import run_outbox_worker
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_outbox_worker())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
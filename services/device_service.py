@@ -1,20 +1,27 @@
+import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Callable
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from smart_common.core.db import transactional_session
+from smart_common.core.config import settings
+from smart_common.core.db import run_in_session, transactional_session
 from smart_common.enums.device import DeviceMode
 from smart_common.enums.device_dependency import DeviceDependencyAction
 from smart_common.enums.event import EventType
+from smart_common.enums.outbox import OutboxEventStatus
 from smart_common.enums.scheduler import SchedulerControlMode, SchedulerPolicyType
 from smart_common.enums.sensor import SensorType
 from smart_common.enums.user import UserRole
 from smart_common.events.device_events import (
+    DeviceBatchCommandItem,
+    DeviceBatchCommandPayload,
     DeviceCommandPayload,
     DeviceCreatedPayload,
     DeviceDeletePayload,
@@ -23,11 +30,18 @@ from smart_common.events.device_events import (
 from smart_common.events.event_dispatcher import EventDispatcher
 from smart_common.models.device import Device
 from smart_common.models.microcontroller import Microcontroller
+from smart_common.models.outbox_event import OutboxEvent
 from smart_common.nats.client import NATSClient
 from smart_common.nats.event_helpers import ack_subject_for_entity, subject_for_entity
 from smart_common.nats.publisher import NatsPublisher
+from smart_common.nats.state_cache import (
+    LatestStateCache,
+    device_state_key,
+    device_state_payload,
+)
 from smart_common.repositories.device import DeviceRepository
 from smart_common.repositories.microcontroller import MicrocontrollerRepository
+from smart_common.repositories.outbox_repository import FINAL_STATUSES, OutboxRepository
 from smart_common.repositories.scheduler import SchedulerRepository
 from smart_common.schemas.automation_rule import (
     AutomationRuleGroup,
@@ -36,12 +50,18 @@ from smart_common.schemas.automation_rule import (
     extract_legacy_power_threshold,
     uses_source,
 )
+from smart_common.schemas.device_config_patch import (
+    CONFIG_VERSION_KEY,
+    DeviceConfigPatch,
+    build_device_config_patch,
+)
 from smart_common.schemas.device_schema import DeviceListQuery, DeviceResponse
 from smart_common.schemas.device_dependency import (
     DeviceDependencyRule,
     parse_device_dependency_rule,
 )
 from smart_common.schemas.scheduler_policy import SchedulerControlPolicy
+from smart_common.services.outbox_relay import OutboxRelay, OutboxResult, outbox_relay
 
 logger = logging.getLogger(__name__)
 
@@ -150,18 +170,95 @@ def _slot_dependency_rule(slot) -> DeviceDependencyRule | None:
     return _dependency_rule_from_value(getattr(slot, "device_dependency_rule_json", None))
 
 
+def _find_device_config_entry(
+    devices_config: list, device: Device
+) -> tuple[int | None, dict | None]:
+    for index, item in enumerate(devices_config):
+        if not isinstance(item, dict):
+            continue
+        if (
+            item.get("device_id") == device.id
+            or item.get("pin_number") == device.device_number
+        ):
+            return index, item
+    return None, None
+
+
+def _device_config_fields(device: Device, microcontroller: Microcontroller) -> dict:
+    auto_rule = _rule_from_value(device.auto_rule_json)
+    dependency_rule = _dependency_rule_from_value(device.device_dependency_rule_json)
+    return {
+        "device_id": device.id,
+        "device_uuid": str(device.uuid),
+        "device_number": device.device_number,
+        "pin_number": device.device_number,
+        "mode": device.mode.value if hasattr(device.mode, "value") else str(device.mode),
+        "rated_power": (
+            float(device.rated_power) if device.rated_power is not None else None
+        ),
+        "threshold_value": (
+            float(device.threshold_value)
+            if device.threshold_value is not None
+            else None
+        ),
+        "threshold_unit": _provider_power_unit(microcontroller),
+        "auto_rule": auto_rule.model_dump() if auto_rule is not None else None,
+        "device_dependency_rule": (
+            dependency_rule.model_dump(
+                mode="json",
+                exclude={"target_device_number"},
+            )
+            if dependency_rule is not None
+            else None
+        ),
+    }
+
+
+@dataclass
+class DeviceCommandResult:
+    device: Device
+    ok: bool
+    is_on: bool | None = None
+    error: str | None = None
+    # The agent answered but refused, as opposed to no ACK at all.
+    rejected: bool = False
+
+
+def _results_by_device_id(entries) -> dict[int, dict]:
+    """Per-device batch ACK entries keyed by int device id; agents may send strings."""
+    by_id: dict[int, dict] = {}
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            by_id[int(entry.get("device_id"))] = entry
+        except (TypeError, ValueError):
+            continue
+    return by_id
+
+
 class DeviceService:
     def __init__(
         self,
         repo_factory: Callable[[Session], DeviceRepository],
         microcontroller_repo_factory: Callable[[Session], MicrocontrollerRepository],
         scheduler_repo_factory: Callable[[Session], SchedulerRepository] | None = None,
+        state_cache: LatestStateCache | None = None,
+        outbox: OutboxRelay | None = None,
     ):
         self._repo_factory = repo_factory
         self._microcontroller_repo_factory = microcontroller_repo_factory
         self._scheduler_repo_factory = scheduler_repo_factory
+        self.state_cache = state_cache
         self.logger = logger
         self.events = EventDispatcher(NatsPublisher(NATSClient()))
+        self.outbox = outbox or outbox_relay
+        self.outbox.register_reconciler(
+            EventType.DEVICE_CREATED.value, self._reconcile_device_created
+        )
+        self.outbox.register_reconciler(
+            EventType.DEVICE_COMMAND.value, self._reconcile_manual_state
+        )
 
     # ---------------------------------------------------------------------
     # Repositories
@@ -525,6 +622,32 @@ class DeviceService:
 
         return device
 
+    def get_device_state(
+        self, db: Session, device_id: int, user_id: int
+    ) -> dict:
+        """
+        Current on/off state and mode, from the shared state cache when
+        set. Cached entries of another user's device count as a miss, so
+        the database read below answers 404.
+        """
+
+        def load() -> dict:
+            device = self.get_device(db, device_id, user_id)
+            return device_state_payload(
+                device.id,
+                user_id=user_id,
+                is_on=device.manual_state if isinstance(device.manual_state, bool) else None,
+                mode=device.mode.value if device.mode is not None else None,
+                changed_at=device.last_state_change_at,
+            )
+
+        if self.state_cache is None:
+            return load()
+        state = self.state_cache.device_state(device_id, load)
+        if state.get("user_id") != user_id:
+            return load()
+        return state
+
     def list_for_microcontroller(
         self, db: Session, user_id: int, mc_uuid: UUID
     ) -> list[Device]:
@@ -550,7 +673,7 @@ class DeviceService:
     # ---------------------------------------------------------------------
 
     async def create_device(
-        self, db: Session, user_id: int, mc_uuid: UUID, payload: dict
+        self, db: Session | AsyncSession, user_id: int, mc_uuid: UUID, payload: dict
     ) -> Device:
         self.logger.info(
             "CREATE device | user_id=%s mc_uuid=%s",
@@ -559,122 +682,196 @@ class DeviceService:
         )
         self.logger.debug("CREATE device payload | %s", payload)
 
-        microcontroller = self._ensure_microcontroller(db, user_id, mc_uuid)
-
         async with transactional_session(db):
-            repo = self._repo(db)
-
-            devices_count = repo.count_for_microcontroller(microcontroller.id)
-            self.logger.debug(
-                "Microcontroller devices count | mc_id=%s count=%s max=%s",
-                microcontroller.id,
-                devices_count,
-                microcontroller.max_devices,
+            device, event_id = await run_in_session(
+                db, self._stage_device_create, user_id, mc_uuid, payload
             )
 
-            if devices_count >= microcontroller.max_devices:
-                self.logger.warning(
-                    "Max devices exceeded | mc_id=%s",
-                    microcontroller.id,
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        f"Microcontroller supports max "
-                        f"{microcontroller.max_devices} devices"
+        # Committed: the ACK wait below holds no DB connection.
+        result = await self.outbox.deliver(event_id)
+        if not result.ok and result.status not in FINAL_STATUSES:
+            # Still in flight: the relay loop applies the ACK or removes
+            # the device once the event settles.
+            raise HTTPException(
+                status_code=status.HTTP_202_ACCEPTED,
+                detail={
+                    "message": (
+                        "Device creation is waiting for the microcontroller; "
+                        "it is removed if the agent does not acknowledge it"
                     ),
-                )
+                    "device_id": device.id,
+                    "event_id": str(event_id),
+                    "status": result.status.value,
+                },
+            )
+        if not result.ok:
+            raise self._ack_failed(EventType.DEVICE_CREATED, result)
 
-            effective_auto_rule = self._ensure_auto_rule_for_mode(
-                microcontroller=microcontroller,
-                new_mode=payload.get("mode"),
-                new_threshold=payload.get("threshold_value"),
-                new_auto_rule=payload.get("auto_rule"),
+        # The reconciler stored the ACKed state in its own transaction.
+        await run_in_session(db, Session.refresh, device)
+        await self._cache_device_state(device, user_id)
+        return device
+
+    def _stage_device_create(
+        self, db: Session, user_id: int, mc_uuid: UUID, payload: dict
+    ) -> tuple[Device, UUID]:
+        microcontroller = self._ensure_microcontroller(db, user_id, mc_uuid)
+        repo = self._repo(db)
+
+        devices_count = repo.count_for_microcontroller(microcontroller.id)
+        self.logger.debug(
+            "Microcontroller devices count | mc_id=%s count=%s max=%s",
+            microcontroller.id,
+            devices_count,
+            microcontroller.max_devices,
+        )
+
+        if devices_count >= microcontroller.max_devices:
+            self.logger.warning(
+                "Max devices exceeded | mc_id=%s",
+                microcontroller.id,
             )
-            effective_dependency_rule = self._normalize_dependency_rule(
-                db=db,
-                user_id=user_id,
-                raw_rule=payload.get("device_dependency_rule"),
-                source_microcontroller=microcontroller,
-                source_device=None,
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Microcontroller supports max "
+                    f"{microcontroller.max_devices} devices"
+                ),
             )
-            if effective_dependency_rule is not None:
-                self._ensure_dependency_target_is_available(
-                    microcontroller=microcontroller,
-                    candidate_rules=[effective_dependency_rule],
-                    exclude_source_device_id=None,
-                )
-            self._ensure_scheduler_for_mode(
-                db=db,
-                user_id=user_id,
+
+        effective_auto_rule = self._ensure_auto_rule_for_mode(
+            microcontroller=microcontroller,
+            new_mode=payload.get("mode"),
+            new_threshold=payload.get("threshold_value"),
+            new_auto_rule=payload.get("auto_rule"),
+        )
+        effective_dependency_rule = self._normalize_dependency_rule(
+            db=db,
+            user_id=user_id,
+            raw_rule=payload.get("device_dependency_rule"),
+            source_microcontroller=microcontroller,
+            source_device=None,
+        )
+        if effective_dependency_rule is not None:
+            self._ensure_dependency_target_is_available(
                 microcontroller=microcontroller,
-                new_mode=payload.get("mode"),
-                scheduler_in_payload="scheduler_id" in payload,
-                new_scheduler_id=payload.get("scheduler_id"),
+                candidate_rules=[effective_dependency_rule],
+                exclude_source_device_id=None,
             )
+        self._ensure_scheduler_for_mode(
+            db=db,
+            user_id=user_id,
+            microcontroller=microcontroller,
+            new_mode=payload.get("mode"),
+            scheduler_in_payload="scheduler_id" in payload,
+            new_scheduler_id=payload.get("scheduler_id"),
+        )
 
-            data = dict(payload)
-            data["microcontroller_id"] = microcontroller.id
-            data["auto_rule_json"] = (
-                effective_auto_rule.model_dump() if effective_auto_rule is not None else None
-            )
-            data["device_dependency_rule_json"] = (
-                effective_dependency_rule.model_dump(mode="json")
-                if effective_dependency_rule is not None
+        data = dict(payload)
+        data["microcontroller_id"] = microcontroller.id
+        data["auto_rule_json"] = (
+            effective_auto_rule.model_dump() if effective_auto_rule is not None else None
+        )
+        data["device_dependency_rule_json"] = (
+            effective_dependency_rule.model_dump(mode="json")
+            if effective_dependency_rule is not None
+            else None
+        )
+        legacy_threshold = extract_legacy_power_threshold(effective_auto_rule)
+        data["threshold_value"] = (
+            legacy_threshold[0] if legacy_threshold is not None else None
+        )
+        data.pop("auto_rule", None)
+        data.pop("device_dependency_rule", None)
+
+        device = repo.create(data)
+        if not isinstance(device.manual_state, bool):
+            device.manual_state = False
+        config_patch = self._sync_device_config_state(
+            db,
+            device,
+            is_on=(
+                device.manual_state
+                if isinstance(device.manual_state, bool)
                 else None
-            )
-            legacy_threshold = extract_legacy_power_threshold(effective_auto_rule)
-            data["threshold_value"] = (
-                legacy_threshold[0] if legacy_threshold is not None else None
-            )
-            data.pop("auto_rule", None)
-            data.pop("device_dependency_rule", None)
-
-            device = repo.create(data)
-            if not isinstance(device.manual_state, bool):
-                device.manual_state = False
-            self._sync_device_config_state(
-                device,
-                is_on=(
-                    device.manual_state
-                    if isinstance(device.manual_state, bool)
-                    else None
-                ),
-            )
+            ),
+        )
 
-            self.logger.info(
-                "Device CREATED | device_id=%s mc_uuid=%s",
-                device.id,
-                microcontroller.uuid,
-            )
+        self.logger.info(
+            "Device CREATED | device_id=%s mc_uuid=%s",
+            device.id,
+            microcontroller.uuid,
+        )
 
-            ack_data = await self._publish_event(
-                microcontroller_uuid=microcontroller.uuid,
-                event_type=EventType.DEVICE_CREATED,
-                payload=DeviceCreatedPayload(
-                    device_id=device.id,
-                    device_uuid=str(device.uuid),
-                    device_number=device.device_number,
-                    mode=device.mode.value,
-                    rated_power=device.rated_power,
-                    threshold_value=device.threshold_value,
-                    threshold_unit=_provider_power_unit(microcontroller),
-                    auto_rule=_rule_from_value(device.auto_rule_json),
-                    device_dependency_rule=_dependency_rule_from_value(
-                        device.device_dependency_rule_json
-                    ),
-                    scheduler_id=device.scheduler_id,
-                    microcontroller_uuid=str(microcontroller.uuid),
-                ),
-            )
+        event_payload = DeviceCreatedPayload(
+            device_id=device.id,
+            device_uuid=str(device.uuid),
+            device_number=device.device_number,
+            mode=device.mode.value,
+            rated_power=device.rated_power,
+            threshold_value=device.threshold_value,
+            threshold_unit=_provider_power_unit(microcontroller),
+            auto_rule=_rule_from_value(device.auto_rule_json),
+            device_dependency_rule=_dependency_rule_from_value(
+                device.device_dependency_rule_json
+            ),
+            scheduler_id=device.scheduler_id,
+            microcontroller_uuid=str(microcontroller.uuid),
+            config_patch=config_patch,
+        )
+        event = self._enqueue_event(
+            db,
+            microcontroller_uuid=microcontroller.uuid,
+            event_type=EventType.DEVICE_CREATED,
+            payload=event_payload,
+            reconcile={"device_id": device.id},
+        )
+        return device, event.event_id
+
+    def _reconcile_device_created(self, db: Session, event: OutboxEvent) -> None:
+        device = self._repo(db).get_by_id((event.reconcile_json or {}).get("device_id"))
+        if device is None:
+            return
+        self._invalidate_device_state(db, device.id)
 
-            ack_state = self.ack_device_state(ack_data)
+        if event.status == OutboxEventStatus.ACK_OK:
+            ack_state = self.ack_device_state(event.ack_payload_json or {})
             if ack_state is not None:
                 device.manual_state = ack_state
                 device.last_state_change_at = datetime.now(timezone.utc)
-                self._sync_device_config_state(device, is_on=ack_state)
+                self._sync_device_config_state(
+                    db,
+                    device,
+                    is_on=ack_state,
+                    bump_version=False,
+                )
+            return
+
+        # Not confirmed by the agent: undo the creation, as the rollback
+        # did when the ACK was awaited inside the transaction.
+        self.logger.warning(
+            "Device creation not acknowledged, removing | device_id=%s status=%s",
+            device.id,
+            event.status.value,
+        )
+        self._remove_device_config_entry(db, device)
+        self._repo(db).delete(device)
+
+    def _remove_device_config_entry(self, db: Session, device: Device) -> None:
+        microcontroller = getattr(device, "microcontroller", None)
+        if not microcontroller:
+            return
+
+        db.refresh(microcontroller, ["config"])
+        config = dict(microcontroller.config or {})
+        current = config.get("devices_config")
+        if not isinstance(current, list):
+            return
 
-            return device
+        index, _ = _find_device_config_entry(current, device)
+        if index is not None:
+            config["devices_config"] = current[:index] + current[index + 1 :]
+            microcontroller.config = config
 
     async def update_device(
         self,
@@ -750,7 +947,8 @@ class DeviceService:
             payload.pop("device_dependency_rule", None)
 
             updated = self._repo(db).update_for_user(device_id, user_id, payload)
-            self._sync_device_config_state(
+            config_patch = self._sync_device_config_state(
+                db,
                 updated,
                 is_on=(
                     updated.manual_state
@@ -780,10 +978,12 @@ class DeviceService:
                         updated.device_dependency_rule_json
                     ),
                     scheduler_id=updated.scheduler_id,
+                    config_patch=config_patch,
                 ),
             )
 
-            return updated
+        await self._cache_device_state(updated, user_id)
+        return updated
 
     async def delete_device(
         self,
@@ -823,19 +1023,140 @@ class DeviceService:
                 device.id,
             )
 
+        if self.state_cache is not None:
+            await self.state_cache.delete(device_state_key(device_id))
+
     async def disable_scheduler_devices(
         self,
         *,
-        db: Session,
+        db: Session | AsyncSession,
         user_id: int,
         scheduler_id: int,
     ) -> list[Device]:
-        devices = self._repo(db).list_for_scheduler(
-            scheduler_id=scheduler_id,
+        """
+        Detach every device from the scheduler, or raise: 400 when the
+        agent rejected a device, 504 when one was not acknowledged. The
+        devices that were acknowledged stay detached either way.
+        """
+        results = await self.disable_scheduler_devices_bulk(
+            db=db,
             user_id=user_id,
+            scheduler_id=scheduler_id,
+        )
+        failed = [result for result in results if not result.ok]
+        if failed:
+            rejected = any(result.rejected for result in failed)
+            raise HTTPException(
+                status_code=(
+                    status.HTTP_400_BAD_REQUEST
+                    if rejected
+                    else status.HTTP_504_GATEWAY_TIMEOUT
+                ),
+                detail={
+                    "message": (
+                        "Agent rejected the scheduler disable command"
+                        if rejected
+                        else "Microcontroller did not acknowledge the scheduler disable command"
+                    ),
+                    "failed_devices": [
+                        {"device_id": result.device.id, "error": result.error}
+                        for result in failed
+                    ],
+                },
+            )
+        return [result.device for result in results]
+
+    async def disable_scheduler_devices_bulk(
+        self,
+        *,
+        db: Session | AsyncSession,
+        user_id: int,
+        scheduler_id: int,
+        concurrency: int | None = None,
+    ) -> list[DeviceCommandResult]:
+        """
+        Switch every device of the scheduler to MANUAL and off.
+
+        With `DEVICE_BATCH_COMMANDS_ENABLED`, devices are grouped per
+        microcontroller and each group goes out as one `DISABLE_SCHEDULER`
+        batch command; microcontrollers are commanded concurrently, at most
+        `concurrency` at a time, and the ACKed results are written in one
+        transaction. Otherwise each device is updated and switched off on
+        its own, which every agent version understands. Devices whose
+        command failed are left unchanged and reported with `ok=False`.
+        """
+        async with transactional_session(db):
+            groups = await run_in_session(
+                db, self._group_scheduler_devices, user_id, scheduler_id
+            )
+        if not groups:
+            return []
+
+        if not settings.DEVICE_BATCH_COMMANDS_ENABLED:
+            results = [
+                await self._disable_scheduler_device(db, user_id, device)
+                for devices in groups.values()
+                for device in devices
+            ]
+            self.logger.info(
+                "Scheduler devices disabled one by one | scheduler_id=%s devices=%s failed=%s",
+                scheduler_id,
+                len(results),
+                sum(1 for result in results if not result.ok),
+            )
+            return results
+
+        semaphore = asyncio.Semaphore(
+            concurrency or settings.DEVICE_BULK_COMMAND_CONCURRENCY
         )
 
-        for device in devices:
+        async def send(microcontroller_uuid: UUID, devices: list[Device]):
+            async with semaphore:
+                return await self._send_disable_scheduler_command(
+                    microcontroller_uuid, devices
+                )
+
+        outcomes = await asyncio.gather(
+            *(send(mc_uuid, devices) for mc_uuid, devices in groups.items())
+        )
+
+        async with transactional_session(db):
+            results = await run_in_session(
+                db, self._apply_disable_scheduler_results, groups, outcomes
+            )
+
+        for result in results:
+            if result.ok:
+                await self._cache_device_state(result.device, user_id)
+
+        self.logger.info(
+            "Scheduler devices disabled | scheduler_id=%s microcontrollers=%s devices=%s failed=%s",
+            scheduler_id,
+            len(groups),
+            len(results),
+            sum(1 for result in results if not result.ok),
+        )
+        return results
+
+    def _group_scheduler_devices(
+        self, db: Session, user_id: int, scheduler_id: int
+    ) -> dict[UUID, list[Device]]:
+        groups: dict[UUID, list[Device]] = {}
+        for device in self._repo(db).list_for_scheduler(
+            scheduler_id=scheduler_id,
+            user_id=user_id,
+        ):
+            groups.setdefault(device.microcontroller.uuid, []).append(device)
+        return groups
+
+    async def _disable_scheduler_device(
+        self,
+        db: Session,
+        user_id: int,
+        device: Device,
+    ) -> DeviceCommandResult:
+        """Per-device DEVICE_UPDATED + manual-state command, for older agents."""
+        try:
             await self.update_device(
                 db,
                 user_id,
@@ -845,63 +1166,283 @@ class DeviceService:
                     "scheduler_id": None,
                 },
             )
-            await self.set_manual_state(
+            _, acked = await self.set_manual_state(
                 db=db,
                 user_id=user_id,
                 device_id=device.id,
                 state=False,
             )
+        except HTTPException as exc:
+            return DeviceCommandResult(
+                device=device,
+                ok=False,
+                error=str(exc.detail),
+                rejected=exc.status_code == status.HTTP_400_BAD_REQUEST,
+            )
+        if not acked:
+            return DeviceCommandResult(
+                device=device,
+                ok=False,
+                error="Microcontroller did not confirm the device switch-off",
+            )
+        return DeviceCommandResult(device=device, ok=True, is_on=False)
 
-        return devices
+    async def _send_disable_scheduler_command(
+        self,
+        microcontroller_uuid: UUID,
+        devices: list[Device],
+    ) -> tuple[dict | None, str | None]:
+        command_id = str(uuid4())
+        payload = DeviceBatchCommandPayload(
+            command_id=command_id,
+            command="DISABLE_SCHEDULER",
+            devices=[
+                DeviceBatchCommandItem(
+                    device_id=device.id,
+                    device_uuid=str(device.uuid),
+                    device_number=device.device_number,
+                    mode=DeviceMode.MANUAL.value,
+                    is_on=False,
+                    scheduler_id=None,
+                )
+                for device in devices
+            ],
+        )
+
+        try:
+            result = await self.events.publish_event_and_wait_for_ack(
+                entity_type=EventType.DEVICE_COMMAND.value,
+                entity_id=str(microcontroller_uuid),
+                event_type=EventType.DEVICE_COMMAND,
+                data=payload,
+                predicate=lambda e: (e.get("data") or {}).get("command_id") == command_id,
+                timeout=10.0,
+                subject=subject_for_entity(
+                    microcontroller_uuid, EventType.DEVICE_COMMAND.value
+                ),
+                ack_subject=ack_subject_for_entity(
+                    microcontroller_uuid, EventType.DEVICE_COMMAND.value
+                ),
+            )
+        except Exception as exc:
+            self.logger.error(
+                "BATCH COMMAND ACK FAILED | mc_uuid=%s devices=%s error=%s",
+                microcontroller_uuid,
+                len(devices),
+                exc,
+            )
+            return None, f"Microcontroller did not acknowledge the command: {exc}"
+
+        ack_data = result.get("data") or {}
+        if not ack_data.get("ok", False):
+            return ack_data, "Agent rejected the command"
+        return ack_data, None
+
+    def _apply_disable_scheduler_results(
+        self,
+        db: Session,
+        groups: dict[UUID, list[Device]],
+        outcomes: list[tuple[dict | None, str | None]],
+    ) -> list[DeviceCommandResult]:
+        now = datetime.now(timezone.utc)
+        results: list[DeviceCommandResult] = []
+
+        for devices, (ack_data, error) in zip(groups.values(), outcomes):
+            per_device = _results_by_device_id((ack_data or {}).get("results"))
+            for device in devices:
+                entry = per_device.get(device.id)
+                if error is None and entry is None:
+                    # Only devices the agent reported are confirmed.
+                    results.append(
+                        DeviceCommandResult(
+                            device=device,
+                            ok=False,
+                            error="Agent did not report the device",
+                        )
+                    )
+                    continue
+                if error is not None or not entry.get("ok", True):
+                    results.append(
+                        DeviceCommandResult(
+                            device=device,
+                            ok=False,
+                            error=error or "Agent rejected the device command",
+                            rejected=ack_data is not None,
+                        )
+                    )
+                    continue
+
+                ack_state = self.ack_device_state(entry)
+                is_on = ack_state if ack_state is not None else False
+                device.mode = DeviceMode.MANUAL
+                device.scheduler_id = None
+                device.manual_state = is_on
+                device.last_state_change_at = now
+                self._sync_device_config_state(
+                    db,
+                    device,
+                    is_on=is_on,
+                    bump_version=False,
+                )
+                results.append(DeviceCommandResult(device=device, ok=True, is_on=is_on))
+
+        return results
 
     async def set_manual_state(
         self,
         *,
-        db: Session,
+        db: Session | AsyncSession,
         user_id: int,
         device_id: int,
         state: bool,
     ) -> tuple[DeviceResponse, bool]:
 
+        device, device_dto = await run_in_session(
+            db, self._load_device_response, device_id, user_id
+        )
+
+        async with transactional_session(db):
+            event_id = await run_in_session(db, self._stage_manual_state, device, state)
+
+        result = await self.outbox.deliver(event_id)
+        if not result.ok:
+            self.logger.warning(
+                "SET MANUAL STATE – ACK FAILED | device_id=%s | %s",
+                device_id,
+                result.error or result.status.value,
+            )
+            # The reconciler restored the previous state, or will once the
+            # relay loop settles an event still in flight.
+            return device_dto, False
+
+        device_dto = await run_in_session(db, self._refresh_device_response, device)
+        await self._cache_device_state(device, user_id)
+        return device_dto, True
+
+    def _load_device_response(
+        self, db: Session, device_id: int, user_id: int
+    ) -> tuple[Device, DeviceResponse]:
         device = self.get_device(db, device_id, user_id)
-        device_dto = DeviceResponse.model_validate(device, from_attributes=True)
+        return device, DeviceResponse.model_validate(device, from_attributes=True)
+
+    def _stage_manual_state(self, db: Session, device: Device, state: bool) -> UUID:
+        previous = {
+            "mode": device.mode.value if device.mode is not None else None,
+            "manual_state": device.manual_state,
+            "last_state_change_at": (
+                device.last_state_change_at.isoformat()
+                if device.last_state_change_at is not None
+                else None
+            ),
+        }
+        device.mode = DeviceMode.MANUAL
+        device.manual_state = state
+        device.last_state_change_at = datetime.now(timezone.utc)
+
+        command = DeviceCommandPayload(
+            device_id=device.id,
+            device_uuid=str(device.uuid),
+            device_number=device.device_number,
+            command="SET_STATE",
+            mode="MANUAL",
+            is_on=state,
+        )
+        event = self._enqueue_event(
+            db,
+            microcontroller_uuid=device.microcontroller.uuid,
+            event_type=EventType.DEVICE_COMMAND,
+            payload=command,
+            reconcile={"device_id": device.id, "state": state, "previous": previous},
+        )
+        return event.event_id
 
-        try:
-            async with transactional_session(db):
-                device.mode = DeviceMode.MANUAL
-                device.manual_state = state
-                device.last_state_change_at = datetime.now(timezone.utc)
+    def _reconcile_manual_state(self, db: Session, event: OutboxEvent) -> None:
+        reconcile = event.reconcile_json or {}
+        device = self._repo(db).get_by_id(reconcile.get("device_id"))
+        if device is None:
+            return
+        self._invalidate_device_state(db, device.id)
 
-                ack_data = await self._publish_event(
-                    microcontroller_uuid=device.microcontroller.uuid,
-                    event_type=EventType.DEVICE_COMMAND,
-                    payload=DeviceCommandPayload(
-                        device_id=device_id,
-                        device_uuid=str(device.uuid),
-                        device_number=device.device_number,
-                        command="SET_STATE",
-                        mode="MANUAL",
-                        is_on=state,
-                    ),
+        if event.status == OutboxEventStatus.ACK_OK:
+            ack_state = self.ack_device_state(event.ack_payload_json or {})
+            if ack_state is not None:
+                device.manual_state = ack_state
+
+            if isinstance(device.manual_state, bool):
+                self._sync_device_config_state(
+                    db,
+                    device,
+                    is_on=device.manual_state,
+                    bump_version=False,
                 )
+            return
 
-                ack_state = self.ack_device_state(ack_data)
-                if ack_state is not None:
-                    device.manual_state = ack_state
+        # Restore the previous state unless a later change replaced ours.
+        if device.mode != DeviceMode.MANUAL or device.manual_state != reconcile.get("state"):
+            return
+        previous = reconcile.get("previous") or {}
+        device.mode = (
+            DeviceMode(previous["mode"]) if previous.get("mode") is not None else None
+        )
+        device.manual_state = previous.get("manual_state")
+        device.last_state_change_at = (
+            datetime.fromisoformat(previous["last_state_change_at"])
+            if previous.get("last_state_change_at")
+            else None
+        )
 
-                if isinstance(device.manual_state, bool):
-                    self._sync_device_config_state(device, is_on=device.manual_state)
+    @staticmethod
+    def _refresh_device_response(db: Session, device: Device) -> DeviceResponse:
+        db.refresh(device)
+        return DeviceResponse.model_validate(device, from_attributes=True)
 
-                device_dto = DeviceResponse.model_validate(device, from_attributes=True)
-            return device_dto, True
+    # ---------------------------------------------------------------------
+    # Outbox
+    # ---------------------------------------------------------------------
 
-        except HTTPException as exc:
-            self.logger.warning(
-                "SET MANUAL STATE – ACK FAILED | device_id=%s | %s",
-                device_id,
-                exc,
-            )
-            return device_dto, False
+    def _enqueue_event(
+        self,
+        db: Session,
+        *,
+        microcontroller_uuid: UUID,
+        event_type: EventType,
+        payload,
+        reconcile: dict,
+    ) -> OutboxEvent:
+        subject, ack_subject, envelope = self.events.build_ack_event(
+            entity_type=event_type.value,
+            entity_id=str(microcontroller_uuid),
+            event_type=event_type,
+            data=payload,
+            subject=subject_for_entity(microcontroller_uuid, event_type.value),
+            ack_subject=ack_subject_for_entity(microcontroller_uuid, event_type.value),
+        )
+        self.logger.debug(
+            "OUTBOX event | type=%s mc_uuid=%s subject=%s payload=%s",
+            event_type,
+            microcontroller_uuid,
+            subject,
+            payload,
+        )
+        return OutboxRepository(db).enqueue(
+            event_type=event_type.value,
+            entity_id=str(microcontroller_uuid),
+            subject=subject,
+            ack_subject=ack_subject,
+            payload=envelope,
+            ack_match={"device_id": payload.device_id},
+            reconcile=reconcile,
+        )
+
+    @staticmethod
+    def _ack_failed(event_type: EventType, result: OutboxResult) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=(
+                f"Microcontroller did not acknowledge "
+                f"the {event_type.value} event: {result.error or result.status.value}"
+            ),
+        )
 
     # ---------------------------------------------------------------------
     # Events
@@ -940,118 +1481,100 @@ class DeviceService:
 
     def _sync_device_config_state(
         self,
+        db: Session,
         device: Device,
         *,
         is_on: bool | None,
-    ) -> None:
+        bump_version: bool = True,
+    ) -> DeviceConfigPatch | None:
+        """
+        Bring the device's `devices_config` entry in line with the device row.
+
+        Only the changed entry is written. With `bump_version` the entry
+        version is incremented and the resulting patch is returned so it
+        can be shipped to the agent; state echoed back from an agent ACK
+        is stored without a new version.
+        """
         microcontroller = getattr(device, "microcontroller", None)
         if not microcontroller:
-            return
-
-        config = dict(microcontroller.config or {})
-        raw_devices_config = config.get("devices_config")
+            return None
 
+        raw_devices_config = (microcontroller.config or {}).get("devices_config")
         devices_config = (
-            [dict(item) for item in raw_devices_config if isinstance(item, dict)]
-            if isinstance(raw_devices_config, list)
-            else []
+            raw_devices_config if isinstance(raw_devices_config, list) else []
         )
 
-        updated = False
-        for item in devices_config:
-            if (
-                item.get("device_id") == device.id
-                or item.get("pin_number") == device.device_number
-            ):
-                mode_value = (
-                    device.mode.value
-                    if hasattr(device.mode, "value")
-                    else str(device.mode)
-                )
-                threshold_value = (
-                    float(device.threshold_value)
-                    if device.threshold_value is not None
-                    else None
-                )
-                threshold_unit = _provider_power_unit(microcontroller)
-                auto_rule = _rule_from_value(device.auto_rule_json)
-                dependency_rule = _dependency_rule_from_value(
-                    device.device_dependency_rule_json
-                )
-                rated_power = (
-                    float(device.rated_power) if device.rated_power is not None else None
-                )
-                item["device_id"] = device.id
-                item["device_uuid"] = str(device.uuid)
-                item["device_number"] = device.device_number
-                item["pin_number"] = device.device_number
-                item["mode"] = mode_value
-                item["rated_power"] = rated_power
-                item["threshold_value"] = threshold_value
-                item["threshold_unit"] = threshold_unit
-                item["auto_rule"] = (
-                    auto_rule.model_dump() if auto_rule is not None else None
-                )
-                item["device_dependency_rule"] = (
-                    dependency_rule.model_dump(
-                        mode="json",
-                        exclude={"target_device_number"},
-                    )
-                    if dependency_rule is not None
-                    else None
-                )
-                if is_on is not None:
-                    item["is_on"] = is_on
-                elif "is_on" not in item and isinstance(device.manual_state, bool):
-                    item["is_on"] = device.manual_state
-                updated = True
-
-        if not updated:
-            mode_value = (
-                device.mode.value if hasattr(device.mode, "value") else str(device.mode)
+        index, previous = _find_device_config_entry(devices_config, device)
+        entry = {
+            **(previous or {}),
+            **_device_config_fields(device, microcontroller),
+        }
+        if is_on is not None:
+            entry["is_on"] = is_on
+        elif "is_on" not in entry:
+            entry["is_on"] = (
+                device.manual_state if isinstance(device.manual_state, bool) else None
             )
-            threshold_value = (
-                float(device.threshold_value)
-                if device.threshold_value is not None
-                else None
-            )
-            threshold_unit = _provider_power_unit(microcontroller)
-            auto_rule = _rule_from_value(device.auto_rule_json)
-            dependency_rule = _dependency_rule_from_value(device.device_dependency_rule_json)
-            rated_power = (
-                float(device.rated_power) if device.rated_power is not None else None
-            )
-            devices_config.append(
-                {
-                    "device_id": device.id,
-                    "device_uuid": str(device.uuid),
-                    "device_number": device.device_number,
-                    "pin_number": device.device_number,
-                    "mode": mode_value,
-                    "rated_power": rated_power,
-                    "threshold_value": threshold_value,
-                    "threshold_unit": threshold_unit,
-                    "auto_rule": (
-                        auto_rule.model_dump() if auto_rule is not None else None
-                    ),
-                    "device_dependency_rule": (
-                        dependency_rule.model_dump(
-                            mode="json",
-                            exclude={"target_device_number"},
-                        )
-                        if dependency_rule is not None
-                        else None
-                    ),
-                    "is_on": (
-                        is_on
-                        if is_on is not None
-                        else (device.manual_state if isinstance(device.manual_state, bool) else None)
-                    ),
-                }
+
+        patch = build_device_config_patch(previous, entry)
+        if patch is None:
+            return None
+
+        if bump_version:
+            entry[CONFIG_VERSION_KEY] = patch.version
+        else:
+            entry[CONFIG_VERSION_KEY] = patch.base_version
+            patch = None
+
+        db.flush()
+        written = self._microcontroller_repo(db).write_device_config_entry(
+            microcontroller,
+            index=index,
+            entry=entry,
+        )
+        if not written:
+            self.logger.warning(
+                "devices_config entry moved, rewriting full config | device_id=%s mc_id=%s",
+                device.id,
+                microcontroller.id,
             )
+            db.refresh(microcontroller, ["config"])
+            config = dict(microcontroller.config or {})
+            current = config.get("devices_config")
+            next_devices_config = list(current) if isinstance(current, list) else []
+            current_index, _ = _find_device_config_entry(next_devices_config, device)
+            if current_index is None:
+                next_devices_config.append(entry)
+            else:
+                next_devices_config[current_index] = entry
+            config["devices_config"] = next_devices_config
+            microcontroller.config = config
+
+        return patch
+
+    async def _cache_device_state(self, device: Device, user_id: int) -> None:
+        """Share the committed device state with other API nodes."""
+        if self.state_cache is None:
+            return
+        await self.state_cache.put_device_state(
+            device.id,
+            is_on=device.manual_state if isinstance(device.manual_state, bool) else None,
+            mode=device.mode.value if device.mode is not None else None,
+            changed_at=device.last_state_change_at,
+            user_id=user_id,
+        )
 
-        config["devices_config"] = devices_config
-        microcontroller.config = config
+    def _invalidate_device_state(self, db: Session, device_id: int) -> None:
+        """Drop the cached state once the reconciler's transaction commits."""
+        if self.state_cache is None:
+            return
+        key = device_state_key(device_id)
+        event.listen(
+            db,
+            "after_commit",
+            lambda _session: self.state_cache.invalidate_threadsafe(key),
+            once=True,
+        )
 
     async def _publish_event(
         self, microcontroller_uuid: UUID, event_type: EventType, payload
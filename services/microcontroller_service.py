@@ -1,13 +1,18 @@
 import logging
+from dataclasses import asdict, dataclass
 from typing import Any, Callable, Optional
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from smart_common.core import db
+from smart_common.core.db import run_in_session, transactional_session
 from smart_common.enums.event import EventType
+from smart_common.enums.outbox import OutboxEventStatus
 from smart_common.models.microcontroller import Microcontroller
+from smart_common.models.outbox_event import OutboxEvent
 from smart_common.models.microcontroller_sensor_capability import (
     MicrocontrollerSensorCapability,
 )
@@ -24,6 +29,7 @@ from smart_common.nats.publisher import NatsPublisher
 from smart_common.providers.enums import ProviderKind, ProviderType
 from smart_common.providers.registry import resolve_sensor_type
 from smart_common.repositories.microcontroller import MicrocontrollerRepository
+from smart_common.repositories.outbox_repository import OutboxRepository
 from smart_common.repositories.provider import ProviderRepository
 from smart_common.schemas.automation_rule import (
     AutomationRuleGroup,
@@ -37,6 +43,41 @@ from smart_common.schemas.microcontroller_schema import (
     MicrocontrollerAgentCommandAck,
     MicrocontrollerConfigUpdateRequest,
 )
+from smart_common.services.outbox_relay import OutboxRelay, outbox_relay
+from smart_common.nats.state_cache import LatestStateCache
+
+
+@dataclass
+class _PowerProviderChange:
+    """Provider switch for one microcontroller; stored with its outbox event."""
+
+    microcontroller_id: int
+    microcontroller_uuid: str
+    previous_provider_id: int | None
+    previous_provider_config: dict[str, Any] | None
+    previous_provider_uuid: str | None
+    previous_unit: str | None
+    provider_uuid: str | None
+    provider_id: int | None = None
+    unit: str | None = None
+    has_power_meter: bool = False
+    has_energy_storage: bool = False
+    provider_config: dict[str, Any] | None = None
+
+    @property
+    def unchanged(self) -> bool:
+        return (
+            self.previous_provider_uuid == self.provider_uuid
+            and self.previous_unit == self.unit
+        )
+
+    def event_data(self) -> dict[str, Any]:
+        return {
+            "provider_uuid": self.provider_uuid,
+            "unit": self.unit,
+            "has_power_meter": self.has_power_meter,
+            "has_energy_storage": self.has_energy_storage,
+        }
 
 
 class MicrocontrollerService:
@@ -45,11 +86,18 @@ class MicrocontrollerService:
         self,
         repo_factory: Callable[[Session], MicrocontrollerRepository],
         provider_repo_factory: Optional[Callable[[Session], ProviderRepository]] = None,
+        outbox: OutboxRelay | None = None,
+        state_cache: LatestStateCache | None = None,
     ):
         self._repo_factory = repo_factory
         self._provider_repo_factory = provider_repo_factory
+        self.state_cache = state_cache
         self.logger = logging.getLogger(__name__)
         self.events = EventDispatcher(NatsPublisher(NATSClient()))
+        self.outbox = outbox or outbox_relay
+        self.outbox.register_reconciler(
+            EventType.PROVIDER_UPDATED.value, self._reconcile_power_provider
+        )
 
     def _repo(self, db: Session) -> MicrocontrollerRepository:
         return self._repo_factory(db)
@@ -309,6 +357,26 @@ class MicrocontrollerService:
             log_message="Microcontroller updated by user",
         )
 
+    def get_online_status(
+        self,
+        db: Session,
+        user_id: int,
+        microcontroller_uuid: UUID,
+    ) -> dict[str, Any]:
+        """Online flag and last heartbeat, from the shared state cache."""
+        microcontroller = self._repo(db).get_for_user_by_uuid(microcontroller_uuid, user_id)
+        if not microcontroller:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Microcontroller not found",
+            )
+        if self.state_cache is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Microcontroller online status is not available",
+            )
+        return self.state_cache.microcontroller_online(str(microcontroller.uuid))
+
     def _normalize_sensor_values(self, sensors: list[str | SensorType]) -> list[str]:
         return [
             sensor.value if isinstance(sensor, SensorType) else str(sensor)
@@ -623,35 +691,103 @@ class MicrocontrollerService:
 
     async def set_power_provider(
         self,
-        db: Session,
+        db: Session | AsyncSession,
         *,
         user_id: int,
         microcontroller_uuid: UUID,
         provider_uuid: UUID | None,
     ) -> Microcontroller:
+        async with transactional_session(db):
+            microcontroller, change = await run_in_session(
+                db,
+                self._stage_power_provider,
+                user_id=user_id,
+                microcontroller_uuid=microcontroller_uuid,
+                provider_uuid=provider_uuid,
+            )
+
+            if change.unchanged:
+                self.logger.info(
+                    "Provider already set for microcontroller",
+                    extra={
+                        "microcontroller_uuid": change.microcontroller_uuid,
+                        "provider_uuid": change.provider_uuid,
+                        "unit": change.unit,
+                    },
+                )
+                return microcontroller
+
+            event_id = await run_in_session(
+                db, self._apply_power_provider, microcontroller, change
+            )
+
+        # Committed: the ACK wait below holds no DB connection; the
+        # reconciler restores the previous provider if the agent refuses.
+        result = await self.outbox.deliver(event_id)
+        if result.status == OutboxEventStatus.ACK_FAIL:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Agent rejected provider update",
+            )
+        if not result.ok:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=(
+                    "Microcontroller did not acknowledge PROVIDER_UPDATED event: "
+                    f"{result.error or result.status.value}"
+                ),
+            )
+        ack_data = result.ack_data or {}
+        self._validate_provider_updated_ack(ack_data, change)
+
+        await run_in_session(db, Session.refresh, microcontroller)
+
+        self.logger.info(
+            "Provider updated for microcontroller",
+            extra={
+                "microcontroller_uuid": change.microcontroller_uuid,
+                "previous_provider_uuid": change.previous_provider_uuid,
+                "provider_uuid": change.provider_uuid,
+                "previous_unit": change.previous_unit,
+                "unit": change.unit,
+                "has_power_meter": change.has_power_meter,
+                "has_energy_storage": change.has_energy_storage,
+                "ack_changed": ack_data.get("changed"),
+            },
+        )
+
+        return microcontroller
+
+    def _stage_power_provider(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        microcontroller_uuid: UUID,
+        provider_uuid: UUID | None,
+    ) -> tuple[Microcontroller, _PowerProviderChange]:
         microcontroller = self._repo(db).get_for_user_by_uuid(microcontroller_uuid, user_id)
         if not microcontroller:
             raise HTTPException(status_code=404, detail="Microcontroller not found")
 
-        previous_provider_uuid = (
-            str(microcontroller.power_provider.uuid)
-            if getattr(microcontroller, "power_provider", None)
-            else None
-        )
-        previous_provider_unit = (
-            microcontroller.power_provider.unit.value
-            if getattr(microcontroller, "power_provider", None)
-            and getattr(microcontroller.power_provider, "unit", None) is not None
-            else None
+        previous_provider = getattr(microcontroller, "power_provider", None)
+        change = _PowerProviderChange(
+            microcontroller_id=microcontroller.id,
+            microcontroller_uuid=str(microcontroller.uuid),
+            previous_provider_id=microcontroller.power_provider_id,
+            previous_provider_config=(microcontroller.config or {}).get("provider"),
+            previous_provider_uuid=(
+                str(previous_provider.uuid) if previous_provider else None
+            ),
+            previous_unit=(
+                previous_provider.unit.value
+                if previous_provider
+                and getattr(previous_provider, "unit", None) is not None
+                else None
+            ),
+            provider_uuid=str(provider_uuid) if provider_uuid is not None else None,
         )
 
-        next_provider_id: int | None = None
-        next_provider_uuid = str(provider_uuid) if provider_uuid is not None else None
-        next_provider_unit: str | None = None
-        next_provider_has_power_meter = False
-        next_provider_has_energy_storage = False
-        next_provider_config: dict[str, Any] | None = None
-
         if provider_uuid is not None:
             provider = self._provider_repo(db).get_for_user_by_uuid(provider_uuid, user_id)
             if not provider or not provider.enabled:
@@ -663,115 +799,78 @@ class MicrocontrollerService:
                 microcontroller=microcontroller,
                 provider=provider,
             )
-            next_provider_id = provider.id
-            next_provider_uuid = str(provider.uuid)
-            next_provider_unit = provider.unit.value if provider.unit is not None else None
-            next_provider_has_power_meter = bool(provider.has_power_meter)
-            next_provider_has_energy_storage = bool(provider.has_energy_storage)
-            next_provider_config = self._provider_config_payload(provider)
-
-        if (
-            previous_provider_uuid == next_provider_uuid
-            and previous_provider_unit == next_provider_unit
-        ):
-            self.logger.info(
-                "Provider already set for microcontroller",
-                extra={
-                    "microcontroller_uuid": str(microcontroller.uuid),
-                    "provider_uuid": next_provider_uuid,
-                    "unit": next_provider_unit,
-                },
-            )
-            return microcontroller
+            change.provider_id = provider.id
+            change.provider_uuid = str(provider.uuid)
+            change.unit = provider.unit.value if provider.unit is not None else None
+            change.has_power_meter = bool(provider.has_power_meter)
+            change.has_energy_storage = bool(provider.has_energy_storage)
+            change.provider_config = self._provider_config_payload(provider)
 
-        ack_data = await self._publish_provider_updated(
-            microcontroller_uuid=str(microcontroller.uuid),
-            provider_uuid=next_provider_uuid,
-            previous_provider_uuid=previous_provider_uuid,
-            unit=next_provider_unit,
-            has_power_meter=next_provider_has_power_meter,
-            has_energy_storage=next_provider_has_energy_storage,
-        )
+        return microcontroller, change
 
-        microcontroller.power_provider_id = next_provider_id
+    def _apply_power_provider(
+        self,
+        db: Session,
+        microcontroller: Microcontroller,
+        change: _PowerProviderChange,
+    ) -> UUID:
+        microcontroller.power_provider_id = change.provider_id
         config = dict(microcontroller.config or {})
-        config["provider"] = next_provider_config
+        config["provider"] = change.provider_config
         microcontroller.config = config
-        db.commit()
-        db.refresh(microcontroller)
 
-        self.logger.info(
-            "Provider updated for microcontroller",
-            extra={
-                "microcontroller_uuid": str(microcontroller.uuid),
-                "previous_provider_uuid": previous_provider_uuid,
-                "provider_uuid": next_provider_uuid,
-                "previous_unit": previous_provider_unit,
-                "unit": next_provider_unit,
-                "has_power_meter": next_provider_has_power_meter,
-                "has_energy_storage": next_provider_has_energy_storage,
-                "ack_changed": ack_data.get("changed"),
+        subject, ack_subject, payload = self.events.build_ack_event(
+            entity_type="microcontroller",
+            entity_id=change.microcontroller_uuid,
+            event_type=EventType.PROVIDER_UPDATED,
+            data=change.event_data(),
+            subject=(
+                f"{stream_name()}.{change.microcontroller_uuid}.command.provider_updated"
+            ),
+            ack_subject=f"{stream_name()}.provider_update.ack",
+            source="backend",
+        )
+        event = OutboxRepository(db).enqueue(
+            event_type=EventType.PROVIDER_UPDATED.value,
+            entity_id=change.microcontroller_uuid,
+            subject=subject,
+            ack_subject=ack_subject,
+            payload=payload,
+            ack_match={
+                "microcontroller_uuid": change.microcontroller_uuid,
+                **change.event_data(),
             },
+            reconcile=asdict(change),
         )
+        return event.event_id
 
-        return microcontroller
-
-    async def _publish_provider_updated(
-        self,
-        *,
-        microcontroller_uuid: str,
-        provider_uuid: str | None,
-        previous_provider_uuid: str | None,
-        unit: str | None,
-        has_power_meter: bool,
-        has_energy_storage: bool,
-    ) -> dict:
-        event_type = EventType.PROVIDER_UPDATED
-        subject = f"{stream_name()}.{microcontroller_uuid}.command.provider_updated"
-        ack_subject = f"{stream_name()}.provider_update.ack"
-        try:
-            result = await self.events.publish_event_and_wait_for_ack(
-                entity_type="microcontroller",
-                entity_id=microcontroller_uuid,
-                event_type=event_type,
-                data={
-                    "provider_uuid": provider_uuid,
-                    "unit": unit,
-                    "has_power_meter": has_power_meter,
-                    "has_energy_storage": has_energy_storage,
-                },
-                predicate=lambda payload: self._provider_updated_ack_matches(
-                    payload=payload,
-                    microcontroller_uuid=microcontroller_uuid,
-                    provider_uuid=provider_uuid,
-                    unit=unit,
-                    has_power_meter=has_power_meter,
-                    has_energy_storage=has_energy_storage,
-                ),
-                timeout=10.0,
-                subject=subject,
-                ack_subject=ack_subject,
-                source="backend",
-            )
-        except Exception as exc:
-            self.logger.error(
-                "PROVIDER_UPDATED ACK FAILED | mc_uuid=%s error=%s",
-                microcontroller_uuid,
-                exc,
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                detail=f"Microcontroller did not acknowledge PROVIDER_UPDATED event: {exc}",
-            ) from exc
+    def _reconcile_power_provider(self, db: Session, event: OutboxEvent) -> None:
+        change = _PowerProviderChange(**(event.reconcile_json or {}))
+        if event.status == OutboxEventStatus.ACK_OK:
+            try:
+                self._validate_provider_updated_ack(event.ack_payload_json or {}, change)
+                return
+            except HTTPException as exc:
+                self.logger.warning(
+                    "PROVIDER_UPDATED ACK invalid | mc_uuid=%s detail=%s",
+                    change.microcontroller_uuid,
+                    exc.detail,
+                )
 
-        ack_data = result.get("data") or {}
-        if not ack_data.get("ok", False):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Agent rejected provider update",
-            )
+        microcontroller = self._repo(db).get_by_id(change.microcontroller_id)
+        # Restore the previous provider unless a later change replaced ours.
+        if microcontroller is None or microcontroller.power_provider_id != change.provider_id:
+            return
+        microcontroller.power_provider_id = change.previous_provider_id
+        config = dict(microcontroller.config or {})
+        config["provider"] = change.previous_provider_config
+        microcontroller.config = config
 
+    def _validate_provider_updated_ack(
+        self,
+        ack_data: dict,
+        change: _PowerProviderChange,
+    ) -> None:
         changed = ack_data.get("changed")
         if changed not in {True, False}:
             raise HTTPException(
@@ -779,13 +878,13 @@ class MicrocontrollerService:
                 detail="Agent returned invalid provider update acknowledgement",
             )
 
-        if str(ack_data.get("microcontroller_uuid")) != microcontroller_uuid:
+        if str(ack_data.get("microcontroller_uuid")) != change.microcontroller_uuid:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Agent ACK microcontroller_uuid mismatch",
             )
 
-        expected_provider_uuid = provider_uuid
+        expected_provider_uuid = change.provider_uuid
         got_provider_uuid = ack_data.get("provider_uuid")
         if expected_provider_uuid is None:
             if got_provider_uuid is not None:
@@ -801,13 +900,13 @@ class MicrocontrollerService:
 
         if changed is True:
             got_previous = ack_data.get("previous_provider_uuid")
-            if previous_provider_uuid is None:
+            if change.previous_provider_uuid is None:
                 if got_previous is not None:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Agent ACK previous_provider_uuid mismatch",
                     )
-            elif str(got_previous) != previous_provider_uuid:
+            elif str(got_previous) != change.previous_provider_uuid:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Agent ACK previous_provider_uuid mismatch",
@@ -816,52 +915,10 @@ class MicrocontrollerService:
         if changed is False:
             self.logger.info(
                 "Agent provider update was idempotent | mc_uuid=%s provider_uuid=%s",
-                microcontroller_uuid,
-                provider_uuid,
+                change.microcontroller_uuid,
+                change.provider_uuid,
             )
 
-        return ack_data
-
-    def _provider_updated_ack_matches(
-        self,
-        *,
-        payload: dict,
-        microcontroller_uuid: str,
-        provider_uuid: str | None,
-        unit: str | None,
-        has_power_meter: bool,
-        has_energy_storage: bool,
-    ) -> bool:
-        if not isinstance(payload, dict):
-            return False
-
-        data = payload.get("data")
-        if not isinstance(data, dict):
-            return False
-
-        if str(data.get("microcontroller_uuid")) != microcontroller_uuid:
-            return False
-
-        incoming_provider_uuid = data.get("provider_uuid")
-        if provider_uuid is None:
-            if incoming_provider_uuid is not None:
-                return False
-        elif str(incoming_provider_uuid) != provider_uuid:
-            return False
-
-        incoming_unit = data.get("unit")
-        if unit is None:
-            if incoming_unit is not None:
-                return False
-        elif str(incoming_unit) != unit:
-            return False
-
-        if bool(data.get("has_power_meter", False)) != has_power_meter:
-            return False
-        if bool(data.get("has_energy_storage", False)) != has_energy_storage:
-            return False
-        return True
-
     # def __init__(
     #     self,
     #     repo_factory: Callable[[Session], MicrocontrollerRepository],
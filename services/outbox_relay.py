@@ -0,0 +1,580 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Collection
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from smart_common.core.config import settings
+from smart_common.core.db import SessionLocal
+from smart_common.enums.outbox import OutboxEventStatus
+from smart_common.models.outbox_event import OutboxEvent
+from smart_common.nats.compression import decode_message_json
+from smart_common.nats.publisher import NatsPublisher, publisher
+from smart_common.repositories.outbox_repository import (
+    FINAL_STATUSES,
+    OutboxRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Runs in the relay's transaction once an event reached a final status.
+Reconciler = Callable[[Session, OutboxEvent], None]
+
+
+@dataclass(frozen=True)
+class OutboxResult:
+    event_id: UUID
+    status: OutboxEventStatus
+    ack_data: dict[str, Any] | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OutboxEventStatus.ACK_OK
+
+
+@dataclass
+class _Delivery:
+    event_id: UUID
+    event_type: str
+    entity_id: str
+    subject: str
+    ack_subject: str
+    payload: dict[str, Any]
+    ack_match: dict[str, Any]
+    attempt: int
+    ack: asyncio.Future | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_event(cls, event: OutboxEvent) -> "_Delivery":
+        return cls(
+            event_id=event.event_id,
+            event_type=event.event_type,
+            entity_id=event.entity_id,
+            subject=event.subject,
+            ack_subject=event.ack_subject,
+            payload=dict(event.payload_json),
+            ack_match=dict(event.ack_match_json or {}),
+            attempt=event.attempt,
+        )
+
+
+def ack_matches(payload: dict[str, Any], match: dict[str, Any]) -> bool:
+    """
+    True when `payload["data"]` (or its nested `ack`) carries every
+    `match` field: None must stay unset, booleans compare by truthiness,
+    other values as strings.
+    """
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return False
+
+    sources = [data]
+    nested_ack = data.get("ack")
+    if isinstance(nested_ack, dict):
+        sources.append(nested_ack)
+
+    for source in sources:
+        for key, expected in match.items():
+            value = source.get(key)
+            if expected is None:
+                if value is not None:
+                    break
+            elif isinstance(expected, bool):
+                if bool(value) != expected:
+                    break
+            elif value is None or str(value) != str(expected):
+                break
+        else:
+            return True
+    return False
+
+
+class OutboxRelay:
+    """
+    Publishes committed `OutboxEvent`s and reconciles their ACKs.
+
+    Services write the state change and its event in one short
+    transaction, so no DB connection or row lock is held while an agent
+    answers. Each `run_once()` claims a batch of due events, publishes it
+    (in order per microcontroller, concurrently across them, with one ACK
+    subscription per ack subject), waits for the ACKs until
+    `ack_timeout_sec` and then, in one transaction, stores the outcomes
+    and runs the reconciler registered for each event type.
+
+    `deliver()` pushes one event through the same path right away for
+    callers that report the agent's answer, e.g. an API request. It never
+    raises: a failed publish is settled like any other (retry, then
+    ACK_FAIL and the reconciler). `run()` must be running somewhere for
+    events `deliver()` could not settle; it also purges settled events
+    older than `retention_sec`. See `smart_common.services.outbox_worker`.
+    """
+
+    def __init__(
+        self,
+        *,
+        publisher: NatsPublisher = publisher,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int | None = None,
+        poll_interval_sec: float | None = None,
+        ack_timeout_sec: float | None = None,
+        max_attempts: int | None = None,
+        retry_delay_sec: float | None = None,
+        retention_sec: float | None = None,
+    ) -> None:
+        self.publisher = publisher
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval_sec = poll_interval_sec or settings.OUTBOX_POLL_INTERVAL_SEC
+        self.ack_timeout_sec = ack_timeout_sec or settings.OUTBOX_ACK_TIMEOUT_SEC
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.retry_delay_sec = (
+            settings.OUTBOX_RETRY_DELAY_SEC if retry_delay_sec is None else retry_delay_sec
+        )
+
+        self.retention_sec = retention_sec or settings.OUTBOX_RETENTION_SEC
+
+        self._reconcilers: dict[str, Reconciler] = {}
+        self._waiters: dict[UUID, asyncio.Future] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self.published = 0
+        self.acked = 0
+        self.failed = 0
+        self.purged = 0
+
+    def register_reconciler(self, event_type: str, reconciler: Reconciler) -> None:
+        self._reconcilers[event_type] = reconciler
+
+    def notify(self) -> None:
+        """Wake `run()` now instead of at the next poll interval."""
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Run loop
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Relay until `stop()` is called."""
+        self._stopping.clear()
+        loop = asyncio.get_running_loop()
+        next_purge_at = loop.time()
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Outbox relay cycle failed")
+                processed = 0
+
+            if loop.time() >= next_purge_at:
+                next_purge_at = loop.time() + settings.OUTBOX_PURGE_INTERVAL_SEC
+                try:
+                    await asyncio.to_thread(self.purge_finished)
+                except Exception:
+                    logger.exception("Outbox purge failed")
+
+            if processed >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.poll_interval_sec
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+
+    async def run_once(self, *, event_ids: Collection[UUID] | None = None) -> int:
+        """Claim, publish and settle one batch; returns how many were claimed."""
+        deliveries, abandoned = await asyncio.to_thread(self._claim, event_ids)
+        for result in abandoned:
+            self._resolve(result)
+        if not deliveries:
+            return 0
+
+        try:
+            results = await self._publish_batch(deliveries)
+        except Exception as exc:
+            # The events are already committed as SENT; settle them as
+            # publish failures instead of leaving them to claim_abandoned.
+            error = str(exc) or type(exc).__name__
+            logger.warning("Outbox batch publish failed", extra={"error": error})
+            for delivery in deliveries:
+                if delivery.ack is not None and not delivery.ack.done():
+                    delivery.ack.cancel()
+                delivery.error = delivery.error or error
+            results = [None] * len(deliveries)
+
+        settled = await asyncio.to_thread(self._settle, deliveries, results)
+        for result in settled:
+            self._resolve(result)
+        return len(deliveries)
+
+    # ------------------------------------------------------------------
+    # Deliver one event now
+    # ------------------------------------------------------------------
+
+    async def deliver(
+        self,
+        event_id: UUID,
+        *,
+        timeout: float | None = None,
+    ) -> OutboxResult:
+        """
+        Publish `event_id` without waiting for the next relay cycle and
+        return its reconciled outcome. If it is not final within `timeout`
+        the current status is returned, and the `run()` loop (started by
+        `NatsModule(outbox_relay=True)` or the outbox worker script)
+        settles it later.
+        Errors are logged and reported in the result, never raised.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.ack_timeout_sec + 5.0)
+        future = self._waiters.setdefault(event_id, loop.create_future())
+        error: str | None = None
+        try:
+            while not future.done():
+                # Not claimable while an earlier event of the same
+                # microcontroller is in flight or another relay has it.
+                try:
+                    await self.run_once(event_ids=[event_id])
+                except Exception as exc:
+                    error = str(exc) or type(exc).__name__
+                    logger.exception(
+                        "Outbox delivery cycle failed",
+                        extra={"event_id": str(event_id)},
+                    )
+                remaining = deadline - loop.time()
+                if future.done() or remaining <= 0:
+                    break
+                await asyncio.wait({future}, timeout=min(self.poll_interval_sec, remaining))
+                if not future.done():
+                    status = await self._safe_load_status(event_id)
+                    if status in FINAL_STATUSES:
+                        return OutboxResult(event_id=event_id, status=status)
+
+            if future.done():
+                return future.result()
+            status = await self._safe_load_status(event_id)
+            return OutboxResult(
+                event_id=event_id,
+                status=status or OutboxEventStatus.PENDING,
+                error=error or "Outbox event not settled before timeout",
+            )
+        finally:
+            if self._waiters.get(event_id) is future:
+                del self._waiters[event_id]
+
+    # ------------------------------------------------------------------
+    # NATS
+    # ------------------------------------------------------------------
+
+    async def _publish_batch(self, deliveries: list[_Delivery]) -> list[OutboxResult | None]:
+        loop = asyncio.get_running_loop()
+        client = self.publisher.client
+        await client.ensure_connected()
+
+        by_ack_subject: dict[str, list[_Delivery]] = defaultdict(list)
+        for delivery in deliveries:
+            delivery.ack = loop.create_future()
+            by_ack_subject[delivery.ack_subject].append(delivery)
+
+        def ack_handler(waiting: list[_Delivery]):
+            async def handle(msg) -> None:
+                try:
+                    payload = decode_message_json(msg)
+                except Exception:
+                    logger.warning("Outbox relay received undecodable ACK", exc_info=True)
+                    return
+                for delivery in waiting:
+                    if delivery.ack.done() or delivery.error is not None:
+                        continue
+                    if ack_matches(payload, delivery.ack_match):
+                        delivery.ack.set_result(payload)
+                        return
+
+            return handle
+
+        subscriptions = []
+        try:
+            for ack_subject, waiting in by_ack_subject.items():
+                subscriptions.append(
+                    await client.nc.subscribe(ack_subject, cb=ack_handler(waiting))
+                )
+            # ACK subscriptions must reach the server before the commands.
+            await client.nc.flush()
+
+            by_entity: dict[str, list[_Delivery]] = defaultdict(list)
+            for delivery in deliveries:
+                by_entity[delivery.entity_id].append(delivery)
+            await asyncio.gather(
+                *(self._publish_in_order(items) for items in by_entity.values())
+            )
+
+            waiting = [
+                delivery.ack
+                for delivery in deliveries
+                if delivery.error is None
+            ]
+            if waiting:
+                await asyncio.wait(waiting, timeout=self.ack_timeout_sec)
+        finally:
+            for subscription in subscriptions:
+                try:
+                    await subscription.unsubscribe()
+                except Exception:
+                    logger.debug("Outbox ACK unsubscribe failed", exc_info=True)
+
+        results: list[OutboxResult | None] = []
+        for delivery in deliveries:
+            if delivery.error is not None:
+                # Publish failed; retried unless out of attempts.
+                results.append(None)
+                continue
+            if not delivery.ack.done():
+                delivery.ack.cancel()
+                results.append(
+                    OutboxResult(
+                        event_id=delivery.event_id,
+                        status=OutboxEventStatus.TIMEOUT,
+                        error="Timeout waiting for ACK",
+                    )
+                )
+                continue
+            ack_data = delivery.ack.result().get("data") or {}
+            results.append(
+                OutboxResult(
+                    event_id=delivery.event_id,
+                    status=(
+                        OutboxEventStatus.ACK_OK
+                        if ack_data.get("ok", False)
+                        else OutboxEventStatus.ACK_FAIL
+                    ),
+                    ack_data=ack_data,
+                    error=None if ack_data.get("ok", False) else "Agent rejected event",
+                )
+            )
+        return results
+
+    async def _publish_in_order(self, deliveries: list[_Delivery]) -> None:
+        for delivery in deliveries:
+            try:
+                await self.publisher.publish(
+                    delivery.subject,
+                    delivery.payload,
+                    context={
+                        "component": "outbox-relay",
+                        "event_id": str(delivery.event_id),
+                        "event_type": delivery.event_type,
+                        "attempt": delivery.attempt,
+                    },
+                )
+                self.published += 1
+            except Exception as exc:
+                delivery.error = str(exc) or type(exc).__name__
+                logger.warning(
+                    "Outbox publish failed",
+                    extra={
+                        "event_id": str(delivery.event_id),
+                        "event_type": delivery.event_type,
+                        "attempt": delivery.attempt,
+                        "error": delivery.error,
+                    },
+                )
+
+    # ------------------------------------------------------------------
+    # DB (run in a worker thread)
+    # ------------------------------------------------------------------
+
+    def _claim(
+        self, event_ids: Collection[UUID] | None
+    ) -> tuple[list[_Delivery], list[OutboxResult]]:
+        session = self.session_factory()
+        try:
+            repo = OutboxRepository(session)
+            now = _utc_now()
+            abandoned: list[OutboxResult] = []
+            if event_ids is None:
+                for event in repo.claim_abandoned(now_utc=now, limit=self.batch_size):
+                    if event.attempt < self.max_attempts:
+                        repo.mark_retry(
+                            event,
+                            now_utc=now,
+                            retry_delay_sec=0.0,
+                            error="ACK deadline passed without a relay result",
+                        )
+                        continue
+                    result = OutboxResult(
+                        event_id=event.event_id,
+                        status=OutboxEventStatus.TIMEOUT,
+                        error="ACK deadline passed without a relay result",
+                    )
+                    self._finish(session, repo, event, result, now)
+                    abandoned.append(result)
+
+            events = repo.claim_pending(
+                limit=self.batch_size,
+                now_utc=now,
+                ack_timeout_sec=self.ack_timeout_sec,
+                event_ids=event_ids,
+            )
+            deliveries = [_Delivery.from_event(event) for event in events]
+            session.commit()
+            return deliveries, abandoned
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _settle(
+        self,
+        deliveries: list[_Delivery],
+        results: list[OutboxResult | None],
+    ) -> list[OutboxResult]:
+        session = self.session_factory()
+        try:
+            repo = OutboxRepository(session)
+            now = _utc_now()
+            settled: list[OutboxResult] = []
+            for delivery, result in zip(deliveries, results):
+                event = repo.get_for_update(event_id=delivery.event_id)
+                if event is None or event.status != OutboxEventStatus.SENT:
+                    continue
+
+                if result is None:
+                    if event.attempt < self.max_attempts:
+                        repo.mark_retry(
+                            event,
+                            now_utc=now,
+                            retry_delay_sec=self.retry_delay_sec,
+                            error=delivery.error,
+                        )
+                        continue
+                    result = OutboxResult(
+                        event_id=delivery.event_id,
+                        status=OutboxEventStatus.ACK_FAIL,
+                        error=delivery.error,
+                    )
+
+                self._finish(session, repo, event, result, now)
+                settled.append(result)
+            session.commit()
+            return settled
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _finish(
+        self,
+        session: Session,
+        repo: OutboxRepository,
+        event: OutboxEvent,
+        result: OutboxResult,
+        now: datetime,
+    ) -> None:
+        repo.mark_result(
+            event,
+            status=result.status,
+            now_utc=now,
+            ack_payload=result.ack_data,
+            error=result.error,
+        )
+        if result.ok:
+            self.acked += 1
+        else:
+            self.failed += 1
+            logger.warning(
+                "Outbox event not acknowledged",
+                extra={
+                    "event_id": str(event.event_id),
+                    "event_type": event.event_type,
+                    "entity_id": event.entity_id,
+                    "status": result.status.value,
+                    "error": result.error,
+                },
+            )
+
+        reconciler = self._reconcilers.get(event.event_type)
+        if reconciler is None:
+            return
+        try:
+            with session.begin_nested():
+                reconciler(session, event)
+        except Exception:
+            logger.exception(
+                "Outbox reconciler failed",
+                extra={"event_id": str(event.event_id), "event_type": event.event_type},
+            )
+
+    async def _safe_load_status(self, event_id: UUID) -> OutboxEventStatus | None:
+        try:
+            return await asyncio.to_thread(self._load_status, event_id)
+        except Exception:
+            logger.exception("Outbox status lookup failed", extra={"event_id": str(event_id)})
+            return None
+
+    def purge_finished(self) -> int:
+        """Delete settled events older than `retention_sec`, in batches."""
+        older_than = _utc_now() - timedelta(seconds=self.retention_sec)
+        batch_size = settings.OUTBOX_PURGE_BATCH_SIZE
+        purged = 0
+        while True:
+            session = self.session_factory()
+            try:
+                deleted = OutboxRepository(session).purge_finished(
+                    older_than=older_than, limit=batch_size
+                )
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+            purged += deleted
+            if deleted < batch_size:
+                break
+        if purged:
+            self.purged += purged
+            logger.info("Outbox events purged", extra={"count": purged})
+        return purged
+
+    def _load_status(self, event_id: UUID) -> OutboxEventStatus | None:
+        session = self.session_factory()
+        try:
+            return OutboxRepository(session).get_status(event_id=event_id)
+        finally:
+            session.close()
+
+    def _resolve(self, result: OutboxResult) -> None:
+        future = self._waiters.get(result.event_id)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "published": self.published,
+            "acked": self.acked,
+            "failed": self.failed,
+            "purged": self.purged,
+            "waiters": len(self._waiters),
+        }
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+outbox_relay = OutboxRelay()
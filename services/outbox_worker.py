@@ -0,0 +1,72 @@
+"""
+Outbox relay worker.
+
+Committed outbox events are only retried, timed out, reconciled and
+purged while an `OutboxRelay.run()` loop is running. Run it inside an API
+process with `NatsModule(outbox_relay=True)`, or as a separate worker:
+
+    python -m smart_common.scripts.run_outbox_worker
+
+Reconcilers are registered here as well, so a relay running outside the
+API processes still undoes unacknowledged device creations and restores
+rejected states.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from smart_common.nats.state_cache import LatestStateCache
+from smart_common.repositories.device import DeviceRepository
+from smart_common.repositories.microcontroller import MicrocontrollerRepository
+from smart_common.repositories.provider import ProviderRepository
+from smart_common.services.device_service import DeviceService
+from smart_common.services.microcontroller_service import MicrocontrollerService
+from smart_common.services.outbox_relay import OutboxRelay, outbox_relay
+
+logger = logging.getLogger(__name__)
+
+
+def register_outbox_reconcilers(
+    relay: OutboxRelay = outbox_relay,
+    *,
+    state_cache: LatestStateCache | None = None,
+) -> OutboxRelay:
+    """
+    Register the reconcilers of every service that writes outbox events;
+    with `state_cache`, reconciled devices are invalidated in it.
+    """
+    DeviceService(
+        DeviceRepository,
+        MicrocontrollerRepository,
+        state_cache=state_cache,
+        outbox=relay,
+    )
+    MicrocontrollerService(
+        MicrocontrollerRepository,
+        ProviderRepository,
+        outbox=relay,
+        state_cache=state_cache,
+    )
+    return relay
+
+
+async def run_outbox_worker(relay: OutboxRelay = outbox_relay) -> None:
+    """Connect, then relay until SIGINT/SIGTERM."""
+    register_outbox_reconcilers(relay)
+    await relay.publisher.client.connect()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, relay.stop)
+        except NotImplementedError:
+            pass
+
+    logger.info("Outbox worker started")
+    try:
+        await relay.run()
+    finally:
+        await relay.publisher.client.close()
+        logger.info("Outbox worker stopped", extra=relay.stats())
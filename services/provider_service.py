@@ -1,5 +1,5 @@
 import logging
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -21,10 +21,20 @@ from smart_common.schemas.automation_rule import (
 )
 
 # ---- provider config schemas ----
+from smart_common.nats.state_cache import (
+    LatestStateCache,
+    provider_metrics_state,
+    provider_power_state,
+)
+from smart_common.repositories.measurement_repository import MeasurementRepository
 from smart_common.repositories.microcontroller import MicrocontrollerRepository
 from smart_common.repositories.provider import ProviderRepository
 from smart_common.core.security import encrypt_secret
 from smart_common.repositories.provider_credentials import ProviderCredentialRepository
+from smart_common.providers.adapters.factory import (
+    invalidate_provider_adapters,
+    invalidate_provider_credentials,
+)
 from smart_common.providers.definitions.base import ProviderDefinition
 from smart_common.providers.definitions.registry import PROVIDER_DEFINITION_REGISTRY
 from smart_common.providers.registry import resolve_sensor_type
@@ -38,9 +48,11 @@ class ProviderService:
         microcontroller_repo_factory: Optional[
             Callable[[Session], MicrocontrollerRepository]
         ],
+        state_cache: LatestStateCache | None = None,
     ):
         self._provider_repo_factory = provider_repo_factory
         self._microcontroller_repo_factory = microcontroller_repo_factory
+        self.state_cache = state_cache
         self.logger = logging.getLogger(__name__)
 
     # ---------- repositories ----------
@@ -147,6 +159,8 @@ class ProviderService:
             return ProviderPowerSource.INVERTER
         if vendor == ProviderVendor.GOODWE:
             return ProviderPowerSource.METER
+        if vendor in (ProviderVendor.FRONIUS, ProviderVendor.SUNSPEC):
+            return ProviderPowerSource.INVERTER
         return None
 
     def _resolve_definition(self, vendor: ProviderVendor) -> ProviderDefinition:
@@ -165,7 +179,7 @@ class ProviderService:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Provider config schema is not defined",
             )
-        return schema.model_validate(config or {}).model_dump()
+        return schema.model_validate(config or {}).model_dump(mode="json")
 
     def _validate_credentials(
         self,
@@ -239,6 +253,29 @@ class ProviderService:
                 )
 
             return self._validate_external_id(external_id)
+        if vendor == ProviderVendor.FRONIUS:
+            host = config.get("host")
+
+            if not host:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Fronius provider requires host in config",
+                )
+
+            return self._validate_external_id(host)
+        if vendor == ProviderVendor.SUNSPEC:
+            host = config.get("host")
+
+            if not host:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="SunSpec provider requires host in config",
+                )
+
+            # One TCP endpoint can serve several devices by unit id.
+            return self._validate_external_id(
+                f"{host}:{config.get('port', 502)}/{config.get('unit_id', 1)}"
+            )
 
     def _coerce_power_value(self, raw_value) -> float | None:
         if raw_value is None:
@@ -517,6 +554,7 @@ class ProviderService:
 
         db.commit()
         db.refresh(provider)
+        invalidate_provider_adapters(provider.id)
         self.logger.info(
             "Provider updated",
             extra={
@@ -656,6 +694,65 @@ class ProviderService:
                         ),
                     )
 
+    # ---------- latest state ----------
+
+    def get_latest_power(
+        self,
+        db: Session,
+        user_id: int,
+        provider_id: int,
+    ) -> dict[str, Any] | None:
+        """Latest power reading, served from the shared state cache when set."""
+        self._ensure_provider(db, user_id, provider_id)
+
+        def load() -> dict[str, Any] | None:
+            measurement = self._latest_measurement(db, provider_id)
+            if measurement is None:
+                return None
+            return provider_power_state(
+                provider_id,
+                value=measurement.measured_value,
+                unit=measurement.measured_unit,
+                measured_at=measurement.measured_at,
+            )
+
+        if self.state_cache is None:
+            return load()
+        return self.state_cache.provider_power(provider_id, load)
+
+    def get_latest_metrics(
+        self,
+        db: Session,
+        user_id: int,
+        provider_id: int,
+    ) -> dict[str, Any] | None:
+        """Latest extra metric values, served from the shared state cache when set."""
+        self._ensure_provider(db, user_id, provider_id)
+
+        def load() -> dict[str, Any] | None:
+            measurement = self._latest_measurement(db, provider_id)
+            if measurement is None or not measurement.metric_samples:
+                return None
+            return provider_metrics_state(
+                provider_id,
+                metrics={
+                    sample.metric_key: {
+                        "value": float(sample.value),
+                        "unit": sample.unit,
+                    }
+                    for sample in measurement.metric_samples
+                },
+                measured_at=measurement.measured_at,
+            )
+
+        if self.state_cache is None:
+            return load()
+        return self.state_cache.provider_metrics(provider_id, load)
+
+    @staticmethod
+    def _latest_measurement(db: Session, provider_id: int):
+        return MeasurementRepository(db).get_last_measurement(provider_id)
+
     def get_provider(
         self,
         db: Session,
@@ -678,6 +775,8 @@ class ProviderService:
             return False
         self._repo(db).delete(provider)
         db.commit()
+        invalidate_provider_adapters(provider.id)
+        invalidate_provider_credentials(provider.id)
         self.logger.info(
             "Provider deleted",
             extra={"provider_id": provider.id, "user_id": user_id},
@@ -724,6 +823,7 @@ class ProviderService:
                 refresh_token=_encrypt_optional(credentials.get("refresh_token")),
             )
         )
+        invalidate_provider_credentials(provider_id)
 
     def _create_provider(
         self,